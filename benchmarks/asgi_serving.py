@@ -0,0 +1,84 @@
+"""
+Requests/sec of an async Flask view served through asgiref's WsgiToAsgi (a new event loop per request)
+versus FlaskAsgiApp (one persistent loop per worker).
+
+The ASGI apps are driven in-process, so the numbers show the serving overhead without network noise.
+
+    PYTHONPATH=src python benchmarks/asgi_serving.py --requests 2000 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any
+
+from asgiref.wsgi import WsgiToAsgi
+from flask import Flask, jsonify
+from flask.typing import ResponseReturnValue
+
+from infrastructure.server.asgi import FlaskAsgiApp, LoopBoundFlask
+
+
+def build_app(app: Flask) -> Flask:
+    @app.get("/ping")
+    async def ping() -> ResponseReturnValue:
+        # Stands in for a DB round trip
+        await asyncio.sleep(0.001)
+        return jsonify({"ok": True})
+
+    return app
+
+
+async def request(asgi_app: Any) -> None:
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict[str, Any]) -> None:
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/ping",
+        "query_string": b"",
+        "headers": [],
+        "server": ("bench", 80),
+        "client": ("127.0.0.1", 1),
+        "http_version": "1.1",
+        "scheme": "http",
+        "root_path": "",
+        "asgi": {"version": "3.0"},
+    }
+    await asgi_app(scope, receive, send)
+
+
+async def run(asgi_app: Any, requests: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited() -> None:
+        async with semaphore:
+            await request(asgi_app)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(limited() for _ in range(requests)))
+    return requests / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    candidates = {
+        "WsgiToAsgi": WsgiToAsgi(build_app(Flask("before"))),
+        "FlaskAsgiApp": FlaskAsgiApp(build_app(LoopBoundFlask("after")), wsgi_threads=32, executor_threads=16),
+    }
+    for name, asgi_app in candidates.items():
+        rps = asyncio.run(run(asgi_app, args.requests, args.concurrency))
+        print(f"{name:>14}: {rps:8.0f} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Time to list the branches of a repository with many refs through GitPython's `repo.heads`, which parses
+every head and loads its commit, versus `GitPythonStorage`, which reads the ref files directly, and the
+first page of `list_branches`.
+
+    PYTHONPATH=src python benchmarks/branch_listing.py --branches 20000 --repeat 5
+"""
+
+import argparse
+import asyncio
+import subprocess
+import tempfile
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+
+from git import Repo
+
+from domain.schemas.repository_storage import ListBranchesSchema
+from infrastructure.storage.git_storage import GitPythonStorage
+
+REPO_PATH = "bench-repo"
+
+
+def build_repository(base_path: Path, branches: int, packed: bool) -> None:
+    repo_dir = base_path / REPO_PATH
+    Repo.init(repo_dir, bare=True)
+    env = ["-c", "user.name=bench", "-c", "user.email=bench@example.com"]
+    tree = subprocess.run(["git", "mktree"], cwd=repo_dir, input=b"", capture_output=True, check=True).stdout
+    sha = subprocess.run(
+        ["git", *env, "commit-tree", tree.decode().strip(), "-m", "init"], cwd=repo_dir, capture_output=True, check=True
+    ).stdout.decode().strip()
+    commands = "".join(f"create refs/heads/branch-{i:06d} {sha}\n" for i in range(branches))
+    subprocess.run(["git", "update-ref", "--stdin"], cwd=repo_dir, input=commands.encode(), check=True)
+    if packed:
+        subprocess.run(["git", "pack-refs", "--all"], cwd=repo_dir, check=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--branches", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for packed in (False, True):
+        with tempfile.TemporaryDirectory() as tmp:
+            base_path = Path(tmp)
+            build_repository(base_path, args.branches, packed)
+            storage = GitPythonStorage(repositories_dir=base_path)
+            page = ListBranchesSchema(repo_path=REPO_PATH, limit=100)
+
+            candidates: dict[str, Callable[[], object]] = {
+                "repo.heads": lambda: [
+                    (i.name, i.commit.hexsha) for i in Repo(base_path / REPO_PATH).heads  # noqa: B023
+                ],
+                "get_branches": lambda: asyncio.run(storage.get_branches(REPO_PATH)),  # noqa: B023
+                "list_branches": lambda: asyncio.run(storage.list_branches(page)),  # noqa: B023
+            }
+
+            print(f"{args.branches} {'packed' if packed else 'loose'} refs")
+            for name, run in candidates.items():
+                seconds = min(timeit.repeat(run, number=1, repeat=args.repeat))
+                print(f"{name:>14}: {seconds * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
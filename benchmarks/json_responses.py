@@ -0,0 +1,45 @@
+"""
+Time to build a JSON response for a tree listing with `jsonify` over `model_dump()` dicts versus
+`json_response`, which serialises the models directly.
+
+    PYTHONPATH=src python benchmarks/json_responses.py --entries 1000 --repeat 200
+"""
+
+import argparse
+import timeit
+from collections.abc import Callable
+
+from flask import Flask, Response, jsonify
+
+from api.utils.json_response import json_response
+from domain.schemas.repository_storage import TreeNode
+
+
+def build_nodes(entries: int) -> list[TreeNode]:
+    return [
+        TreeNode(name=f"module_{i}.py", path=f"src/package/module_{i}.py", type="blob", sha=f"{i:040x}", size=i * 17)
+        for i in range(entries)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    nodes = build_nodes(args.entries)
+    candidates: dict[str, Callable[[], Response]] = {
+        "jsonify": lambda: jsonify([i.model_dump() for i in nodes]),
+        "json_response": lambda: json_response(nodes),
+    }
+
+    app = Flask(__name__)
+    with app.app_context():
+        for name, build in candidates.items():
+            seconds = min(timeit.repeat(build, number=args.repeat, repeat=3)) / args.repeat
+            print(f"{name:>14}: {seconds * 1000:8.3f} ms per response")
+
+
+if __name__ == "__main__":
+    main()
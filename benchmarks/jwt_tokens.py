@@ -0,0 +1,72 @@
+"""
+Access tokens signed and verified per second: RS256 with the PEM strings handed to PyJWT on every call, as
+TokenService used to, then keys parsed once by the key store for each supported algorithm.
+
+    PYTHONPATH=src python benchmarks/jwt_tokens.py --tokens 2000
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+from uuid import uuid4
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from cryptography.hazmat.primitives.asymmetric.types import PrivateKeyTypes
+
+from domain.services.auth.keys import parse_jwt_keys
+
+
+def generate_key(algorithm: str) -> PrivateKeyTypes:
+    if algorithm == "RS256":
+        return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    if algorithm == "ES256":
+        return ec.generate_private_key(ec.SECP256R1())
+    return ed25519.Ed25519PrivateKey.generate()
+
+
+def to_pem(key: PrivateKeyTypes) -> tuple[str, str]:
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    public_pem = key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return private_pem.decode(), public_pem.decode()
+
+
+def rate(count: int, operation: Callable[[int], object]) -> float:
+    start = time.perf_counter()
+    for i in range(count):
+        operation(i)
+    return count / (time.perf_counter() - start)
+
+
+def measure(
+    name: str, algorithm: str, signing_key: object, verification_key: object, payload: dict[str, object], count: int
+) -> None:
+    tokens = [jwt.encode(payload, key=signing_key, algorithm=algorithm)] * count
+    signed = rate(count, lambda _: jwt.encode(payload, key=signing_key, algorithm=algorithm))
+    verified = rate(count, lambda i: jwt.decode(tokens[i], key=verification_key, algorithms=[algorithm]))
+    print(f"{name:<20} {signed:8.0f} signed/s {verified:10.0f} verified/s  {len(tokens[0])} bytes")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tokens", type=int, default=2000)
+    args = parser.parse_args()
+
+    now = int(time.time())
+    payload = {"sub": str(uuid4()), "email": "alice@example.com", "iat": now, "exp": now + 900}
+
+    for algorithm in ("RS256", "ES256", "EdDSA"):
+        private_pem, public_pem = to_pem(generate_key(algorithm))
+        if algorithm == "RS256":
+            measure("RS256, PEM per call", algorithm, private_pem, public_pem, payload, args.tokens)
+        keys = parse_jwt_keys(private_pem, public_pem, algorithm)
+        measure(f"{algorithm}, parsed", algorithm, keys.signing_key, keys.verification_key, payload, args.tokens)
+
+
+if __name__ == "__main__":
+    main()
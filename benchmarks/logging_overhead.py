@@ -0,0 +1,73 @@
+"""
+Time spent in the request thread on the logging of one request (the access log line and a use case's
+records), with the sink configurations of `init_logger`. Records go to /dev/null, so the numbers are the
+formatting and hand-off cost, not the terminal's. The CPU column is the request thread's own time, the wall
+time also holds the GIL time taken by the writer threads.
+
+    PYTHONPATH=src python benchmarks/logging_overhead.py --requests 20000
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections.abc import Callable
+from typing import Any
+from uuid import uuid4
+
+from loguru import logger
+
+from config.logging import LevelSampler, QueuedJsonSink, format_record
+
+
+def log_request(request_id: str) -> None:
+    request_logger = logger.bind(request_id=request_id)
+    request_logger.bind(use_case="GetBranchesUseCase", username="alice", repository_name="linux").info(
+        "Starting get branches"
+    )
+    request_logger.debug("Repository found")
+    request_logger.info('{} - "{} {}" {}', "127.0.0.1", "GET", "/api/v1/users/alice/repositories/linux/branches", 200)
+
+
+def run(requests: int) -> tuple[float, float]:
+    request_ids = [str(uuid4()) for _ in range(requests)]
+    start, start_cpu = time.perf_counter(), time.thread_time()
+    for request_id in request_ids:
+        log_request(request_id)
+    return time.perf_counter() - start, time.thread_time() - start_cpu
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20_000)
+    args = parser.parse_args()
+
+    devnull = open(os.devnull, "w")
+    setups: dict[str, Callable[[], tuple[int, Any]]] = {
+        "text, synchronous": lambda: (logger.add(devnull, format=format_record, level="INFO"), None),
+        "text, enqueue=True": lambda: (logger.add(devnull, format=format_record, level="INFO", enqueue=True), None),
+        "json, queued": lambda: _json(devnull, {}),
+        "json, queued, 10% of INFO": lambda: _json(devnull, {"INFO": 0.1}),
+    }
+
+    for name, setup in setups.items():
+        logger.remove()
+        handler_id, sink = setup()
+        run(min(args.requests, 1000))  # warm-up
+        elapsed, cpu = run(args.requests)
+        logger.remove(handler_id)  # waits for the queued records
+        dropped = f", {sink.dropped} dropped" if sink is not None else ""
+        print(
+            f"{name:<28} {cpu / args.requests * 1e6:8.1f} µs CPU, {elapsed / args.requests * 1e6:8.1f} µs wall"
+            f" per request{dropped}",
+            file=sys.stderr,
+        )
+
+
+def _json(stream: Any, sampling: dict[str, float]) -> tuple[int, QueuedJsonSink]:
+    sink = QueuedJsonSink(stream=stream)
+    return logger.add(sink, format="{message}", level="INFO", filter=LevelSampler(sampling)), sink
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Cost of recording a request duration in a labelled histogram, with per-thread slots versus one lock
+shared by all threads, as the WSGI threads of a worker would record it.
+
+    PYTHONPATH=src python benchmarks/metrics_overhead.py --threads 8 --observations 200000
+"""
+
+import argparse
+import bisect
+import threading
+import time
+from collections.abc import Callable
+
+from infrastructure.metrics.registry import DEFAULT_BUCKETS, Registry
+
+
+class LockedHistogram:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts = [0] * (len(DEFAULT_BUCKETS) + 1)
+        self._sum = 0.0
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._counts[bisect.bisect_left(DEFAULT_BUCKETS, value)] += 1
+            self._sum += value
+
+
+def run(threads: int, observations: int, observe: Callable[[float], None]) -> float:
+    barrier = threading.Barrier(threads + 1)
+
+    def record() -> None:
+        barrier.wait()
+        for i in range(observations):
+            observe((i % 100) / 1000)
+
+    workers = [threading.Thread(target=record) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--observations", type=int, default=200_000)
+    args = parser.parse_args()
+
+    histogram = Registry().histogram("request_seconds", "Requests.", labelnames=("method", "route", "status"))
+    locked: dict[tuple[str, str, str], LockedHistogram] = {("GET", "/branches", "200"): LockedHistogram()}
+    candidates: dict[str, Callable[[float], None]] = {
+        "thread slots": lambda value: histogram.labels("GET", "/branches", "200").observe(value),
+        "shared lock": lambda value: locked[("GET", "/branches", "200")].observe(value),
+    }
+
+    total = args.threads * args.observations
+    for name, observe in candidates.items():
+        seconds = run(args.threads, args.observations, observe)
+        print(f"{name:>13}: {seconds / total * 1e9:8.1f} ns per observation")
+
+
+if __name__ == "__main__":
+    main()
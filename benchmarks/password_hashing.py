@@ -0,0 +1,82 @@
+"""
+Password checks per second of concurrent logins, with bcrypt run inline on the event loop as the login used
+to, in the hasher's thread pool, and in a process pool for comparison. Also reports the longest stall of the
+event loop, which every other request of the worker waits through.
+
+    PYTHONPATH=src python benchmarks/password_hashing.py --logins 32 --rounds 12 --workers 4
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ProcessPoolExecutor
+
+from domain.services.auth.password_hasher import check_password, hash_password
+from infrastructure.auth.password_hasher import PooledPasswordHasher
+
+PASSWORD = "Password123"
+
+
+async def run(logins: int, verify: Callable[[str, str], Awaitable[bool]], password_hash: str) -> tuple[float, float]:
+    longest_stall = 0.0
+
+    async def watch_loop() -> None:
+        nonlocal longest_stall
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(0.001)
+            longest_stall = max(longest_stall, time.perf_counter() - started - 0.001)
+
+    watcher = asyncio.create_task(watch_loop())
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    await asyncio.gather(*(verify(PASSWORD, password_hash) for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    await asyncio.sleep(0.01)  # lets the watcher see the last stall
+    watcher.cancel()
+    return logins / elapsed, longest_stall
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    cores = len(os.sched_getaffinity(0))
+    password_hash = hash_password(PASSWORD, args.rounds)
+    loop = asyncio.get_running_loop()
+
+    async def inline(password: str, hashed: str) -> bool:
+        return check_password(password, hashed)
+
+    hasher = PooledPasswordHasher(workers=args.workers, rounds=args.rounds)
+    processes = ProcessPoolExecutor(args.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    async def in_processes(password: str, hashed: str) -> bool:
+        return await loop.run_in_executor(processes, check_password, password, hashed)
+
+    await in_processes(PASSWORD, password_hash)  # starts the processes
+    candidates: dict[str, Callable[[str, str], Awaitable[bool]]] = {
+        "inline": inline,
+        f"{args.workers} threads": hasher.verify,
+        f"{args.workers} processes": in_processes,
+    }
+    print(f"{cores} cores, cost {args.rounds}")
+    for name, verify in candidates.items():
+        rate, stall = await run(args.logins, verify, password_hash)
+        print(
+            f"{name:<12} {rate:7.1f} logins/s {rate / cores:7.1f} per core,"
+            f" longest loop stall {stall * 1000:7.1f} ms"
+        )
+
+    hasher.shutdown()
+    processes.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,45 @@
+"""add forked_from_id to repositories
+
+Revision ID: 3c1f7a9e5b2d
+Revises: 7122db3a117e
+Create Date: 2026-10-19 09:30:12.418305
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3c1f7a9e5b2d"
+down_revision: Union[str, Sequence[str], None] = "7122db3a117e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("repositories", sa.Column("forked_from_id", sa.UUID(), nullable=True))
+    op.create_index(
+        op.f("ix_repositories_forked_from_id"),
+        "repositories",
+        ["forked_from_id"],
+        unique=False,
+    )
+    op.create_foreign_key(
+        op.f("fk_repositories_forked_from_id_repositories"),
+        "repositories",
+        "repositories",
+        ["forked_from_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(op.f("fk_repositories_forked_from_id_repositories"), "repositories", type_="foreignkey")
+    op.drop_index(op.f("ix_repositories_forked_from_id"), table_name="repositories")
+    op.drop_column("repositories", "forked_from_id")
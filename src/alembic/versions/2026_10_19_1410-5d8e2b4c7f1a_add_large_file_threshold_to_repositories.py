@@ -0,0 +1,29 @@
+"""add large_file_threshold to repositories
+
+Revision ID: 5d8e2b4c7f1a
+Revises: 3c1f7a9e5b2d
+Create Date: 2026-10-19 14:10:37.902114
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5d8e2b4c7f1a"
+down_revision: Union[str, Sequence[str], None] = "3c1f7a9e5b2d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("repositories", sa.Column("large_file_threshold", sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("repositories", "large_file_threshold")
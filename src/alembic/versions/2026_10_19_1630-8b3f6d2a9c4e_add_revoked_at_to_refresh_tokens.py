@@ -0,0 +1,33 @@
+"""add revoked_at to refresh_tokens
+
+Revision ID: 8b3f6d2a9c4e
+Revises: 5d8e2b4c7f1a
+Create Date: 2026-10-19 16:30:12.418305
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8b3f6d2a9c4e"
+down_revision: Union[str, Sequence[str], None] = "5d8e2b4c7f1a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("refresh_tokens", sa.Column("revoked_at", sa.DateTime(timezone=True), nullable=True))
+    # When they were revoked is unknown, the retention of the purge starts now for them
+    op.execute("UPDATE refresh_tokens SET revoked_at = now() WHERE is_revoked")
+    op.create_index(op.f("ix_refresh_tokens_revoked_at"), "refresh_tokens", ["revoked_at"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_refresh_tokens_revoked_at"), table_name="refresh_tokens")
+    op.drop_column("refresh_tokens", "revoked_at")
@@ -0,0 +1,34 @@
+"""index refresh_tokens by user and creation
+
+Revision ID: c4a9e1f7d2b6
+Revises: 8b3f6d2a9c4e
+Create Date: 2026-10-19 18:00:41.205713
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4a9e1f7d2b6"
+down_revision: Union[str, Sequence[str], None] = "8b3f6d2a9c4e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_refresh_tokens_user_id_created_at_id",
+        "refresh_tokens",
+        ["user_id", "created_at", "id"],
+        unique=False,
+    )
+    op.drop_index(op.f("ix_refresh_tokens_user_id"), table_name="refresh_tokens")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f("ix_refresh_tokens_user_id"), "refresh_tokens", ["user_id"], unique=False)
+    op.drop_index("ix_refresh_tokens_user_id_created_at_id", table_name="refresh_tokens")
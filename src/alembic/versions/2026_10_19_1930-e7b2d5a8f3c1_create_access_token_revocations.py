@@ -0,0 +1,64 @@
+"""create access token revocations
+
+Revision ID: e7b2d5a8f3c1
+Revises: c4a9e1f7d2b6
+Create Date: 2026-10-19 19:30:08.661947
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e7b2d5a8f3c1"
+down_revision: Union[str, Sequence[str], None] = "c4a9e1f7d2b6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "revoked_access_tokens",
+        sa.Column("jti", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+            name=op.f("fk_revoked_access_tokens_user_id_users"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("jti", name=op.f("pk_revoked_access_tokens")),
+    )
+    op.create_index(
+        op.f("ix_revoked_access_tokens_expires_at"), "revoked_access_tokens", ["expires_at"], unique=False
+    )
+    op.create_index(op.f("ix_revoked_access_tokens_user_id"), "revoked_access_tokens", ["user_id"], unique=False)
+    op.create_table(
+        "user_token_revocations",
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("revoked_before", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+            name=op.f("fk_user_token_revocations_user_id_users"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("user_id", name=op.f("pk_user_token_revocations")),
+    )
+    op.create_index(
+        op.f("ix_user_token_revocations_revoked_before"), "user_token_revocations", ["revoked_before"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_user_token_revocations_revoked_before"), table_name="user_token_revocations")
+    op.drop_table("user_token_revocations")
+    op.drop_index(op.f("ix_revoked_access_tokens_user_id"), table_name="revoked_access_tokens")
+    op.drop_index(op.f("ix_revoked_access_tokens_expires_at"), table_name="revoked_access_tokens")
+    op.drop_table("revoked_access_tokens")
@@ -5,6 +5,26 @@ class ApiException(Exception):
         super().__init__(self.message)
 
 
+class MissingContentLengthException(ApiException):
+    def __init__(self, message: str = "Content-Length header is required"):
+        super().__init__(message, 411)
+
+
 class MissingCookiesException(ApiException):
     def __init__(self, message: str = "Required cookies are missing"):
         super().__init__(message, 400)
+
+
+class InvalidCursorException(ApiException):
+    def __init__(self, message: str = "Invalid pagination cursor"):
+        super().__init__(message, 400)
+
+
+class InvalidQueryParameterException(ApiException):
+    def __init__(self, message: str = "Invalid query parameter"):
+        super().__init__(message, 400)
+
+
+class InvalidLfsBatchException(ApiException):
+    def __init__(self, message: str = "Invalid LFS batch request"):
+        super().__init__(message, 422)
@@ -0,0 +1,27 @@
+from collections.abc import Callable
+from http import HTTPStatus
+from typing import Any
+
+from flask import Response, request
+
+from api.utils.json_response import json_response
+from domain.value_objects.git import ConditionalResult
+
+
+def get_if_none_match() -> frozenset[str]:
+    """ETags from the request's `If-None-Match`. Weak ones are kept, the header is compared weakly."""
+
+    etags = request.if_none_match
+    if etags.star_tag:
+        return frozenset({"*"})
+    return frozenset(etags.as_set(include_weak=True))
+
+
+def conditional_response(
+    result: ConditionalResult[Any], build: Callable[[Any], Response] = json_response
+) -> Response:
+    """Builds the body from `result.data`, or an empty 304 if the client's copy is current."""
+
+    response = Response(status=HTTPStatus.NOT_MODIFIED) if result.not_modified else build(result.data)
+    response.set_etag(result.etag)
+    return response
@@ -0,0 +1,33 @@
+from collections.abc import Sequence
+from functools import cache
+from typing import Any
+
+from flask import Response
+from pydantic import BaseModel, TypeAdapter
+
+
+@cache
+def _list_adapter(model: type[BaseModel]) -> TypeAdapter[list[Any]]:
+    # Building an adapter compiles a serializer, so one is kept per model
+    return TypeAdapter(list[model])  # type: ignore[valid-type]
+
+
+def dump_json(data: BaseModel | Sequence[BaseModel]) -> bytes:
+    """Serialises a model or a list of models of one type straight to JSON bytes."""
+
+    if isinstance(data, BaseModel):
+        return data.__pydantic_serializer__.to_json(data)
+    if not data:
+        return b"[]"
+    return _list_adapter(type(data[0])).dump_json(list(data))
+
+
+def json_response(data: BaseModel | Sequence[BaseModel], mimetype: str = "application/json") -> Response:
+    """
+    Replaces `jsonify([i.model_dump() for i in data])`.
+
+    Pydantic writes the JSON in Rust, without building an intermediate dict per model and encoding it
+    again with the stdlib encoder. Dates are written in ISO 8601.
+    """
+
+    return Response(dump_json(data), mimetype=mimetype)
@@ -0,0 +1,17 @@
+import base64
+import binascii
+
+from api.exceptions.api import InvalidCursorException
+
+
+def encode_cursor(value: str) -> str:
+    return base64.urlsafe_b64encode(value.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    """:raises InvalidCursorException:"""
+
+    try:
+        return base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError) as e:
+        raise InvalidCursorException() from e
@@ -1,5 +1,6 @@
 from typing import Any
 
+from api.exceptions.api import InvalidQueryParameterException
 from domain.exceptions.common import MissingRequiredFieldException
 
 
@@ -10,3 +11,14 @@ def get_required_field(data: dict[str, Any], field_name: str) -> Any:
         return data[field_name]
     except KeyError as e:
         raise MissingRequiredFieldException(f"Field '{field_name}' is required") from e
+
+
+def get_int_field(data: dict[str, Any], field_name: str, default: int) -> int:
+    """:raises InvalidQueryParameterException:"""
+
+    if field_name not in data:
+        return default
+    try:
+        return int(data[field_name])
+    except (TypeError, ValueError) as e:
+        raise InvalidQueryParameterException(f"Field '{field_name}' must be an integer") from e
@@ -1,20 +1,25 @@
+from http import HTTPStatus
 from typing import cast
 
 from dependency_injector.wiring import Provide, inject
-from flask import Blueprint, Response, jsonify, make_response, request
+from flask import Blueprint, Response, g, jsonify, make_response, request
 from pydantic import IPvAnyAddress
 
 from api.exceptions.api import MissingCookiesException
 from application.commands.auth import (
     RefreshTokensCommand,
     UserLoginCommand,
+    UserLogoutCommand,
     UserRegisterCommand,
 )
 from application.use_cases.auth.login_user import LoginUserUseCase
+from application.use_cases.auth.logout_user import LogoutUserUseCase
 from application.use_cases.auth.refresh_tokens import RefreshTokensUseCase
 from application.use_cases.auth.register_user import RegisterUserUseCase
 from config import settings
+from domain.services.auth.token import TokenService
 from infrastructure.di.container import Container
+from infrastructure.middleware.auth import require_auth
 
 auth_router = Blueprint("auth", __name__, url_prefix=settings.api.auth.prefix)
 
@@ -91,3 +96,39 @@ async def refresh(
         samesite=settings.auth.cookies.refresh.samesite,
     )
     return response, 200
+
+
+@auth_router.route(settings.api.auth.logout_prefix, methods=settings.api.auth.logout_methods)
+@require_auth()
+@inject
+async def logout(
+    use_case: LogoutUserUseCase = Provide[Container.use_cases.logout_user],
+) -> tuple[Response, int]:
+    data = request.get_json(silent=True) or {}
+    payload = g.access_payload
+    command = UserLogoutCommand(
+        user_id=payload.sub,
+        access_token_jti=payload.jti,
+        access_token_exp=payload.exp,
+        refresh_token=request.cookies.get("refresh_token"),
+        everywhere=data.get("everywhere", False),
+    )
+    await use_case.execute(command)
+
+    response = make_response("", HTTPStatus.NO_CONTENT)
+    response.delete_cookie(
+        "refresh_token",
+        httponly=settings.auth.cookies.refresh.httponly,
+        secure=settings.auth.cookies.refresh.secure,
+        samesite=settings.auth.cookies.refresh.samesite,
+    )
+    return response, HTTPStatus.NO_CONTENT
+
+
+@auth_router.get(settings.api.auth.jwks_prefix)
+@inject
+async def jwks(token_service: TokenService = Provide[Container.services.token_service]) -> tuple[Response, int]:
+    response = jsonify(token_service.jwks())
+    response.cache_control.public = True
+    response.cache_control.max_age = settings.auth.jwt.jwks_max_age
+    return response, 200
@@ -1,40 +1,70 @@
 import base64
 import io
 from http import HTTPStatus
+from typing import BinaryIO, cast
 
-import filetype
 from dependency_injector.wiring import Provide, inject
-from flask import Blueprint, Response, g, jsonify, request, send_file
-
-from api.utils.require_field import get_required_field
+from flask import Blueprint, Response, g, jsonify, request, send_file, url_for
+from pydantic import ValidationError
+
+from api.exceptions.api import InvalidLfsBatchException, MissingContentLengthException
+from api.utils.conditional import conditional_response, get_if_none_match
+from api.utils.json_response import json_response
+from api.utils.pagination import decode_cursor, encode_cursor
+from api.utils.require_field import get_int_field, get_required_field
 from application.commands.git import (
+    BranchSort,
     CreateBranchCommand,
     CreateInitialCommitCommand,
     CreateRepositoryCommand,
     DeleteRepositoryCommand,
+    DownloadLargeObjectCommand,
+    ExportRepositoryCommand,
+    ForkRepositoryCommand,
     GetBranchesCommand,
     GetCommitsCommand,
     GetFileCommand,
+    GetImportStatusCommand,
     GetRepositoryCommand,
     GetTreeCommand,
+    ImportRepositoryCommand,
+    LfsBatchCommand,
     UpdateFileCommand,
+    UploadLargeObjectCommand,
 )
 from application.use_cases.git.branches.create_branch import CreateBranchUseCase
 from application.use_cases.git.branches.get_branches import GetBranchesUseCase
+from application.use_cases.git.bundles.export_repository import ExportRepositoryUseCase
+from application.use_cases.git.bundles.get_import_status import GetImportStatusUseCase
+from application.use_cases.git.bundles.import_repository import ImportRepositoryUseCase
 from application.use_cases.git.commits.create_initial_commit import CreateInitialCommitUseCase
 from application.use_cases.git.commits.get_commits import GetCommitsUseCase
 from application.use_cases.git.commits.update_file import UpdateFileUseCase
 from application.use_cases.git.create_repository import CreateRepositoryUseCase
 from application.use_cases.git.delete_repository import DeleteRepositoryUseCase
+from application.use_cases.git.fork_repository import ForkRepositoryUseCase
 from application.use_cases.git.get_file import GetFileUseCase
+from application.use_cases.git.get_file_metadata import GetFileMetadataUseCase
 from application.use_cases.git.get_repository import GetRepositoryUseCase
 from application.use_cases.git.get_tree import GetTreeUseCase
+from application.use_cases.git.lfs.batch import LfsBatchUseCase
+from application.use_cases.git.lfs.download_object import DownloadLargeObjectUseCase
+from application.use_cases.git.lfs.upload_object import UploadLargeObjectUseCase
 from config import settings
+from domain.exceptions.common import MissingRequiredFieldException
+from domain.exceptions.git import BundleTooLargeException
+from domain.schemas.repository_storage import FileContent
 from domain.value_objects.common import Pagination
+from domain.value_objects.git import BranchPage, LfsObjectSpec
 from infrastructure.di.container import Container
 from infrastructure.middleware.auth import require_auth
+from infrastructure.middleware.rate_limit import rate_limit
 from infrastructure.utils.security import get_sanitized_data, sanitize_html_input
 
+COSTS = settings.rate_limit.costs
+# Room for the multipart boundaries and the other form fields next to the bundle
+IMPORT_FORM_OVERHEAD = 64 * 1024
+
 repositories_router = Blueprint("repositories", __name__, url_prefix=settings.api.repositories.prefix)
 
 
@@ -51,6 +81,7 @@ async def create_repository(
         repository_name=data["repository_name"],
         user_id=payload.sub,
         description=data["description"],
+        large_file_threshold=data.get("large_file_threshold"),
     )
     repository = await use_case.execute(command)
     return jsonify({"repository_id": repository.id}), HTTPStatus.CREATED
@@ -74,9 +105,93 @@ async def delete_repository(
     return Response(), HTTPStatus.NO_CONTENT
 
 
+@repositories_router.route("/<username>/<repository_name>/forks", methods=["POST"])
+@require_auth()
+@rate_limit(cost=COSTS.fork)
+@inject
+async def fork_repository(
+    username: str,
+    repository_name: str,
+    use_case: ForkRepositoryUseCase = Provide[Container.use_cases.fork_repository],
+) -> tuple[Response, int]:
+    _, data = get_sanitized_data(request)
+
+    command = ForkRepositoryCommand(
+        initiator_id=g.access_payload.sub,
+        owner_username=username,
+        repository_name=repository_name,
+        fork_name=data.get("repository_name"),
+        description=data.get("description"),
+    )
+    repository = await use_case.execute(command)
+    return jsonify({"repository_id": repository.id}), HTTPStatus.CREATED
+
+
+@repositories_router.route("/import", methods=["POST"])
+@require_auth()
+@rate_limit(cost=COSTS.bundle)
+@inject
+async def import_repository(
+    use_case: ImportRepositoryUseCase = Provide[Container.use_cases.import_repository],
+) -> tuple[Response, int]:
+    max_size = settings.git.bundle.max_size
+    if request.content_length is not None and request.content_length > max_size + IMPORT_FORM_OVERHEAD:
+        raise BundleTooLargeException(max_size=max_size)
+    # Chunked uploads have no Content-Length, the form parser stops reading them past this limit instead
+    request.max_content_length = max_size + IMPORT_FORM_OVERHEAD
+
+    bundle = request.files.get("bundle")
+    if bundle is None:
+        raise MissingRequiredFieldException("Field 'bundle' is required")
+
+    command = ImportRepositoryCommand(
+        user_id=g.access_payload.sub,
+        repository_name=sanitize_html_input(get_required_field(request.form, "repository_name")),
+        description=sanitize_html_input(request.form.get("description", "")),
+        bundle=cast(BinaryIO, bundle.stream),
+    )
+    job = await use_case.execute(command)
+    return json_response(job), HTTPStatus.ACCEPTED
+
+
+@repositories_router.route("/<username>/<repository_name>/import", methods=["GET"])
+@require_auth(optional=True)
+@inject
+async def get_import_status(
+    username: str,
+    repository_name: str,
+    use_case: GetImportStatusUseCase = Provide[Container.use_cases.get_import_status],
+) -> tuple[Response, int]:
+    command = GetImportStatusCommand(owner_username=username, repository_name=repository_name)
+    job = await use_case.execute(command)
+
+    return json_response(job), HTTPStatus.OK
+
+
+@repositories_router.route("/<username>/<repository_name>/bundle", methods=["GET"])
+@require_auth(optional=True)
+@rate_limit(cost=COSTS.bundle)
+@inject
+async def export_repository(
+    username: str,
+    repository_name: str,
+    use_case: ExportRepositoryUseCase = Provide[Container.use_cases.export_repository],
+) -> Response:
+    command = ExportRepositoryCommand(owner_username=username, repository_name=repository_name)
+    stream = await use_case.execute(command)
+
+    return Response(
+        stream,
+        mimetype="application/x-git-bundle",
+        headers={"Content-Disposition": f"attachment; filename={repository_name}.bundle"},
+    )
+
+
 @repositories_router.route("", methods=["GET"])
 @repositories_router.route("/<username>", methods=["GET"])
 @repositories_router.route("/<username>/<repository_name>", methods=["GET"])
+@require_auth(optional=True)
+@rate_limit(cost=COSTS.listing)
 @inject
 async def get_repositories(
     username: str | None = None,
@@ -91,20 +206,51 @@ async def get_repositories(
         pagination=Pagination(**{k: int(query[k]) for k in query if k in ["limit", "offset"]}),
     )
     result = await use_case.execute(command)
-    return jsonify([i.model_dump() for i in result]), 200
+    return json_response(result), 200
 
 
 @repositories_router.route("/<username>/<repository_name>/branches", methods=["GET"])
+@require_auth(optional=True)
+@rate_limit(cost=COSTS.listing)
 @inject
 async def get_branches(
     username: str,
     repository_name: str,
     use_case: GetBranchesUseCase = Provide[Container.use_cases.get_branches],
-) -> tuple[Response, int]:
-    command = GetBranchesCommand(username=username, repository_name=repository_name)
-    branches = await use_case.execute(command)
+) -> Response:
+    """Query: `prefix`, `sort` (`name` or `-name`), `limit` and `cursor` from the previous page's `Link` header."""
 
-    return jsonify([i.model_dump() for i in branches]), 200
+    query, _ = get_sanitized_data(request)
+    cursor = query.get("cursor")
+
+    command = GetBranchesCommand(
+        username=username,
+        repository_name=repository_name,
+        if_none_match=get_if_none_match(),
+        prefix=query.get("prefix", ""),
+        sort=cast(BranchSort, query.get("sort", "name")),  # the command rejects other values
+        after=decode_cursor(cursor) if cursor else None,
+        limit=get_int_field(query, "limit", settings.git.branches.page_size),
+    )
+    result = await use_case.execute(command)
+
+    def build(page: BranchPage) -> Response:
+        response = json_response(page.branches)
+        if page.next_after is not None:
+            next_url = url_for(
+                ".get_branches",
+                username=username,
+                repository_name=repository_name,
+                prefix=command.prefix or None,
+                sort=command.sort,
+                limit=command.limit,
+                cursor=encode_cursor(page.next_after),
+                _external=True,
+            )
+            response.headers["Link"] = f'<{next_url}>; rel="next"'
+        return response
+
+    return conditional_response(result, build)
 
 
 @repositories_router.route("/<username>/<repository_name>/branches", methods=["POST"])
@@ -130,21 +276,24 @@ async def create_branch(
 
 
 @repositories_router.route("/<username>/<repository_name>/branches/<branch_name>", methods=["GET"])
+@require_auth(optional=True)
+@rate_limit(cost=COSTS.commits)
 @inject
 async def get_commits(
     username: str,
     repository_name: str,
     branch_name: str,
     use_case: GetCommitsUseCase = Provide[Container.use_cases.get_commits],
-) -> tuple[Response, int]:
+) -> Response:
     command = GetCommitsCommand(
         owner_username=username,
         repository_name=repository_name,
         branch_name=branch_name,
+        if_none_match=get_if_none_match(),
     )
-    commits = await use_case.execute(command)
+    result = await use_case.execute(command)
 
-    return jsonify([i.model_dump() for i in commits]), HTTPStatus.OK
+    return conditional_response(result)
 
 
 @repositories_router.route("/<username>/<repository_name>/contents/<branch_name>/<path:file_path>", methods=["POST"])
@@ -170,7 +319,7 @@ async def update_file(
     # TODO: Sanitize message
     commit = await use_case.execute(command)
 
-    return jsonify(commit.model_dump()), 200
+    return json_response(commit), 200
 
 
 @repositories_router.route("/<username>/<repository_name>/initial-commit", methods=["POST"])
@@ -191,11 +340,13 @@ async def create_initial_commit(
     )
     commit = await use_case.execute(command)
 
-    return jsonify(commit.model_dump()), 200
+    return json_response(commit), 200
 
 
 @repositories_router.get("/<username>/<repository_name>/tree/<ref>/")
 @repositories_router.get("/<username>/<repository_name>/tree/<ref>/<path:directory_path>")
+@require_auth(optional=True)
+@rate_limit(cost=COSTS.tree)
 @inject
 async def get_tree(
     username: str,
@@ -203,19 +354,46 @@ async def get_tree(
     ref: str,
     directory_path: str = "",
     use_case: GetTreeUseCase = Provide[Container.use_cases.get_tree],
-) -> tuple[Response, int]:
+) -> Response:
     command = GetTreeCommand(
         owner_username=username,
         repository_name=repository_name,
         ref=ref,
         path=directory_path,
+        if_none_match=get_if_none_match(),
     )
-    tree_nodes = await use_case.execute(command)
+    result = await use_case.execute(command)
 
-    return jsonify([i.model_dump() for i in tree_nodes]), HTTPStatus.OK
+    return conditional_response(result)
 
 
-@repositories_router.get("/<username>/<repository_name>/blob/<ref>/<path:file_path>")
+@repositories_router.get("/<username>/<repository_name>/meta/<ref>/<path:file_path>")
+@require_auth(optional=True)
+@rate_limit(cost=COSTS.blob)
+@inject
+async def get_file_metadata(
+    username: str,
+    repository_name: str,
+    ref: str,
+    file_path: str,
+    use_case: GetFileMetadataUseCase = Provide[Container.use_cases.get_file_metadata],
+) -> tuple[Response, int]:
+    command = GetFileCommand(
+        owner_username=username,
+        repository_name=repository_name,
+        file_path=file_path,
+        ref=ref,
+    )
+    metadata = await use_case.execute(command)
+
+    response = json_response(metadata)
+    response.set_etag(metadata.sha)
+    return response, HTTPStatus.OK
+
+
+@repositories_router.route("/<username>/<repository_name>/blob/<ref>/<path:file_path>", methods=["GET", "HEAD"])
+@require_auth(optional=True)
+@rate_limit(cost=COSTS.blob)
 @inject
 async def get_file(
     username: str,
@@ -223,19 +401,134 @@ async def get_file(
     ref: str,
     file_path: str,
     use_case: GetFileUseCase = Provide[Container.use_cases.get_file],
+    metadata_use_case: GetFileMetadataUseCase = Provide[Container.use_cases.get_file_metadata],
 ) -> Response:
     command = GetFileCommand(
         owner_username=username,
         repository_name=repository_name,
         file_path=file_path,
         ref=ref,
+        if_none_match=get_if_none_match(),
     )
-    # TODO: add file mimetype to usecase response
-    file_content = await use_case.execute(command)
+
+    if request.method == "HEAD":
+        # Answered from the object header, the content isn't read
+        metadata = await metadata_use_case.execute(command)
+        response = Response(mimetype=metadata.mimetype)
+        response.content_length = metadata.size
+        response.set_etag(metadata.sha)
+        return response
+
+    result = await use_case.execute(command)
+    return conditional_response(result, _file_response)
+
+
+def _file_response(file_content: FileContent) -> Response:
     if file_content.encoding == "base64":
         data = io.BytesIO(base64.b64decode(file_content.content))
     else:
         data = io.BytesIO(file_content.content.encode(file_content.encoding))
-    kind = filetype.guess(data)
 
-    return send_file(data, mimetype=kind.mime if kind else "application/octet-stream", as_attachment=False)
+    return send_file(
+        data, mimetype=file_content.mimetype or "application/octet-stream", as_attachment=False, etag=False
+    )
+
+
+LFS_MIMETYPE = "application/vnd.git-lfs+json"
+
+
+@repositories_router.route("/<username>/<repository_name>/info/lfs/objects/batch", methods=["POST"])
+@require_auth(optional=True)
+@inject
+async def lfs_batch(
+    username: str,
+    repository_name: str,
+    use_case: LfsBatchUseCase = Provide[Container.use_cases.lfs_batch],
+) -> tuple[Response, int]:
+    _, data = get_sanitized_data(request)
+    payload = g.access_payload
+    operation = get_required_field(data, "operation")
+
+    if operation == "upload" and payload is None:
+        return jsonify({"error": "Unauthorized"}), HTTPStatus.UNAUTHORIZED
+
+    specs = get_required_field(data, "objects")
+    if not isinstance(specs, list):
+        raise InvalidLfsBatchException("Field 'objects' must be a list")
+
+    # The LFS batch API answers malformed requests with 422
+    try:
+        command = LfsBatchCommand(
+            initiator_id=payload.sub if payload else None,
+            owner_username=username,
+            repository_name=repository_name,
+            operation=operation,
+            objects=[LfsObjectSpec.model_validate(obj) for obj in specs],
+        )
+    except ValidationError as e:
+        raise InvalidLfsBatchException() from e
+
+    statuses = await use_case.execute(command)
+
+    href_headers = {"Authorization": request.headers["Authorization"]} if payload else {}
+    objects = []
+    for status in statuses:
+        item: dict[str, object] = {"oid": status.oid, "size": status.size, "authenticated": True}
+        href = url_for(
+            ".download_large_object", username=username, repository_name=repository_name, oid=status.oid, _external=True
+        )
+
+        if operation == "download":
+            if status.stored_size is None:
+                item["error"] = {"code": HTTPStatus.NOT_FOUND, "message": "Object does not exist"}
+            else:
+                item["size"] = status.stored_size
+                item["actions"] = {"download": {"href": href, "header": href_headers}}
+        elif status.stored_size is None:
+            # Objects that are already stored get no actions, so the client skips the upload
+            item["actions"] = {"upload": {"href": href, "header": href_headers}}
+
+        objects.append(item)
+
+    response = jsonify({"transfer": "basic", "objects": objects, "hash_algo": "sha256"})
+    response.mimetype = LFS_MIMETYPE
+    return response, HTTPStatus.OK
+
+
+@repositories_router.route("/<username>/<repository_name>/info/lfs/objects/<oid>", methods=["PUT"])
+@require_auth()
+@inject
+async def upload_large_object(
+    username: str,
+    repository_name: str,
+    oid: str,
+    use_case: UploadLargeObjectUseCase = Provide[Container.use_cases.upload_large_object],
+) -> tuple[Response, int]:
+    if request.content_length is None:
+        raise MissingContentLengthException()
+
+    command = UploadLargeObjectCommand(
+        initiator_id=g.access_payload.sub,
+        owner_username=username,
+        repository_name=repository_name,
+        oid=oid,
+        size=request.content_length,
+        stream=cast(BinaryIO, request.stream),
+    )
+    await use_case.execute(command)
+
+    return Response(), HTTPStatus.OK
+
+
+@repositories_router.route("/<username>/<repository_name>/info/lfs/objects/<oid>", methods=["GET"])
+@inject
+async def download_large_object(
+    username: str,
+    repository_name: str,
+    oid: str,
+    use_case: DownloadLargeObjectUseCase = Provide[Container.use_cases.download_large_object],
+) -> Response:
+    command = DownloadLargeObjectCommand(owner_username=username, repository_name=repository_name, oid=oid)
+    stream = await use_case.execute(command)
+
+    return Response(stream, mimetype="application/octet-stream")
@@ -1,3 +1,5 @@
+from uuid import UUID
+
 from pydantic import EmailStr, Field, IPvAnyAddress
 
 from application.ports.command import BaseCommand
@@ -19,6 +21,16 @@ class UserLoginCommand(BaseCommand):
     user_agent: str | None = Field(default=None, max_length=settings.session.ua_max_length)
 
 
+class UserLogoutCommand(BaseCommand):
+    user_id: UUID
+    access_token_jti: UUID | None = None
+    access_token_exp: int
+    refresh_token: str | None = None
+
+    # Revokes every session of the user instead of the current one
+    everywhere: bool = False
+
+
 class RefreshTokensCommand(BaseCommand):
     refresh_token: str
     ip_address: IPvAnyAddress | None = None
@@ -1,10 +1,12 @@
+from typing import BinaryIO, Literal
 from uuid import UUID
 
-from pydantic import Field, field_validator
+from pydantic import Field, SkipValidation, field_validator
 
 from application.ports.command import BaseCommand
 from config import settings
 from domain.value_objects.common import Pagination
+from domain.value_objects.git import LfsObjectSpec
 
 
 def validate_repository_name(name: str) -> str:
@@ -19,10 +21,20 @@ def validate_repository_name(name: str) -> str:
     return name
 
 
+def validate_oid(oid: str) -> str:
+    """:raises ValueError:"""
+
+    if not settings.git.lfs.oid_pattern.match(oid):
+        raise ValueError("Object id must be a lowercase hex SHA-256 digest")
+
+    return oid
+
+
 class CreateRepositoryCommand(BaseCommand):
     repository_name: str
     user_id: UUID
     description: str = Field(max_length=settings.git.description_max_length)
+    large_file_threshold: int | None = Field(default=None, gt=0)
 
     @field_validator("repository_name")
     @classmethod
@@ -44,6 +56,22 @@ class DeleteRepositoryCommand(BaseCommand):
         return validate_repository_name(v)
 
 
+class ForkRepositoryCommand(BaseCommand):
+    initiator_id: UUID
+    owner_username: str
+    repository_name: str
+
+    fork_name: str | None = None  # defaults to the source repository name
+    description: str | None = Field(default=None, max_length=settings.git.description_max_length)
+
+    @field_validator("fork_name")
+    @classmethod
+    def validate_fork_name(cls, v: str | None) -> str | None:
+        """:raises ValueError:"""
+
+        return validate_repository_name(v) if v is not None else None
+
+
 class GetRepositoryCommand(BaseCommand):
     user_id: UUID | None = None
     username: str | None = None
@@ -51,10 +79,27 @@ class GetRepositoryCommand(BaseCommand):
     pagination: Pagination = Pagination()
 
 
-class GetBranchesCommand(BaseCommand):
+class ConditionalCommand(BaseCommand):
+    """A read command carrying the client's `If-None-Match` ETags."""
+
+    if_none_match: frozenset[str] = frozenset()
+
+    def is_current(self, etag: str) -> bool:
+        return etag in self.if_none_match or "*" in self.if_none_match
+
+
+BranchSort = Literal["name", "-name"]
+
+
+class GetBranchesCommand(ConditionalCommand):
     username: str
     repository_name: str
 
+    prefix: str = Field(default="", max_length=255)
+    sort: BranchSort = "name"
+    after: str | None = None  # name of the last branch of the previous page
+    limit: int = Field(default=settings.git.branches.page_size, ge=1, le=settings.git.branches.max_page_size)
+
 
 class CreateBranchCommand(BaseCommand):
     initiator_id: UUID
@@ -84,7 +129,7 @@ class CreateInitialCommitCommand(BaseCommand):
     msg: str = "Initial commit"
 
 
-class GetCommitsCommand(BaseCommand):
+class GetCommitsCommand(ConditionalCommand):
     owner_username: str
     repository_name: str
     branch_name: str
@@ -92,15 +137,86 @@ class GetCommitsCommand(BaseCommand):
     pagination: Pagination = Pagination()
 
 
-class GetTreeCommand(BaseCommand):
+class GetTreeCommand(ConditionalCommand):
     owner_username: str
     repository_name: str
     ref: str
     path: str
 
 
-class GetFileCommand(BaseCommand):
+class GetFileCommand(ConditionalCommand):
     owner_username: str
     repository_name: str
     ref: str
     file_path: str
+
+
+class ImportRepositoryCommand(BaseCommand):
+    model_config = {"arbitrary_types_allowed": True}
+
+    user_id: UUID
+    repository_name: str
+    description: str = Field(default="", max_length=settings.git.description_max_length)
+    bundle: SkipValidation[BinaryIO]
+
+    @field_validator("repository_name")
+    @classmethod
+    def validate_repository_name(cls, v: str) -> str:
+        """:raises ValueError:"""
+        return validate_repository_name(v)
+
+
+class GetImportStatusCommand(BaseCommand):
+    owner_username: str
+    repository_name: str
+
+
+class ExportRepositoryCommand(BaseCommand):
+    owner_username: str
+    repository_name: str
+
+
+class LfsBatchCommand(BaseCommand):
+    initiator_id: UUID | None = None
+    owner_username: str
+    repository_name: str
+    operation: Literal["download", "upload"]
+    objects: list[LfsObjectSpec] = Field(max_length=1000)
+
+    @field_validator("objects")
+    @classmethod
+    def validate_objects(cls, v: list[LfsObjectSpec]) -> list[LfsObjectSpec]:
+        """:raises ValueError:"""
+
+        for obj in v:
+            validate_oid(obj.oid)
+        return v
+
+
+class UploadLargeObjectCommand(BaseCommand):
+    model_config = {"arbitrary_types_allowed": True}
+
+    initiator_id: UUID
+    owner_username: str
+    repository_name: str
+    oid: str
+    size: int = Field(ge=0, le=settings.git.lfs.max_object_size)
+    stream: SkipValidation[BinaryIO]
+
+    @field_validator("oid")
+    @classmethod
+    def validate_oid(cls, v: str) -> str:
+        """:raises ValueError:"""
+        return validate_oid(v)
+
+
+class DownloadLargeObjectCommand(BaseCommand):
+    owner_username: str
+    repository_name: str
+    oid: str
+
+    @field_validator("oid")
+    @classmethod
+    def validate_oid(cls, v: str) -> str:
+        """:raises ValueError:"""
+        return validate_oid(v)
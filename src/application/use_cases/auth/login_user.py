@@ -8,17 +8,19 @@ from application.ports.use_case import AbstractUseCase
 from config import settings
 from domain.schemas.refresh_token import RefreshTokenCreateSchema
 from domain.services.auth.authentication import AuthenticationService
+from domain.services.auth.password_hasher import PasswordHasher
 from domain.services.auth.token import TokenService
 from domain.value_objects.auth import LoginCredentials
 from domain.value_objects.token import AccessTokenVo, RefreshTokenVo
 from infrastructure.repositories.refresh_token import RefreshTokenWriteRepository
-from infrastructure.repositories.user import UserReadRepository
+from infrastructure.repositories.user import UserReadRepository, UserWriteRepository
 
 
 class LoginUserUseCase(AbstractUseCase[UserLoginCommand]):
-    def __init__(self, uow: AbstractUnitOfWork, token_service: TokenService) -> None:
+    def __init__(self, uow: AbstractUnitOfWork, token_service: TokenService, password_hasher: PasswordHasher) -> None:
         self._uow = uow
         self.token_service = token_service
+        self._password_hasher = password_hasher
 
     async def execute(self, command: UserLoginCommand) -> tuple[AccessTokenVo, RefreshTokenVo]:
         logger.bind(
@@ -37,6 +39,8 @@ class LoginUserUseCase(AbstractUseCase[UserLoginCommand]):
             auth_service = AuthenticationService(
                 token_service=self.token_service,
                 user_read_repository=user_read_repository,
+                password_hasher=self._password_hasher,
+                user_write_repository=UserWriteRepository(session=self._uow.session),
             )
 
             credentials = LoginCredentials(email=command.email, password=command.password)
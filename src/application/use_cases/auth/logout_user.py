@@ -0,0 +1,68 @@
+from contextlib import suppress
+from datetime import datetime
+
+from loguru import logger
+
+from application.commands.auth import UserLogoutCommand
+from application.ports.uow import AbstractUnitOfWork
+from application.ports.use_case import AbstractUseCase
+from config import settings
+from domain.exceptions.auth import InvalidTokenException
+from domain.services.auth.token import TokenService
+from domain.value_objects.token import RefreshTokenVo
+from infrastructure.auth.revocation_list import AccessTokenRevocationList
+from infrastructure.repositories.refresh_token import RefreshTokenWriteRepository
+from infrastructure.repositories.token_revocation import TokenRevocationWriteRepository
+
+
+class LogoutUserUseCase(AbstractUseCase[UserLogoutCommand]):
+    def __init__(
+        self,
+        uow: AbstractUnitOfWork,
+        token_service: TokenService,
+        revocations: AccessTokenRevocationList | None = None,
+    ) -> None:
+        self._uow = uow
+        self.token_service = token_service
+        self._revocations = revocations
+
+    async def execute(self, command: UserLogoutCommand) -> None:
+        logger.bind(
+            use_case=self.__class__.__name__, user_id=command.user_id, everywhere=command.everywhere
+        ).info("Starting user logout")
+
+        user_revoked_before: datetime | None = None
+        access_token_expires_at = datetime.fromtimestamp(command.access_token_exp, tz=settings.time.default_tz)
+        async with self._uow:
+            refresh_token_write_repository = RefreshTokenWriteRepository(session=self._uow.session)
+            revocation_repository = TokenRevocationWriteRepository(session=self._uow.session)
+
+            if command.everywhere:
+                await refresh_token_write_repository.revoke_all_for_user(command.user_id)
+                user_revoked_before = await revocation_repository.revoke_user(command.user_id)
+                logger.debug("All sessions of the user revoked")
+            else:
+                if command.access_token_jti is not None:
+                    await revocation_repository.revoke_token(
+                        jti=command.access_token_jti,
+                        user_id=command.user_id,
+                        expires_at=access_token_expires_at,
+                    )
+                if command.refresh_token is not None:
+                    # An invalid or expired refresh token can't be used anyway, the logout still succeeds
+                    with suppress(InvalidTokenException):
+                        payload = self.token_service.verify_refresh(RefreshTokenVo(value=command.refresh_token))
+                        if payload.sub == command.user_id:
+                            await refresh_token_write_repository.revoke_by_identity(payload.jti)
+                logger.debug("Session revoked")
+
+            await revocation_repository.notify()
+            await self._uow.commit()
+            logger.info("Transaction committed successfully, user logged out")
+
+        # The notification reloads the revocations of every worker, this one doesn't wait for it
+        if self._revocations is not None:
+            if user_revoked_before is not None:
+                self._revocations.add_user(command.user_id, user_revoked_before)
+            elif command.access_token_jti is not None:
+                self._revocations.add_token(command.access_token_jti, access_token_expires_at)
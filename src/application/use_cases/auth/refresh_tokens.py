@@ -1,5 +1,6 @@
 from datetime import datetime
-from typing import Any, NamedTuple
+from typing import Any, NamedTuple, NoReturn
+from uuid import UUID
 
 from loguru import logger
 
@@ -7,6 +8,7 @@ from application.commands.auth import RefreshTokensCommand
 from application.ports.uow import AbstractUnitOfWork
 from application.ports.use_case import AbstractUseCase
 from config import settings
+from domain.exceptions.auth import InvalidTokenException
 from domain.exceptions.refresh_token import RefreshTokenAlreadyRevokedException
 from domain.exceptions.user import UserInactiveException
 from domain.schemas.refresh_token import RefreshTokenCreateSchema
@@ -53,33 +55,14 @@ class RefreshTokensUseCase(AbstractUseCase[RefreshTokensCommand]):
         async with self._uow:
             repos = self._init_repositories()
 
-            payload = self.token_service.verify_refresh(token=RefreshTokenVo(value=command.refresh_token))
+            old_refresh = RefreshTokenVo(value=command.refresh_token)
+            payload = self.token_service.verify_refresh(token=old_refresh)
             logger.bind(sub=payload.sub, jti=payload.jti).debug("Refresh token verified and parsed")
 
-            old_refresh_entity = await repos.refresh_read.get_by_identity(identity=payload.jti)
-            if old_refresh_entity.is_revoked:
-                logger.warning("Revoked token reuse detected!")
-                raise RefreshTokenAlreadyRevokedException()
-
-            self.token_service.verify_token_hash(
-                token=RefreshTokenVo(value=command.refresh_token),
-                expected_hash=old_refresh_entity.token_hash,
-            )
-
-            await repos.refresh_write.revoke_by_identity(payload.jti)
-            logger.debug("Old refresh token revoked in DB")
-
-            user = await repos.user_read.get_by_identity(identity=old_refresh_entity.user_id)
-            if not user.is_active:
-                logger.bind(user_id=user.id).error("Inactive user attempted refresh!")
-                raise UserInactiveException()
-
-            new_access = self.token_service.generate_access(user=user)
-            new_refresh = self.token_service.generate_refresh(user=user)
-
+            new_refresh = self.token_service.generate_refresh_for(user_id=payload.sub)
             new_refresh_payload = self.token_service.parse_refresh_without_verification(new_refresh)
             refresh_schema = RefreshTokenCreateSchema(
-                user_id=user.id,
+                user_id=payload.sub,
                 id=new_refresh_payload.jti,
                 token_hash=self.token_service.hash_token(new_refresh.value),
                 expires_at=datetime.fromtimestamp(new_refresh_payload.exp, tz=settings.time.default_tz),
@@ -87,8 +70,41 @@ class RefreshTokensUseCase(AbstractUseCase[RefreshTokensCommand]):
                 user_agent=command.user_agent,
             )
 
-            await repos.refresh_write.create(schema=refresh_schema)
+            user = await repos.refresh_write.rotate(
+                identity=payload.jti,
+                token_hash=self.token_service.hash_token(old_refresh.value),
+                schema=refresh_schema,
+            )
+            if user is None:
+                await self._raise_rejection(repos, payload.jti, old_refresh)
+
+            new_access = self.token_service.generate_access(user=user)
             await self._uow.commit()
             logger.info("Token rotation successful, transaction committed")
 
             return new_access, new_refresh
+
+    async def _raise_rejection(self, repos: _Repositories, jti: UUID, token: RefreshTokenVo) -> NoReturn:
+        """
+        Finds out why the rotation matched no token. Only rejected refreshes pay for these reads.
+
+        :raises RefreshTokenNotFoundException:
+        :raises RefreshTokenAlreadyRevokedException:
+        :raises InvalidTokenException:
+        :raises UserInactiveException:
+        """
+
+        refresh_entity = await repos.refresh_read.get_by_identity(identity=jti)
+        if refresh_entity.is_revoked:
+            logger.warning("Revoked token reuse detected!")
+            raise RefreshTokenAlreadyRevokedException()
+
+        self.token_service.verify_token_hash(token=token, expected_hash=refresh_entity.token_hash)
+
+        user = await repos.user_read.get_by_identity(identity=refresh_entity.user_id)
+        if not user.is_active:
+            logger.bind(user_id=user.id).error("Inactive user attempted refresh!")
+            raise UserInactiveException()
+
+        # The token's row doesn't belong to the user the token was issued for
+        raise InvalidTokenException.invalid_refresh()
@@ -4,13 +4,15 @@ from application.commands.auth import UserRegisterCommand
 from application.ports.uow import AbstractUnitOfWork
 from application.ports.use_case import AbstractUseCase
 from domain.entities.user import User
+from domain.services.auth.password_hasher import PasswordHasher
 from domain.services.auth.registration import RegistrationService
 from infrastructure.repositories.user import UserReadRepository, UserWriteRepository
 
 
 class RegisterUserUseCase(AbstractUseCase[UserRegisterCommand]):
-    def __init__(self, uow: AbstractUnitOfWork) -> None:
+    def __init__(self, uow: AbstractUnitOfWork, password_hasher: PasswordHasher) -> None:
         self._uow = uow
+        self._password_hasher = password_hasher
 
     async def execute(self, command: UserRegisterCommand) -> User:
         with logger.contextualize(email=command.email):
@@ -20,7 +22,9 @@ class RegisterUserUseCase(AbstractUseCase[UserRegisterCommand]):
                 # TODO: I think it's not a good idea to create repositories inside the function. Think about it later
                 read_repo = UserReadRepository(session=self._uow.session)
                 write_repo = UserWriteRepository(session=self._uow.session)
-                registration_service = RegistrationService(read_repository=read_repo)
+                registration_service = RegistrationService(
+                    read_repository=read_repo, password_hasher=self._password_hasher
+                )
 
                 await registration_service.validate_registration(
                     email=command.email,
@@ -29,7 +33,7 @@ class RegisterUserUseCase(AbstractUseCase[UserRegisterCommand]):
                 )
                 logger.debug("Registration validation passed")
 
-                create_schema = registration_service.prepare_user_create_schema(
+                create_schema = await registration_service.prepare_user_create_schema(
                     email=command.email,
                     username=command.username,
                     password=command.password,
@@ -25,7 +25,13 @@ class CreateBranchUseCase(AbstractUseCase[CreateBranchCommand]):
         self._policy_service = policy_service
 
     async def execute(self, command: CreateBranchCommand) -> Any:
-        logger.bind(use_case=self.__class__.__name__, command=command).info("Starting branch creation")
+        logger.bind(
+            use_case=self.__class__.__name__,
+            initiator_id=command.initiator_id,
+            owner_username=command.owner_username,
+            repository_name=command.repository_name,
+            branch_name=command.branch_name,
+        ).info("Starting branch creation")
 
         async with self._uow:
             user_reader = UserReadRepository(session=self._uow.session)
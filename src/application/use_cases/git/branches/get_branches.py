@@ -1,5 +1,3 @@
-from typing import Any
-
 from loguru import logger
 
 from application.commands.git import GetBranchesCommand
@@ -7,21 +5,32 @@ from application.ports.uow import AbstractUnitOfWork
 from application.ports.use_case import AbstractUseCase
 from domain.exceptions.git import RepositoryNotFoundException
 from domain.filters.git import RepositoryFilter
+from domain.schemas.repository_storage import ListBranchesSchema
+from domain.services.etag import make_etag
 from domain.services.repository import RepositoryService
+from domain.value_objects.git import BranchPage, ConditionalResult
 from infrastructure.repositories.repository import RepositoryReader
 from infrastructure.repositories.user import UserReadRepository
 from infrastructure.storage.git_storage import GitPythonStorage
+from infrastructure.utils.stats import ConditionalRequestStats
 
 
 class GetBranchesUseCase(AbstractUseCase[GetBranchesCommand]):
-    def __init__(self, uow: AbstractUnitOfWork, git_storage: GitPythonStorage) -> None:
+    def __init__(
+        self, uow: AbstractUnitOfWork, git_storage: GitPythonStorage, conditional_stats: ConditionalRequestStats
+    ) -> None:
         self._uow = uow
         self._storage = git_storage
+        self._conditional_stats = conditional_stats
 
-    async def execute(self, command: GetBranchesCommand) -> Any:
+    async def execute(self, command: GetBranchesCommand) -> ConditionalResult[BranchPage]:
         """:raises RepositoryNotFoundException:"""
 
-        logger.bind(use_case=self.__class__.__name__, command=command).info("Starting get branches")
+        logger.bind(
+            use_case=self.__class__.__name__,
+            username=command.username,
+            repository_name=command.repository_name,
+        ).info("Starting get branches")
 
         async with self._uow:
             user_reader = UserReadRepository(session=self._uow.session)
@@ -41,7 +50,30 @@ class GetBranchesUseCase(AbstractUseCase[GetBranchesCommand]):
             repository_service = RepositoryService(reader=repository_reader)
             repository_path = repository_service.get_repository_path(user_id=user.id, repository_id=repository.id)
 
-            branches = await self._storage.get_branches(repo_path=repository_path)
-            logger.bind(repository_path=repository_path).debug(f"Found {len(branches)} branches")
+            # Listing the branches only reads refs, the ETag is built from their tips
+            page = await self._storage.list_branches(
+                ListBranchesSchema(
+                    repo_path=repository_path,
+                    prefix=command.prefix,
+                    descending=command.sort == "-name",
+                    after=command.after,
+                    limit=command.limit,
+                )
+            )
+            logger.bind(repository_path=repository_path).debug(f"Found {len(page.branches)} branches")
+
+            etag = make_etag(
+                "branches",
+                command.prefix,
+                command.sort,
+                command.after or "",
+                str(command.limit),
+                page.next_after or "",
+                *(f"{i.name}:{i.commit_sha}" for i in page.branches),
+            )
+            not_modified = command.is_current(etag)
+            self._conditional_stats.record(conditional=bool(command.if_none_match), not_modified=not_modified)
+            if not_modified:
+                return ConditionalResult(etag=etag)
 
-            return branches
+            return ConditionalResult(etag=etag, data=page)
@@ -0,0 +1,56 @@
+from collections.abc import Iterator
+from typing import Callable
+
+from loguru import logger
+
+from application.commands.git import ExportRepositoryCommand
+from application.ports.uow import AbstractUnitOfWork
+from application.ports.use_case import AbstractUseCase
+from config import settings
+from domain.ports.session import AsyncSessionP
+from domain.services.repository import RepositoryService
+from infrastructure.repositories.repository import RepositoryReader
+from infrastructure.storage.git_storage import GitPythonStorage
+
+
+class ExportRepositoryUseCase(AbstractUseCase[ExportRepositoryCommand]):
+    def __init__(
+        self,
+        uow: AbstractUnitOfWork,
+        git_storage: GitPythonStorage,
+        repository_reader_factory: Callable[[AsyncSessionP], RepositoryReader],
+    ) -> None:
+        self._uow = uow
+        self._storage = git_storage
+        self._repository_reader_factory = repository_reader_factory
+
+    async def execute(self, command: ExportRepositoryCommand) -> Iterator[bytes]:
+        """
+        Returns the repository as a git bundle. The bundle is produced while the caller reads it,
+        after the database session has been released.
+
+        :raises RepositoryNotFoundException:
+        :raises EmptyRepositoryException:
+        :raises BundleExportException:
+        """
+
+        logger.bind(
+            use_case=self.__class__.__name__, username=command.owner_username, repository_name=command.repository_name
+        ).info("Starting repository export")
+
+        async with self._uow:
+            repository = await self._repository_reader_factory(self._uow.session).get_by_username_and_repository_name(
+                username=command.owner_username, repository_name=command.repository_name
+            )
+
+        repository_path = RepositoryService.get_repository_path(
+            user_id=repository.owner_id, repository_id=repository.id
+        )
+        stream = await self._storage.open_bundle_stream(
+            repo_path=repository_path,
+            chunk_size=settings.git.bundle.chunk_size,
+            buffer_size=settings.git.bundle.export_buffer_size,
+        )
+
+        logger.bind(repository_path=repository_path).info("Bundle stream opened")
+        return stream
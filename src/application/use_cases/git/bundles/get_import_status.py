@@ -0,0 +1,47 @@
+import asyncio
+from typing import Callable
+
+from loguru import logger
+
+from application.commands.git import GetImportStatusCommand
+from application.ports.uow import AbstractUnitOfWork
+from application.ports.use_case import AbstractUseCase
+from domain.exceptions.git import ImportNotFoundException
+from domain.ports.session import AsyncSessionP
+from domain.value_objects.git import ImportJob
+from infrastructure.repositories.repository import RepositoryReader
+from infrastructure.storage.bundle_import import BundleImportRunner
+
+
+class GetImportStatusUseCase(AbstractUseCase[GetImportStatusCommand]):
+    def __init__(
+        self,
+        uow: AbstractUnitOfWork,
+        import_runner: BundleImportRunner,
+        repository_reader_factory: Callable[[AsyncSessionP], RepositoryReader],
+    ) -> None:
+        self._uow = uow
+        self._import_runner = import_runner
+        self._repository_reader_factory = repository_reader_factory
+
+    async def execute(self, command: GetImportStatusCommand) -> ImportJob:
+        """
+        :raises RepositoryNotFoundException:
+        :raises ImportNotFoundException:
+        """
+
+        logger.bind(
+            use_case=self.__class__.__name__, username=command.owner_username, repository_name=command.repository_name
+        ).info("Starting get import status")
+
+        async with self._uow:
+            repository = await self._repository_reader_factory(self._uow.session).get_by_username_and_repository_name(
+                username=command.owner_username, repository_name=command.repository_name
+            )
+
+        job = await asyncio.to_thread(self._import_runner.get, repository.id)
+        if job is None:
+            logger.debug("Import not found")
+            raise ImportNotFoundException(repository_id=repository.id)
+
+        return job
@@ -0,0 +1,63 @@
+import asyncio
+
+from loguru import logger
+
+from application.commands.git import CreateRepositoryCommand, ImportRepositoryCommand
+from application.ports.use_case import AbstractUseCase
+from application.use_cases.git.create_repository import CreateRepositoryUseCase
+from config import settings
+from domain.services.repository import RepositoryService
+from domain.value_objects.git import ImportJob
+from infrastructure.storage.bundle_import import BundleImportRunner
+from infrastructure.storage.git_storage import GitPythonStorage
+
+
+class ImportRepositoryUseCase(AbstractUseCase[ImportRepositoryCommand]):
+    def __init__(
+        self,
+        git_storage: GitPythonStorage,
+        import_runner: BundleImportRunner,
+        create_repository_use_case: CreateRepositoryUseCase,
+    ) -> None:
+        self._storage = git_storage
+        self._import_runner = import_runner
+        self._create_repository_use_case = create_repository_use_case
+
+    async def execute(self, command: ImportRepositoryCommand) -> ImportJob:
+        """
+        Creates an empty repository and schedules the bundle to be unbundled into it in the background.
+
+        :raises BundleTooLargeException:
+        :raises InvalidBundleException:
+        :raises RepositoryAlreadyExistsException:
+        """
+
+        logger.bind(
+            use_case=self.__class__.__name__, user_id=command.user_id, repository_name=command.repository_name
+        ).info("Starting repository import")
+
+        bundle_path = await self._storage.save_bundle(
+            command.bundle, max_size=settings.git.bundle.max_size, chunk_size=settings.git.bundle.chunk_size
+        )
+        logger.debug("Bundle saved")
+
+        try:
+            await self._storage.verify_bundle(bundle_path)
+            logger.debug("Bundle verified")
+
+            repository = await self._create_repository_use_case.execute(
+                CreateRepositoryCommand(
+                    repository_name=command.repository_name, user_id=command.user_id, description=command.description
+                )
+            )
+        except Exception:
+            await self._storage.remove_bundle(bundle_path)
+            raise
+
+        repository_path = RepositoryService.get_repository_path(user_id=command.user_id, repository_id=repository.id)
+        job = await asyncio.to_thread(
+            self._import_runner.submit, repository_id=repository.id, repo_path=repository_path, bundle_path=bundle_path
+        )
+
+        logger.bind(repository_id=repository.id).info("Repository import scheduled")
+        return job
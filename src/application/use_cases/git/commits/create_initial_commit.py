@@ -29,7 +29,12 @@ class CreateInitialCommitUseCase(AbstractUseCase[CreateInitialCommitCommand]):
         self._policy_service = policy_service
 
     async def execute(self, command: CreateInitialCommitCommand) -> Any:
-        logger.bind(use_case=self.__class__.__name__, command=command).info("Starting creating initial commit")
+        logger.bind(
+            use_case=self.__class__.__name__,
+            initiator_id=command.initiator_id,
+            owner_username=command.owner_username,
+            repository_name=command.repository_name,
+        ).info("Starting creating initial commit")
         # TODO: refactor it, repeating code of fetching repository & initiator (same code in create branch use case)
         # I think it's good to use inheritance for repository & commit use cases
 
@@ -1,5 +1,3 @@
-from typing import Any
-
 from loguru import logger
 
 from application.commands.git import GetCommitsCommand
@@ -8,9 +6,12 @@ from application.ports.use_case import AbstractUseCase
 from domain.exceptions.git import RepositoryNotFoundException
 from domain.filters.git import RepositoryFilter
 from domain.schemas.repository_storage import GetCommitsSchema
+from domain.services.etag import make_etag
 from domain.services.repository import RepositoryService
+from domain.value_objects.git import CommitInfo, ConditionalResult
 from infrastructure.repositories.repository import RepositoryReader
 from infrastructure.storage.git_storage import GitPythonStorage
+from infrastructure.utils.stats import ConditionalRequestStats
 
 
 class GetCommitsUseCase(AbstractUseCase[GetCommitsCommand]):
@@ -18,12 +19,19 @@ class GetCommitsUseCase(AbstractUseCase[GetCommitsCommand]):
         self,
         uow: AbstractUnitOfWork,
         git_storage: GitPythonStorage,
+        conditional_stats: ConditionalRequestStats,
     ) -> None:
         self._uow = uow
         self._git_storage = git_storage
+        self._conditional_stats = conditional_stats
 
-    async def execute(self, command: GetCommitsCommand) -> Any:
-        logger.bind(use_case=self.__class__.__name__, command=command).info("Starting fethcing commits")
+    async def execute(self, command: GetCommitsCommand) -> ConditionalResult[list[CommitInfo]]:
+        logger.bind(
+            use_case=self.__class__.__name__,
+            owner_username=command.owner_username,
+            repository_name=command.repository_name,
+            branch_name=command.branch_name,
+        ).info("Starting fethcing commits")
 
         async with self._uow:
             result = await RepositoryReader(session=self._uow.session).get_all(
@@ -42,12 +50,17 @@ class GetCommitsUseCase(AbstractUseCase[GetCommitsCommand]):
                 user_id=repository.owner_id, repository_id=repository.id
             )
 
-            commits = await self._git_storage.get_commits(
-                schema=GetCommitsSchema(
-                    repo_path=repository_path,
-                    branch_name=command.branch_name,
-                )
-            )
-            logger.debug(f"Found {len(commits)} commits")
+            schema = GetCommitsSchema(repo_path=repository_path, branch_name=command.branch_name)
+
+            tip = await self._git_storage.resolve_branch(repo_path=repository_path, branch_name=command.branch_name)
+            etag = make_etag(tip, str(schema.limit))
+            not_modified = command.is_current(etag)
+            self._conditional_stats.record(conditional=bool(command.if_none_match), not_modified=not_modified)
+            if not_modified:
+                logger.bind(etag=etag).info("Commits not modified")
+                return ConditionalResult(etag=etag)
+
+            commits = await self._git_storage.get_commits(schema=schema)
+            logger.debug("Found {} commits", len(commits))
 
-            return commits
+            return ConditionalResult(etag=etag, data=commits)
@@ -5,9 +5,11 @@ from loguru import logger
 from application.commands.git import UpdateFileCommand
 from application.ports.uow import AbstractUnitOfWork
 from application.ports.use_case import AbstractUseCase
+from config import settings
 from domain.exceptions.common import PermissionDenied
 from domain.exceptions.git import RepositoryNotFoundException
 from domain.filters.git import RepositoryFilter
+from domain.ports.large_object_storage import AbstractLargeObjectStorage
 from domain.schemas.repository_storage import UpdateFileSchema
 from domain.services.policy_service import PolicyEngine
 from domain.services.repository import RepositoryService
@@ -18,10 +20,17 @@ from infrastructure.storage.git_storage import GitPythonStorage
 
 
 class UpdateFileUseCase(AbstractUseCase[UpdateFileCommand]):
-    def __init__(self, uow: AbstractUnitOfWork, git_storage: GitPythonStorage, policy_service: PolicyEngine) -> None:
+    def __init__(
+        self,
+        uow: AbstractUnitOfWork,
+        git_storage: GitPythonStorage,
+        policy_service: PolicyEngine,
+        lfs_storage: AbstractLargeObjectStorage,
+    ) -> None:
         self._uow = uow
         self._git_storage = git_storage
         self._policy_service = policy_service
+        self._lfs_storage = lfs_storage
 
     async def execute(self, command: UpdateFileCommand) -> CommitInfo:
         logger.bind(
@@ -34,15 +43,6 @@ class UpdateFileUseCase(AbstractUseCase[UpdateFileCommand]):
         ).info("Start updating file")
 
         async with self._uow:
-            # TODO: optimize this convertion
-            try:
-                content = command.data.decode("utf-8")
-                encoding = "utf-8"
-            except UnicodeDecodeError:
-                content = base64.b64encode(command.data).decode("ascii")
-                encoding = "base64"
-            logger.debug(f"{encoding = }")
-
             user = await UserReadRepository(self._uow.session).get_by_identity(identity=command.user_id)
 
             reader = RepositoryReader(session=self._uow.session)
@@ -64,11 +64,27 @@ class UpdateFileUseCase(AbstractUseCase[UpdateFileCommand]):
                 raise PermissionDenied(f"User {user.email} is not allowed to commit to repository '{repository.name}'")
             logger.debug("User allowed to commit")
 
+            threshold = repository.large_file_threshold or settings.git.lfs.large_file_threshold
+            if len(command.data) >= threshold:
+                # Large files are kept out of the object database, only a pointer is committed
+                pointer = await self._lfs_storage.save_bytes(command.data)
+                content, encoding = pointer.to_text(), "utf-8"
+                logger.bind(oid=pointer.oid).debug("File stored in the large object storage")
+            else:
+                # TODO: optimize this convertion
+                try:
+                    content = command.data.decode("utf-8")
+                    encoding = "utf-8"
+                except UnicodeDecodeError:
+                    content = base64.b64encode(command.data).decode("ascii")
+                    encoding = "base64"
+            logger.debug("encoding = {!r}", encoding)
+
             repository_service = RepositoryService(reader=reader)
             repository_path = repository_service.get_repository_path(
                 user_id=command.user_id, repository_id=repository.id
             )
-            logger.debug(f"{repository_path = }")
+            logger.debug("repository_path = {!r}", repository_path)
 
             schema = UpdateFileSchema(
                 repo_path=repository_path,
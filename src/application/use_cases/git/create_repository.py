@@ -38,7 +38,10 @@ class CreateRepositoryUseCase(AbstractUseCase[CreateRepositoryCommand]):
             writer = self._writer_factory(self._uow.session)
             repository_entity = await writer.create(
                 RepositoryCreateSchema(
-                    name=command.repository_name, owner_id=command.user_id, description=command.description
+                    name=command.repository_name,
+                    owner_id=command.user_id,
+                    description=command.description,
+                    large_file_threshold=command.large_file_threshold,
                 )
             )
             logger.bind(repository_id=repository_entity.id).debug("Repository entity created")
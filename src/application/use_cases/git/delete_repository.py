@@ -58,10 +58,16 @@ class DeleteRepositoryUseCase(AbstractUseCase[DeleteRepositoryCommand]):
             repository_path = RepositoryService.get_repository_path(
                 user_id=target_repository.owner_id, repository_id=target_repository.id
             )
-            await self._storage.delete_repository(repo_path=repository_path)
-            logger.bind(repository_path=repository_path).debug("Repository deleted from the file system")
-
-            await self._uow.commit()
+            tombstone = await self._storage.delete_repository(repo_path=repository_path)
+            logger.bind(repository_path=repository_path, tombstone=tombstone).debug("Repository moved to the trash")
+
+            try:
+                await self._uow.commit()
+            except Exception:
+                if tombstone is not None:
+                    await self._storage.restore_repository(repo_path=repository_path, tombstone=tombstone)
+                    logger.bind(repository_path=repository_path).warning("Commit failed, repository restored")
+                raise
 
             logger.info("Repository deleted successfully")
 
@@ -0,0 +1,99 @@
+from typing import Callable
+
+from loguru import logger
+
+from application.commands.git import ForkRepositoryCommand
+from application.ports.uow import AbstractUnitOfWork
+from application.ports.use_case import AbstractUseCase
+from domain.entities.git import Repository
+from domain.entities.user import User
+from domain.exceptions.common import PermissionDenied
+from domain.ports.session import AsyncSessionP
+from domain.schemas.repository_storage import ForkRepositorySchema, RepositoryCreateSchema
+from domain.services.policy_service import PolicyEngine
+from domain.services.repository import RepositoryService
+from infrastructure.repositories.repository import RepositoryReader, RepositoryWriter
+from infrastructure.repositories.user import UserReadRepository
+from infrastructure.storage.git_storage import GitPythonStorage
+
+
+class ForkRepositoryUseCase(AbstractUseCase[ForkRepositoryCommand]):
+    def __init__(
+        self,
+        uow: AbstractUnitOfWork,
+        git_storage: GitPythonStorage,
+        policy_service: PolicyEngine,
+        user_reader_factory: Callable[[AsyncSessionP], UserReadRepository],
+        repository_reader_factory: Callable[[AsyncSessionP], RepositoryReader],
+        repository_writer_factory: Callable[[AsyncSessionP], RepositoryWriter],
+        repository_service_factory: Callable[[AsyncSessionP], RepositoryService],
+    ) -> None:
+        self._uow = uow
+        self._storage = git_storage
+        self._policy_service = policy_service
+
+        self._user_reader_factory = user_reader_factory
+        self._repository_reader_factory = repository_reader_factory
+        self._repository_writer_factory = repository_writer_factory
+        self._repository_service_factory = repository_service_factory
+
+    async def execute(self, command: ForkRepositoryCommand) -> Repository:
+        """
+        :raises RepositoryNotFoundException:
+        :raises RepositoryAlreadyExistsException:
+        :raises PermissionDenied:
+        """
+
+        logger.bind(
+            use_case=self.__class__.__name__, user_id=command.initiator_id, repository_name=command.repository_name
+        ).info("Starting repository fork")
+
+        async with self._uow:
+            initiator = await self._user_reader_factory(self._uow.session).get_by_identity(command.initiator_id)
+            initiator.ensure_active()
+
+            source = await self._repository_reader_factory(self._uow.session).get_by_username_and_repository_name(
+                username=command.owner_username, repository_name=command.repository_name
+            )
+            self._check_policy(initiator, source)
+
+            service = self._repository_service_factory(self._uow.session)
+            fork_name = command.fork_name or source.name
+            await service.check_repository_name(initiator.id, fork_name)
+            logger.debug("Name has been checked")
+
+            fork = await self._repository_writer_factory(self._uow.session).create(
+                RepositoryCreateSchema(
+                    name=fork_name,
+                    owner_id=initiator.id,
+                    description=command.description if command.description is not None else source.description,
+                    forked_from_id=source.id,
+                )
+            )
+            logger.bind(repository_id=fork.id).debug("Repository entity created")
+
+            schema = ForkRepositorySchema(
+                source_repo_path=service.get_repository_path(user_id=source.owner_id, repository_id=source.id),
+                repo_path=service.get_repository_path(user_id=initiator.id, repository_id=fork.id),
+            )
+            await self._storage.fork_repository(schema)
+            logger.bind(repository_path=schema.repo_path).debug("Fork created in the file system")
+
+            await self._uow.commit()
+
+            logger.info("Repository forked successfully")
+            return fork
+
+    def _check_policy(self, initiator: User, source: Repository) -> None:
+        """:raises PermissionDenied:"""
+
+        is_allowed = self._policy_service.can(
+            action="repository:fork",
+            subject=initiator.to_policy_context(),
+            resource=source.to_policy_context(),
+        )
+
+        if not is_allowed:
+            logger.warning("Permission denied for repository fork")
+            raise PermissionDenied(f"User {initiator.email} is not allowed to fork repository {source.name}")
+        logger.debug("Policy check passed")
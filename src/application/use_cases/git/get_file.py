@@ -7,16 +7,21 @@ from domain.exceptions.git import RepositoryNotFoundException
 from domain.filters.git import RepositoryFilter
 from domain.schemas.repository_storage import FileContent, GetFileSchema
 from domain.services.repository import RepositoryService
+from domain.value_objects.git import ConditionalResult
 from infrastructure.repositories.repository import RepositoryReader
 from infrastructure.storage.git_storage import GitPythonStorage
+from infrastructure.utils.stats import ConditionalRequestStats
 
 
 class GetFileUseCase(AbstractUseCase[GetFileCommand]):
-    def __init__(self, uow: AbstractUnitOfWork, git_storage: GitPythonStorage) -> None:
+    def __init__(
+        self, uow: AbstractUnitOfWork, git_storage: GitPythonStorage, conditional_stats: ConditionalRequestStats
+    ) -> None:
         self._uow = uow
         self._git_storage = git_storage
+        self._conditional_stats = conditional_stats
 
-    async def execute(self, command: GetFileCommand) -> FileContent:
+    async def execute(self, command: GetFileCommand) -> ConditionalResult[FileContent]:
         logger.bind(use_case=self.__class__.__name__).info("Starting fetching the file")
 
         async with self._uow:
@@ -35,9 +40,16 @@ class GetFileUseCase(AbstractUseCase[GetFileCommand]):
             repository_path = RepositoryService.get_repository_path(
                 user_id=repository.owner_id, repository_id=repository.id
             )
-            file_content = await self._git_storage.get_file(
-                GetFileSchema(repo_path=repository_path, file_path=command.file_path, branch_name=command.ref)
-            )
+            schema = GetFileSchema(repo_path=repository_path, file_path=command.file_path, branch_name=command.ref)
+
+            etag = await self._git_storage.resolve_blob(schema)
+            not_modified = command.is_current(etag)
+            self._conditional_stats.record(conditional=bool(command.if_none_match), not_modified=not_modified)
+            if not_modified:
+                logger.bind(etag=etag).info("File not modified")
+                return ConditionalResult(etag=etag)
+
+            file_content = await self._git_storage.get_file(schema)
 
             logger.info("File fetched")
-            return file_content
+            return ConditionalResult(etag=file_content.sha, data=file_content)
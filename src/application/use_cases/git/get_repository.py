@@ -13,7 +13,9 @@ class GetRepositoryUseCase(AbstractUseCase[GetRepositoryCommand]):
         self._uow = uow
 
     async def execute(self, command: GetRepositoryCommand) -> list[Repository]:
-        logger.bind(use_case=self.__class__.__name__, command=command).info("Starting fetching a repository")
+        logger.bind(
+            use_case=self.__class__.__name__, username=command.username, repository_name=command.repository_name
+        ).info("Starting fetching a repository")
 
         async with self._uow:
             reader = RepositoryReader(session=self._uow.session)
@@ -26,6 +28,6 @@ class GetRepositoryUseCase(AbstractUseCase[GetRepositoryCommand]):
                 ),
                 pagination=command.pagination,
             )
-            logger.debug(f"Found {len(result)} repositories")
+            logger.debug("Found {} repositories", len(result))
 
             return result
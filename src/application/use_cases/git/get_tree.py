@@ -6,17 +6,23 @@ from application.ports.use_case import AbstractUseCase
 from domain.exceptions.git import RepositoryNotFoundException
 from domain.filters.git import RepositoryFilter
 from domain.schemas.repository_storage import GetTreeSchema, TreeNode
+from domain.services.etag import make_etag
 from domain.services.repository import RepositoryService
+from domain.value_objects.git import ConditionalResult
 from infrastructure.repositories.repository import RepositoryReader
 from infrastructure.storage.git_storage import GitPythonStorage
+from infrastructure.utils.stats import ConditionalRequestStats
 
 
 class GetTreeUseCase(AbstractUseCase[GetTreeCommand]):
-    def __init__(self, uow: AbstractUnitOfWork, git_storage: GitPythonStorage) -> None:
+    def __init__(
+        self, uow: AbstractUnitOfWork, git_storage: GitPythonStorage, conditional_stats: ConditionalRequestStats
+    ) -> None:
         self._uow = uow
         self._git_storage = git_storage
+        self._conditional_stats = conditional_stats
 
-    async def execute(self, command: GetTreeCommand) -> list[TreeNode]:
+    async def execute(self, command: GetTreeCommand) -> ConditionalResult[list[TreeNode]]:
         logger.bind(use_case=self.__class__.__name__).info("Starting fetching a tree")
 
         async with self._uow:
@@ -36,10 +42,18 @@ class GetTreeUseCase(AbstractUseCase[GetTreeCommand]):
                 user_id=repository.owner_id, repository_id=repository.id
             )
 
-            tree = await self._git_storage.get_tree(
-                GetTreeSchema(repo_path=repository_path, branch_name=command.ref, path=command.path)
-            )
+            schema = GetTreeSchema(repo_path=repository_path, branch_name=command.ref, path=command.path)
+
+            # Entries carry their full path, so equal trees at different paths get different ETags
+            etag = make_etag(await self._git_storage.resolve_tree(schema), command.path)
+            not_modified = command.is_current(etag)
+            self._conditional_stats.record(conditional=bool(command.if_none_match), not_modified=not_modified)
+            if not_modified:
+                logger.bind(etag=etag).info("Tree not modified")
+                return ConditionalResult(etag=etag)
+
+            tree = await self._git_storage.get_tree(schema)
 
             logger.info("Successfully fetched tree for ref: {ref}", ref=command.ref)
 
-            return tree
+            return ConditionalResult(etag=etag, data=tree)
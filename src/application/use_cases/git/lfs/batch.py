@@ -0,0 +1,84 @@
+from typing import Callable
+
+from loguru import logger
+
+from application.commands.git import LfsBatchCommand
+from application.ports.uow import AbstractUnitOfWork
+from application.ports.use_case import AbstractUseCase
+from domain.entities.git import Repository
+from domain.entities.user import User
+from domain.exceptions.common import PermissionDenied
+from domain.ports.large_object_storage import AbstractLargeObjectStorage
+from domain.ports.session import AsyncSessionP
+from domain.services.policy_service import PolicyEngine
+from domain.value_objects.git import LfsObjectStatus
+from infrastructure.repositories.repository import RepositoryReader
+from infrastructure.repositories.user import UserReadRepository
+
+
+class LfsBatchUseCase(AbstractUseCase[LfsBatchCommand]):
+    def __init__(
+        self,
+        uow: AbstractUnitOfWork,
+        lfs_storage: AbstractLargeObjectStorage,
+        policy_service: PolicyEngine,
+        user_reader_factory: Callable[[AsyncSessionP], UserReadRepository],
+        repository_reader_factory: Callable[[AsyncSessionP], RepositoryReader],
+    ) -> None:
+        self._uow = uow
+        self._lfs_storage = lfs_storage
+        self._policy_service = policy_service
+
+        self._user_reader_factory = user_reader_factory
+        self._repository_reader_factory = repository_reader_factory
+
+    async def execute(self, command: LfsBatchCommand) -> list[LfsObjectStatus]:
+        """
+        Reports which of the requested objects are already stored. Uploads of stored objects are skipped
+        by the client, so a file pushed to several repositories is transferred and stored once.
+
+        :raises RepositoryNotFoundException:
+        :raises PermissionDenied:
+        """
+
+        logger.bind(
+            use_case=self.__class__.__name__,
+            operation=command.operation,
+            repository_name=command.repository_name,
+            objects=len(command.objects),
+        ).info("Starting LFS batch")
+
+        async with self._uow:
+            repository = await self._repository_reader_factory(self._uow.session).get_by_username_and_repository_name(
+                username=command.owner_username, repository_name=command.repository_name
+            )
+
+            if command.operation == "upload":
+                if command.initiator_id is None:
+                    raise PermissionDenied("Authentication is required to upload objects")
+
+                initiator = await self._user_reader_factory(self._uow.session).get_by_identity(command.initiator_id)
+                initiator.ensure_active()
+                self._check_policy(initiator, repository)
+
+        statuses = [
+            LfsObjectStatus(oid=obj.oid, size=obj.size, stored_size=await self._lfs_storage.get_size(obj.oid))
+            for obj in command.objects
+        ]
+
+        logger.info("LFS batch finished")
+        return statuses
+
+    def _check_policy(self, initiator: User, repository: Repository) -> None:
+        """:raises PermissionDenied:"""
+
+        is_allowed = self._policy_service.can(
+            action="repository:commit",
+            subject=initiator.to_policy_context(),
+            resource=repository.to_policy_context(),
+        )
+
+        if not is_allowed:
+            logger.warning("Permission denied for uploading large objects")
+            raise PermissionDenied(f"User {initiator.email} is not allowed to upload to repository {repository.name}")
+        logger.debug("Policy check passed")
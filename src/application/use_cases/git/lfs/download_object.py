@@ -0,0 +1,40 @@
+from collections.abc import Iterator
+from typing import Callable
+
+from loguru import logger
+
+from application.commands.git import DownloadLargeObjectCommand
+from application.ports.uow import AbstractUnitOfWork
+from application.ports.use_case import AbstractUseCase
+from domain.ports.large_object_storage import AbstractLargeObjectStorage
+from domain.ports.session import AsyncSessionP
+from infrastructure.repositories.repository import RepositoryReader
+
+
+class DownloadLargeObjectUseCase(AbstractUseCase[DownloadLargeObjectCommand]):
+    def __init__(
+        self,
+        uow: AbstractUnitOfWork,
+        lfs_storage: AbstractLargeObjectStorage,
+        repository_reader_factory: Callable[[AsyncSessionP], RepositoryReader],
+    ) -> None:
+        self._uow = uow
+        self._lfs_storage = lfs_storage
+        self._repository_reader_factory = repository_reader_factory
+
+    async def execute(self, command: DownloadLargeObjectCommand) -> Iterator[bytes]:
+        """
+        :raises RepositoryNotFoundException:
+        :raises LargeObjectNotFoundException:
+        """
+
+        logger.bind(
+            use_case=self.__class__.__name__, repository_name=command.repository_name, oid=command.oid
+        ).info("Starting large object download")
+
+        async with self._uow:
+            await self._repository_reader_factory(self._uow.session).get_by_username_and_repository_name(
+                username=command.owner_username, repository_name=command.repository_name
+            )
+
+        return await self._lfs_storage.open(command.oid)
@@ -0,0 +1,71 @@
+from typing import Callable
+
+from loguru import logger
+
+from application.commands.git import UploadLargeObjectCommand
+from application.ports.uow import AbstractUnitOfWork
+from application.ports.use_case import AbstractUseCase
+from domain.entities.git import Repository
+from domain.entities.user import User
+from domain.exceptions.common import PermissionDenied
+from domain.ports.large_object_storage import AbstractLargeObjectStorage
+from domain.ports.session import AsyncSessionP
+from domain.services.policy_service import PolicyEngine
+from infrastructure.repositories.repository import RepositoryReader
+from infrastructure.repositories.user import UserReadRepository
+
+
+class UploadLargeObjectUseCase(AbstractUseCase[UploadLargeObjectCommand]):
+    def __init__(
+        self,
+        uow: AbstractUnitOfWork,
+        lfs_storage: AbstractLargeObjectStorage,
+        policy_service: PolicyEngine,
+        user_reader_factory: Callable[[AsyncSessionP], UserReadRepository],
+        repository_reader_factory: Callable[[AsyncSessionP], RepositoryReader],
+    ) -> None:
+        self._uow = uow
+        self._lfs_storage = lfs_storage
+        self._policy_service = policy_service
+
+        self._user_reader_factory = user_reader_factory
+        self._repository_reader_factory = repository_reader_factory
+
+    async def execute(self, command: UploadLargeObjectCommand) -> None:
+        """
+        :raises RepositoryNotFoundException:
+        :raises PermissionDenied:
+        :raises LargeObjectIntegrityException:
+        """
+
+        logger.bind(
+            use_case=self.__class__.__name__, user_id=command.initiator_id, oid=command.oid, size=command.size
+        ).info("Starting large object upload")
+
+        async with self._uow:
+            initiator = await self._user_reader_factory(self._uow.session).get_by_identity(command.initiator_id)
+            initiator.ensure_active()
+
+            repository = await self._repository_reader_factory(self._uow.session).get_by_username_and_repository_name(
+                username=command.owner_username, repository_name=command.repository_name
+            )
+            self._check_policy(initiator, repository)
+
+        # The session is released before the (possibly long) transfer starts
+        await self._lfs_storage.save(oid=command.oid, size=command.size, stream=command.stream)
+
+        logger.info("Large object stored")
+
+    def _check_policy(self, initiator: User, repository: Repository) -> None:
+        """:raises PermissionDenied:"""
+
+        is_allowed = self._policy_service.can(
+            action="repository:commit",
+            subject=initiator.to_policy_context(),
+            resource=repository.to_policy_context(),
+        )
+
+        if not is_allowed:
+            logger.warning("Permission denied for uploading large objects")
+            raise PermissionDenied(f"User {initiator.email} is not allowed to upload to repository {repository.name}")
+        logger.debug("Policy check passed")
@@ -2,8 +2,9 @@ import os
 import re
 from datetime import UTC, timezone
 from pathlib import Path
-from typing import Any, ClassVar
+from typing import Any, ClassVar, Literal
 from urllib.parse import quote_plus
+from uuid import UUID
 
 from loguru import logger
 from pydantic import BaseModel, PostgresDsn
@@ -29,6 +30,77 @@ class RunConfig(BaseModel):
     port: int = 5000
     reload: bool = True
 
+    wsgi_threads: int = 32  # threads running the synchronous part of Flask requests
+    executor_threads: int = 16  # the event loop's default executor, used for git and file system work
+
+
+class CompressionConfig(BaseModel):
+    encodings: list[str] = ["br", "zstd", "gzip"]  # preferred first, `br` and `zstd` need brotli and zstandard
+    min_size: int = 1024  # smaller bodies are sent as is
+
+    gzip_level: int = 6
+    brotli_quality: int = 4  # higher levels are too slow for per-request compression
+    zstd_level: int = 3
+
+    cache_size: int = 512  # compressed bodies of SHA-addressed responses
+    cache_max_body_size: int = 1024 * 1024
+
+
+class RateLimitConfig(BaseModel):
+    class Costs(BaseModel):
+        listing: float = 1  # repositories, branches
+        blob: float = 1
+        tree: float = 2
+        commits: float = 3
+        fork: float = 10
+        bundle: float = 20  # bundle export and import
+
+    enabled: bool = True
+    capacity: float = 60  # burst size, in cost units
+    refill_rate: float = 2  # cost units per second
+    costs: Costs = Costs()
+
+    backend: Literal["memory", "redis"] = "memory"  # redis shares the buckets between workers
+    redis_url: str = "redis://localhost:6379/0"
+    key_prefix: str = "rate-limit:"
+    max_keys: int = 100_000  # buckets kept by the memory backend
+
+
+class MetricsConfig(BaseModel):
+    enabled: bool = True
+    path: str = "/metrics"  # outside the API prefix, meant to be reachable from the scraper's network only
+
+
+class TracingConfig(BaseModel):
+    enabled: bool = False
+    service_name: str = "github-clone"
+    sample_ratio: float = 1.0  # of traces started here, traces continued from a `traceparent` keep its decision
+
+    exporter: Literal["otlp", "memory"] = "otlp"
+    otlp_endpoint: str = "http://localhost:4318"  # OTLP/HTTP, spans are posted to `/v1/traces`
+    otlp_headers: dict[str, str] = {}
+    export_timeout: float = 10
+
+    max_queue_size: int = 2048  # finished spans waiting for export, more are dropped
+    max_batch_size: int = 512
+    schedule_delay: float = 5  # seconds between exports
+
+
+class ProfilingConfig(BaseModel):
+    admin_user_ids: list[UUID] = []  # users allowed to profile requests and read profiles, nobody by default
+    header: str = "X-Profile"
+    query_param: str = "profile"
+    path: str = "/debug/profiles"
+    interval: float = 0.005  # seconds between samples
+
+    max_requested: int = 100  # explicitly requested profiles kept
+
+    # Share of all requests profiled to keep the slowest ones of each route, 0 turns it off
+    auto_capture_ratio: float = 0.0
+    auto_capture_min_duration: float = 0.2  # faster requests are never kept
+    slowest_per_route: int = 5
+    window: float = 3600  # seconds a captured profile is kept for
+
 
 class ApiConfig(BaseModel):
     class ApiV1Confg(BaseModel):
@@ -46,6 +118,11 @@ class ApiConfig(BaseModel):
         refresh_prefix: str = "/refresh"
         refresh_methods: list[str] = ["POST"]
 
+        logout_prefix: str = "/logout"
+        logout_methods: list[str] = ["POST"]
+
+        jwks_prefix: str = "/jwks.json"
+
     class RepositoryConfig(BaseModel):
         prefix: str = "/repositories"
 
@@ -60,6 +137,18 @@ class ApiConfig(BaseModel):
 
 
 class DatabaseConfig(BaseModel):
+    class SlowQueries(BaseModel):
+        enabled: bool = True
+        threshold: float = 0.2  # seconds, slower statements are logged
+
+        # Share of slow SELECTs run again under `EXPLAIN (ANALYZE, BUFFERS)` to log their plan, 0 turns it off.
+        # The statement runs twice, so keep it low.
+        explain_sample_ratio: float = 0.0
+        explain_interval: float = 300  # seconds between plans of the same statement
+
+        max_fingerprints: int = 500  # distinct statements tracked, the least recently seen are dropped
+        reservoir_size: int = 512  # latest durations per statement the p95 is computed over
+
     host: str = "localhost"
     port: int = 5432
     user: str
@@ -70,6 +159,7 @@ class DatabaseConfig(BaseModel):
     echo_pool: bool = False
     pool_size: int = 50
     max_overflow: int = 10
+    slow_queries: SlowQueries = SlowQueries()
 
     naming_convention: dict[str, str] = {
         "ix": "ix_%(column_0_label)s",
@@ -129,7 +219,12 @@ class TimeConfig(BaseModel):
 
 class AuthConfig(BaseModel):
     class JWT(BaseModel):
-        algorithm: str = "RS256"
+        class RetiredKey(BaseModel):
+            public_key_file_path: str
+            algorithm: str
+
+        # RS256, ES256 (P-256 keys) or EdDSA (Ed25519 keys). EdDSA and ES256 sign much faster than RS256
+        algorithm: Literal["RS256", "ES256", "EdDSA"] = "RS256"
 
         access_token_lifetime: int = 15 * 60  # 15 minutes
         refresh_token_lifetime: int = 30 * 24 * 3600  # 30 days
@@ -145,6 +240,10 @@ class AuthConfig(BaseModel):
 
         private_key_file_path: str
         public_key_file_path: str
+        key_check_interval: float = 5.0  # seconds between checks of the key files for a rotation
+        # Former signing keys, still accepted until their tokens expire. Tokens are matched to keys by `kid`
+        retired_keys: list[RetiredKey] = []
+        jwks_max_age: int = 300  # seconds clients may cache the JWKS
 
         @property
         def private_key(self) -> str:
@@ -154,6 +253,23 @@ class AuthConfig(BaseModel):
         def public_key(self) -> str:
             return (BASE_DIR / Path(self.public_key_file_path)).read_text()
 
+    class AccessTokenCache(BaseModel):
+        enabled: bool = True
+        max_size: int = 10_000  # verified tokens per worker, the least recently used are dropped
+
+    class AccessTokenRevocation(BaseModel):
+        enabled: bool = True
+        channel: str = "access_token_revocations"  # LISTEN/NOTIFY channel announcing new revocations
+        # Seconds between reloads without a notification, they cover the ones missed while reconnecting
+        reload_interval: float = 30.0
+
+    class RefreshTokenPurge(BaseModel):
+        enabled: bool = True
+        interval: float = 3600.0  # seconds between runs
+        batch_size: int = 1000  # rows deleted per transaction
+        batch_pause: float = 0.1  # seconds
+        revoked_retention: float = 7 * 24 * 3600  # seconds revoked tokens are kept to detect their reuse
+
     class TokenHash(BaseModel):
         algorithm: str = "sha256"
         length: int = 64
@@ -162,6 +278,10 @@ class AuthConfig(BaseModel):
         min_length: int = 8
         max_length: int = 72  # limit for brcypt algorithm
 
+        # Each +1 doubles the time of a hash. Hashes of another cost are rehashed on the next login
+        bcrypt_rounds: int = 12
+        hasher_workers: int = 4  # threads hashing in parallel, best set to the number of cores
+
         # Passwords contains at least one: lowercase letter, uppercase letter and digit
         pattern: re.Pattern[str] = re.compile(r"^(?=.*[a-z])(?=.*[A-Z])(?=.*\d).+$")
 
@@ -175,6 +295,9 @@ class AuthConfig(BaseModel):
         refresh: Refresh = Refresh()
 
     jwt: JWT
+    access_token_cache: AccessTokenCache = AccessTokenCache()
+    access_token_revocation: AccessTokenRevocation = AccessTokenRevocation()
+    refresh_token_purge: RefreshTokenPurge = RefreshTokenPurge()
     token_hash: TokenHash = TokenHash()
     password: Password = Password()
     cookies: Cookies = Cookies()
@@ -182,6 +305,11 @@ class AuthConfig(BaseModel):
 
 class Logger(BaseModel):
     log_level: str
+    # "json" writes one object per line from a background thread, "text" is the coloured console format
+    format: Literal["text", "json"] = "text"
+    max_queue_size: int = 10_000  # json records waiting for the writer, newer ones are dropped over it
+    # Share of the records kept per level, e.g. {"INFO": 0.1}. Levels not listed are all kept
+    sampling: dict[str, float] = {}
 
 
 class SessionConfig(BaseModel):
@@ -190,7 +318,41 @@ class SessionConfig(BaseModel):
 
 
 class GitConfig(BaseModel):
+    class Reaper(BaseModel):
+        interval: float = 30.0  # seconds between runs
+        files_per_batch: int = 500
+        batch_pause: float = 0.05  # seconds
+        pool_min_age: float = 3600.0  # seconds a pool must stay without members before it's removed
+        min_age: float = 300.0  # seconds a deleted repository stays restorable before it's removed
+
+    class SparePool(BaseModel):
+        size: int = 10  # 0 disables the pool
+        interval: float = 1.0  # seconds between refills
+
+    class Branches(BaseModel):
+        page_size: int = 100
+        max_page_size: int = 1000
+
+    class Bundle(BaseModel):
+        max_size: int = 2 * 1024**3  # 2 GiB
+        chunk_size: int = 64 * 1024
+        export_buffer_size: int = 4 * 1024**2  # smaller bundles are sent only once git has finished
+        import_workers: int = 2
+        job_ttl: float = 24 * 3600.0  # seconds a finished import stays visible
+
+    class Lfs(BaseModel):
+        large_file_threshold: int = 10 * 1024**2  # 10 MiB, repositories may override it
+        max_object_size: int = 5 * 1024**3  # 5 GiB
+        chunk_size: int = 64 * 1024
+        oid_pattern: ClassVar[re.Pattern[str]] = re.compile(r"^[0-9a-f]{64}$")
+
     repositories_base_path: str
+    blob_metadata_cache_size: int = 4096
+    reaper: Reaper = Reaper()
+    branches: Branches = Branches()
+    bundle: Bundle = Bundle()
+    lfs: Lfs = Lfs()
+    spare_pool: SparePool = SparePool()
 
     repository_name_pattern: ClassVar[re.Pattern[str]] = re.compile(r"^[a-zA-Z0-9_-]{1,100}$")
     description_max_length: int = 10_000
@@ -209,6 +371,11 @@ class Settings(BaseSettings):
     )
 
     run: RunConfig = RunConfig()
+    compression: CompressionConfig = CompressionConfig()
+    rate_limit: RateLimitConfig = RateLimitConfig()
+    metrics: MetricsConfig = MetricsConfig()
+    tracing: TracingConfig = TracingConfig()
+    profiling: ProfilingConfig = ProfilingConfig()
     api: ApiConfig = ApiConfig()
     db: DatabaseConfig
     time: TimeConfig = TimeConfig()
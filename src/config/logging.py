@@ -1,10 +1,142 @@
+import json
+import random
 import sys
-from typing import Any, Mapping
+import threading
+import traceback
+import zlib
+from collections import deque
+from typing import TYPE_CHECKING, Any, Mapping, TextIO
 
 from loguru import logger
 
 from .config import settings
 
+if TYPE_CHECKING:
+    from loguru import Message, Record
+
+
+def serialize_record(record: "Record") -> str:
+    """One JSON object per line. Extras that aren't JSON types are written as their `str`."""
+
+    document: dict[str, Any] = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "message": record["message"],
+        "logger": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+    }
+    if record["extra"]:
+        document["extra"] = record["extra"]
+    exception = record["exception"]
+    if exception is not None and exception.type is not None:
+        document["exception"] = {
+            "type": exception.type.__name__,
+            "value": str(exception.value),
+            "traceback": "".join(traceback.format_exception(exception.type, exception.value, exception.traceback)),
+        }
+    return json.dumps(document, default=str, ensure_ascii=False) + "\n"
+
+
+class QueuedJsonSink:
+    """
+    Loguru sink that hands records to a writer thread, so JSON serialisation and the stream I/O are off the
+    request path.
+
+    The buffer is bounded: when the writer can't keep up records are dropped and counted instead of blocking the
+    caller. Loguru's own `enqueue=True` queue is unbounded and pickles every record in the caller. A deque is
+    used rather than `queue.Queue`, an append doesn't take a lock nor wake the writer, which polls instead.
+    """
+
+    def __init__(
+        self,
+        stream: TextIO | None = None,
+        max_queue_size: int = 10_000,
+        batch_size: int = 256,
+        flush_interval: float = 0.05,
+    ) -> None:
+        self._stream = stream if stream is not None else sys.stdout
+        self._records: deque["Record"] = deque()
+        self._max_queue_size = max_queue_size
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._stopped = threading.Event()
+        self.dropped = 0
+        self.written = 0
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, message: "Message") -> None:
+        if len(self._records) >= self._max_queue_size:
+            self.dropped += 1
+            return
+        self._records.append(message.record)
+
+    @property
+    def queued(self) -> int:
+        return len(self._records)
+
+    def stop(self) -> None:
+        """Called by loguru on `logger.remove`, writes what is still queued."""
+
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self._flush_interval):
+            self._drain()
+        self._drain()
+
+    def _drain(self) -> None:
+        while self._records:
+            batch: list["Record"] = []
+            while self._records and len(batch) < self._batch_size:
+                batch.append(self._records.popleft())
+
+            lines = [serialize_record(record) for record in batch]
+            try:
+                self._stream.write("".join(lines))
+                self._stream.flush()
+            except Exception:
+                # A broken stream mustn't kill the writer, the records are counted as dropped instead
+                self.dropped += len(lines)
+            else:
+                self.written += len(lines)
+
+
+class LevelSampler:
+    """
+    Loguru filter keeping only a share of the records of the configured levels, other levels always pass.
+
+    Records of a request are kept or dropped together: the decision is taken on the request ID when there is one,
+    so a sampled request keeps its whole story.
+    """
+
+    def __init__(self, ratios: Mapping[str, float]) -> None:
+        self._ratios = {level.upper(): ratio for level, ratio in ratios.items()}
+        self.sampled_out = 0
+
+    def __call__(self, record: "Record") -> bool:
+        return self.keeps(record["level"].name, record["extra"].get("request_id"))
+
+    def keeps(self, level: str, request_id: Any = None) -> bool:
+        """
+        The filter's decision, for callers that want to skip building a record altogether: loguru formats
+        the message before filters run. Deterministic for a request ID, so the filter agrees with it afterwards.
+        """
+
+        ratio = self._ratios.get(level)
+        if ratio is None or ratio >= 1:
+            return True
+
+        if request_id is not None:
+            keep = zlib.crc32(str(request_id).encode()) / 0xFFFFFFFF < ratio
+        else:
+            keep = random.random() < ratio
+        if not keep:
+            self.sampled_out += 1
+        return keep
+
 
 def format_record(record: Mapping[str, Any]) -> str:
     fmt = "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level:<8}</level> | <level>{message}</level>"
@@ -13,12 +145,25 @@ def format_record(record: Mapping[str, Any]) -> str:
     return fmt + "\n"
 
 
+sink: QueuedJsonSink | None = None  # set up by `init_logger` in the json format
+sampler = LevelSampler(settings.logger.sampling)
+
+
 def init_logger() -> None:
+    global sink
+
     logger.remove()
+    if settings.logger.format == "json":
+        sink = QueuedJsonSink(max_queue_size=settings.logger.max_queue_size)
+        # The message is all loguru formats in the caller, the record is serialised by the writer thread
+        logger.add(sink, format="{message}", level=settings.logger.log_level, filter=sampler, catch=True)
+        return
+
     logger.add(
         sys.stdout,
         format=format_record,
         level=settings.logger.log_level,
+        filter=sampler,
         backtrace=True,
         diagnose=True,
         enqueue=True,
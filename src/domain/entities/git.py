@@ -12,6 +12,8 @@ class Repository(BaseEntity):
     description: str | None
     created_at: datetime
     updated_at: datetime | None
+    forked_from_id: UUID | None = None
+    large_file_threshold: int | None = None  # bytes, falls back to the global setting
 
     def to_policy_context(self) -> dict[str, Any]:
         return {"owner_id": self.owner_id}
@@ -15,5 +15,6 @@ class RefreshToken(BaseEntity):
     expires_at: datetime
     created_at: datetime = Field(default_factory=lambda: datetime.now(tz=settings.time.default_tz))
     is_revoked: bool = False
+    revoked_at: datetime | None = None
     user_agent: UserAgent | None = None
     ip_address: IpAddress | None = None
@@ -0,0 +1,15 @@
+from datetime import datetime
+from uuid import UUID
+
+from domain.ports.entity import BaseEntity
+
+
+class RevokedAccessToken(BaseEntity):
+    jti: UUID
+    user_id: UUID
+    expires_at: datetime  # the token's `exp`, the revocation is useless after it
+
+
+class UserTokenRevocation(BaseEntity):
+    user_id: UUID
+    revoked_before: datetime  # access tokens of the user issued up to this moment are revoked
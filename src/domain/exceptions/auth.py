@@ -20,6 +20,10 @@ class InvalidTokenException(AuthException):
     def hash_mismatch(cls) -> Self:
         return cls("Token hash mismatch")
 
+    @classmethod
+    def revoked_access(cls) -> Self:
+        return cls("Access token has been revoked")
+
 
 class TokenExpiredException(InvalidTokenException):
     @classmethod
@@ -50,3 +54,8 @@ class InvalidCredentialsException(AuthException):
         if fields is None:
             fields = ["email", "password"]
         super().__init__(f"Invalid {' or '.join(fields)}")
+
+
+class RevocationsUnavailableException(AuthException):
+    def __init__(self) -> None:
+        super().__init__("Access token revocations are not loaded yet")
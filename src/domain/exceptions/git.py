@@ -92,3 +92,52 @@ class RepositoryAlreadyExistsException(AlreadyExistsException, RepositoryExcepti
 class RepositoryAlreadyInitializedException(RepositoryException):
     def __init__(self, *, repository_name: str) -> None:
         super().__init__(f"Repository '{repository_name}' is already initialized")
+
+
+class EmptyRepositoryException(RepositoryException):
+    def __init__(self, *, repository_name: str | None = None) -> None:
+        super().__init__(f"Repository '{repository_name}' is empty" if repository_name else "Repository is empty")
+
+
+# ====================
+# ====== Bundle ======
+# ====================
+class BundleException(GitException):
+    pass
+
+
+class InvalidBundleException(BundleException):
+    def __init__(self, *, reason: str) -> None:
+        super().__init__(f"Invalid git bundle: {reason}")
+
+
+class BundleTooLargeException(BundleException):
+    def __init__(self, *, max_size: int) -> None:
+        super().__init__(f"Git bundle exceeds the maximum size of {max_size} bytes")
+
+
+class BundleExportException(BundleException):
+    def __init__(self, *, reason: str) -> None:
+        super().__init__(f"Failed to export git bundle: {reason}")
+
+
+class ImportNotFoundException(NotFoundException, BundleException):
+    def __init__(self, *, repository_id: UUID) -> None:
+        super().__init__(f"No import found for repository with id {repository_id}")
+
+
+# ====================
+# ======= LFS ========
+# ====================
+class LargeObjectException(GitException):
+    pass
+
+
+class LargeObjectNotFoundException(NotFoundException, LargeObjectException):
+    def __init__(self, *, oid: str) -> None:
+        super().__init__(f"Large object '{oid}' not found")
+
+
+class LargeObjectIntegrityException(LargeObjectException):
+    def __init__(self, *, oid: str, reason: str) -> None:
+        super().__init__(f"Large object '{oid}' was rejected: {reason}")
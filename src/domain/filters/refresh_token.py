@@ -1,5 +1,13 @@
+from datetime import datetime
+from uuid import UUID
+
 from domain.ports.filter import BaseFilter
 
 
 class RefreshTokenFilter(BaseFilter):
-    pass
+    user_id: UUID | None = None
+    is_revoked: bool | None = None
+    expires_after: datetime | None = None
+    expires_before: datetime | None = None
+    created_after: datetime | None = None
+    created_before: datetime | None = None
@@ -0,0 +1,34 @@
+from abc import ABC, abstractmethod
+from collections.abc import Mapping
+from typing import Any, NamedTuple
+
+
+class VerificationKey(NamedTuple):
+    algorithm: str
+    key: Any
+    jwk: dict[str, Any]  # public key as published in the JWKS, with its `kid`
+
+
+class JwtKeys(NamedTuple):
+    """
+    Keys parsed into the objects PyJWT signs and verifies with, so the PEM isn't parsed on every call.
+
+    Tokens are signed with the current pair and carry its `kid`. They are verified with the key of their `kid`,
+    which may be a retired key of another algorithm, so rotating keys doesn't invalidate sessions.
+    """
+
+    kid: str
+    algorithm: str
+    signing_key: Any
+    verification_keys: Mapping[str, VerificationKey]  # by kid, the current pair's public key included
+
+    @property
+    def verification_key(self) -> Any:
+        return self.verification_keys[self.kid].key
+
+
+class AbstractJwtKeyStore(ABC):
+    @abstractmethod
+    def current(self) -> JwtKeys:
+        """Keys of one pair, read together so a rotation can't mix the private key of one pair with another's"""
+        pass
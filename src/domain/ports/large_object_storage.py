@@ -0,0 +1,28 @@
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from typing import BinaryIO
+
+from domain.value_objects.git import LfsPointer
+
+
+class AbstractLargeObjectStorage(ABC):
+    """Content-addressed storage for large files, shared by all repositories and keyed by SHA-256."""
+
+    @abstractmethod
+    async def get_size(self, oid: str) -> int | None:
+        """Returns None if the object is not stored"""
+        pass
+
+    @abstractmethod
+    async def save(self, oid: str, size: int, stream: BinaryIO) -> None:
+        """:raises LargeObjectIntegrityException:"""
+        pass
+
+    @abstractmethod
+    async def save_bytes(self, data: bytes) -> LfsPointer:
+        pass
+
+    @abstractmethod
+    async def open(self, oid: str) -> Iterator[bytes]:
+        """:raises LargeObjectNotFoundException:"""
+        pass
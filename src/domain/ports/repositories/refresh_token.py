@@ -1,13 +1,17 @@
 from abc import abstractmethod
+from collections.abc import AsyncIterator
+from datetime import datetime
 from uuid import UUID
 
 from domain.entities.refresh import RefreshToken
+from domain.entities.user import User
 from domain.filters.refresh_token import RefreshTokenFilter
 from domain.ports.repository import AbstractReadRepository, AbstractWriteRepository
 from domain.schemas.refresh_token import (
     RefreshTokenCreateSchema,
     RefreshTokenUpdateSchema,
 )
+from domain.value_objects.common import KeysetPagination
 
 
 class AbstractRefreshTokenReadRepository(AbstractReadRepository[RefreshToken, UUID, RefreshTokenFilter]):
@@ -17,7 +21,18 @@ class AbstractRefreshTokenReadRepository(AbstractReadRepository[RefreshToken, UU
         pass
 
     @abstractmethod
-    async def get_all(self, filter_: RefreshTokenFilter) -> list[RefreshToken]:
+    async def get_all(
+        self, filter_: RefreshTokenFilter, pagination: KeysetPagination | None = None
+    ) -> list[RefreshToken]:
+        """Newest tokens first."""
+        pass
+
+    @abstractmethod
+    def stream_all(self, filter_: RefreshTokenFilter, batch_size: int = 1000) -> AsyncIterator[RefreshToken]:
+        """
+        Yields every matching token, newest first, fetching `batch_size` rows at a time from a server side cursor.
+        For bulk jobs, the whole result is never held in memory.
+        """
         pass
 
     @abstractmethod
@@ -48,3 +63,22 @@ class AbstractRefreshTokenWriteRepository(
     @abstractmethod
     async def revoke_all_for_user(self, user_id: UUID) -> None:
         pass
+
+    @abstractmethod
+    async def rotate(self, identity: UUID, token_hash: str, schema: RefreshTokenCreateSchema) -> User | None:
+        """
+        Revokes the token `identity` and creates `schema` in its place, atomically, returning the token's user.
+
+        Nothing is changed and None is returned if the token doesn't exist, is already revoked, doesn't match
+        `token_hash`, doesn't belong to `schema.user_id` or its user is inactive. Of concurrent rotations of the same
+        token only one succeeds.
+        """
+        pass
+
+    @abstractmethod
+    async def delete_stale(self, expired_before: datetime, revoked_before: datetime, limit: int) -> int:
+        """
+        Deletes up to `limit` tokens that expired before `expired_before` or were revoked before `revoked_before`.
+        Returns how many were deleted.
+        """
+        pass
@@ -0,0 +1,41 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from uuid import UUID
+
+from domain.entities.token_revocation import RevokedAccessToken, UserTokenRevocation
+
+
+class AbstractTokenRevocationReadRepository(ABC):
+    @abstractmethod
+    async def get_revoked_tokens(self, expires_after: datetime) -> list[RevokedAccessToken]:
+        """Revoked tokens that haven't expired by `expires_after`."""
+        pass
+
+    @abstractmethod
+    async def get_user_revocations(self, revoked_after: datetime) -> list[UserTokenRevocation]:
+        """Per user revocations newer than `revoked_after`, older ones only cover expired tokens."""
+        pass
+
+
+class AbstractTokenRevocationWriteRepository(ABC):
+    @abstractmethod
+    async def revoke_token(self, jti: UUID, user_id: UUID, expires_at: datetime) -> None:
+        pass
+
+    @abstractmethod
+    async def revoke_user(self, user_id: UUID) -> datetime:
+        """Revokes every access token issued to the user until now, returns the time they are revoked up to."""
+        pass
+
+    @abstractmethod
+    async def delete_stale(self, expired_before: datetime, revoked_before: datetime, limit: int) -> int:
+        """
+        Deletes up to `limit` revoked tokens that expired before `expired_before` and up to `limit` user revocations
+        older than `revoked_before`, neither can match a valid token anymore. Returns how many were deleted.
+        """
+        pass
+
+    @abstractmethod
+    async def notify(self) -> None:
+        """Tells the workers mirroring the revocations to reload them, once the transaction is committed."""
+        pass
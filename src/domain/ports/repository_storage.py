@@ -1,17 +1,24 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from pathlib import Path
+from typing import BinaryIO
 
 from domain.schemas.repository_storage import (
     CreateBranchSchema,
     DeleteBranchSchema,
     DeleteFileSchema,
     FileContent,
+    FileMetadata,
+    ForkRepositorySchema,
     GetCommitsSchema,
     GetFileSchema,
     GetRefsSchema,
+    GetTreeSchema,
     InitRepositorySchema,
+    ListBranchesSchema,
     UpdateFileSchema,
 )
-from domain.value_objects.git import BranchInfo, CommitInfo, FsRepo
+from domain.value_objects.git import BranchInfo, BranchPage, CommitInfo, FsRepo
 
 
 class AbstractRepositoryStorage(ABC):
@@ -20,7 +27,45 @@ class AbstractRepositoryStorage(ABC):
         pass
 
     @abstractmethod
-    async def delete_repository(self, repo_path: str) -> None:
+    async def delete_repository(self, repo_path: str) -> str | None:
+        """Returns a tombstone that can be passed to `restore_repository`, or None if there was nothing to delete"""
+        pass
+
+    @abstractmethod
+    async def restore_repository(self, repo_path: str, tombstone: str) -> None:
+        pass
+
+    @abstractmethod
+    async def fork_repository(self, schema: ForkRepositorySchema) -> FsRepo:
+        """:raises RepositoryNotFoundException:"""
+        pass
+
+    @abstractmethod
+    async def save_bundle(self, stream: BinaryIO, max_size: int, chunk_size: int) -> Path:
+        """:raises BundleTooLargeException:"""
+        pass
+
+    @abstractmethod
+    async def verify_bundle(self, bundle_path: Path) -> None:
+        """:raises InvalidBundleException:"""
+        pass
+
+    @abstractmethod
+    async def remove_bundle(self, bundle_path: Path) -> None:
+        pass
+
+    @abstractmethod
+    def import_bundle(self, repo_path: str, bundle_path: Path) -> None:
+        """:raises InvalidBundleException:"""
+        pass
+
+    @abstractmethod
+    async def open_bundle_stream(self, repo_path: str, chunk_size: int, buffer_size: int) -> Iterator[bytes]:
+        """
+        :raises RepositoryNotFoundException:
+        :raises EmptyRepositoryException:
+        :raises BundleExportException:
+        """
         pass
 
     @abstractmethod
@@ -39,6 +84,10 @@ class AbstractRepositoryStorage(ABC):
     async def get_branches(self, repo_path: str) -> list[BranchInfo]:
         pass
 
+    @abstractmethod
+    async def list_branches(self, schema: ListBranchesSchema) -> BranchPage:
+        pass
+
     @abstractmethod
     async def get_commits(self, schema: GetCommitsSchema) -> list[CommitInfo]:
         pass
@@ -51,6 +100,33 @@ class AbstractRepositoryStorage(ABC):
     async def get_file(self, schema: GetFileSchema) -> FileContent:
         pass
 
+    @abstractmethod
+    async def get_file_metadata(self, schema: GetFileSchema) -> FileMetadata:
+        pass
+
+    @abstractmethod
+    async def resolve_branch(self, repo_path: str, branch_name: str) -> str:
+        """:raises BranchNotFoundException:"""
+        pass
+
+    @abstractmethod
+    async def resolve_tree(self, schema: GetTreeSchema) -> str:
+        """
+        :raises BranchNotFoundException:
+        :raises FileNotFoundException:
+        :raises IsFileException:
+        """
+        pass
+
+    @abstractmethod
+    async def resolve_blob(self, schema: GetFileSchema) -> str:
+        """
+        :raises BranchNotFoundException:
+        :raises FileNotFoundException:
+        :raises IsDirectoryException:
+        """
+        pass
+
     @abstractmethod
     async def update_file(self, schema: UpdateFileSchema) -> CommitInfo:
         pass
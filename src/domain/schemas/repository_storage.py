@@ -11,6 +11,11 @@ class InitRepositorySchema(BaseModel):
     repo_path: str
 
 
+class ForkRepositorySchema(BaseModel):
+    source_repo_path: str
+    repo_path: str
+
+
 class CreateInitialCommitSchema(BaseModel):
     repo_path: str
     message: str = "Initial commit"
@@ -32,6 +37,14 @@ class DeleteBranchSchema(BaseModel):
     # TODO: add force: bool
 
 
+class ListBranchesSchema(BaseModel):
+    repo_path: str
+    prefix: str = ""
+    descending: bool = False
+    after: str | None = None  # name of the last branch of the previous page
+    limit: int
+
+
 class GetCommitsSchema(BaseModel):
     repo_path: str
     branch_name: str = "main"
@@ -48,6 +61,14 @@ class FileContent(BaseModel):
     content: str
     encoding: str = "utf-8"
     sha: str
+    mimetype: str | None = None
+
+
+class FileMetadata(BaseModel):
+    sha: str
+    size: int
+    mimetype: str
+    is_binary: bool
 
 
 class UpdateFileSchema(BaseModel):
@@ -93,6 +114,8 @@ class RepositoryCreateSchema(BaseCreateSchema):
     name: str = Field(max_length=255)
     owner_id: UUID
     description: str | None = None
+    forked_from_id: UUID | None = None
+    large_file_threshold: int | None = None
 
 
 class RepositoryUpdateSchema(BaseUpdateSchema):
@@ -1,10 +1,10 @@
-import bcrypt
-
 from domain.entities.user import User
 from domain.exceptions.auth import InvalidCredentialsException
 from domain.exceptions.user import UserNotFoundException
-from domain.ports.repositories.user import AbstractUserReadRepository
+from domain.ports.repositories.user import AbstractUserReadRepository, AbstractUserWriteRepository
 from domain.ports.service import BaseService
+from domain.schemas.user import UserUpdateSchema
+from domain.services.auth.password_hasher import PasswordHasher
 from domain.services.auth.token import TokenService
 from domain.value_objects.auth import LoginCredentials
 from domain.value_objects.token import AccessTokenVo, RefreshTokenVo
@@ -15,9 +15,15 @@ class AuthenticationService(BaseService):
         self,
         token_service: TokenService,
         user_read_repository: AbstractUserReadRepository,
+        password_hasher: PasswordHasher | None = None,
+        user_write_repository: AbstractUserWriteRepository | None = None,
     ) -> None:
+        """Hashes of an outdated cost are only replaced on login if a write repository is given."""
+
         self._token_service = token_service
         self._read_repository = user_read_repository
+        self._password_hasher = password_hasher or PasswordHasher()
+        self._write_repository = user_write_repository
 
     # TODO: revoke previous token with the same user_id + user_agent
     async def login(self, credentials: LoginCredentials) -> tuple[AccessTokenVo, RefreshTokenVo]:
@@ -37,14 +43,15 @@ class AuthenticationService(BaseService):
         except UserNotFoundException as e:
             raise InvalidCredentialsException() from e
 
-        if not self.check_password(password=credentials.password, hashed_password=user.password_hash):
+        if not await self.check_password(password=credentials.password, hashed_password=user.password_hash):
             raise InvalidCredentialsException()
 
+        if self._write_repository is not None and self._password_hasher.needs_rehash(user.password_hash):
+            # The only moment the password is known, so the cost is changed as users log in
+            password_hash = await self._password_hasher.hash(credentials.password)
+            user = await self._write_repository.update(user.id, UserUpdateSchema(password_hash=password_hash))
+
         return user
 
-    @staticmethod
-    def check_password(password: str, hashed_password: str) -> bool:
-        return bcrypt.checkpw(
-            password=password.encode("utf-8"),
-            hashed_password=hashed_password.encode("utf-8"),
-        )
+    async def check_password(self, password: str, hashed_password: str) -> bool:
+        return await self._password_hasher.verify(password=password, password_hash=hashed_password)
@@ -0,0 +1,80 @@
+import base64
+import hashlib
+import json
+from collections.abc import Sequence
+from typing import Any
+
+import jwt
+
+from domain.ports.jwt_keys import AbstractJwtKeyStore, JwtKeys, VerificationKey
+
+# Members of each key type hashed into the thumbprint, RFC 7638 section 3.2
+THUMBPRINT_MEMBERS = {"RSA": ("e", "kty", "n"), "EC": ("crv", "kty", "x", "y"), "OKP": ("crv", "kty", "x")}
+
+
+def jwk_thumbprint(jwk: dict[str, Any]) -> str:
+    """RFC 7638 thumbprint, used as the `kid`: stable for a key and the same whoever computes it"""
+
+    members = {name: jwk[name] for name in THUMBPRINT_MEMBERS[jwk["kty"]]}
+    digest = hashlib.sha256(json.dumps(members, separators=(",", ":"), sort_keys=True).encode()).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+def _parse(pem: str, algorithm: str) -> Any:
+    """:raises PyJWTError:"""
+
+    try:
+        parser = jwt.get_algorithm_by_name(algorithm)
+    except NotImplementedError as e:
+        raise jwt.InvalidAlgorithmError(f"Unsupported algorithm: {algorithm}") from e
+
+    try:
+        return parser.prepare_key(pem)
+    except ValueError as e:
+        raise jwt.InvalidKeyError(str(e)) from e
+
+
+def parse_verification_key(public_key: str, algorithm: str) -> VerificationKey:
+    """:raises PyJWTError: If the algorithm is unsupported or the key can't be parsed"""
+
+    key = _parse(public_key, algorithm)
+    jwk: dict[str, Any] = jwt.get_algorithm_by_name(algorithm).to_jwk(key, as_dict=True)
+    jwk.update(kid=jwk_thumbprint(jwk), alg=algorithm, use="sig")
+    return VerificationKey(algorithm=algorithm, key=key, jwk=jwk)
+
+
+def parse_jwt_keys(
+    private_key: str, public_key: str, algorithm: str, retired_keys: Sequence[tuple[str, str]] = ()
+) -> JwtKeys:
+    """
+    `retired_keys` are (public key, algorithm) pairs of former signing keys, still accepted until their tokens expire.
+
+    :raises PyJWTError: If an algorithm is unsupported or a key can't be parsed
+    """
+
+    current = parse_verification_key(public_key, algorithm)
+    verification_keys = {current.jwk["kid"]: current}
+    for retired_public_key, retired_algorithm in retired_keys:
+        retired = parse_verification_key(retired_public_key, retired_algorithm)
+        verification_keys.setdefault(retired.jwk["kid"], retired)
+
+    return JwtKeys(
+        kid=current.jwk["kid"],
+        algorithm=algorithm,
+        signing_key=_parse(private_key, algorithm),
+        verification_keys=verification_keys,
+    )
+
+
+class StaticJwtKeyStore(AbstractJwtKeyStore):
+    """Keys given as PEM strings, parsed once."""
+
+    def __init__(
+        self, private_key: str, public_key: str, algorithm: str, retired_keys: Sequence[tuple[str, str]] = ()
+    ) -> None:
+        """:raises PyJWTError:"""
+
+        self._keys = parse_jwt_keys(private_key, public_key, algorithm, retired_keys)
+
+    def current(self) -> JwtKeys:
+        return self._keys
@@ -0,0 +1,52 @@
+import asyncio
+from typing import Any, Callable, TypeVar
+
+import bcrypt
+
+from config import settings
+from domain.ports.service import BaseService
+
+T = TypeVar("T")
+
+
+def hash_password(password: str, rounds: int) -> str:
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=rounds)).decode()
+
+
+def check_password(password: str, password_hash: str) -> bool:
+    return bcrypt.checkpw(password=password.encode("utf-8"), hashed_password=password_hash.encode("utf-8"))
+
+
+def get_rounds(password_hash: str) -> int | None:
+    """Cost of a `$2b$12$...` hash, None if it isn't a bcrypt hash"""
+
+    parts = password_hash.split("$")
+    if len(parts) != 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+class PasswordHasher(BaseService):
+    """
+    bcrypt off the event loop: a hash takes hundreds of milliseconds by design, during which the loop would serve
+    nobody else. bcrypt releases the GIL while hashing, so threads run hashes in parallel.
+
+    This one runs them in the default executor, PooledPasswordHasher in a pool of their own.
+    """
+
+    def __init__(self, rounds: int = settings.auth.password.bcrypt_rounds) -> None:
+        self.rounds = rounds
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        return await asyncio.to_thread(func, *args)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password, self.rounds)
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        return await self._run(check_password, password, password_hash)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """The hash was made with another cost than the configured one"""
+
+        return get_rounds(password_hash) != self.rounds
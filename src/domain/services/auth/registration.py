@@ -1,6 +1,5 @@
 import re
 
-import bcrypt
 from pydantic import EmailStr
 
 from config import settings
@@ -13,15 +12,18 @@ from domain.exceptions.user import (
 from domain.ports.repositories.user import AbstractUserReadRepository
 from domain.ports.service import BaseService
 from domain.schemas.user import UserCreateSchema
+from domain.services.auth.password_hasher import PasswordHasher
 
 
 class RegistrationService(BaseService):
     def __init__(
         self,
         read_repository: AbstractUserReadRepository,
+        password_hasher: PasswordHasher | None = None,
     ) -> None:
         super().__init__()
         self.read_repository = read_repository
+        self._password_hasher = password_hasher or PasswordHasher()
 
     async def validate_registration(
         self,
@@ -46,8 +48,8 @@ class RegistrationService(BaseService):
         self._check_username_policy(username=username)
         self._check_password_policy(password=password)
 
-    def prepare_user_create_schema(self, email: EmailStr, username: str, password: str) -> UserCreateSchema:
-        hashed_password = self._hash_password(password=password)
+    async def prepare_user_create_schema(self, email: EmailStr, username: str, password: str) -> UserCreateSchema:
+        hashed_password = await self._hash_password(password=password)
         return UserCreateSchema(email=email, username=username, password_hash=hashed_password)
 
     async def _email_exists(self, email: EmailStr) -> bool:
@@ -91,7 +93,5 @@ class RegistrationService(BaseService):
         if len(username) > settings.user.username.max_length:
             raise InvalidUsernameException.too_long(settings.user.username.max_length)
 
-    def _hash_password(self, password: str) -> str:
-        salt: bytes = bcrypt.gensalt()
-        hashed_password: bytes = bcrypt.hashpw(password.encode(), salt)
-        return hashed_password.decode()
+    async def _hash_password(self, password: str) -> str:
+        return await self._password_hasher.hash(password)
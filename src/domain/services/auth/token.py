@@ -1,14 +1,16 @@
 import hashlib
 from datetime import UTC, datetime
 from typing import Any
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 import jwt
 
 from config import settings
 from domain.entities.user import User
 from domain.exceptions.auth import InvalidTokenException, TokenExpiredException
+from domain.ports.jwt_keys import AbstractJwtKeyStore
 from domain.ports.service import BaseService
+from domain.services.auth.keys import StaticJwtKeyStore
 from domain.value_objects.token import (
     AccessTokenPayload,
     AccessTokenVo,
@@ -20,13 +22,25 @@ from domain.value_objects.token import (
 class TokenService(BaseService):
     def __init__(
         self,
-        private_key: str,
-        public_key: str,
+        private_key: str | None = None,
+        public_key: str | None = None,
         access_token_lifetime: int = settings.auth.jwt.access_token_lifetime,
         refresh_token_lifetime: int = settings.auth.jwt.refresh_token_lifetime,
+        key_store: AbstractJwtKeyStore | None = None,
     ) -> None:
-        self.__private_key = private_key
-        self.public_key = public_key
+        """
+        Keys are given either as PEM strings, parsed once here, or as a key store that follows key rotations.
+
+        :raises ValueError: If neither the keys nor a key store are given
+        :raises PyJWTError: If the keys can't be parsed
+        """
+
+        if key_store is None:
+            if private_key is None or public_key is None:
+                raise ValueError("Either both keys or a key store are required")
+            key_store = StaticJwtKeyStore(private_key, public_key, settings.auth.jwt.algorithm)
+
+        self._key_store = key_store
         self.access_token_lifetime = access_token_lifetime
         self.refresh_token_lifetime = refresh_token_lifetime
 
@@ -43,12 +57,9 @@ class TokenService(BaseService):
             email=user.email,
             iat=issued_at,
             exp=expires_at,
+            jti=uuid4(),
         )
-        token: str = jwt.encode(
-            payload.model_dump(mode="json"),
-            key=self.__private_key,
-            algorithm=settings.auth.jwt.algorithm,
-        )
+        token = self._encode(payload.model_dump(mode="json"))
         return AccessTokenVo(value=token)
 
     def _verify_access(self, token: AccessTokenVo) -> AccessTokenPayload:
@@ -61,17 +72,13 @@ class TokenService(BaseService):
         :raises ValueError: If payload['type'] is not TokenTypeEnum.ACCESS
         """
 
-        payload = jwt.decode(
-            token.value,
-            key=self.public_key,
-            algorithms=[settings.auth.jwt.algorithm],
-            options=settings.auth.jwt.access_decode_options,
-        )
+        payload = self._decode(token.value, options=settings.auth.jwt.access_decode_options)
         return AccessTokenPayload(
             sub=payload["sub"],
             email=payload["email"],
             iat=payload["iat"],
             exp=payload["exp"],
+            jti=payload.get("jti"),
             type=payload["type"],
         )
 
@@ -94,20 +101,20 @@ class TokenService(BaseService):
     # =================
     def generate_refresh(self, user: User) -> RefreshTokenVo:
         """Generate a new refresh token for a user."""
+        return self.generate_refresh_for(user_id=user.id)
+
+    def generate_refresh_for(self, user_id: UUID) -> RefreshTokenVo:
+        """Generate a new refresh token for a user known only by id, e.g. before the user is loaded."""
         issued_at = int(datetime.now(UTC).timestamp())
         expires_at = issued_at + self.refresh_token_lifetime
 
         payload = RefreshTokenPayload(
-            sub=user.id,
+            sub=user_id,
             iat=issued_at,
             exp=expires_at,
             jti=uuid4(),
         )
-        token: str = jwt.encode(
-            payload.model_dump(mode="json"),
-            key=self.__private_key,
-            algorithm=settings.auth.jwt.algorithm,
-        )
+        token = self._encode(payload.model_dump(mode="json"))
         return RefreshTokenVo(value=token)
 
     def _verify_refresh(self, token: RefreshTokenVo) -> RefreshTokenPayload:
@@ -119,12 +126,7 @@ class TokenService(BaseService):
                             (e.g., malformed, invalid signature, or missing required claims).
         :raises ValueError: If payload['type'] is not TokenTypeEnum.REFRESH
         """
-        payload = jwt.decode(
-            token.value,
-            key=self.public_key,
-            algorithms=[settings.auth.jwt.algorithm],
-            options=settings.auth.jwt.refresh_decode_options,
-        )
+        payload = self._decode(token.value, options=settings.auth.jwt.refresh_decode_options)
 
         return self._payload_dict_to_refresh_payload(payload)
 
@@ -160,8 +162,6 @@ class TokenService(BaseService):
         """
         payload = jwt.decode(
             token.value,
-            key=self.public_key,
-            algorithms=[settings.auth.jwt.algorithm],
             options={
                 **settings.auth.jwt.refresh_decode_options,
                 "verify_signature": False,
@@ -185,6 +185,32 @@ class TokenService(BaseService):
     # ================
     # ==== COMMON ====
     # ================
+    def _encode(self, claims: dict[str, Any]) -> str:
+        keys = self._key_store.current()
+        return jwt.encode(claims, key=keys.signing_key, algorithm=keys.algorithm, headers={"kid": keys.kid})
+
+    def _decode(self, token: str, options: dict[str, Any]) -> dict[str, Any]:
+        """
+        Verifies the token with the key of its `kid` and that key's algorithm only, whatever `alg` the header
+        claims. Tokens without a `kid`, issued before keys had one, are verified with the current key.
+
+        :raises PyJWTError:
+        """
+
+        keys = self._key_store.current()
+        kid = jwt.get_unverified_header(token).get("kid", keys.kid)
+        key = keys.verification_keys.get(kid) if isinstance(kid, str) else None
+        if key is None:
+            raise jwt.InvalidKeyError("Unknown key id")
+
+        payload: dict[str, Any] = jwt.decode(token, key=key.key, algorithms=[key.algorithm], options=options)
+        return payload
+
+    def jwks(self) -> dict[str, Any]:
+        """Public keys tokens are verified with, as a JSON Web Key Set"""
+
+        return {"keys": [key.jwk for key in self._key_store.current().verification_keys.values()]}
+
     @staticmethod
     def hash_token(token: str) -> str:
         """:raises ValueError:"""
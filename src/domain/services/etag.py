@@ -0,0 +1,13 @@
+import hashlib
+
+
+def make_etag(*parts: str) -> str:
+    """
+    Builds a strong ETag from git SHAs and the parameters that shape a response.
+
+    A single SHA is used as is, so a blob's ETag stays its object id.
+    """
+
+    if len(parts) == 1:
+        return parts[0]
+    return hashlib.sha1("\0".join(parts).encode()).hexdigest()
@@ -1,6 +1,28 @@
+from datetime import datetime
+from uuid import UUID
+
 from pydantic import BaseModel, Field
 
 
 class Pagination(BaseModel):
     limit: int = Field(le=100, default=10)
     offset: int = Field(ge=0, default=0)
+
+
+class Cursor(BaseModel):
+    """Position of a row in a listing ordered by `(created_at, id)`, usually the last row of the previous page."""
+
+    created_at: datetime
+    id: UUID
+
+
+class KeysetPagination(BaseModel):
+    """
+    Rows following `after`, or the first page without it.
+
+    Unlike `Pagination.offset`, the rows before the cursor aren't read and skipped, so any page costs the same, and
+    rows inserted or deleted meanwhile don't shift the pages.
+    """
+
+    limit: int = Field(gt=0, le=100, default=10)
+    after: Cursor | None = None
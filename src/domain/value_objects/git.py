@@ -1,7 +1,11 @@
 from datetime import datetime
 from pathlib import Path
+from typing import ClassVar, Generic, Literal, TypeVar
+from uuid import UUID
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
+
+T = TypeVar("T")
 
 
 class Author(BaseModel):
@@ -14,6 +18,11 @@ class BranchInfo(BaseModel):
     commit_sha: str
 
 
+class BranchPage(BaseModel):
+    branches: list[BranchInfo]
+    next_after: str | None = None  # pass as `after` to get the next page, None on the last page
+
+
 class CommitInfo(BaseModel):
     commit_hash: str
     author: Author
@@ -23,3 +32,45 @@ class CommitInfo(BaseModel):
 
 class FsRepo(BaseModel):
     full_path: Path
+
+
+class ImportJob(BaseModel):
+    repository_id: UUID
+    status: Literal["pending", "running", "succeeded", "failed"] = "pending"
+    error: str | None = None
+    created_at: datetime
+    finished_at: datetime | None = None
+
+
+class LfsPointer(BaseModel):
+    """Git LFS pointer file that is committed instead of the large file itself."""
+
+    SPEC_URL: ClassVar[str] = "https://git-lfs.github.com/spec/v1"
+
+    oid: str  # sha256 hex digest
+    size: int
+
+    def to_text(self) -> str:
+        return f"version {self.SPEC_URL}\noid sha256:{self.oid}\nsize {self.size}\n"
+
+
+class LfsObjectSpec(BaseModel):
+    oid: str
+    size: int = Field(ge=0)
+
+
+class LfsObjectStatus(BaseModel):
+    oid: str
+    size: int
+    stored_size: int | None  # None if the object is not stored yet
+
+
+class ConditionalResult(BaseModel, Generic[T]):
+    """A read result with its ETag. `data` is None when the client already has this version."""
+
+    etag: str
+    data: T | None = None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.data is None
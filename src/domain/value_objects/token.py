@@ -12,6 +12,7 @@ class AccessTokenPayload(BaseModel):
 
     iat: int
     exp: int
+    jti: UUID | None = None  # tokens issued before access tokens had one can't be revoked one by one
 
     type: Literal[TokenTypeEnum.ACCESS] = TokenTypeEnum.ACCESS
 
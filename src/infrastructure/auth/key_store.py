@@ -0,0 +1,95 @@
+import threading
+import time
+from collections.abc import Sequence
+from pathlib import Path
+
+import jwt
+from loguru import logger
+
+from domain.ports.jwt_keys import AbstractJwtKeyStore, JwtKeys
+from domain.services.auth.keys import parse_jwt_keys
+
+FileVersion = tuple[int, int, int]  # (inode, size, mtime_ns)
+
+
+class FileJwtKeyStore(AbstractJwtKeyStore):
+    """
+    Keys read from PEM files, parsed once and shared by every TokenService of the process.
+
+    The files are checked for changes at most every `check_interval` seconds. A changed pair is parsed and checked
+    to match before it replaces the current keys in a single assignment. A pair that doesn't (e.g. only one file
+    was replaced yet, or a file was caught half-written) is logged and tried again on the next check, the current
+    keys are kept meanwhile.
+
+    To rotate without logging everyone out, the former public key is listed in `retired_keys` with its algorithm
+    until the tokens it signed have expired.
+    """
+
+    PROBE_CLAIMS = {"probe": True}
+
+    def __init__(
+        self,
+        private_key_path: Path,
+        public_key_path: Path,
+        algorithm: str,
+        check_interval: float,
+        retired_keys: Sequence[tuple[Path, str]] = (),
+    ) -> None:
+        """:raises OSError, PyJWTError: If the keys can't be loaded at startup"""
+
+        self._paths = (private_key_path, public_key_path, *(path for path, _ in retired_keys))
+        self._algorithm = algorithm
+        self._retired_algorithms = [algorithm for _, algorithm in retired_keys]
+        self._check_interval = check_interval
+        self._lock = threading.Lock()
+
+        self._versions = self._stat()
+        self._keys = self._load()
+        self._checked_at = time.monotonic()
+
+    def current(self) -> JwtKeys:
+        if time.monotonic() - self._checked_at >= self._check_interval:
+            self._reload_if_changed()
+        return self._keys
+
+    def _reload_if_changed(self) -> None:
+        # Another thread is already checking, the current keys are served meanwhile
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._checked_at = time.monotonic()
+            try:
+                versions = self._stat()
+                if versions == self._versions:
+                    return
+                keys = self._load()
+            except (OSError, jwt.PyJWTError):
+                logger.bind(paths=[str(path) for path in self._paths]).exception("JWT keys reload failed")
+                return
+
+            self._keys, self._versions = keys, versions
+            logger.bind(kid=keys.kid, algorithm=keys.algorithm).info("JWT keys reloaded")
+        finally:
+            self._lock.release()
+
+    def _stat(self) -> tuple[FileVersion, ...]:
+        """:raises OSError:"""
+
+        versions = []
+        for path in self._paths:
+            stat = path.stat()
+            versions.append((stat.st_ino, stat.st_size, stat.st_mtime_ns))
+        return tuple(versions)
+
+    def _load(self) -> JwtKeys:
+        """:raises OSError, PyJWTError:"""
+
+        private_key, public_key, *retired_keys = (path.read_text() for path in self._paths)
+        keys = parse_jwt_keys(
+            private_key, public_key, self._algorithm, list(zip(retired_keys, self._retired_algorithms, strict=True))
+        )
+
+        # Keys of different pairs parse fine but would reject every token signed from now on
+        probe = jwt.encode(self.PROBE_CLAIMS, key=keys.signing_key, algorithm=keys.algorithm)
+        jwt.decode(probe, key=keys.verification_key, algorithms=[keys.algorithm])
+        return keys
@@ -0,0 +1,50 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from domain.services.auth.password_hasher import PasswordHasher
+
+T = TypeVar("T")
+
+
+class PooledPasswordHasher(PasswordHasher):
+    """
+    bcrypt in a pool of `workers` threads of its own, so a login storm can't take the default executor's threads
+    from file reads and git calls. Hashes beyond the workers wait in the pool's queue, `pending` and
+    `wait_seconds` show how long that queue gets.
+
+    Threads rather than processes: bcrypt releases the GIL, so they hash in parallel on every core without
+    pickling, nor spawned processes importing the application again.
+    """
+
+    def __init__(self, workers: int, rounds: int) -> None:
+        super().__init__(rounds=rounds)
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+
+        self.pending = 0  # submitted and not finished yet, running ones included
+        self.completed = 0
+        self.wait_seconds = 0.0  # total time spent queued before a worker picked the hash up
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        submitted_at = time.perf_counter()
+
+        def timed() -> T:
+            with self._lock:
+                self.wait_seconds += time.perf_counter() - submitted_at
+            return func(*args)
+
+        with self._lock:
+            self.pending += 1
+        try:
+            return await asyncio.wrap_future(self._executor.submit(timed))
+        finally:
+            with self._lock:
+                self.pending -= 1
+                self.completed += 1
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,111 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator, Awaitable
+from datetime import datetime, timedelta
+from typing import Callable
+
+from loguru import logger
+from pydantic import BaseModel
+
+from application.ports.uow import AbstractUnitOfWork
+from config import settings
+from infrastructure.repositories.refresh_token import RefreshTokenWriteRepository
+from infrastructure.repositories.token_revocation import TokenRevocationWriteRepository
+
+
+class RefreshTokenPurgeStats(BaseModel):
+    runs: int = 0
+    rows_deleted: int = 0
+    revocations_deleted: int = 0
+    last_run_deleted: int = 0
+    errors: int = 0
+    last_run_duration: float = 0.0
+
+
+class RefreshTokenPurger:
+    """
+    Deletes refresh tokens that can't be used anymore, rotation only revokes them.
+
+    Expired tokens are rejected by their signature's `exp` anyway. Revoked ones are kept for `revoked_retention`
+    seconds, so that the reuse of a stolen token is still reported as such rather than as an unknown token.
+
+    Access token revocations are deleted too once they can't match a valid token: revoked tokens after their
+    expiry, and user revocations `access_token_lifetime` seconds after they were made.
+
+    Rows are deleted in batches of `batch_size`, each in its own transaction with a `batch_pause` between them,
+    so a large backlog doesn't hold locks on the table or flood the WAL in one go.
+    """
+
+    def __init__(
+        self,
+        uow_factory: Callable[[], AbstractUnitOfWork],
+        interval: float,
+        batch_size: int,
+        batch_pause: float,
+        revoked_retention: float,
+        access_token_lifetime: int,
+    ) -> None:
+        self._uow_factory = uow_factory
+        self._interval = interval
+        self._batch_size = batch_size
+        self._batch_pause = batch_pause
+        self._revoked_retention = timedelta(seconds=revoked_retention)
+        self._access_token_lifetime = timedelta(seconds=access_token_lifetime)
+        self.stats = RefreshTokenPurgeStats()
+
+    async def run(self) -> None:
+        logger.bind(interval=self._interval).info("Refresh token purger started")
+        while True:
+            try:
+                await self.purge()
+            except Exception:
+                self.stats.errors += 1
+                logger.exception("Refresh token purge failed")
+
+            await asyncio.sleep(self._interval)
+
+    async def purge(self) -> int:
+        """Deletes every stale refresh token and access token revocation, returns how many rows were deleted."""
+
+        started_at = time.perf_counter()
+        now = datetime.now(tz=settings.time.default_tz)
+
+        tokens = 0
+        async for batch in self._batches(
+            lambda uow: RefreshTokenWriteRepository(session=uow.session).delete_stale(
+                expired_before=now, revoked_before=now - self._revoked_retention, limit=self._batch_size
+            )
+        ):
+            tokens += batch
+            self.stats.rows_deleted += batch
+
+        revocations = 0
+        async for batch in self._batches(
+            lambda uow: TokenRevocationWriteRepository(session=uow.session).delete_stale(
+                expired_before=now, revoked_before=now - self._access_token_lifetime, limit=self._batch_size
+            )
+        ):
+            revocations += batch
+            self.stats.revocations_deleted += batch
+
+        self.stats.runs += 1
+        self.stats.last_run_deleted = tokens + revocations
+        self.stats.last_run_duration = time.perf_counter() - started_at
+        if tokens or revocations:
+            logger.bind(
+                refresh_tokens=tokens, revocations=revocations, duration=self.stats.last_run_duration
+            ).info("Stale tokens purged")
+        return tokens + revocations
+
+    async def _batches(self, delete_batch: Callable[[AbstractUnitOfWork], Awaitable[int]]) -> AsyncIterator[int]:
+        """Runs `delete_batch` in a transaction of its own until it deletes less than a batch, yields the counts."""
+
+        while True:
+            async with self._uow_factory() as uow:
+                batch = await delete_batch(uow)
+                await uow.commit()
+
+            yield batch
+            if batch < self._batch_size:
+                return
+            await asyncio.sleep(self._batch_pause)
@@ -0,0 +1,138 @@
+import asyncio
+from contextlib import suppress
+from datetime import datetime, timedelta
+from typing import Any, Callable
+from uuid import UUID
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from application.ports.uow import AbstractUnitOfWork
+from config import settings
+from domain.value_objects.token import AccessTokenPayload
+from infrastructure.auth.token_cache import VerifiedTokenCache
+from infrastructure.repositories.token_revocation import TokenRevocationReadRepository
+
+
+class AccessTokenRevocationList:
+    """
+    In-process mirror of the access token revocations, so that `require_auth` checks them without a query.
+
+    Only revocations that can still match a valid token are loaded: tokens that haven't expired yet and users
+    revoked within the last access token lifetime. The mirror holds the revocations of the last few minutes, plain
+    dicts are smaller than the false positives of a Bloom filter would be worth.
+
+    It's reloaded when a revocation is committed, announced on the `channel` with NOTIFY, and every
+    `reload_interval` in case a notification was missed while reconnecting. Revocations committed by this worker
+    are added right away, a token revoked by another worker is accepted here until the notification arrives.
+    Until the first load succeeds `loaded` is false and `require_auth` rejects every token.
+
+    The verified tokens of users revoked since the previous load are dropped from `token_cache`, whichever
+    worker revoked them.
+    """
+
+    def __init__(
+        self,
+        uow_factory: Callable[[], AbstractUnitOfWork],
+        engine: AsyncEngine,
+        channel: str,
+        reload_interval: float,
+        access_token_lifetime: int,
+        token_cache: VerifiedTokenCache | None = None,
+    ) -> None:
+        self._uow_factory = uow_factory
+        self._engine = engine
+        self._channel = channel
+        self._reload_interval = reload_interval
+        self._access_token_lifetime = timedelta(seconds=access_token_lifetime)
+        self._token_cache = token_cache
+
+        self._tokens: dict[UUID, float] = {}  # jti -> exp
+        self._users: dict[UUID, float] = {}  # user id -> timestamp up to which their tokens are revoked
+
+        self.reloads = 0
+        self.rejected = 0
+        self.errors = 0
+
+    def is_revoked(self, payload: AccessTokenPayload) -> bool:
+        revoked_before = self._users.get(payload.sub)
+        # `iat` is in whole seconds, a token issued in the second of the revocation is revoked too
+        revoked = (payload.jti is not None and payload.jti in self._tokens) or (
+            revoked_before is not None and payload.iat <= revoked_before
+        )
+        if revoked:
+            self.rejected += 1
+        return revoked
+
+    @property
+    def loaded(self) -> bool:
+        return self.reloads > 0
+
+    def add_token(self, jti: UUID, expires_at: datetime) -> None:
+        """Adds a token revoked by this worker, without waiting for the reload its notification triggers."""
+
+        self._tokens[jti] = expires_at.timestamp()
+
+    def add_user(self, user_id: UUID, revoked_before: datetime) -> None:
+        """Adds a user revoked by this worker, without waiting for the reload its notification triggers."""
+
+        self._users[user_id] = max(revoked_before.timestamp(), self._users.get(user_id, 0.0))
+        if self._token_cache is not None:
+            self._token_cache.invalidate_user(user_id)
+
+    def __len__(self) -> int:
+        return len(self._tokens) + len(self._users)
+
+    async def reload(self) -> None:
+        now = datetime.now(tz=settings.time.default_tz)
+        async with self._uow_factory() as uow:
+            repository = TokenRevocationReadRepository(session=uow.session)
+            tokens = await repository.get_revoked_tokens(expires_after=now)
+            users = await repository.get_user_revocations(revoked_after=now - self._access_token_lifetime)
+
+        # Swapped whole, lookups never see a half built mirror
+        previous_users = self._users
+        self._tokens = {token.jti: token.expires_at.timestamp() for token in tokens}
+        self._users = {user.user_id: user.revoked_before.timestamp() for user in users}
+        self.reloads += 1
+
+        if self._token_cache is not None:
+            for user_id, revoked_before in self._users.items():
+                if previous_users.get(user_id) != revoked_before:
+                    self._token_cache.invalidate_user(user_id)
+
+    async def run(self) -> None:
+        logger.bind(channel=self._channel).info("Access token revocation listener started")
+        while True:
+            try:
+                await self._listen()
+            except Exception:
+                self.errors += 1
+                logger.exception("Access token revocation listener failed, reconnecting")
+                await asyncio.sleep(self._reload_interval)
+
+    async def _listen(self) -> None:
+        reload_requested = asyncio.Event()
+
+        def on_notification(*args: Any) -> None:
+            reload_requested.set()
+
+        async with self._engine.connect() as connection:
+            raw_connection = await connection.get_raw_connection()
+            listener = raw_connection.driver_connection
+            if listener is None:
+                # Invalidated while being checked out, `run` reconnects
+                raise RuntimeError("Revocation listener connection was invalidated")
+            await listener.add_listener(self._channel, on_notification)
+            try:
+                while True:
+                    # Loaded after LISTEN, a revocation committed in between is either loaded or notified
+                    reload_requested.clear()
+                    await self.reload()
+                    with suppress(TimeoutError):
+                        await asyncio.wait_for(reload_requested.wait(), timeout=self._reload_interval)
+                    if not reload_requested.is_set():
+                        # No notification for a while, make sure the connection they arrive on is still alive
+                        await listener.execute("SELECT 1")
+            finally:
+                await listener.remove_listener(self._channel, on_notification)
@@ -0,0 +1,63 @@
+import hashlib
+import time
+from uuid import UUID
+
+from domain.value_objects.token import AccessTokenPayload
+from infrastructure.utils.cache import LRUCache
+
+
+class VerifiedTokenCache:
+    """
+    Payloads of access tokens whose signature was verified, so a client sending the same token over and over
+    costs one signature check per worker.
+
+    Entries are keyed by the SHA-256 of the token, the tokens themselves aren't kept. An entry is served until
+    the token's `exp` and dropped on the first lookup after it, the token then goes through the verification
+    again, which reports it as expired. Cached tokens still go through the revocation check, revoking one drops
+    it from here on its next use, and `AccessTokenRevocationList` drops the tokens of revoked users on reload.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self._cache: LRUCache[bytes, AccessTokenPayload] = LRUCache(max_size=max_size)
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> AccessTokenPayload | None:
+        key = self._key(token)
+        payload = self._cache.get(key)
+        if payload is not None and payload.exp <= time.time():
+            self._cache.invalidate(key)
+            payload = None
+
+        if payload is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return payload
+
+    def set(self, token: str, payload: AccessTokenPayload) -> None:
+        self._cache.set(self._key(token), payload)
+
+    def invalidate(self, token: str) -> None:
+        self._cache.invalidate(self._key(token))
+
+    def invalidate_user(self, user_id: UUID) -> int:
+        """Drops the tokens of a user, e.g. when their sessions are revoked. Returns how many were cached."""
+
+        return self._cache.invalidate_where(lambda payload: payload.sub == user_id)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
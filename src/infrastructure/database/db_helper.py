@@ -10,6 +10,9 @@ from sqlalchemy.ext.asyncio import (
 )
 
 from config import settings
+from config.config import DatabaseConfig
+from infrastructure.database.pool import TimedAsyncQueuePool
+from infrastructure.database.slow_queries import SlowQueryMonitor
 
 
 class DatabaseHelper:
@@ -20,6 +23,7 @@ class DatabaseHelper:
         echo_pool: bool = False,
         pool_size: int = 5,
         max_overflow: int = 10,
+        slow_queries: DatabaseConfig.SlowQueries | None = None,
     ) -> None:
         self.engine: AsyncEngine = create_async_engine(
             url=url,
@@ -27,7 +31,13 @@ class DatabaseHelper:
             echo_pool=echo_pool,
             pool_size=pool_size,
             max_overflow=max_overflow,
+            poolclass=TimedAsyncQueuePool,
         )
+        self.slow_query_monitor: SlowQueryMonitor | None = None
+        if slow_queries is not None and slow_queries.enabled:
+            self.slow_query_monitor = SlowQueryMonitor(slow_queries)
+            self.slow_query_monitor.instrument(self.engine)
+
         self.async_sessionmaker: async_sessionmaker[AsyncSession] = async_sessionmaker(
             bind=self.engine,
             autoflush=False,
@@ -50,6 +60,7 @@ db_helper = DatabaseHelper(
     echo_pool=settings.db.echo_pool,
     pool_size=settings.db.pool_size,
     max_overflow=settings.db.max_overflow,
+    slow_queries=settings.db.slow_queries,
 )
 
 
@@ -1,5 +1,12 @@
-__all__ = ("UserModel", "RefreshTokenModel", "RepositoryModel")
+__all__ = (
+    "UserModel",
+    "RefreshTokenModel",
+    "RepositoryModel",
+    "RevokedAccessTokenModel",
+    "UserTokenRevocationModel",
+)
 
 from .refresh_token import RefreshTokenModel
 from .repository import RepositoryModel
+from .token_revocation import RevokedAccessTokenModel, UserTokenRevocationModel
 from .user import UserModel
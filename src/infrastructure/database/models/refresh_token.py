@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy import DateTime, ForeignKey, Index, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from config import settings
@@ -16,8 +16,12 @@ from .user import UserModel
 
 class RefreshTokenModel(Base[RefreshToken], UUIDMixin, CreatedAtMixin):
     __tablename__ = "refresh_tokens"
+    __table_args__ = (
+        # Serves the keyset pagination of a user's tokens, and lookups by `user_id` alone as its prefix
+        Index("ix_refresh_tokens_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
 
-    user_id: Mapped[UUID] = mapped_column(ForeignKey(UserModel.id, ondelete="CASCADE"), index=True, nullable=False)
+    user_id: Mapped[UUID] = mapped_column(ForeignKey(UserModel.id, ondelete="CASCADE"), nullable=False)
     token_hash: Mapped[str] = mapped_column(
         String(length=settings.auth.token_hash.length),
         unique=True,
@@ -27,6 +31,7 @@ class RefreshTokenModel(Base[RefreshToken], UUIDMixin, CreatedAtMixin):
 
     expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True, nullable=False)
     is_revoked: Mapped[bool] = mapped_column(default=False)
+    revoked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), index=True, nullable=True)
 
     user_agent: Mapped[str] = mapped_column(String(length=settings.session.ua_max_length), nullable=True)
     ip_address: Mapped[str] = mapped_column(String(length=settings.session.ip_max_length), nullable=True)
@@ -39,6 +44,7 @@ class RefreshTokenModel(Base[RefreshToken], UUIDMixin, CreatedAtMixin):
             created_at=self.created_at,
             expires_at=self.expires_at,
             is_revoked=self.is_revoked,
+            revoked_at=self.revoked_at,
             user_agent=UserAgent(value=self.user_agent) if self.user_agent else None,
             ip_address=IpAddress(value=self.ip_address) if self.ip_address else None,
         )
@@ -1,6 +1,6 @@
 from uuid import UUID
 
-from sqlalchemy import ForeignKey, String, Text
+from sqlalchemy import BigInteger, ForeignKey, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from domain.entities.git import Repository
@@ -16,6 +16,12 @@ class RepositoryModel(Base[Repository], UUIDMixin, CreatedAtMixin, UpdatedAtMixi
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     owner_id: Mapped[UUID] = mapped_column(ForeignKey(UserModel.id), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
+    forked_from_id: Mapped[UUID | None] = mapped_column(
+        ForeignKey("repositories.id", ondelete="SET NULL"),
+        index=True,
+        nullable=True,
+    )
+    large_file_threshold: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
 
     def to_entity(self) -> Repository:
         return Repository(
@@ -25,4 +31,6 @@ class RepositoryModel(Base[Repository], UUIDMixin, CreatedAtMixin, UpdatedAtMixi
             description=self.description,
             created_at=self.created_at,
             updated_at=self.updated_at,
+            forked_from_id=self.forked_from_id,
+            large_file_threshold=self.large_file_threshold,
         )
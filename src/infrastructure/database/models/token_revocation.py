@@ -0,0 +1,32 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from domain.entities.token_revocation import RevokedAccessToken, UserTokenRevocation
+
+from .base import Base
+from .user import UserModel
+
+
+class RevokedAccessTokenModel(Base[RevokedAccessToken]):
+    __tablename__ = "revoked_access_tokens"
+
+    jti: Mapped[UUID] = mapped_column(PostgresUUID(as_uuid=True), primary_key=True)
+    user_id: Mapped[UUID] = mapped_column(ForeignKey(UserModel.id, ondelete="CASCADE"), index=True, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True, nullable=False)
+
+    def to_entity(self) -> RevokedAccessToken:
+        return RevokedAccessToken(jti=self.jti, user_id=self.user_id, expires_at=self.expires_at)
+
+
+class UserTokenRevocationModel(Base[UserTokenRevocation]):
+    __tablename__ = "user_token_revocations"
+
+    user_id: Mapped[UUID] = mapped_column(ForeignKey(UserModel.id, ondelete="CASCADE"), primary_key=True)
+    revoked_before: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True, nullable=False)
+
+    def to_entity(self) -> UserTokenRevocation:
+        return UserTokenRevocation(user_id=self.user_id, revoked_before=self.revoked_before)
@@ -0,0 +1,21 @@
+import time
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+from infrastructure.metrics.instruments import DB_POOL_CHECKOUT_SECONDS
+from infrastructure.tracing.tracer import TRACER
+
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    The default pool of async engines, recording how long each checkout waits for a connection, in a
+    metric and, inside a trace, in a `db.pool.checkout` span.
+    """
+
+    def connect(self) -> PoolProxiedConnection:
+        start = time.perf_counter()
+        try:
+            with TRACER.span("db.pool.checkout", require_parent=True):
+                return super().connect()
+        finally:
+            DB_POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - start)
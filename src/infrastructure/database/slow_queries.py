@@ -0,0 +1,209 @@
+import hashlib
+import math
+import random
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any
+
+from loguru import logger
+from pydantic import BaseModel
+from sqlalchemy import Engine, event
+from sqlalchemy.engine import Connection, ExecutionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from config.config import DatabaseConfig
+
+MAX_LOGGED_STATEMENT_LENGTH = 4096
+EXPLAIN_SAVEPOINT = "slow_query_explain"
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"\$\d+|%\(\w+\)s|%s|(?<!:):\w+|\?")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_REPEATED_ROWS = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """
+    Normalises a statement so that executions differing only in values are counted together: literals and
+    placeholders become `?`, lists of them `(...)`, whitespace is collapsed.
+    """
+
+    normalised = _STRING_LITERAL.sub("?", statement)
+    normalised = _PLACEHOLDER.sub("?", normalised)
+    normalised = _NUMBER_LITERAL.sub("?", normalised)
+    normalised = _PLACEHOLDER_LIST.sub("(...)", normalised)
+    normalised = _REPEATED_ROWS.sub("(...)", normalised)
+    return _WHITESPACE.sub(" ", normalised).strip()
+
+
+class StatementSummary(BaseModel):
+    fingerprint_id: str
+    fingerprint: str
+    count: int
+    total_seconds: float
+    p95_seconds: float
+    max_seconds: float
+    slow_count: int
+    last_plan: str | None
+
+
+class _StatementStats:
+    __slots__ = ("fingerprint", "count", "total", "max", "slow", "durations", "last_plan", "explained_at")
+
+    def __init__(self, statement_fingerprint: str, reservoir_size: int) -> None:
+        self.fingerprint = statement_fingerprint
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.slow = 0
+        self.durations: deque[float] = deque(maxlen=reservoir_size)
+        self.last_plan: str | None = None
+        self.explained_at = -math.inf
+
+    def p95(self) -> float:
+        if not self.durations:
+            return 0.0
+        ordered = sorted(self.durations)
+        return ordered[math.ceil(0.95 * len(ordered)) - 1]
+
+
+class SlowQueryMonitor:
+    """
+    Times every statement of an engine and aggregates the durations per statement fingerprint.
+
+    Statements slower than `threshold` are logged with the SQL, never the parameters. The request ID is added
+    to the record by the logging middleware. A share of slow SELECTs is run again under
+    `EXPLAIN (ANALYZE, BUFFERS)` inside a savepoint, at most once per `explain_interval` per statement, and the
+    plan is logged with it.
+    """
+
+    def __init__(self, config: DatabaseConfig.SlowQueries) -> None:
+        self._config = config
+        self._stats: OrderedDict[str, _StatementStats] = OrderedDict()  # fingerprint id -> stats
+        self._fingerprint_ids: dict[str, str] = {}  # statement -> fingerprint id, statements repeat verbatim
+        self._lock = threading.Lock()
+
+    def instrument(self, engine: AsyncEngine | Engine) -> None:
+        sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+        event.listen(sync_engine, "before_cursor_execute", self._start)
+        event.listen(sync_engine, "after_cursor_execute", self._finish)
+
+    def summary(self) -> list[StatementSummary]:
+        """Statements by total time spent in them, most first."""
+
+        with self._lock:
+            summaries = [
+                StatementSummary(
+                    fingerprint_id=fingerprint_id,
+                    fingerprint=stats.fingerprint,
+                    count=stats.count,
+                    total_seconds=stats.total,
+                    p95_seconds=stats.p95(),
+                    max_seconds=stats.max,
+                    slow_count=stats.slow,
+                    last_plan=stats.last_plan,
+                )
+                for fingerprint_id, stats in self._stats.items()
+            ]
+        return sorted(summaries, key=lambda summary: summary.total_seconds, reverse=True)
+
+    def _start(
+        self, conn: Connection, cursor: Any, statement: str, parameters: Any, context: ExecutionContext, many: bool
+    ) -> None:
+        context._query_started_at = time.perf_counter()  # type: ignore[attr-defined]
+
+    def _finish(
+        self, conn: Connection, cursor: Any, statement: str, parameters: Any, context: ExecutionContext, many: bool
+    ) -> None:
+        started_at: float | None = getattr(context, "_query_started_at", None)
+        if started_at is None:
+            return
+        duration = time.perf_counter() - started_at
+        slow = duration >= self._config.threshold
+
+        fingerprint_id, stats, explain = self._record(statement, duration, slow)
+        if not slow:
+            return
+
+        plan = None
+        if explain and not many and not getattr(context, "is_server_side", False) and conn.dialect.name == "postgresql":
+            plan = self._explain(conn, statement, parameters)
+            with self._lock:
+                stats.last_plan = plan
+
+        log = logger.bind(
+            duration_ms=round(duration * 1000, 1),
+            fingerprint_id=fingerprint_id,
+            statement=statement[:MAX_LOGGED_STATEMENT_LENGTH],
+            rows=cursor.rowcount,
+        )
+        if plan is not None:
+            log = log.bind(plan=plan)
+        log.warning("Slow SQL statement")
+
+    def _record(self, statement: str, duration: float, slow: bool) -> tuple[str, _StatementStats, bool]:
+        """Adds the duration to the statement's stats. Returns whether this execution should be explained."""
+
+        with self._lock:
+            fingerprint_id = self._fingerprint_ids.get(statement)
+            if fingerprint_id is None:
+                fingerprint_id = hashlib.sha1(fingerprint(statement).encode()).hexdigest()[:12]
+                if len(self._fingerprint_ids) >= self._config.max_fingerprints * 4:
+                    # Statements with inlined literals never repeat, the cache is rebuilt rather than grown
+                    self._fingerprint_ids.clear()
+                self._fingerprint_ids[statement] = fingerprint_id
+
+            stats = self._stats.get(fingerprint_id)
+            if stats is None:
+                stats = _StatementStats(fingerprint(statement), self._config.reservoir_size)
+                self._stats[fingerprint_id] = stats
+                while len(self._stats) > self._config.max_fingerprints:
+                    self._stats.popitem(last=False)
+            self._stats.move_to_end(fingerprint_id)
+
+            stats.count += 1
+            stats.total += duration
+            stats.max = max(stats.max, duration)
+            stats.durations.append(duration)
+
+            explain = False
+            if slow:
+                stats.slow += 1
+                now = time.monotonic()
+                explain = (
+                    stats.fingerprint.startswith("SELECT ")
+                    and now - stats.explained_at >= self._config.explain_interval
+                    and random.random() < self._config.explain_sample_ratio
+                )
+                if explain:
+                    stats.explained_at = now
+
+        return fingerprint_id, stats, explain
+
+    @staticmethod
+    def _explain(conn: Connection, statement: str, parameters: Any) -> str | None:
+        """
+        Runs the statement again under `EXPLAIN (ANALYZE, BUFFERS)` on a cursor of its own, the statement's
+        cursor still holds its rows. The savepoint keeps a failing EXPLAIN from aborting the transaction.
+        """
+
+        cursor = conn.connection.dbapi_connection.cursor()  # type: ignore[union-attr]
+        try:
+            cursor.execute(f"SAVEPOINT {EXPLAIN_SAVEPOINT}")
+            try:
+                cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+                plan = "\n".join(row[0] for row in cursor.fetchall())
+            except Exception:
+                cursor.execute(f"ROLLBACK TO SAVEPOINT {EXPLAIN_SAVEPOINT}")
+                raise
+            cursor.execute(f"RELEASE SAVEPOINT {EXPLAIN_SAVEPOINT}")
+            return plan
+        except Exception as e:
+            logger.bind(error=str(e)).warning("Failed to explain a slow SQL statement")
+            return None
+        finally:
+            cursor.close()
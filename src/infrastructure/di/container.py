@@ -8,7 +8,7 @@ from infrastructure.di.containers.use_cases import UseCaseContainer
 
 class Container(containers.DeclarativeContainer):
     database = providers.Container(DatabaseContainer)
-    services = providers.Container(ServiceContainer)
+    services = providers.Container(ServiceContainer, database=database)
     storages = providers.Container(StorageContainer)
 
     use_cases = providers.Container(
@@ -5,6 +5,7 @@ from infrastructure.uow.sqlalchemy import SqlAlchemyUoW
 
 
 class DatabaseContainer(containers.DeclarativeContainer):
+    engine = providers.Callable(lambda: db_helper.engine)
     session_factory = providers.Callable(lambda: db_helper.async_sessionmaker)
     uow = providers.Factory(
         SqlAlchemyUoW,
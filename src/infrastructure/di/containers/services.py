@@ -3,13 +3,72 @@ from dependency_injector import containers, providers
 from config import settings
 from config.config import BASE_DIR
 from domain.services.auth.token import TokenService
+from infrastructure.auth.key_store import FileJwtKeyStore
+from infrastructure.auth.password_hasher import PooledPasswordHasher
+from infrastructure.auth.refresh_token_purger import RefreshTokenPurger
+from infrastructure.auth.revocation_list import AccessTokenRevocationList
+from infrastructure.auth.token_cache import VerifiedTokenCache
+from infrastructure.middleware.rate_limit import RateLimiter
 from infrastructure.policy_loader import PolicyLoader
+from infrastructure.profiling.sampler import SamplingProfiler
+from infrastructure.profiling.store import ProfileStore
+from infrastructure.rate_limit.backends import create_rate_limit_backend
+from infrastructure.utils.stats import ConditionalRequestStats
 
 
 class ServiceContainer(containers.DeclarativeContainer):
-    token_service = providers.Singleton(
-        TokenService,
-        private_key=settings.auth.jwt.private_key,
-        public_key=settings.auth.jwt.public_key,
+    database = providers.DependenciesContainer()
+
+    jwt_key_store = providers.Singleton(
+        FileJwtKeyStore,
+        private_key_path=BASE_DIR / settings.auth.jwt.private_key_file_path,
+        public_key_path=BASE_DIR / settings.auth.jwt.public_key_file_path,
+        algorithm=settings.auth.jwt.algorithm,
+        check_interval=settings.auth.jwt.key_check_interval,
+        retired_keys=[
+            (BASE_DIR / key.public_key_file_path, key.algorithm) for key in settings.auth.jwt.retired_keys
+        ],
+    )
+    token_service = providers.Singleton(TokenService, key_store=jwt_key_store)
+    password_hasher = providers.Singleton(
+        PooledPasswordHasher,
+        workers=settings.auth.password.hasher_workers,
+        rounds=settings.auth.password.bcrypt_rounds,
+    )
+    access_token_cache = providers.Singleton(VerifiedTokenCache, max_size=settings.auth.access_token_cache.max_size)
+    access_token_revocations = providers.Singleton(
+        AccessTokenRevocationList,
+        uow_factory=database.uow.provider,
+        engine=database.engine,
+        channel=settings.auth.access_token_revocation.channel,
+        reload_interval=settings.auth.access_token_revocation.reload_interval,
+        access_token_lifetime=settings.auth.jwt.access_token_lifetime,
+        token_cache=access_token_cache,
+    )
+    refresh_token_purger = providers.Singleton(
+        RefreshTokenPurger,
+        uow_factory=database.uow.provider,
+        interval=settings.auth.refresh_token_purge.interval,
+        batch_size=settings.auth.refresh_token_purge.batch_size,
+        batch_pause=settings.auth.refresh_token_purge.batch_pause,
+        revoked_retention=settings.auth.refresh_token_purge.revoked_retention,
+        access_token_lifetime=settings.auth.jwt.access_token_lifetime,
     )
     policy_service = providers.Singleton(PolicyLoader.load_from_yaml, file_path=BASE_DIR / settings.policies_file_path)
+    conditional_stats = providers.Singleton(ConditionalRequestStats)
+
+    rate_limit_backend = providers.Singleton(create_rate_limit_backend, config=settings.rate_limit)
+    rate_limiter = providers.Singleton(
+        RateLimiter,
+        backend=rate_limit_backend,
+        capacity=settings.rate_limit.capacity,
+        refill_rate=settings.rate_limit.refill_rate,
+    )
+
+    profiler = providers.Singleton(SamplingProfiler, interval=settings.profiling.interval)
+    profile_store = providers.Singleton(
+        ProfileStore,
+        max_requested=settings.profiling.max_requested,
+        slowest_per_route=settings.profiling.slowest_per_route,
+        window=settings.profiling.window,
+    )
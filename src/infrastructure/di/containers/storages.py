@@ -1,11 +1,47 @@
 from dependency_injector import containers, providers
 
 from config import settings
+from infrastructure.storage.bundle_import import BundleImportRunner
 from infrastructure.storage.git_storage import GitPythonStorage
+from infrastructure.storage.lfs_storage import LocalLargeObjectStorage
+from infrastructure.storage.reaper import TombstoneReaper
+from infrastructure.storage.spare_pool import SpareRepositoryPool
 
 
 class StorageContainer(containers.DeclarativeContainer):
+    spare_pool = providers.Singleton(
+        SpareRepositoryPool,
+        spare_dir=settings.git.storage_base_path / GitPythonStorage.SPARE_DIR_NAME,
+        size=settings.git.spare_pool.size,
+        interval=settings.git.spare_pool.interval,
+    )
+
     git_storage = providers.Singleton(
         GitPythonStorage,
         repositories_dir=settings.git.storage_base_path,
+        spare_pool=spare_pool if settings.git.spare_pool.size > 0 else None,
+        metadata_cache_size=settings.git.blob_metadata_cache_size,
+    )
+
+    lfs_storage = providers.Singleton(
+        LocalLargeObjectStorage,
+        objects_dir=settings.git.storage_base_path / GitPythonStorage.LFS_DIR_NAME / "objects",
+        chunk_size=settings.git.lfs.chunk_size,
+    )
+
+    reaper = providers.Singleton(
+        TombstoneReaper,
+        git_storage=git_storage,
+        interval=settings.git.reaper.interval,
+        files_per_batch=settings.git.reaper.files_per_batch,
+        batch_pause=settings.git.reaper.batch_pause,
+        pool_min_age=settings.git.reaper.pool_min_age,
+        min_age=settings.git.reaper.min_age,
+    )
+
+    bundle_import_runner = providers.Singleton(
+        BundleImportRunner,
+        git_storage=git_storage,
+        max_workers=settings.git.bundle.import_workers,
+        job_ttl=settings.git.bundle.job_ttl,
     )
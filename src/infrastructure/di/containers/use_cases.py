@@ -1,18 +1,28 @@
 from dependency_injector import containers, providers
 
 from application.use_cases.auth.login_user import LoginUserUseCase
+from application.use_cases.auth.logout_user import LogoutUserUseCase
 from application.use_cases.auth.refresh_tokens import RefreshTokensUseCase
 from application.use_cases.auth.register_user import RegisterUserUseCase
 from application.use_cases.git.branches.create_branch import CreateBranchUseCase
 from application.use_cases.git.branches.get_branches import GetBranchesUseCase
+from application.use_cases.git.bundles.export_repository import ExportRepositoryUseCase
+from application.use_cases.git.bundles.get_import_status import GetImportStatusUseCase
+from application.use_cases.git.bundles.import_repository import ImportRepositoryUseCase
 from application.use_cases.git.commits.create_initial_commit import CreateInitialCommitUseCase
 from application.use_cases.git.commits.get_commits import GetCommitsUseCase
 from application.use_cases.git.commits.update_file import UpdateFileUseCase
 from application.use_cases.git.create_repository import CreateRepositoryUseCase
 from application.use_cases.git.delete_repository import DeleteRepositoryUseCase
+from application.use_cases.git.fork_repository import ForkRepositoryUseCase
 from application.use_cases.git.get_file import GetFileUseCase
+from application.use_cases.git.get_file_metadata import GetFileMetadataUseCase
 from application.use_cases.git.get_repository import GetRepositoryUseCase
 from application.use_cases.git.get_tree import GetTreeUseCase
+from application.use_cases.git.lfs.batch import LfsBatchUseCase
+from application.use_cases.git.lfs.download_object import DownloadLargeObjectUseCase
+from application.use_cases.git.lfs.upload_object import UploadLargeObjectUseCase
+from config import settings
 from infrastructure.factories.repositories import create_repository_reader, create_repository_writer, create_user_reader
 from infrastructure.factories.services import create_repository_service
 
@@ -25,17 +35,25 @@ class UseCaseContainer(containers.DeclarativeContainer):
     register_user = providers.Factory(
         RegisterUserUseCase,
         uow=database.uow,
+        password_hasher=services.password_hasher,
     )
     login_user = providers.Factory(
         LoginUserUseCase,
         uow=database.uow,
         token_service=services.token_service,
+        password_hasher=services.password_hasher,
     )
     refresh_tokens = providers.Factory(
         RefreshTokensUseCase,
         uow=database.uow,
         token_service=services.token_service,
     )
+    logout_user = providers.Factory(
+        LogoutUserUseCase,
+        uow=database.uow,
+        token_service=services.token_service,
+        revocations=services.access_token_revocations if settings.auth.access_token_revocation.enabled else None,
+    )
     create_repository = providers.Factory(
         CreateRepositoryUseCase,
         uow=database.uow,
@@ -52,6 +70,34 @@ class UseCaseContainer(containers.DeclarativeContainer):
         repository_reader_factory=create_repository_reader,
         repository_writer_factory=create_repository_writer,
     )
+    fork_repository = providers.Factory(
+        ForkRepositoryUseCase,
+        uow=database.uow,
+        git_storage=storages.git_storage,
+        policy_service=services.policy_service,
+        user_reader_factory=create_user_reader,
+        repository_reader_factory=create_repository_reader,
+        repository_writer_factory=create_repository_writer,
+        repository_service_factory=create_repository_service,
+    )
+    import_repository = providers.Factory(
+        ImportRepositoryUseCase,
+        git_storage=storages.git_storage,
+        import_runner=storages.bundle_import_runner,
+        create_repository_use_case=create_repository,
+    )
+    get_import_status = providers.Factory(
+        GetImportStatusUseCase,
+        uow=database.uow,
+        import_runner=storages.bundle_import_runner,
+        repository_reader_factory=create_repository_reader,
+    )
+    export_repository = providers.Factory(
+        ExportRepositoryUseCase,
+        uow=database.uow,
+        git_storage=storages.git_storage,
+        repository_reader_factory=create_repository_reader,
+    )
     get_repositories = providers.Factory(
         GetRepositoryUseCase,
         uow=database.uow,
@@ -61,6 +107,7 @@ class UseCaseContainer(containers.DeclarativeContainer):
         GetBranchesUseCase,
         uow=database.uow,
         git_storage=storages.git_storage,
+        conditional_stats=services.conditional_stats,
     )
 
     create_branch = providers.Factory(
@@ -75,6 +122,32 @@ class UseCaseContainer(containers.DeclarativeContainer):
         uow=database.uow,
         git_storage=storages.git_storage,
         policy_service=services.policy_service,
+        lfs_storage=storages.lfs_storage,
+    )
+
+    lfs_batch = providers.Factory(
+        LfsBatchUseCase,
+        uow=database.uow,
+        lfs_storage=storages.lfs_storage,
+        policy_service=services.policy_service,
+        user_reader_factory=create_user_reader,
+        repository_reader_factory=create_repository_reader,
+    )
+
+    upload_large_object = providers.Factory(
+        UploadLargeObjectUseCase,
+        uow=database.uow,
+        lfs_storage=storages.lfs_storage,
+        policy_service=services.policy_service,
+        user_reader_factory=create_user_reader,
+        repository_reader_factory=create_repository_reader,
+    )
+
+    download_large_object = providers.Factory(
+        DownloadLargeObjectUseCase,
+        uow=database.uow,
+        lfs_storage=storages.lfs_storage,
+        repository_reader_factory=create_repository_reader,
     )
 
     create_initial_commit = providers.Factory(
@@ -88,16 +161,25 @@ class UseCaseContainer(containers.DeclarativeContainer):
         GetCommitsUseCase,
         uow=database.uow,
         git_storage=storages.git_storage,
+        conditional_stats=services.conditional_stats,
     )
 
     get_tree = providers.Factory(
         GetTreeUseCase,
         uow=database.uow,
         git_storage=storages.git_storage,
+        conditional_stats=services.conditional_stats,
     )
 
     get_file = providers.Factory(
         GetFileUseCase,
         uow=database.uow,
         git_storage=storages.git_storage,
+        conditional_stats=services.conditional_stats,
+    )
+
+    get_file_metadata = providers.Factory(
+        GetFileMetadataUseCase,
+        uow=database.uow,
+        git_storage=storages.git_storage,
     )
@@ -0,0 +1,251 @@
+import time
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from inspect import iscoroutinefunction
+from typing import Any, TypeVar
+
+from sqlalchemy.pool import Pool, QueuePool
+
+from config.logging import LevelSampler, QueuedJsonSink
+from infrastructure.auth.password_hasher import PooledPasswordHasher
+from infrastructure.auth.refresh_token_purger import RefreshTokenPurger
+from infrastructure.auth.revocation_list import AccessTokenRevocationList
+from infrastructure.database.slow_queries import SlowQueryMonitor
+from infrastructure.metrics.registry import Histogram, Registry, Sample
+
+T = TypeVar("T", bound=type)
+
+REGISTRY = Registry()
+
+# Labels are kept to bounded sets: routes are URL rule templates, never paths with repository names in them
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "Time to produce the response headers, by method, URL rule and status.",
+    labelnames=("method", "route", "status"),
+)
+GIT_OPERATION_SECONDS = REGISTRY.histogram(
+    "git_storage_operation_duration_seconds",
+    "Duration of GitPythonStorage operations, by method.",
+    labelnames=("method",),
+)
+DB_POOL_CHECKOUT_SECONDS = REGISTRY.histogram(
+    "db_pool_checkout_duration_seconds",
+    "Time to get a connection from the SQLAlchemy pool, including opening one when the pool grows.",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+
+
+def time_async_methods(histogram: Histogram) -> Callable[[T], T]:
+    """
+    Class decorator recording the duration of every public coroutine method under its name.
+
+    Methods returning iterators (e.g. bundle streams) are timed until the iterator is returned, not consumed.
+    """
+
+    def decorator(cls: T) -> T:
+        for name, method in list(vars(cls).items()):
+            if not name.startswith("_") and iscoroutinefunction(method):
+                setattr(cls, name, _timed(method, histogram.labels(name)))
+        return cls
+
+    return decorator
+
+
+def _timed(method: Callable[..., Any], series: Any) -> Callable[..., Any]:
+    @wraps(method)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            series.observe(time.perf_counter() - start)
+
+    return wrapper
+
+
+def register_pool(registry: Registry, pool: Pool) -> None:
+    """Connections of a queue pool in use, in overflow and kept idle. Read from the pool when scraped."""
+
+    if not isinstance(pool, QueuePool):
+        return
+
+    registry.callback(
+        "db_pool_connections",
+        "Connections of the SQLAlchemy pool by state.",
+        "gauge",
+        lambda: [(("checked_out",), pool.checkedout()), (("checked_in",), pool.checkedin())],
+        labelnames=("state",),
+    )
+    registry.callback(
+        "db_pool_overflow",
+        "Connections opened beyond the pool size.",
+        "gauge",
+        # SQLAlchemy counts the overflow from `-size` while the pool is still filling up
+        lambda: [((), max(0, pool.overflow()))],
+    )
+    registry.callback("db_pool_size", "Configured size of the SQLAlchemy pool.", "gauge", lambda: [((), pool.size())])
+
+
+def register_executors(registry: Registry, get_executors: Callable[[], Mapping[str, ThreadPoolExecutor]]) -> None:
+    """
+    Work items waiting for a thread of each executor. `get_executors` is called on every scrape, the
+    default executor of the loop is only created once the server starts.
+    """
+
+    def collect() -> Iterable[Sample]:
+        # `_work_queue` holds the submitted items no thread has picked up yet
+        return [((name,), executor._work_queue.qsize()) for name, executor in get_executors().items()]
+
+    registry.callback(
+        "executor_queue_depth",
+        "Work items waiting for a free thread, by executor.",
+        "gauge",
+        collect,
+        labelnames=("executor",),
+    )
+
+
+def register_caches(registry: Registry, caches: Mapping[str, Callable[[], tuple[float, float]]]) -> None:
+    """`caches` maps a cache name to a function returning its hits and misses."""
+
+    def collect(index: int) -> Iterable[Sample]:
+        return [((name,), stats()[index]) for name, stats in caches.items()]
+
+    def collect_ratio() -> Iterable[Sample]:
+        samples = []
+        for name, stats in caches.items():
+            hits, misses = stats()
+            samples.append(((name,), hits / (hits + misses) if hits + misses else 0.0))
+        return samples
+
+    registry.callback("cache_hits_total", "Cache hits, by cache.", "counter", lambda: collect(0), ("cache",))
+    registry.callback("cache_misses_total", "Cache misses, by cache.", "counter", lambda: collect(1), ("cache",))
+    registry.callback("cache_hit_ratio", "Share of lookups that hit, by cache.", "gauge", collect_ratio, ("cache",))
+
+
+def register_statements(registry: Registry, monitor: SlowQueryMonitor) -> None:
+    """
+    Executions and p95 latency per statement fingerprint. The number of fingerprints is capped by the monitor,
+    `db_statement_info` maps their IDs to the normalised SQL.
+    """
+
+    def collect(field: str) -> Iterable[Sample]:
+        return [((i.fingerprint_id,), getattr(i, field)) for i in monitor.summary()]
+
+    registry.callback(
+        "db_statements_total",
+        "Statements executed, by fingerprint.",
+        "counter",
+        lambda: collect("count"),
+        ("fingerprint",),
+    )
+    registry.callback(
+        "db_statement_p95_seconds",
+        "95th percentile of the latest durations, by fingerprint.",
+        "gauge",
+        lambda: collect("p95_seconds"),
+        ("fingerprint",),
+    )
+    registry.callback(
+        "db_statement_info",
+        "Normalised SQL of each fingerprint.",
+        "gauge",
+        lambda: [((i.fingerprint_id, i.fingerprint[:200]), 1) for i in monitor.summary()],
+        ("fingerprint", "statement"),
+    )
+
+
+def register_logging(registry: Registry, sink: QueuedJsonSink | None, sampler: LevelSampler) -> None:
+    """Records lost to a full queue or left out by sampling, and the writer backlog in the json format."""
+
+    registry.callback(
+        "log_records_sampled_out_total",
+        "Records left out by the per-level sampling.",
+        "counter",
+        lambda: [((), sampler.sampled_out)],
+    )
+    if sink is None:
+        return
+
+    registry.callback(
+        "log_records_dropped_total",
+        "Records dropped because the writer queue was full or the stream failed.",
+        "counter",
+        lambda: [((), sink.dropped)],
+    )
+    registry.callback(
+        "log_records_written_total", "Records written by the writer thread.", "counter", lambda: [((), sink.written)]
+    )
+    registry.callback("log_queue_size", "Records waiting for the writer thread.", "gauge", lambda: [((), sink.queued)])
+
+
+def register_password_hasher(registry: Registry, hasher: PooledPasswordHasher) -> None:
+    """The average wait is `password_hash_wait_seconds_total / password_hashes_total`."""
+
+    registry.callback(
+        "password_hashes_pending",
+        "bcrypt hashes and checks submitted and not finished, running ones included.",
+        "gauge",
+        lambda: [((), hasher.pending)],
+    )
+    registry.callback(
+        "password_hasher_workers", "Threads of the password hasher.", "gauge", lambda: [((), hasher.workers)]
+    )
+    registry.callback(
+        "password_hashes_total", "bcrypt hashes and checks finished.", "counter", lambda: [((), hasher.completed)]
+    )
+    registry.callback(
+        "password_hash_wait_seconds_total",
+        "Time hashes and checks waited for a free thread.",
+        "counter",
+        lambda: [((), hasher.wait_seconds)],
+    )
+
+
+def register_refresh_token_purger(registry: Registry, purger: RefreshTokenPurger) -> None:
+    registry.callback(
+        "refresh_tokens_purged_total",
+        "Expired and long revoked refresh tokens deleted.",
+        "counter",
+        lambda: [((), purger.stats.rows_deleted)],
+    )
+    registry.callback(
+        "access_token_revocations_purged_total",
+        "Access token revocations deleted once they can't match a valid token.",
+        "counter",
+        lambda: [((), purger.stats.revocations_deleted)],
+    )
+    registry.callback(
+        "refresh_token_purge_errors_total",
+        "Purge runs that failed.",
+        "counter",
+        lambda: [((), purger.stats.errors)],
+    )
+
+
+def register_access_token_revocations(registry: Registry, revocations: AccessTokenRevocationList) -> None:
+    registry.callback(
+        "access_token_revocations",
+        "Revocations mirrored in memory, tokens and users.",
+        "gauge",
+        lambda: [((), len(revocations))],
+    )
+    registry.callback(
+        "access_tokens_rejected_revoked_total",
+        "Requests rejected because their access token was revoked.",
+        "counter",
+        lambda: [((), revocations.rejected)],
+    )
+    registry.callback(
+        "access_token_revocation_reloads_total",
+        "Reloads of the revocations, on notification or timer.",
+        "counter",
+        lambda: [((), revocations.reloads)],
+    )
+    registry.callback(
+        "access_token_revocation_listener_errors_total",
+        "Failures of the connection listening for revocations.",
+        "counter",
+        lambda: [((), revocations.errors)],
+    )
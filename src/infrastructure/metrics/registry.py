@@ -0,0 +1,222 @@
+import bisect
+import math
+import threading
+from collections.abc import Callable, Iterable, Sequence
+from typing import Literal, TypeVar
+
+MetricType = Literal["counter", "gauge", "histogram"]
+Sample = tuple[tuple[str, ...], float]  # label values -> value
+
+M = TypeVar("M", "Counter", "Histogram")
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _ThreadSlots:
+    """
+    Values of one labelled series, one slot per thread.
+
+    A thread only ever writes its own slot, so recording takes no lock and threads don't contend on
+    shared counters. The lock is taken when a thread records its first value and when metrics are scraped.
+    """
+
+    __slots__ = ("_size", "_local", "_slots", "_lock")
+
+    def __init__(self, size: int) -> None:
+        self._size = size
+        self._local = threading.local()
+        self._slots: list[list[float]] = []
+        self._lock = threading.Lock()
+
+    def slot(self) -> list[float]:
+        try:
+            return self._local.slot  # type: ignore[no-any-return]
+        except AttributeError:
+            slot = [0.0] * self._size
+            with self._lock:
+                self._slots.append(slot)
+            self._local.slot = slot
+            return slot
+
+    def totals(self) -> list[float]:
+        with self._lock:
+            slots = list(self._slots)
+        return [math.fsum(values) for values in zip(*slots, strict=True)] if slots else [0.0] * self._size
+
+
+class _Metric:
+    type: MetricType
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str]) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+
+class _CounterChild:
+    __slots__ = ("_slots",)
+
+    def __init__(self) -> None:
+        self._slots = _ThreadSlots(1)
+
+    def inc(self, amount: float = 1) -> None:
+        self._slots.slot()[0] += amount
+
+
+class Counter(_Metric):
+    type: MetricType = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._children: dict[tuple[str, ...], _CounterChild] = {}
+
+    def labels(self, *values: str) -> _CounterChild:
+        child = self._children.get(values)
+        if child is None:
+            # `setdefault` is atomic, two threads adding the same series end up with the same child
+            child = self._children.setdefault(values, _CounterChild())
+        return child
+
+    def inc(self, amount: float = 1) -> None:
+        self.labels().inc(amount)
+
+    def lines(self) -> Iterable[str]:
+        for values, child in list(self._children.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child._slots.totals()[0])}"
+
+
+class _HistogramChild:
+    __slots__ = ("_bounds", "_slots")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self._bounds = bounds
+        # One slot per bucket, then the `+Inf` bucket, then the sum
+        self._slots = _ThreadSlots(len(bounds) + 2)
+
+    def observe(self, value: float) -> None:
+        slot = self._slots.slot()
+        slot[bisect.bisect_left(self._bounds, value)] += 1
+        slot[-1] += value
+
+
+class Histogram(_Metric):
+    type: MetricType = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._bounds = tuple(sorted(buckets))
+        self._children: dict[tuple[str, ...], _HistogramChild] = {}
+
+    def labels(self, *values: str) -> _HistogramChild:
+        child = self._children.get(values)
+        if child is None:
+            child = self._children.setdefault(values, _HistogramChild(self._bounds))
+        return child
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def lines(self) -> Iterable[str]:
+        names = (*self.labelnames, "le")
+        for values, child in list(self._children.items()):
+            *counts, total = child._slots.totals()
+            cumulative = 0.0
+            for bound, count in zip((*self._bounds, math.inf), counts, strict=True):
+                cumulative += count
+                le = "+Inf" if bound == math.inf else repr(float(bound))
+                yield f"{self.name}_bucket{_format_labels(names, (*values, le))} {_format_value(cumulative)}"
+
+            labels = _format_labels(self.labelnames, values)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {_format_value(cumulative)}"
+
+
+class CallbackMetric(_Metric):
+    """Values read from elsewhere (a pool, an executor, a cache) when metrics are scraped."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        type: MetricType,
+        labelnames: Sequence[str],
+        collect: Callable[[], Iterable[Sample]],
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.type = type
+        self._collect = collect
+
+    def lines(self) -> Iterable[str]:
+        for values, value in self._collect():
+            yield f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(value)}"
+
+
+class Registry:
+    """Metrics of the process, rendered in the Prometheus text exposition format."""
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Counter | Histogram | CallbackMetric] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(
+        self,
+        name: str,
+        documentation: str,
+        type: MetricType,
+        collect: Callable[[], Iterable[Sample]],
+        labelnames: Sequence[str] = (),
+    ) -> CallbackMetric:
+        """Registering a name again replaces the callback, e.g. when an app is created again in tests."""
+
+        metric = CallbackMetric(name, documentation, type, labelnames, collect)
+        with self._lock:
+            self._metrics[name] = metric
+        return metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        lines: list[str] = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {_escape(metric.documentation, quote=False)}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.lines())
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric: M) -> M:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+
+def _escape(value: str, quote: bool = True) -> str:
+    value = value.replace("\\", r"\\").replace("\n", r"\n")
+    return value.replace('"', r"\"") if quote else value
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)) + "}"
+
+
+def _format_value(value: float) -> str:
+    value = float(value)
+    if value == math.inf:
+        return "+Inf"
+    return str(int(value)) if value.is_integer() else repr(value)
@@ -1,32 +1,91 @@
 from functools import wraps
 from typing import Any, Awaitable, Callable
 
-from flask import Response, g, jsonify, request
+from flask import Flask, current_app, g, jsonify, request
+from flask.typing import ResponseReturnValue
 from loguru import logger
 
-from config import settings
+from domain.exceptions.auth import InvalidTokenException, RevocationsUnavailableException
 from domain.services.auth.token import TokenService
-from domain.value_objects.token import AccessTokenVo
+from domain.value_objects.token import AccessTokenPayload, AccessTokenVo
+from infrastructure.auth.revocation_list import AccessTokenRevocationList
+from infrastructure.auth.token_cache import VerifiedTokenCache
 
+EXTENSION_NAME = "token_service"
+CACHE_EXTENSION_NAME = "access_token_cache"
+REVOCATIONS_EXTENSION_NAME = "access_token_revocations"
 
-def require_auth() -> (
-    Callable[[Callable[..., Awaitable[tuple[Response, int]]]], Callable[..., Awaitable[tuple[Response, int]]]]
-):
-    token_service = TokenService(private_key=settings.auth.jwt.private_key, public_key=settings.auth.jwt.public_key)
 
+def setup_auth(
+    app: Flask,
+    token_service: TokenService,
+    cache: VerifiedTokenCache | None = None,
+    revocations: AccessTokenRevocationList | None = None,
+) -> None:
+    """
+    Routes decorated with `require_auth` verify tokens with this service, shared with the use cases.
+    Without a cache every request checks the token's signature, without a revocation list tokens are accepted
+    until they expire.
+    """
+
+    app.extensions[EXTENSION_NAME] = token_service
+    app.extensions[CACHE_EXTENSION_NAME] = cache
+    app.extensions[REVOCATIONS_EXTENSION_NAME] = revocations
+
+
+def verify_access_token(token: str) -> AccessTokenPayload:
+    """
+    :raises TokenExpiredException:
+    :raises InvalidTokenException:
+    :raises RevocationsUnavailableException:
+    """
+
+    revocations: AccessTokenRevocationList | None = current_app.extensions.get(REVOCATIONS_EXTENSION_NAME)
+    if revocations is not None and not revocations.loaded:
+        # Fails closed, a revoked token must not pass because the revocations haven't been read yet
+        raise RevocationsUnavailableException()
+
+    cache: VerifiedTokenCache | None = current_app.extensions.get(CACHE_EXTENSION_NAME)
+    payload = cache.get(token) if cache is not None else None
+    if payload is None:
+        token_service: TokenService = current_app.extensions[EXTENSION_NAME]
+        payload = token_service.verify_access(AccessTokenVo(value=token))
+        if cache is not None:
+            cache.set(token, payload)
+
+    # Checked on cache hits too, the cache only saves the signature check
+    if revocations is not None and revocations.is_revoked(payload):
+        if cache is not None:
+            cache.invalidate(token)
+        raise InvalidTokenException.revoked_access()
+    return payload
+
+
+def require_auth(optional: bool = False) -> (
+    Callable[[Callable[..., Awaitable[ResponseReturnValue]]], Callable[..., Awaitable[ResponseReturnValue]]]
+):
     def decorator(
-        func: Callable[..., Awaitable[tuple[Response, int]]],
-    ) -> Callable[..., Awaitable[tuple[Response, int]]]:
+        func: Callable[..., Awaitable[ResponseReturnValue]],
+    ) -> Callable[..., Awaitable[ResponseReturnValue]]:
 
         @wraps(func)
-        async def decorated(*args: Any, **kwargs: Any) -> tuple[Response, int]:
+        async def decorated(*args: Any, **kwargs: Any) -> ResponseReturnValue:
             g.access_payload = None
             auth_header = request.headers.get("Authorization")
             if not auth_header or not auth_header.startswith("Bearer "):
+                if optional:
+                    return await func(*args, **kwargs)
                 return jsonify({"error": "Unauthorized"}), 401
 
             access_token = auth_header.split(" ")[1]
-            payload = token_service.verify_access(AccessTokenVo(value=access_token))
+            try:
+                payload = verify_access_token(access_token)
+            except InvalidTokenException:
+                if not optional:
+                    raise
+                # Public routes treat an expired or invalid token like a missing one
+                logger.debug("Invalid access token on an optional route, continuing anonymously")
+                return await func(*args, **kwargs)
             logger.bind(user_id=payload.sub)
 
             g.access_payload = payload
@@ -0,0 +1,210 @@
+import zlib
+from collections.abc import Callable, Iterable, Iterator
+from itertools import chain
+from typing import Protocol
+
+import filetype
+from flask import Flask, Response, request
+from loguru import logger
+from werkzeug.wsgi import ClosingIterator
+
+from config.config import CompressionConfig
+from infrastructure.utils.cache import LRUCache
+
+try:
+    import brotli
+except ImportError:  # optional, `br` is offered only when installed
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional, `zstd` is offered only when installed
+    zstandard = None  # type: ignore[assignment]
+
+
+class Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+
+class _BrotliCompressor:
+    def __init__(self, quality: int) -> None:
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return bytes(self._compressor.process(data))
+
+    def flush(self) -> bytes:
+        return bytes(self._compressor.finish())
+
+
+# Declared types that are compressed already. Anything else is sniffed with `filetype` before compressing.
+COMPRESSED_MIMETYPE_PREFIXES = ("image/", "video/", "audio/", "font/woff")
+COMPRESSED_MIMETYPES = frozenset(
+    {
+        "application/zip",
+        "application/gzip",
+        "application/x-gzip",
+        "application/x-bzip2",
+        "application/x-xz",
+        "application/zstd",
+        "application/x-7z-compressed",
+        "application/x-rar-compressed",
+        "application/pdf",
+        "application/x-git-bundle",  # a packfile, its objects are zlib-compressed
+    }
+)
+# Sniffed formats that do gain from compression despite their image/audio/archive type
+UNCOMPRESSED_SNIFFED_MIMETYPES = frozenset(
+    {"image/bmp", "image/x-icon", "image/vnd.adobe.photoshop", "audio/x-wav", "audio/x-aiff", "application/x-tar"}
+)
+COMPRESSIBLE_SVG = "image/svg+xml"
+SNIFF_SIZE = 262  # `filetype` looks at most at this many leading bytes
+
+
+def available_encoders(config: CompressionConfig) -> dict[str, Callable[[], Compressor]]:
+    """Encoders in the server's order of preference, limited to the libraries that are installed."""
+
+    encoders: dict[str, Callable[[], Compressor]] = {}
+    for encoding in config.encodings:
+        if encoding == "br" and brotli is not None:
+            encoders["br"] = lambda: _BrotliCompressor(config.brotli_quality)
+        elif encoding == "zstd" and zstandard is not None:
+            encoders["zstd"] = lambda: zstandard.ZstdCompressor(level=config.zstd_level).compressobj()
+        elif encoding == "gzip":
+            encoders["gzip"] = lambda: zlib.compressobj(config.gzip_level, zlib.DEFLATED, 31)
+    return encoders
+
+
+def is_compressible_mimetype(mimetype: str | None) -> bool:
+    if not mimetype:
+        return True
+    if mimetype == COMPRESSIBLE_SVG:
+        return True
+    return mimetype not in COMPRESSED_MIMETYPES and not mimetype.startswith(COMPRESSED_MIMETYPE_PREFIXES)
+
+
+def is_compressed_content(head: bytes) -> bool:
+    kind = filetype.guess(head) if head else None
+    if kind is None or kind.mime in UNCOMPRESSED_SNIFFED_MIMETYPES:
+        return False
+    mime: str = kind.mime
+    return mime != COMPRESSIBLE_SVG
+
+
+def setup_compression_middleware(app: Flask, config: CompressionConfig) -> LRUCache[tuple[str, str, str], bytes]:
+    """
+    Compresses responses with the best encoding the client accepts.
+
+    Bodies of responses with a strong ETag are addressed by a git SHA and never change, so their compressed
+    form is cached and reused. Streamed bodies are compressed chunk by chunk and are cached too if they
+    turn out small enough.
+    """
+
+    encoders = available_encoders(config)
+    cache: LRUCache[tuple[str, str, str], bytes] = LRUCache(max_size=config.cache_size)
+    logger.bind(encodings=list(encoders)).debug("Response compression enabled")
+
+    def _cache_key(response: Response, encoding: str) -> tuple[str, str, str] | None:
+        etag, weak = response.get_etag()
+        if etag is None or weak:
+            return None
+        return request.endpoint or request.path, etag, encoding
+
+    def _compress_all(data: bytes, encoding: str) -> bytes:
+        compressor = encoders[encoding]()
+        return compressor.compress(data) + compressor.flush()
+
+    def _compress_stream(
+        chunks: Iterable[bytes], encoding: str, cache_key: tuple[str, str, str] | None
+    ) -> Iterator[bytes]:
+        compressor = encoders[encoding]()
+        cached: list[bytes] | None = [] if cache_key else None
+        cached_size = 0
+        for chunk in chunks:
+            compressed = compressor.compress(chunk)
+            if not compressed:
+                continue
+            if cached is not None:
+                cached_size += len(compressed)
+                if cached_size <= config.cache_max_body_size:
+                    cached.append(compressed)
+                else:
+                    cached = None
+            yield compressed
+
+        tail = compressor.flush()
+        if cached is not None and cache_key is not None and cached_size + len(tail) <= config.cache_max_body_size:
+            cache.set(cache_key, b"".join(cached) + tail)
+        yield tail
+
+    def _mark_encoded(response: Response, encoding: str) -> None:
+        response.headers["Content-Encoding"] = encoding
+        # Ranges and strong validators apply to the identity representation only
+        response.headers.pop("Accept-Ranges", None)
+        etag, weak = response.get_etag()
+        if etag is not None and not weak:
+            response.set_etag(etag, weak=True)
+
+    @app.after_request
+    def compress_response(response: Response) -> Response:
+        if (
+            not encoders
+            or request.method == "HEAD"
+            or response.status_code < 200
+            or response.status_code in (204, 206, 304)
+            or "Content-Encoding" in response.headers
+            or not is_compressible_mimetype(response.mimetype)
+        ):
+            return response
+
+        response.vary.add("Accept-Encoding")
+        encoding = request.accept_encodings.best_match(list(encoders))
+        if encoding is None:
+            return response
+
+        length = response.content_length
+        if length is not None and length < config.min_size:
+            return response
+
+        cache_key = _cache_key(response, encoding)
+        cached = cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            close = getattr(response.response, "close", None)
+            if close is not None:
+                close()
+            response.direct_passthrough = False
+            response.set_data(cached)
+            _mark_encoded(response, encoding)
+            return response
+
+        if not response.is_streamed:
+            data = response.get_data()
+            if len(data) < config.min_size or is_compressed_content(data[:SNIFF_SIZE]):
+                return response
+            compressed = _compress_all(data, encoding)
+            if cache_key:
+                cache.set(cache_key, compressed)
+            response.set_data(compressed)
+            _mark_encoded(response, encoding)
+            return response
+
+        # The first chunk is read ahead to sniff the content. The original iterable is still closed at the end.
+        source = response.response
+        chunks = response.iter_encoded()  # views may stream str chunks
+        head = next(chunks, b"")
+        body = chain([head], chunks)
+        close = [source.close] if hasattr(source, "close") else []
+        if is_compressed_content(head[:SNIFF_SIZE]):
+            response.response = ClosingIterator(body, close)
+            return response
+
+        response.response = ClosingIterator(_compress_stream(body, encoding, cache_key), close)
+        response.direct_passthrough = False
+        response.headers.pop("Content-Length", None)
+        _mark_encoded(response, encoding)
+        return response
+
+    return cache
+
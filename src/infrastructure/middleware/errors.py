@@ -7,12 +7,19 @@ from werkzeug.exceptions import HTTPException
 
 from api.exceptions.api import ApiException
 from domain.exceptions import CustomException
-from domain.exceptions.auth import InvalidCredentialsException, InvalidTokenException, TokenExpiredException, WeakPasswordException
+from domain.exceptions.auth import InvalidCredentialsException, InvalidTokenException, RevocationsUnavailableException, TokenExpiredException, WeakPasswordException
 from domain.exceptions.common import MissingRequiredFieldException, PermissionDenied
 from domain.exceptions.git import (
     BranchAlreadyExistsException,
     BranchNotFoundException,
+    BundleExportException,
+    BundleTooLargeException,
+    EmptyRepositoryException,
     FileNotFoundException,
+    ImportNotFoundException,
+    InvalidBundleException,
+    LargeObjectIntegrityException,
+    LargeObjectNotFoundException,
     RepositoryAlreadyExistsException,
     RepositoryAlreadyInitializedException,
     RepositoryNotFoundException,
@@ -37,13 +44,21 @@ ERROR_MAP: dict[type, tuple[str, int]] = {
     FileNotFoundException: ("File not found", 404),
     UserInactiveException: ("User account is inactive", 403),
     InvalidTokenException: ("Invalid token", 401),
+    RevocationsUnavailableException: ("Authentication is temporarily unavailable", 503),
+    EmptyRepositoryException: ("Repository is empty", 409),
+    InvalidBundleException: ("Invalid git bundle", 400),
+    BundleTooLargeException: ("Git bundle is too large", 413),
+    BundleExportException: ("Failed to export repository", 500),
+    ImportNotFoundException: ("Import not found", 404),
+    LargeObjectNotFoundException: ("Large object not found", 404),
+    LargeObjectIntegrityException: ("Large object is corrupted", 422),
 }
 
 def register_error_handlers(app: Flask) -> None:
 
     @app.errorhandler(ApiException)
     def handle_api_error(exc: ApiException) -> tuple[Response, int]:
-        logger.info(f"API error: {exc.message}")
+        logger.info("API error: {}", exc.message)
         return jsonify({"error": exc.message}), exc.status_code
 
     @app.errorhandler(CustomException)
@@ -53,10 +68,10 @@ def register_error_handlers(app: Flask) -> None:
 
         if exc_type in ERROR_MAP:
             _, status_code = ERROR_MAP[exc_type]
-            logger.info(f"Handled error: {error_message}")
+            logger.info("Handled error: {}", error_message)
             return jsonify({"error": error_message}), status_code
 
-        logger.warning(f"Unmapped custom error: {exc_type.__name__} | {error_message}")
+        logger.warning("Unmapped custom error: {} | {}", exc_type.__name__, error_message)
         return jsonify({"error": error_message}), 500
 
     @app.errorhandler(ValidationError)
@@ -71,7 +86,7 @@ def register_error_handlers(app: Flask) -> None:
 
         formatted_msg = "\n".join(error_details)
 
-        logger.info(f"Validation failed: {formatted_msg}")
+        logger.info("Validation failed: {}", formatted_msg)
         return jsonify({"error": "Invalid input data", "details": formatted_msg}), 400
 
     @app.errorhandler(HTTPException)
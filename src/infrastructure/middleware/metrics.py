@@ -0,0 +1,41 @@
+import time
+
+from flask import Flask, Response, g, request
+
+from infrastructure.metrics.registry import Histogram, Registry
+
+KNOWN_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def setup_metrics(app: Flask, registry: Registry, histogram: Histogram, path: str) -> None:
+    """
+    Records the duration of every request in `histogram`, labelled by method, route and status, and
+    serves the registry at `path`.
+
+    Requests are labelled with their URL rule, e.g. `/<username>/<repository_name>/branches`, so the
+    number of series doesn't grow with users and repositories. Streamed bodies are timed until the
+    response is returned, not until the body is sent.
+    """
+
+    @app.before_request
+    def start_timer() -> None:
+        g.request_started_at = time.perf_counter()
+
+    @app.after_request
+    def record_duration(response: Response) -> Response:
+        started_at = g.pop("request_started_at", None)
+        if started_at is None:
+            return response
+
+        method = request.method if request.method in KNOWN_METHODS else "OTHER"
+        route = request.url_rule.rule if request.url_rule is not None else UNMATCHED_ROUTE
+        histogram.labels(method, route, str(response.status_code)).observe(
+            time.perf_counter() - started_at
+        )
+        return response
+
+    def metrics() -> Response:
+        return Response(registry.render(), content_type=Registry.CONTENT_TYPE)
+
+    app.add_url_rule(path, "metrics", metrics, methods=["GET"])
@@ -0,0 +1,99 @@
+import random
+import threading
+from http import HTTPStatus
+
+from flask import Flask, Response, g, jsonify, request
+from loguru import logger
+from pydantic import ValidationError
+
+from config.config import ProfilingConfig
+from domain.exceptions import CustomException
+from infrastructure.middleware.auth import verify_access_token
+from infrastructure.profiling.sampler import ProfileSession, SamplingProfiler
+from infrastructure.profiling.store import ProfileStore
+
+PROFILING_ENDPOINTS = frozenset({"profiling_list", "profiling_get"})
+
+
+def setup_profiling(app: Flask, profiler: SamplingProfiler, store: ProfileStore, config: ProfilingConfig) -> None:
+    """
+    Profiles requests of administrators that send the profiling header or query parameter, and a share
+    of all requests when automatic capture is on, keeping the slowest ones of each route.
+
+    Administrators are the users listed in `config.admin_user_ids`. Profiles are served as folded stacks at
+    `<config.path>/<request id>` and listed at `config.path`, to administrators only. Tokens are verified like in
+    `require_auth`, so the app needs `setup_auth` too, and a revoked token gets no profiling. Must be set up after
+    the logging middleware, which assigns the request ID.
+    """
+
+    admin_ids = frozenset(config.admin_user_ids)
+
+    def is_admin() -> bool:
+        auth_header = request.headers.get("Authorization", "")
+        if not admin_ids or not auth_header.startswith("Bearer "):
+            return False
+        try:
+            payload = verify_access_token(auth_header.split(" ")[1])
+        except (CustomException, ValidationError):
+            return False
+        return payload.sub in admin_ids
+
+    def is_profiling_requested() -> bool:
+        return bool(request.headers.get(config.header) or request.args.get(config.query_param))
+
+    @app.before_request
+    def start_profile() -> None:
+        if request.endpoint in PROFILING_ENDPOINTS:
+            return
+
+        requested = is_profiling_requested() and is_admin()
+        if not requested and not (config.auto_capture_ratio and random.random() < config.auto_capture_ratio):
+            return
+
+        session = ProfileSession(
+            request_id=getattr(g, "request_id", ""),
+            method=request.method,
+            route=request.url_rule.rule if request.url_rule is not None else request.path,
+            thread_id=threading.get_ident(),
+        )
+        g.profile_session = session
+        g.profile_requested = requested
+        g.profile_token = profiler.start(session)
+
+    @app.after_request
+    def link_profile(response: Response) -> Response:
+        if g.get("profile_requested"):
+            response.headers["X-Profile-ID"] = g.profile_session.request_id
+        return response
+
+    @app.teardown_request
+    def stop_profile(exception: BaseException | None) -> None:
+        session: ProfileSession | None = g.pop("profile_session", None)
+        if session is None:
+            return
+        profiler.stop(session, g.pop("profile_token"))
+
+        if g.pop("profile_requested", False):
+            store.add_requested(session)
+            logger.bind(duration=session.duration, samples=session.samples.total()).info("Request profiled")
+        elif session.duration >= config.auto_capture_min_duration:
+            store.offer(session)
+
+    def forbidden() -> tuple[Response, int]:
+        return jsonify({"error": "Forbidden"}), HTTPStatus.FORBIDDEN
+
+    def list_profiles() -> Response | tuple[Response, int]:
+        if not is_admin():
+            return forbidden()
+        return jsonify([profile.model_dump(mode="json", exclude={"folded"}) for profile in store.list()])
+
+    def get_profile(request_id: str) -> Response | tuple[Response, int]:
+        if not is_admin():
+            return forbidden()
+        profile = store.get(request_id)
+        if profile is None:
+            return jsonify({"error": "Profile not found"}), HTTPStatus.NOT_FOUND
+        return Response(profile.folded, mimetype="text/plain")
+
+    app.add_url_rule(config.path, "profiling_list", list_profiles, methods=["GET"])
+    app.add_url_rule(f"{config.path}/<request_id>", "profiling_get", get_profile, methods=["GET"])
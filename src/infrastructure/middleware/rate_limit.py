@@ -0,0 +1,86 @@
+import math
+from functools import wraps
+from http import HTTPStatus
+from typing import Any, Awaitable, Callable
+
+from flask import Flask, Response, current_app, g, jsonify, make_response, request
+from flask.typing import ResponseReturnValue
+from loguru import logger
+
+from infrastructure.rate_limit.backends import AbstractRateLimitBackend, RateLimitDecision
+
+EXTENSION_NAME = "rate_limiter"
+
+
+class RateLimiter:
+    """Token bucket per client. Routes spend `cost` tokens per request, the bucket refills at `refill_rate`/s."""
+
+    def __init__(self, backend: AbstractRateLimitBackend, capacity: float, refill_rate: float) -> None:
+        self._backend = backend
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+
+    async def acquire(self, key: str, cost: float) -> RateLimitDecision:
+        # A route costing more than the burst size would never pass
+        return await self._backend.consume(
+            key=key, cost=min(cost, self.capacity), capacity=self.capacity, refill_rate=self.refill_rate
+        )
+
+    def headers(self, decision: RateLimitDecision) -> dict[str, str]:
+        """`RateLimit-*` fields of the IETF draft, `Reset` is the number of seconds until the bucket is full."""
+
+        reset = (self.capacity - decision.remaining) / self.refill_rate
+        headers = {
+            "RateLimit-Limit": str(int(self.capacity)),
+            "RateLimit-Remaining": str(int(decision.remaining)),
+            "RateLimit-Reset": str(math.ceil(reset)),
+            "RateLimit-Policy": f"{int(self.capacity)};w={math.ceil(self.capacity / self.refill_rate)}",
+        }
+        if not decision.allowed:
+            headers["Retry-After"] = str(math.ceil(decision.retry_after))
+        return headers
+
+
+def setup_rate_limiting(app: Flask, limiter: RateLimiter | None) -> None:
+    """Routes decorated with `rate_limit` aren't limited if no limiter is set up."""
+
+    app.extensions[EXTENSION_NAME] = limiter
+
+
+def get_client_key() -> str:
+    """Authenticated clients are limited per user, anonymous ones per IP address."""
+
+    payload = getattr(g, "access_payload", None)
+    if payload is not None:
+        return f"user:{payload.sub}"
+    return f"ip:{request.remote_addr}"
+
+
+def rate_limit(cost: float = 1) -> (
+    Callable[[Callable[..., Awaitable[ResponseReturnValue]]], Callable[..., Awaitable[Response]]]
+):
+    """Must be applied below `require_auth`, so that authenticated clients are limited by their user id."""
+
+    def decorator(func: Callable[..., Awaitable[ResponseReturnValue]]) -> Callable[..., Awaitable[Response]]:
+
+        @wraps(func)
+        async def decorated(*args: Any, **kwargs: Any) -> Response:
+            limiter: RateLimiter | None = current_app.extensions.get(EXTENSION_NAME)
+            if limiter is None:
+                return make_response(await func(*args, **kwargs))
+
+            key = get_client_key()
+            decision = await limiter.acquire(key=key, cost=cost)
+            if not decision.allowed:
+                logger.bind(client=key, cost=cost, retry_after=decision.retry_after).info("Rate limit exceeded")
+                response = jsonify({"error": "Too many requests"})
+                response.status_code = HTTPStatus.TOO_MANY_REQUESTS
+            else:
+                response = make_response(await func(*args, **kwargs))
+
+            response.headers.update(limiter.headers(decision))
+            return response
+
+        return decorated
+
+    return decorator
@@ -5,6 +5,9 @@ from typing import TYPE_CHECKING
 from flask import Flask, Response, g, has_app_context, request
 from loguru import logger
 
+from config.logging import sampler
+from infrastructure.tracing.tracer import get_current_span
+
 if TYPE_CHECKING:
     from loguru import Record
 
@@ -16,6 +19,10 @@ def setup_logging_middleware(app: Flask) -> None:
             if request_id:
                 record["extra"]["request_id"] = request_id
 
+        span = get_current_span()
+        if span is not None:
+            record["extra"]["trace_id"] = span.context.trace_id
+
     logger.configure(patcher=patch_record)
 
     logging.getLogger("uvicorn.access").level = logging.WARNING
@@ -27,7 +34,9 @@ def setup_logging_middleware(app: Flask) -> None:
 
     @app.after_request
     def log_request(response: Response) -> Response:
-        logger.info(f'{request.remote_addr} - "{request.method} {request.path}" {response.status_code}')
+        # Loguru formats the message before the sampling filter runs, so the decision is taken up front
+        if sampler.keeps("INFO", getattr(g, "request_id", None)):
+            logger.info('{} - "{} {}" {}', request.remote_addr, request.method, request.path, response.status_code)
 
         if hasattr(g, "request_id"):
             response.headers["X-Request-ID"] = g.request_id
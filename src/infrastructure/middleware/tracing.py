@@ -0,0 +1,63 @@
+import uuid
+
+from flask import Flask, Response, g, request
+
+from infrastructure.tracing.tracer import SpanContext, Tracer
+
+
+def setup_tracing(app: Flask, tracer: Tracer) -> None:
+    """
+    Runs every request in a server span.
+
+    A `traceparent` header continues the caller's trace. Otherwise the trace ID is taken from the request
+    ID when it is a UUID, so a trace can be looked up by the `X-Request-ID` returned with the response.
+    Must be set up after the logging middleware, which assigns the request ID.
+    """
+
+    @app.before_request
+    def start_request_span() -> None:
+        if not tracer.enabled:
+            return
+
+        request_id = getattr(g, "request_id", None)
+        span = tracer.start_span(
+            f"{request.method} {request.url_rule.rule if request.url_rule is not None else request.path}",
+            kind="server",
+            attributes={"http.method": request.method, "http.target": request.path},
+            parent=SpanContext.from_traceparent(request.headers.get("traceparent")),
+            trace_id=_trace_id_from(request_id),
+        )
+        if request_id:
+            span.set_attribute("request.id", request_id)
+        g.trace_span = span
+        g.trace_token = tracer.activate(span)
+
+    @app.after_request
+    def set_response_status(response: Response) -> Response:
+        span = g.get("trace_span")
+        if span is not None:
+            span.set_attribute("http.status_code", response.status_code)
+            if response.status_code >= 500:
+                span.status = "error"
+        return response
+
+    @app.teardown_request
+    def end_request_span(exception: BaseException | None) -> None:
+        span = g.pop("trace_span", None)
+        if span is None:
+            return
+        if exception is not None:
+            span.record_exception(exception)
+        # WSGI threads are reused and don't copy the context, the span must not leak into the next request
+        tracer.deactivate(g.pop("trace_token"))
+        tracer.end_span(span)
+
+
+def _trace_id_from(request_id: str | None) -> str | None:
+    if not request_id:
+        return None
+    try:
+        trace_id = uuid.UUID(request_id).hex
+    except ValueError:
+        return None
+    return trace_id if int(trace_id, 16) else None
@@ -0,0 +1,196 @@
+import asyncio
+import sys
+import sysconfig
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Coroutine
+from concurrent.futures import Future
+from contextvars import ContextVar
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Any, TypeVar
+
+from infrastructure.tracing.instrumentation import TracedThreadPoolExecutor
+
+T = TypeVar("T")
+
+AWAITING_FRAME = "[awaiting]"
+
+_current_session: ContextVar["ProfileSession | None"] = ContextVar("profile_session", default=None)
+
+
+class ProfileSession:
+    """
+    Samples collected for one request, as folded stacks (`frame;frame;frame count`), the input format of
+    flamegraph.pl, speedscope and most flame graph viewers.
+
+    A request runs on several threads: the WSGI thread, the event loop while its view coroutine runs and
+    executor threads while they run its git work. The session tracks each of them, so that samples of the
+    shared loop and executors are attributed to the request they were taken for.
+    """
+
+    def __init__(self, request_id: str, method: str, route: str, thread_id: int) -> None:
+        self.request_id = request_id
+        self.method = method
+        self.route = route
+        self.started_at = time.perf_counter()
+        self.duration = 0.0
+
+        self.wsgi_thread_id = thread_id
+        self.executor_thread_ids: set[int] = set()
+        self.task: asyncio.Task[Any] | None = None
+        self.loop: asyncio.AbstractEventLoop | None = None
+
+        self.samples: Counter[str] = Counter()
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+    @staticmethod
+    def current() -> "ProfileSession | None":
+        return _current_session.get()
+
+
+class SamplingProfiler:
+    """
+    Samples the stacks of profiled requests from a background thread every `interval` seconds.
+
+    The thread only runs while a session is active. Requests that aren't profiled pay for one context
+    variable lookup in the hooks that track sessions.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._sessions: set[ProfileSession] = set()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._labels: dict[CodeType, str] = {}
+
+    def start(self, session: ProfileSession) -> object:
+        """Makes `session` current and starts sampling it. Returns a token for `stop`."""
+
+        with self._lock:
+            self._sessions.add(session)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+                self._thread.start()
+        return _current_session.set(session)
+
+    def stop(self, session: ProfileSession, token: Any) -> None:
+        _current_session.reset(token)
+        session.duration = time.perf_counter() - session.started_at
+        with self._lock:
+            self._sessions.discard(session)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                sessions = list(self._sessions)
+                if not sessions:
+                    self._thread = None
+                    return
+
+            frames = sys._current_frames()
+            for session in sessions:
+                for stack in self._sample(session, frames):
+                    session.samples[stack] += 1
+            # Frame objects of other threads must not outlive the sample. Kept over the sleep they crashed
+            # CPython 3.12 in the garbage collector once their threads moved on.
+            del frames
+
+    def _sample(self, session: ProfileSession, frames: dict[int, FrameType]) -> list[str]:
+        stacks = [
+            self._fold("executor", frames[thread_id])
+            for thread_id in list(session.executor_thread_ids)
+            if thread_id in frames
+        ]
+
+        task, loop = session.task, session.loop
+        if task is None or loop is None or task.done():
+            # The synchronous part of the request: routing, hooks, compression
+            frame = frames.get(session.wsgi_thread_id)
+            return [self._fold("wsgi", frame)] if frame is not None else stacks
+
+        coroutine = task.get_coro()
+        loop_thread_id = getattr(loop, "_thread_id", None)
+        if asyncio.current_task(loop) is task and loop_thread_id in frames:
+            # Running on the loop, the frames above the task's coroutine belong to the loop itself
+            stacks.append(self._fold("loop", frames[loop_thread_id], root=getattr(coroutine, "cr_frame", None)))
+        elif not stacks:
+            # Suspended and not waiting for an executor thread, i.e. waiting for I/O such as the database
+            stacks.append(self._fold_awaiting(coroutine))
+        return stacks
+
+    def _fold(self, thread: str, frame: FrameType | None, root: FrameType | None = None) -> str:
+        labels = []
+        while frame is not None:
+            labels.append(self._label(frame.f_code))
+            if frame is root:
+                break
+            frame = frame.f_back
+        labels.append(thread)
+        return ";".join(reversed(labels))
+
+    def _fold_awaiting(self, coroutine: Any) -> str:
+        labels = ["loop"]
+        while coroutine is not None and getattr(coroutine, "cr_frame", None) is not None:
+            labels.append(self._label(coroutine.cr_code))
+            coroutine = coroutine.cr_await
+        labels.append(AWAITING_FRAME)
+        return ";".join(labels)
+
+    def _label(self, code: CodeType) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{code.co_qualname} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+            self._labels[code] = label
+        return label
+
+
+_PATH_PREFIXES = sorted(
+    {str(Path(p)) + "/" for p in (sysconfig.get_paths()["purelib"], sysconfig.get_paths()["stdlib"], *sys.path) if p},
+    key=len,
+    reverse=True,
+)
+
+
+def _short_path(filename: str) -> str:
+    for prefix in _PATH_PREFIXES:
+        if filename.startswith(prefix):
+            return filename[len(prefix) :]
+    return filename
+
+
+async def track_task(coroutine: Coroutine[Any, Any, T]) -> T:
+    """Runs a view coroutine on the loop, letting the profiler of its request find the task it runs in."""
+
+    session = _current_session.get()
+    if session is None:
+        return await coroutine
+
+    session.task, session.loop = asyncio.current_task(), asyncio.get_running_loop()
+    try:
+        return await coroutine
+    finally:
+        session.task = None
+
+
+class ProfiledThreadPoolExecutor(TracedThreadPoolExecutor):
+    """Marks the threads running work of a profiled request, so that the profiler samples them for it."""
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future[Any]:
+        session = _current_session.get()
+        if session is None:
+            return super().submit(fn, *args, **kwargs)
+
+        def run() -> Any:
+            thread_id = threading.get_ident()
+            session.executor_thread_ids.add(thread_id)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                session.executor_thread_ids.discard(thread_id)
+
+        return super().submit(run)
@@ -0,0 +1,93 @@
+import threading
+import time
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from config import settings
+from infrastructure.profiling.sampler import ProfileSession
+from infrastructure.utils.cache import LRUCache
+
+
+class StoredProfile(BaseModel):
+    request_id: str
+    method: str
+    route: str
+    duration: float
+    captured_at: datetime
+    requested: bool  # asked for with the profiling header, rather than captured as one of the slowest
+    folded: str
+
+
+class ProfileStore:
+    """
+    Profiles by request ID: the ones requested explicitly, up to `max_requested`, and the `slowest_per_route`
+    slowest of the automatically captured requests of every route over the last `window` seconds.
+    """
+
+    def __init__(self, max_requested: int, slowest_per_route: int, window: float) -> None:
+        self._requested: LRUCache[str, StoredProfile] = LRUCache(max_size=max_requested)
+        self._slowest: dict[str, list[tuple[float, StoredProfile]]] = {}  # route -> (monotonic time, profile)
+        self._slowest_per_route = slowest_per_route
+        self._window = window
+        self._lock = threading.Lock()
+
+    def add_requested(self, session: ProfileSession) -> StoredProfile:
+        profile = self._to_profile(session, requested=True)
+        self._requested.set(profile.request_id, profile)
+        return profile
+
+    def offer(self, session: ProfileSession) -> bool:
+        """Keeps the profile if it's among the slowest of its route in the window. Returns whether it was kept."""
+
+        now = time.monotonic()
+        route = f"{session.method} {session.route}"
+        with self._lock:
+            kept = [entry for entry in self._slowest.get(route, []) if now - entry[0] < self._window]
+            if len(kept) >= self._slowest_per_route:
+                fastest = min(range(len(kept)), key=lambda i: kept[i][1].duration)
+                if kept[fastest][1].duration >= session.duration:
+                    self._slowest[route] = kept
+                    return False
+                kept.pop(fastest)
+
+            kept.append((now, self._to_profile(session, requested=False)))
+            self._slowest[route] = kept
+            return True
+
+    def get(self, request_id: str) -> StoredProfile | None:
+        profile = self._requested.get(request_id)
+        if profile is not None:
+            return profile
+        with self._lock:
+            for entries in self._slowest.values():
+                for _, stored in entries:
+                    if stored.request_id == request_id:
+                        return stored
+        return None
+
+    def list(self) -> list[StoredProfile]:
+        """Every profile kept, slowest first. Captured ones older than the window are dropped."""
+
+        now = time.monotonic()
+        with self._lock:
+            for route, entries in list(self._slowest.items()):
+                entries[:] = [entry for entry in entries if now - entry[0] < self._window]
+                if not entries:
+                    del self._slowest[route]
+            captured = [profile for entries in self._slowest.values() for _, profile in entries]
+
+        requested = self._requested.values()
+        return sorted([*requested, *captured], key=lambda profile: profile.duration, reverse=True)
+
+    @staticmethod
+    def _to_profile(session: ProfileSession, requested: bool) -> StoredProfile:
+        return StoredProfile(
+            request_id=session.request_id,
+            method=session.method,
+            route=session.route,
+            duration=session.duration,
+            captured_at=datetime.now(tz=settings.time.default_tz),
+            requested=requested,
+            folded=session.folded(),
+        )
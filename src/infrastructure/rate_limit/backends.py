@@ -0,0 +1,120 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Protocol
+
+from loguru import logger
+from pydantic import BaseModel
+
+from config.config import RateLimitConfig
+
+
+class RateLimitDecision(BaseModel):
+    allowed: bool
+    remaining: float  # tokens left in the bucket
+    retry_after: float  # seconds until the request would be allowed, 0 if it was
+
+
+class AbstractRateLimitBackend(ABC):
+    """Token buckets keyed by client. `consume` must take `cost` tokens atomically."""
+
+    @abstractmethod
+    async def consume(self, key: str, cost: float, capacity: float, refill_rate: float) -> RateLimitDecision:
+        pass
+
+
+class InMemoryRateLimitBackend(AbstractRateLimitBackend):
+    """
+    Buckets of one worker process. With several workers each client gets the limit once per worker.
+
+    The least recently used buckets are dropped over `max_keys`, a dropped bucket starts full again.
+    """
+
+    def __init__(self, max_keys: int) -> None:
+        self._max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()  # key -> (tokens, updated_at)
+        self._lock = threading.Lock()
+
+    async def consume(self, key: str, cost: float, capacity: float, refill_rate: float) -> RateLimitDecision:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * refill_rate)
+
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self._max_keys:
+                self._buckets.popitem(last=False)
+
+        retry_after = 0.0 if allowed else (cost - tokens) / refill_rate
+        return RateLimitDecision(allowed=allowed, remaining=tokens, retry_after=retry_after)
+
+
+class RedisClient(Protocol):
+    def eval(self, script: str, numkeys: int, *keys_and_args: str) -> Awaitable[Any]: ...
+
+
+class RedisRateLimitBackend(AbstractRateLimitBackend):
+    """
+    Buckets shared by all workers, kept in Redis as `{tokens, ts}` hashes.
+
+    The refill and the take run in one Lua script, so concurrent requests of a client can't both spend the same
+    tokens. Redis' clock is used, so workers with skewed clocks agree. If Redis is unreachable requests are let
+    through, the limiter must not take the API down with it.
+    """
+
+    SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local refill_rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * refill_rate)
+
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / refill_rate * 1000) + 1000)
+return {allowed, tostring(tokens)}
+"""
+
+    def __init__(self, client: RedisClient, key_prefix: str) -> None:
+        self._client = client
+        self._key_prefix = key_prefix
+
+    async def consume(self, key: str, cost: float, capacity: float, refill_rate: float) -> RateLimitDecision:
+        try:
+            allowed, tokens = await self._client.eval(
+                self.SCRIPT, 1, self._key_prefix + key, str(capacity), str(refill_rate), str(cost)
+            )
+        except Exception:
+            logger.bind(key=key).exception("Rate limit backend failed, letting the request through")
+            return RateLimitDecision(allowed=True, remaining=capacity, retry_after=0.0)
+
+        remaining = float(tokens)
+        if int(allowed):
+            return RateLimitDecision(allowed=True, remaining=remaining, retry_after=0.0)
+        return RateLimitDecision(allowed=False, remaining=remaining, retry_after=(cost - remaining) / refill_rate)
+
+
+def create_rate_limit_backend(config: RateLimitConfig) -> AbstractRateLimitBackend:
+    if config.backend == "redis":
+        # Imported only when configured (the `rate-limit` extra), Redis isn't needed for a single worker
+        from redis.asyncio import Redis
+
+        return RedisRateLimitBackend(client=Redis.from_url(config.redis_url), key_prefix=config.key_prefix)
+
+    return InMemoryRateLimitBackend(max_keys=config.max_keys)
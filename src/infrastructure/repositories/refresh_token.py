@@ -1,9 +1,14 @@
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select, update
+from sqlalchemy import Select, String, delete, false, func, insert, literal, or_, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from config import settings
 from domain.entities.refresh import RefreshToken
+from domain.entities.user import User
 from domain.exceptions.refresh_token import RefreshTokenNotFoundException
 from domain.filters.refresh_token import RefreshTokenFilter
 from domain.ports.repositories.refresh_token import (
@@ -14,7 +19,9 @@ from domain.schemas.refresh_token import (
     RefreshTokenCreateSchema,
     RefreshTokenUpdateSchema,
 )
+from domain.value_objects.common import KeysetPagination
 from infrastructure.database.models.refresh_token import RefreshTokenModel
+from infrastructure.database.models.user import UserModel
 
 
 class RefreshTokenWriteRepository(AbstractRefreshTokenWriteRepository):
@@ -42,6 +49,7 @@ class RefreshTokenWriteRepository(AbstractRefreshTokenWriteRepository):
 
         if schema.is_revoked is not None:
             model.is_revoked = schema.is_revoked
+            model.revoked_at = datetime.now(tz=settings.time.default_tz) if schema.is_revoked else None
 
         await self._session.flush()
 
@@ -63,6 +71,7 @@ class RefreshTokenWriteRepository(AbstractRefreshTokenWriteRepository):
             return False
 
         model.is_revoked = True
+        model.revoked_at = datetime.now(tz=settings.time.default_tz)
         await self._session.flush()
         return True
 
@@ -73,11 +82,71 @@ class RefreshTokenWriteRepository(AbstractRefreshTokenWriteRepository):
                 RefreshTokenModel.user_id == user_id,
                 RefreshTokenModel.is_revoked == False,  # noqa: E712
             )
-            .values(is_revoked=True)
+            .values(is_revoked=True, revoked_at=func.now())
         )
         await self._session.execute(stmt)
         await self._session.flush()
 
+    async def rotate(self, identity: UUID, token_hash: str, schema: RefreshTokenCreateSchema) -> User | None:
+        # One statement: the revocation, the user's checks and the insert of the new token. The UPDATE re-checks
+        # `is_revoked` after waiting for the row lock, so a concurrent rotation of the same token finds no row.
+        revoked = (
+            update(RefreshTokenModel)
+            .where(
+                RefreshTokenModel.id == identity,
+                RefreshTokenModel.token_hash == token_hash,
+                RefreshTokenModel.user_id == schema.user_id,
+                RefreshTokenModel.is_revoked == False,  # noqa: E712
+                UserModel.id == RefreshTokenModel.user_id,
+                UserModel.is_active == True,  # noqa: E712
+            )
+            .values(is_revoked=True, revoked_at=func.now())
+            .returning(RefreshTokenModel.user_id)
+            .cte("revoked")
+        )
+        created = (
+            insert(RefreshTokenModel)
+            .from_select(
+                ["id", "user_id", "token_hash", "expires_at", "created_at", "is_revoked", "user_agent", "ip_address"],
+                select(
+                    literal(schema.id),
+                    revoked.c.user_id,
+                    literal(schema.token_hash),
+                    literal(schema.expires_at),
+                    func.now(),
+                    false(),
+                    literal(schema.user_agent, String),
+                    literal(schema.ip_address, String),
+                ),
+            )
+            .returning(RefreshTokenModel.id)
+            .cte("created")
+        )
+        stmt = select(UserModel).join(revoked, UserModel.id == revoked.c.user_id).add_cte(created)
+
+        user = (await self._session.execute(stmt)).scalar_one_or_none()
+        return user.to_entity() if user is not None else None
+
+    async def delete_stale(self, expired_before: datetime, revoked_before: datetime, limit: int) -> int:
+        # Rows locked by a concurrent refresh are left for the next batch instead of waited for
+        stale_ids = (
+            select(RefreshTokenModel.id)
+            .where(
+                or_(
+                    RefreshTokenModel.expires_at < expired_before,
+                    RefreshTokenModel.revoked_at < revoked_before,
+                )
+            )
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self._session.execute(
+            delete(RefreshTokenModel)
+            .where(RefreshTokenModel.id.in_(stale_ids))
+            .execution_options(synchronize_session=False)
+        )
+        return int(result.rowcount)  # type: ignore[attr-defined]
+
 
 class RefreshTokenReadRepository(AbstractRefreshTokenReadRepository):
     def __init__(self, session: AsyncSession) -> None:
@@ -100,8 +169,46 @@ class RefreshTokenReadRepository(AbstractRefreshTokenReadRepository):
 
         return model.to_entity()
 
-    async def get_all(self, filter_: RefreshTokenFilter) -> list[RefreshToken]:
-        stmt = select(RefreshTokenModel)
+    async def get_all(
+        self, filter_: RefreshTokenFilter, pagination: KeysetPagination | None = None
+    ) -> list[RefreshToken]:
+        stmt = self._select(filter_)
+
+        if pagination:
+            if pagination.after is not None:
+                stmt = stmt.where(
+                    tuple_(RefreshTokenModel.created_at, RefreshTokenModel.id)
+                    < tuple_(pagination.after.created_at, pagination.after.id)
+                )
+            stmt = stmt.limit(pagination.limit)
+
         result = await self._session.execute(stmt)
 
         return [m.to_entity() for m in result.scalars().all()]
+
+    async def stream_all(self, filter_: RefreshTokenFilter, batch_size: int = 1000) -> AsyncIterator[RefreshToken]:
+        stmt = self._select(filter_).execution_options(yield_per=batch_size)
+        result = await self._session.stream_scalars(stmt)
+
+        async for model in result:
+            yield model.to_entity()
+
+    @staticmethod
+    def _select(filter_: RefreshTokenFilter) -> Select[Any]:
+        stmt = select(RefreshTokenModel)
+
+        if filter_.user_id is not None:
+            stmt = stmt.where(RefreshTokenModel.user_id == filter_.user_id)
+        if filter_.is_revoked is not None:
+            stmt = stmt.where(RefreshTokenModel.is_revoked == filter_.is_revoked)
+        if filter_.expires_after is not None:
+            stmt = stmt.where(RefreshTokenModel.expires_at > filter_.expires_after)
+        if filter_.expires_before is not None:
+            stmt = stmt.where(RefreshTokenModel.expires_at <= filter_.expires_before)
+        if filter_.created_after is not None:
+            stmt = stmt.where(RefreshTokenModel.created_at > filter_.created_after)
+        if filter_.created_before is not None:
+            stmt = stmt.where(RefreshTokenModel.created_at <= filter_.created_before)
+
+        # `id` breaks ties between tokens created at the same time, the keyset must be unique
+        return stmt.order_by(RefreshTokenModel.created_at.desc(), RefreshTokenModel.id.desc())
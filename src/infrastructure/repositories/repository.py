@@ -25,6 +25,8 @@ class RepositoryWriter(AbstractRepositoryWriter):
             name=schema.name,
             owner_id=schema.owner_id,
             description=schema.description,
+            forked_from_id=schema.forked_from_id,
+            large_file_threshold=schema.large_file_threshold,
         )
         self._session.add(repo_model)
         await self._session.flush()
@@ -0,0 +1,82 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from domain.entities.token_revocation import RevokedAccessToken, UserTokenRevocation
+from domain.ports.repositories.token_revocation import (
+    AbstractTokenRevocationReadRepository,
+    AbstractTokenRevocationWriteRepository,
+)
+from infrastructure.database.models.token_revocation import RevokedAccessTokenModel, UserTokenRevocationModel
+
+
+class TokenRevocationWriteRepository(AbstractTokenRevocationWriteRepository):
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def revoke_token(self, jti: UUID, user_id: UUID, expires_at: datetime) -> None:
+        stmt = (
+            insert(RevokedAccessTokenModel)
+            .values(jti=jti, user_id=user_id, expires_at=expires_at)
+            .on_conflict_do_nothing(index_elements=[RevokedAccessTokenModel.jti])
+        )
+        await self._session.execute(stmt)
+
+    async def revoke_user(self, user_id: UUID) -> datetime:
+        insert_stmt = insert(UserTokenRevocationModel).values(user_id=user_id, revoked_before=func.now())
+        stmt = insert_stmt.on_conflict_do_update(
+            index_elements=[UserTokenRevocationModel.user_id],
+            set_={"revoked_before": insert_stmt.excluded.revoked_before},
+        ).returning(UserTokenRevocationModel.revoked_before)
+        revoked_before: datetime = (await self._session.execute(stmt)).scalar_one()
+        return revoked_before
+
+    async def delete_stale(self, expired_before: datetime, revoked_before: datetime, limit: int) -> int:
+        # Rows locked by a concurrent revocation are left for the next batch instead of waited for
+        expired_jtis = (
+            select(RevokedAccessTokenModel.jti)
+            .where(RevokedAccessTokenModel.expires_at < expired_before)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        tokens = await self._session.execute(
+            delete(RevokedAccessTokenModel)
+            .where(RevokedAccessTokenModel.jti.in_(expired_jtis))
+            .execution_options(synchronize_session=False)
+        )
+        stale_user_ids = (
+            select(UserTokenRevocationModel.user_id)
+            .where(UserTokenRevocationModel.revoked_before < revoked_before)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        users = await self._session.execute(
+            delete(UserTokenRevocationModel)
+            .where(UserTokenRevocationModel.user_id.in_(stale_user_ids))
+            .execution_options(synchronize_session=False)
+        )
+        return int(tokens.rowcount) + int(users.rowcount)  # type: ignore[attr-defined]
+
+    async def notify(self) -> None:
+        await self._session.execute(select(func.pg_notify(settings.auth.access_token_revocation.channel, "")))
+
+
+class TokenRevocationReadRepository(AbstractTokenRevocationReadRepository):
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def get_revoked_tokens(self, expires_after: datetime) -> list[RevokedAccessToken]:
+        stmt = select(RevokedAccessTokenModel).where(RevokedAccessTokenModel.expires_at > expires_after)
+        result = await self._session.execute(stmt)
+
+        return [m.to_entity() for m in result.scalars().all()]
+
+    async def get_user_revocations(self, revoked_after: datetime) -> list[UserTokenRevocation]:
+        stmt = select(UserTokenRevocationModel).where(UserTokenRevocationModel.revoked_before > revoked_after)
+        result = await self._session.execute(stmt)
+
+        return [m.to_entity() for m in result.scalars().all()]
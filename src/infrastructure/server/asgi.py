@@ -0,0 +1,233 @@
+import asyncio
+import sys
+from collections.abc import Awaitable, Callable, Coroutine, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractAsyncContextManager
+from tempfile import SpooledTemporaryFile
+from typing import IO, Any, TypeVar
+
+from flask import Flask
+from loguru import logger
+
+from infrastructure.profiling.sampler import ProfiledThreadPoolExecutor, track_task
+
+T = TypeVar("T")
+
+Scope = dict[str, Any]
+Message = dict[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+
+
+class LoopBoundFlask(Flask):
+    """
+    Flask app that runs `async def` views on one long-lived event loop.
+
+    Plain Flask wraps every async view with asgiref's `async_to_sync`, which starts a new event loop per
+    request. Objects bound to a loop, such as asyncpg connections in the SQLAlchemy pool, then can't be
+    reused between requests. Once `loop` is set, views are scheduled on it from the WSGI worker thread.
+    Without a loop (e.g. under the test client or a plain WSGI server) the default behaviour is kept.
+    """
+
+    loop: asyncio.AbstractEventLoop | None = None
+
+    def async_to_sync(self, func: Callable[..., Coroutine[Any, Any, T]]) -> Callable[..., T]:
+        loop = self.loop
+        if loop is None:
+            return super().async_to_sync(func)
+
+        def run(*args: Any, **kwargs: Any) -> T:
+            # `call_soon_threadsafe` copies the caller's context, so Flask's request context reaches the coroutine
+            return asyncio.run_coroutine_threadsafe(track_task(func(*args, **kwargs)), loop).result()
+
+        return run
+
+
+class FlaskAsgiApp:
+    """
+    Serves a `LoopBoundFlask` app from an ASGI server, replacing asgiref's `WsgiToAsgi`.
+
+    `WsgiToAsgi` runs every request on a single thread, and Flask then adds a new event loop per async
+    view. Here the WSGI part of a request runs on a bounded thread pool and async views run on the
+    server's loop. Views, the database pool and the default executor (used by `asyncio.to_thread` for
+    git work) all share that one loop for the lifetime of the worker.
+
+    `lifespan` is entered on the ASGI startup event and exited on shutdown, in the process that serves the app.
+    Background work that the app depends on is started there, also when the server imports the app by name.
+    """
+
+    # Larger request bodies are spooled to a temporary file
+    MAX_BODY_IN_MEMORY = 1024 * 1024
+
+    def __init__(
+        self,
+        app: LoopBoundFlask,
+        wsgi_threads: int,
+        executor_threads: int,
+        lifespan: Callable[[], AbstractAsyncContextManager[None]] | None = None,
+    ) -> None:
+        self.app = app
+        self._lifespan_context = lifespan
+        self._wsgi_executor = ThreadPoolExecutor(max_workers=wsgi_threads, thread_name_prefix="wsgi")
+        self._wsgi_threads = wsgi_threads
+        self._executor_threads = executor_threads
+        self._default_executor: ThreadPoolExecutor | None = None
+
+    @property
+    def executors(self) -> dict[str, ThreadPoolExecutor]:
+        """The WSGI thread pool and, once the server has started, the loop's default executor."""
+
+        executors = {"wsgi": self._wsgi_executor}
+        if self._default_executor is not None:
+            executors["default"] = self._default_executor
+        return executors
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            raise ValueError(f"Unsupported ASGI scope type: {scope['type']}")
+
+        loop = self._bind_loop()
+        await loop.run_in_executor(self._wsgi_executor, self._handle, scope, receive, send, loop)
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.get_running_loop()
+        if self.app.loop is not loop:
+            # Records the time git work spends queued in traces, and samples it for profiled requests
+            self._default_executor = ProfiledThreadPoolExecutor(
+                max_workers=self._executor_threads, thread_name_prefix="executor"
+            )
+            loop.set_default_executor(self._default_executor)
+            self.app.loop = loop
+            logger.bind(wsgi_threads=self._wsgi_threads, executor_threads=self._executor_threads).info(
+                "Flask app bound to the server event loop"
+            )
+        return loop
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        context = self._lifespan_context() if self._lifespan_context is not None else None
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self._bind_loop()
+                if context is not None:
+                    try:
+                        await context.__aenter__()
+                    except Exception as e:
+                        logger.exception("Application startup failed")
+                        await send({"type": "lifespan.startup.failed", "message": str(e)})
+                        return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self._wsgi_executor.shutdown(wait=False, cancel_futures=True)
+                if context is not None:
+                    await context.__aexit__(None, None, None)
+                self.app.loop = None
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def _handle(self, scope: Scope, receive: Receive, send: Send, loop: asyncio.AbstractEventLoop) -> None:
+        """Runs the WSGI app in a worker thread, every ASGI call is handed back to the loop."""
+
+        def call(awaitable: Awaitable[T]) -> T:
+            async def _await() -> T:
+                return await awaitable
+
+            return asyncio.run_coroutine_threadsafe(_await(), loop).result()
+
+        # The body is read up front: async views read it on the loop thread, where waiting on `receive` would
+        # deadlock. Reading it here keeps the file writes off the loop.
+        body = SpooledTemporaryFile(max_size=self.MAX_BODY_IN_MEMORY)
+        more_body = True
+        while more_body:
+            message = call(receive())
+            if message["type"] == "http.disconnect":
+                body.close()
+                return
+            body.write(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        body.seek(0)
+
+        environ = self._build_environ(scope, body)
+        response_start: Message = {}
+        started = False
+
+        def start_response(status: str, headers: list[tuple[str, str]], exc_info: Any = None) -> Callable[..., None]:
+            if exc_info and started:
+                raise exc_info[1].with_traceback(exc_info[2])
+
+            response_start.update(
+                type="http.response.start",
+                status=int(status.split(" ", 1)[0]),
+                headers=[(name.lower().encode("latin1"), value.encode("latin1")) for name, value in headers],
+            )
+
+            def write(_: bytes) -> None:
+                raise NotImplementedError("The WSGI write() callable is not supported")
+
+            return write
+
+        def send_start() -> None:
+            nonlocal started
+            if not started:
+                call(send(response_start))
+                started = True
+
+        result: Iterable[bytes] = self.app(environ, start_response)
+        try:
+            for chunk in result:
+                if chunk:
+                    send_start()
+                    call(send({"type": "http.response.body", "body": chunk, "more_body": True}))
+
+            send_start()
+            call(send({"type": "http.response.body", "body": b"", "more_body": False}))
+        finally:
+            close = getattr(result, "close", None)
+            if close is not None:
+                close()
+            body.close()
+
+    @staticmethod
+    def _build_environ(scope: Scope, body: IO[bytes]) -> dict[str, Any]:
+        root_path = scope.get("root_path", "")
+        path = scope["path"]
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path) :]
+
+        server_name, server_port = scope.get("server") or ("localhost", 80)
+        environ: dict[str, Any] = {
+            "REQUEST_METHOD": scope["method"],
+            "SCRIPT_NAME": root_path.encode("utf-8").decode("latin1"),
+            "PATH_INFO": path.encode("utf-8").decode("latin1"),
+            "QUERY_STRING": scope.get("query_string", b"").decode("latin1"),
+            "SERVER_NAME": server_name,
+            "SERVER_PORT": str(server_port),
+            "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": scope.get("scheme", "http"),
+            "wsgi.input": body,
+            "wsgi.input_terminated": True,  # the spooled body ends at EOF, chunked requests work too
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": True,
+            "wsgi.run_once": False,
+        }
+
+        client = scope.get("client")
+        if client:
+            environ["REMOTE_ADDR"], environ["REMOTE_PORT"] = client[0], str(client[1])
+
+        for raw_name, raw_value in scope.get("headers", []):
+            name = raw_name.decode("latin1").upper().replace("-", "_")
+            value = raw_value.decode("latin1")
+            key = name if name in ("CONTENT_TYPE", "CONTENT_LENGTH") else f"HTTP_{name}"
+            if key in environ:
+                separator = "; " if key == "HTTP_COOKIE" else ","
+                environ[key] = f"{environ[key]}{separator}{value}"
+            else:
+                environ[key] = value
+
+        return environ
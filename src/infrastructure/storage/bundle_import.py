@@ -0,0 +1,97 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import UUID, uuid4
+
+from loguru import logger
+
+from config import settings
+from domain.exceptions.git import InvalidBundleException
+from domain.value_objects.git import ImportJob
+from infrastructure.storage.git_storage import GitPythonStorage
+
+
+class BundleImportRunner:
+    """
+    Unbundles uploaded repositories on a small thread pool, outside of the request that uploaded them.
+
+    Job state is written next to the uploaded bundles, so any worker process can report the status of
+    an import that another worker accepted.
+    """
+
+    def __init__(self, git_storage: GitPythonStorage, max_workers: int, job_ttl: float) -> None:
+        self._storage = git_storage
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bundle-import")
+        self._job_ttl = timedelta(seconds=job_ttl)
+        self._lock = threading.Lock()
+
+    @property
+    def jobs_path(self) -> Path:
+        return self._storage.imports_path
+
+    def submit(self, repository_id: UUID, repo_path: str, bundle_path: Path) -> ImportJob:
+        job = ImportJob(repository_id=repository_id, created_at=self._now())
+        with self._lock:
+            self._prune()
+            self._save(job)
+
+        self._executor.submit(self._run, job, repo_path, bundle_path)
+        return job.model_copy()
+
+    def get(self, repository_id: UUID) -> ImportJob | None:
+        try:
+            return ImportJob.model_validate_json(self._job_path(repository_id).read_bytes())
+        except FileNotFoundError:
+            return None
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job: ImportJob, repo_path: str, bundle_path: Path) -> None:
+        log = logger.bind(repository_id=job.repository_id, repository_path=repo_path)
+        log.info("Starting bundle import")
+        self._update(job, status="running")
+
+        try:
+            self._storage.import_bundle(repo_path=repo_path, bundle_path=bundle_path)
+        except InvalidBundleException as e:
+            log.bind(error=str(e)).warning("Bundle import failed")
+            self._update(job, status="failed", error=str(e), finished_at=self._now())
+        except Exception:
+            log.exception("Bundle import failed unexpectedly")
+            self._update(job, status="failed", error="Internal error", finished_at=self._now())
+        else:
+            log.info("Bundle imported successfully")
+            self._update(job, status="succeeded", finished_at=self._now())
+
+    def _update(self, job: ImportJob, **changes: object) -> None:
+        with self._lock:
+            for field, value in changes.items():
+                setattr(job, field, value)
+            self._save(job)
+
+    def _job_path(self, repository_id: UUID) -> Path:
+        return self.jobs_path / f"{repository_id}.json"
+
+    def _save(self, job: ImportJob) -> None:
+        # Written aside and renamed, so readers in other workers never see a partial file
+        self.jobs_path.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.jobs_path / f".{uuid4().hex}.tmp"
+        tmp_path.write_text(job.model_dump_json())
+        os.replace(tmp_path, self._job_path(job.repository_id))
+
+    def _prune(self) -> None:
+        expires_before = self._now() - self._job_ttl
+        for path in self.jobs_path.glob("*.json"):
+            try:
+                job = ImportJob.model_validate_json(path.read_bytes())
+            except FileNotFoundError:
+                continue
+            if job.finished_at and job.finished_at < expires_before:
+                path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _now() -> datetime:
+        return datetime.now(tz=settings.time.default_tz)
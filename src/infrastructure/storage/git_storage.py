@@ -1,23 +1,40 @@
 import asyncio
 import base64
+import bisect
+import fcntl
+import mimetypes
+import os
+import re
 import shutil
+import subprocess
 import tempfile
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
-from typing import NamedTuple, cast
+from typing import IO, BinaryIO, NamedTuple, cast
+from uuid import uuid4
 
+import filetype
 import git
 from git import Repo
 from git.exc import InvalidGitRepositoryError, NoSuchPathError
-from git.objects import Commit
+from git.objects import Commit, TagObject
+from gitdb.db import GitDB
 
 from domain.exceptions.git import (
     BranchAlreadyExistsException,
     BranchNotFoundException,
+    BundleExportException,
+    BundleTooLargeException,
     CommitNotFoundException,
     CurrentHeadDeletionException,
+    EmptyRepositoryException,
     FileNotFoundException,
+    InvalidBundleException,
     IsDirectoryException,
     IsFileException,
+    RepositoryNotFoundException,
     UnmergedBranchDeletionException,
 )
 from domain.ports.repository_storage import AbstractRepositoryStorage
@@ -27,66 +44,536 @@ from domain.schemas.repository_storage import (
     DeleteBranchSchema,
     DeleteFileSchema,
     FileContent,
+    FileMetadata,
+    ForkRepositorySchema,
     GetCommitsSchema,
     GetFileSchema,
     GetRefsSchema,
     GetTreeSchema,
     InitRepositorySchema,
+    ListBranchesSchema,
     TreeNode,
     UpdateFileSchema,
 )
-from domain.value_objects.git import Author, BranchInfo, CommitInfo, FsRepo
+from domain.value_objects.git import Author, BranchInfo, BranchPage, CommitInfo, FsRepo
+from infrastructure.metrics.instruments import GIT_OPERATION_SECONDS, time_async_methods
+from infrastructure.storage.spare_pool import SpareRepositoryPool
+from infrastructure.tracing.instrumentation import trace_async_methods
+from infrastructure.utils.cache import LRUCache
 
 
+@time_async_methods(GIT_OPERATION_SECONDS)
+@trace_async_methods("git")
 class GitPythonStorage(AbstractRepositoryStorage):
     FILE_MODE_REGULAR = 0o100644
     INDEX_STAGE_NORMAL = 0
 
+    # Shared object pools used by forks live next to the users' directories.
+    # Repository names can't contain dots, so this never clashes with a repository path.
+    POOLS_DIR_NAME = ".pools"
+    # Deleted repositories are renamed here and removed later by `TombstoneReaper`
+    TRASH_DIR_NAME = ".trash"
+    # Pre-initialised empty repositories, see `SpareRepositoryPool`
+    SPARE_DIR_NAME = ".spare"
+    # Uploaded bundles waiting to be imported
+    IMPORTS_DIR_NAME = ".imports"
+    # Large file objects, see `LocalLargeObjectStorage`
+    LFS_DIR_NAME = ".lfs"
+    BUNDLE_SIGNATURES = (b"# v2 git bundle\n", b"# v3 git bundle\n")
+    # How much of a blob is read to detect its type
+    SNIFF_SIZE = 8 * 1024
+    HEADS_PREFIX = "refs/heads/"
+    TAGS_PREFIX = "refs/tags/"
+    # Ref names and prefixes are turned into paths, this keeps them inside `refs/`
+    REF_PATH_PATTERN = re.compile(r"^refs/(?!\.)(?!.*/\.)(?!.*//)[^\x00-\x20\x7f~^:?*\[\\]*$")
+
+    # Next to `objects` rather than inside it, so it isn't moved into the pool with it
+    OBJECTS_LOCK_FILE = "objects.lock"
+
     class IndexEntryData(NamedTuple):
         mode: int
         sha: bytes
         stage: int
         path: str
 
-    def __init__(self, repositories_dir: Path) -> None:
+    def __init__(
+        self,
+        repositories_dir: Path,
+        spare_pool: SpareRepositoryPool | None = None,
+        metadata_cache_size: int = 4096,
+    ) -> None:
         self.base_path = repositories_dir
+        self._spare_pool = spare_pool
+        # Blobs are immutable, so metadata keyed by sha never goes stale. The extension is part of the key
+        # because it decides the MIME type of text files.
+        self.metadata_cache: LRUCache[tuple[str, str], FileMetadata] = LRUCache(max_size=metadata_cache_size)
 
     async def init_repository(self, schema: InitRepositorySchema) -> FsRepo:
         def _init() -> FsRepo:
             full_path = self.base_path / schema.repo_path
-            Repo.init(full_path, bare=True)
+            if self._spare_pool is None or not self._spare_pool.acquire(full_path):
+                Repo.init(full_path, bare=True)
             return FsRepo(full_path=full_path)
 
         return await asyncio.to_thread(_init)
 
-    async def delete_repository(self, repo_path: str) -> None:
-        def _delete() -> None:
+    async def delete_repository(self, repo_path: str) -> str | None:
+        """
+        Move the repository into the trash with a single rename and return the tombstone name.
+
+        Nothing is removed from disk here, so the call takes the same time for any repository size.
+        The tombstone can be put back with `restore_repository` until the reaper removes it.
+        """
+
+        def _delete() -> str | None:
             full_path = self.base_path / repo_path
-            if full_path.exists():
-                shutil.rmtree(full_path)
+            if not full_path.exists():
+                return None
 
-        await asyncio.to_thread(_delete)
+            self._leave_pool(full_path, repo_path)
+            return self._tombstone(full_path)
+
+        return await asyncio.to_thread(_delete)
+
+    async def restore_repository(self, repo_path: str, tombstone: str) -> None:
+        """Put a repository removed by `delete_repository` back in place, e.g. when the transaction fails."""
+
+        def _restore() -> None:
+            full_path = self.base_path / repo_path
+            full_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(self.trash_path / tombstone, full_path)
+
+            pool_objects = self._get_pool_objects(full_path)
+            if pool_objects is not None:
+                (pool_objects.parent / "members" / self._member_name(repo_path)).touch()
+
+        await asyncio.to_thread(_restore)
+
+    async def fork_repository(self, schema: ForkRepositorySchema) -> FsRepo:
+        """
+        Create a bare repository that borrows all objects of the source through `objects/info/alternates`.
+
+        On the first fork the source's object directory is moved (renamed, not copied) into a shared pool,
+        so the work done here doesn't depend on the repository size. Only refs are copied.
+
+        :raises RepositoryNotFoundException:
+        """
+
+        def _fork() -> FsRepo:
+            source_path = self.base_path / schema.source_repo_path
+            full_path = self.base_path / schema.repo_path
+            if not (source_path / "objects").is_dir():
+                raise RepositoryNotFoundException()
+
+            pool_objects = self._ensure_pool(source_path, schema.source_repo_path)
+
+            Repo.init(full_path, bare=True)
+            self._join_pool(full_path, schema.repo_path, pool_objects)
+
+            shutil.copytree(source_path / "refs", full_path / "refs", dirs_exist_ok=True)
+            for file_name in ("packed-refs", "HEAD"):
+                if (source_path / file_name).exists():
+                    shutil.copy2(source_path / file_name, full_path / file_name)
+
+            return FsRepo(full_path=full_path)
+
+        return await asyncio.to_thread(_fork)
+
+    # =====================
+    # ====== BUNDLES ======
+    # =====================
+    @property
+    def imports_path(self) -> Path:
+        return self.base_path / self.IMPORTS_DIR_NAME
+
+    async def save_bundle(self, stream: BinaryIO, max_size: int, chunk_size: int) -> Path:
+        """
+        Write an uploaded bundle to disk chunk by chunk and return its path.
+
+        :raises BundleTooLargeException:
+        """
+
+        def _save() -> Path:
+            self.imports_path.mkdir(exist_ok=True)
+            bundle_path = self.imports_path / f"{uuid4().hex}.bundle"
+
+            size = 0
+            with bundle_path.open("wb") as file:
+                while chunk := stream.read(chunk_size):
+                    size += len(chunk)
+                    if size > max_size:
+                        file.close()
+                        bundle_path.unlink()
+                        raise BundleTooLargeException(max_size=max_size)
+                    file.write(chunk)
+
+            return bundle_path
+
+        return await asyncio.to_thread(_save)
+
+    async def verify_bundle(self, bundle_path: Path) -> None:
+        """
+        Check that the bundle can be imported into an empty repository.
+        Pack checksums are verified by git when the bundle is fetched.
+
+        :raises InvalidBundleException:
+        """
+
+        def _verify() -> None:
+            with bundle_path.open("rb") as file:
+                signature = file.readline()
+                if signature not in self.BUNDLE_SIGNATURES:
+                    raise InvalidBundleException(reason="unknown bundle format")
+
+                has_refs = False
+                while (line := file.readline()) not in (b"\n", b""):
+                    if line.startswith(b"-"):
+                        raise InvalidBundleException(reason="bundle depends on commits it doesn't contain")
+                    if not line.startswith(b"@"):  # v3 capabilities
+                        has_refs = True
+
+            if not has_refs:
+                raise InvalidBundleException(reason="bundle has no refs")
+
+            result = subprocess.run(["git", "bundle", "list-heads", str(bundle_path)], capture_output=True)
+            if result.returncode != 0:
+                raise InvalidBundleException(reason="bundle header is corrupted")
+
+        await asyncio.to_thread(_verify)
+
+    async def remove_bundle(self, bundle_path: Path) -> None:
+        await asyncio.to_thread(bundle_path.unlink, missing_ok=True)
+
+    def import_bundle(self, repo_path: str, bundle_path: Path) -> None:
+        """
+        Fetch all branches and tags from the bundle into the repository and point HEAD at the bundle's HEAD.
+        Blocking: it's meant to run in a background worker thread. The bundle file is removed afterwards.
+
+        :raises InvalidBundleException:
+        """
+
+        full_path = self.base_path / repo_path
+        try:
+            with self._objects_lock(full_path, exclusive=False):
+                result = subprocess.run(
+                    [
+                        "git",
+                        "fetch",
+                        "--quiet",
+                        str(bundle_path),
+                        "+refs/heads/*:refs/heads/*",
+                        "+refs/tags/*:refs/tags/*",
+                    ],
+                    cwd=full_path,
+                    capture_output=True,
+                    text=True,
+                )
+            if result.returncode != 0:
+                raise InvalidBundleException(reason=result.stderr.strip() or "git fetch failed")
+
+            heads = subprocess.run(
+                ["git", "bundle", "list-heads", str(bundle_path)], capture_output=True, text=True, check=True
+            ).stdout
+            self._set_head_from_bundle(Repo(full_path), heads)
+        finally:
+            bundle_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _set_head_from_bundle(repo: Repo, heads: str) -> None:
+        refs = {}
+        for line in heads.splitlines():
+            sha, _, ref = line.partition(" ")
+            refs[ref] = sha
+
+        head_sha = refs.get("HEAD")
+        branches = [ref for ref in refs if ref.startswith("refs/heads/")]
+        if not branches:
+            return
+
+        # A bundle stores HEAD as a commit, pick the branch it points to
+        head_ref = next((ref for ref in branches if refs[ref] == head_sha), branches[0])
+        repo.git.symbolic_ref("HEAD", head_ref)
+
+    async def open_bundle_stream(self, repo_path: str, chunk_size: int, buffer_size: int) -> Iterator[bytes]:
+        """
+        Return an iterator over a bundle of all refs of the repository, produced by `git bundle create`
+        as it is read, so the bundle is never kept in memory or on disk.
+
+        Up to `buffer_size` bytes are read before returning: a bundle that fits is only returned once git
+        has exited successfully. Past that point the response has started, so a failure raises from
+        the iterator and the server aborts the connection instead of ending the body normally.
+
+        :raises RepositoryNotFoundException:
+        :raises EmptyRepositoryException:
+        :raises BundleExportException:
+        """
+
+        full_path = self.base_path / repo_path
+
+        def _start() -> tuple[subprocess.Popen[bytes], IO[bytes], list[bytes]]:
+            try:
+                repo = Repo(full_path)
+            except (NoSuchPathError, InvalidGitRepositoryError) as e:
+                raise RepositoryNotFoundException() from e
+
+            if not repo.refs:
+                raise EmptyRepositoryException()
+
+            process = subprocess.Popen(
+                ["git", "bundle", "create", "--quiet", "-", "--all"],
+                cwd=full_path,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+            try:
+                if process.stdout is None:
+                    raise BundleExportException(reason="git bundle create has no output")
+
+                head: list[bytes] = []
+                size = 0
+                while size < buffer_size and (chunk := process.stdout.read(chunk_size)):
+                    head.append(chunk)
+                    size += len(chunk)
+
+                if size < buffer_size:
+                    self._check_bundle_exit(process)
+            except BaseException:
+                self._stop(process)
+                raise
+
+            return process, process.stdout, head
+
+        process, stdout, head = await asyncio.to_thread(_start)
+
+        def _stream() -> Iterator[bytes]:
+            try:
+                yield from head
+                while chunk := stdout.read(chunk_size):
+                    yield chunk
+                self._check_bundle_exit(process)
+            finally:
+                self._stop(process)
+
+        return _stream()
+
+    @staticmethod
+    def _check_bundle_exit(process: subprocess.Popen[bytes]) -> None:
+        if (code := process.wait()) != 0:
+            raise BundleExportException(reason=f"git bundle create exited with code {code}")
+
+    @staticmethod
+    def _stop(process: subprocess.Popen[bytes]) -> None:
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+        if process.stdout is not None:
+            process.stdout.close()
+
+    # =====================
+    # ======= TRASH =======
+    # =====================
+    @property
+    def trash_path(self) -> Path:
+        return self.base_path / self.TRASH_DIR_NAME
+
+    def _tombstone(self, path: Path) -> str:
+        """
+        Renames the directory into the trash. Both live on the same filesystem, so this is atomic.
+
+        The tombstone name starts with the time of deletion (see `tombstone_age`): a rename keeps the
+        directory's own mtime, which says nothing about when it was deleted.
+        """
+
+        tombstone = f"{time.time_ns()}-{uuid4().hex}"
+        self.trash_path.mkdir(exist_ok=True)
+        os.replace(path, self.trash_path / tombstone)
+        return tombstone
+
+    @staticmethod
+    def tombstone_age(tombstone: Path) -> float:
+        """Seconds since the tombstone was moved into the trash. Falls back to mtime for foreign names."""
+
+        deleted_at, _, _ = tombstone.name.partition("-")
+        if deleted_at.isdigit():
+            return time.time() - int(deleted_at) / 1e9
+        return time.time() - tombstone.lstat().st_mtime
+
+    def tombstone_orphan_pools(self, min_age: float) -> int:
+        """
+        Moves pools nobody borrows from anymore into the trash and returns how many were moved.
+
+        Pools are never removed on the request path: a deleted repository may still be restored and rejoin
+        its pool. `min_age` (seconds) protects pools that a fork is creating right now.
+        """
+
+        if not self.pools_path.exists():
+            return 0
+
+        now = time.time()
+        moved = 0
+        for pool_dir in self.pools_path.iterdir():
+            members_dir = pool_dir / "members"
+            if not members_dir.is_dir() or any(members_dir.iterdir()):
+                continue
+            if now - members_dir.stat().st_mtime < min_age:
+                continue
+
+            self._tombstone(pool_dir)
+            moved += 1
+
+        return moved
+
+    # =====================
+    # ==== OBJECT POOL ====
+    # =====================
+    @property
+    def pools_path(self) -> Path:
+        return self.base_path / self.POOLS_DIR_NAME
+
+    @staticmethod
+    def _alternates_file(repo_dir: Path) -> Path:
+        return repo_dir / "objects" / "info" / "alternates"
+
+    @staticmethod
+    def _member_name(repo_path: str) -> str:
+        return repo_path.replace("/", ".")
+
+    def _read_alternates(self, repo_dir: Path) -> list[Path]:
+        """Returns the object directories listed in `objects/info/alternates`, resolved to absolute paths."""
+
+        alternates = self._alternates_file(repo_dir)
+        if not alternates.exists():
+            return []
+
+        objects_dirs = []
+        for line in alternates.read_text().splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                objects_dirs.append((repo_dir / "objects" / line).resolve())
+
+        return objects_dirs
+
+    def _get_pool_objects(self, repo_dir: Path) -> Path | None:
+        """Returns the pool's objects directory the repository borrows from, if any."""
+
+        for objects_dir in self._read_alternates(repo_dir):
+            if objects_dir.parent.parent == self.pools_path.resolve():
+                return objects_dir
+
+        return None
+
+    def _ensure_pool(self, repo_dir: Path, repo_path: str) -> Path:
+        """
+        Makes sure the repository borrows its objects from a pool and returns the pool's objects directory.
+
+        A repository that is not in a pool yet becomes the pool's first member: its objects directory is
+        renamed into the pool and replaced with an empty one pointing there. A repository that is already
+        a member moves the objects it created since joining into the pool, so new forks can see them.
+
+        Runs under the repository's exclusive objects lock: a concurrent fork waits and then finds the pool, and
+        no object is written into the directory while it's moved.
+        """
+
+        with self._objects_lock(repo_dir, exclusive=True):
+            pool_objects = self._get_pool_objects(repo_dir)
+            if pool_objects is not None:
+                self._migrate_objects(repo_dir / "objects", pool_objects)
+                return pool_objects
+
+            pool_dir = self.pools_path / uuid4().hex
+            (pool_dir / "members").mkdir(parents=True)
+            pool_objects = pool_dir / "objects"
+
+            new_objects = repo_dir / "objects.pool-tmp"
+            shutil.rmtree(new_objects, ignore_errors=True)
+            (new_objects / "pack").mkdir(parents=True)
+            (new_objects / "info").mkdir()
+            alternates = os.path.relpath(pool_objects, repo_dir / "objects") + "\n"
+            (new_objects / "info" / "alternates").write_text(alternates)
+
+            os.replace(repo_dir / "objects", pool_objects)
+            os.replace(new_objects, repo_dir / "objects")
+            (pool_dir / "members" / self._member_name(repo_path)).touch()
+
+            return pool_objects
+
+    @classmethod
+    @contextmanager
+    def _objects_lock(cls, repo_dir: Path, exclusive: bool) -> Iterator[None]:
+        """
+        Writers of objects hold it shared, moving the objects into a pool holds it exclusively. It's a `flock`,
+        so it works across worker processes too, and it's released when the file is closed.
+        """
+
+        with open(repo_dir / cls.OBJECTS_LOCK_FILE, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            yield
+
+    def _join_pool(self, repo_dir: Path, repo_path: str, pool_objects: Path) -> None:
+        self._alternates_file(repo_dir).write_text(os.path.relpath(pool_objects, repo_dir / "objects") + "\n")
+        (pool_objects.parent / "members" / self._member_name(repo_path)).touch()
+
+    def _leave_pool(self, repo_dir: Path, repo_path: str) -> None:
+        """
+        Drops the repository's membership in its pool. Pools without members are removed by the reaper.
+
+        Objects that members share always live in the pool itself, so deleting any member (including the
+        repository the others were forked from) never breaks the rest of the network.
+        """
+
+        pool_objects = self._get_pool_objects(repo_dir)
+        if pool_objects is None:
+            return
+
+        (pool_objects.parent / "members" / self._member_name(repo_path)).unlink(missing_ok=True)
+
+    @staticmethod
+    def _migrate_objects(objects_dir: Path, pool_objects: Path) -> None:
+        """Moves the repository's own loose objects and packs into the pool. Files are renamed, not copied."""
+
+        for fanout_dir in objects_dir.iterdir():
+            if len(fanout_dir.name) != 2 or not fanout_dir.is_dir():
+                continue
+
+            target_dir = pool_objects / fanout_dir.name
+            target_dir.mkdir(exist_ok=True)
+            for obj in fanout_dir.iterdir():
+                if (target_dir / obj.name).exists():
+                    obj.unlink()
+                else:
+                    os.replace(obj, target_dir / obj.name)
+
+        # The .idx goes last: git ignores a pack until its index is in place
+        pack_dir = objects_dir / "pack"
+        for idx in pack_dir.glob("*.idx"):
+            for companion in sorted(pack_dir.glob(f"{idx.stem}.*"), key=lambda p: p.suffix == ".idx"):
+                os.replace(companion, pool_objects / "pack" / companion.name)
 
     async def create_initial_commit(self, schema: CreateInitialCommitSchema) -> None:
         """:raises BranchAlreadyExistsException:"""
-        repo = Repo(self.base_path / schema.repo_path)
-
-        if schema.branch_name in repo.heads:
-            raise BranchAlreadyExistsException(branch=schema.branch_name)
-
-        empty_tree_hash = repo.git.hash_object("-t", "tree", "--stdin", istream=b"")
-        empty_tree = git.Tree(repo, binsha=bytes.fromhex(empty_tree_hash))
-
-        author = git.Actor(name=schema.author.name, email=schema.author.email)
-        commit = git.Commit.create_from_tree(
-            repo,
-            tree=empty_tree,
-            message=schema.message,
-            parent_commits=[],
-            author=author,
-            committer=author,
-        )
-        repo.create_head(schema.branch_name, commit=commit.hexsha, force=False)
+
+        def _create() -> None:
+            repo = Repo(self.base_path / schema.repo_path)
+
+            if schema.branch_name in repo.heads:
+                raise BranchAlreadyExistsException(branch=schema.branch_name)
+
+            with self._objects_lock(Path(repo.git_dir), exclusive=False):
+                empty_tree_hash = repo.git.hash_object("-t", "tree", "--stdin", istream=b"")
+                empty_tree = git.Tree(repo, binsha=bytes.fromhex(empty_tree_hash))
+
+                author = git.Actor(name=schema.author.name, email=schema.author.email)
+                commit = git.Commit.create_from_tree(
+                    repo,
+                    tree=empty_tree,
+                    message=schema.message,
+                    parent_commits=[],
+                    author=author,
+                    committer=author,
+                )
+                repo.create_head(schema.branch_name, commit=commit.hexsha, force=False)
+
+        await asyncio.to_thread(_create)
 
     async def repository_exists(self, repo_path: str) -> bool:
         def _exists() -> bool:
@@ -146,12 +633,79 @@ class GitPythonStorage(AbstractRepositoryStorage):
 
     async def get_branches(self, repo_path: str) -> list[BranchInfo]:
         def _get() -> list[BranchInfo]:
-            repo = Repo(self.base_path / repo_path)
-            branches = [BranchInfo(name=head.name, commit_sha=head.commit.hexsha) for head in repo.heads]
-            return branches
+            heads = self._read_refs(self.base_path / repo_path, self.HEADS_PREFIX)
+            return [BranchInfo(name=name[len(self.HEADS_PREFIX) :], commit_sha=sha) for name, sha in heads.items()]
 
         return await asyncio.to_thread(_get)
 
+    async def list_branches(self, schema: ListBranchesSchema) -> BranchPage:
+        """Branches ordered by name, starting after `schema.after`. Only ref files are read."""
+
+        def _list() -> BranchPage:
+            prefix = self.HEADS_PREFIX + schema.prefix
+            heads = self._read_refs(self.base_path / schema.repo_path, prefix)
+            names = sorted((name[len(self.HEADS_PREFIX) :] for name in heads), reverse=schema.descending)
+
+            start = 0
+            if schema.after is not None:
+                # `bisect` needs ascending keys, descending names are searched through their position from the end
+                if schema.descending:
+                    start = len(names) - bisect.bisect_left(names[::-1], schema.after)
+                else:
+                    start = bisect.bisect_right(names, schema.after)
+
+            page = names[start : start + schema.limit]
+            has_more = start + schema.limit < len(names)
+            return BranchPage(
+                branches=[BranchInfo(name=name, commit_sha=heads[self.HEADS_PREFIX + name]) for name in page],
+                next_after=page[-1] if has_more and page else None,
+            )
+
+        return await asyncio.to_thread(_list)
+
+    async def resolve_branch(self, repo_path: str, branch_name: str) -> str:
+        """
+        Returns the SHA of the branch tip. No objects are read, so it's cheap enough to run before every read.
+
+        :raises BranchNotFoundException:
+        """
+
+        def _resolve() -> str:
+            sha = self._read_ref(self.base_path / repo_path, self.HEADS_PREFIX + branch_name)
+            if sha is None:
+                raise BranchNotFoundException(branch=branch_name)
+            return sha
+
+        return await asyncio.to_thread(_resolve)
+
+    async def resolve_tree(self, schema: GetTreeSchema) -> str:
+        """
+        Returns the SHA of the tree at `schema.path`. Only the trees along the path are read, not its entries.
+
+        :raises BranchNotFoundException:
+        :raises FileNotFoundException:
+        :raises IsFileException:
+        """
+
+        def _resolve() -> str:
+            return self._resolve_tree(Repo(self.base_path / schema.repo_path), schema).hexsha
+
+        return await asyncio.to_thread(_resolve)
+
+    async def resolve_blob(self, schema: GetFileSchema) -> str:
+        """
+        Returns the SHA of the blob at `schema.file_path` without reading its content.
+
+        :raises BranchNotFoundException:
+        :raises FileNotFoundException:
+        :raises IsDirectoryException:
+        """
+
+        def _resolve() -> str:
+            return self._resolve_blob(Repo(self.base_path / schema.repo_path), schema).hexsha
+
+        return await asyncio.to_thread(_resolve)
+
     async def get_commit(self, repo_path: str, commit_sha: str) -> CommitInfo:
         """
         :raises CommitNotFoundException:
@@ -175,11 +729,8 @@ class GitPythonStorage(AbstractRepositoryStorage):
         def _get() -> list[CommitInfo]:
             repo = Repo(self.base_path / schema.repo_path)
 
-            if schema.branch_name not in repo.heads:
-                raise BranchNotFoundException(branch=schema.branch_name)
-
-            branch = repo.heads[schema.branch_name]
-            return [self._commit_to_info(commit) for commit in repo.iter_commits(branch, max_count=schema.limit)]
+            tip = self._branch_commit(repo, schema.branch_name)
+            return [self._commit_to_info(commit) for commit in repo.iter_commits(tip, max_count=schema.limit)]
 
         return await asyncio.to_thread(_get)
 
@@ -203,21 +754,12 @@ class GitPythonStorage(AbstractRepositoryStorage):
         """
 
         def _get() -> FileContent:
-            repo = Repo(self.base_path / schema.repo_path)
-            if schema.branch_name not in repo.heads:
-                raise BranchNotFoundException(branch=schema.branch_name)
-
-            commit = repo.heads[schema.branch_name].commit
-
-            try:
-                blob = commit.tree / schema.file_path
-            except KeyError as e:
-                raise FileNotFoundException(file_path=schema.file_path) from e
-
-            if not isinstance(blob, git.Blob):
-                raise IsDirectoryException(file_path=schema.file_path)
+            blob = self._resolve_blob(Repo(self.base_path / schema.repo_path), schema)
 
             content: bytes = blob.data_stream.read()
+            metadata = self._get_cached_metadata(blob.hexsha, schema.file_path) or self._describe_blob(
+                blob.hexsha, len(content), content[: self.SNIFF_SIZE], schema.file_path
+            )
             try:
                 text_content = content.decode("utf-8")
                 encoding = "utf-8"
@@ -229,58 +771,130 @@ class GitPythonStorage(AbstractRepositoryStorage):
                 content=text_content,
                 encoding=encoding,
                 sha=blob.hexsha,
+                mimetype=metadata.mimetype,
             )
 
         return await asyncio.to_thread(_get)
 
+    async def get_file_metadata(self, schema: GetFileSchema) -> FileMetadata:
+        """
+        Describe a file using only the object header and its first `SNIFF_SIZE` bytes.
+
+        :raises FileNotFoundException:
+        :raises IsDirectoryException:
+        :raises BranchNotFoundException:
+        """
+
+        def _get() -> FileMetadata:
+            repo = Repo(self.base_path / schema.repo_path)
+            blob = self._resolve_blob(repo, schema)
+
+            metadata = self._get_cached_metadata(blob.hexsha, schema.file_path)
+            if metadata is not None:
+                return metadata
+
+            # gitdb reads loose and packed objects incrementally, `cat-file --batch` would send the whole blob.
+            # It resolves relative alternates against the cwd, so they are looked up here instead.
+            repo_dir = Path(repo.git_dir)
+            for objects_dir in [repo_dir / "objects", *self._read_alternates(repo_dir)]:
+                odb = GitDB(str(objects_dir))
+                if odb.has_object(blob.binsha):
+                    size = odb.info(blob.binsha).size
+                    head = odb.stream(blob.binsha).read(self.SNIFF_SIZE)
+                    return self._describe_blob(blob.hexsha, size, head, schema.file_path)
+
+            raise FileNotFoundException(file_path=schema.file_path)
+
+        return await asyncio.to_thread(_get)
+
+    @staticmethod
+    def _resolve_blob(repo: Repo, schema: GetFileSchema) -> git.Blob:
+        """
+        :raises FileNotFoundException:
+        :raises IsDirectoryException:
+        :raises BranchNotFoundException:
+        """
+
+        commit = GitPythonStorage._branch_commit(repo, schema.branch_name)
+
+        try:
+            blob = commit.tree / schema.file_path
+        except KeyError as e:
+            raise FileNotFoundException(file_path=schema.file_path) from e
+
+        if not isinstance(blob, git.Blob):
+            raise IsDirectoryException(file_path=schema.file_path)
+
+        return blob
+
+    def _get_cached_metadata(self, sha: str, file_path: str) -> FileMetadata | None:
+        return self.metadata_cache.get((sha, Path(file_path).suffix.lower()))
+
+    def _describe_blob(self, sha: str, size: int, head: bytes, file_path: str) -> FileMetadata:
+        # Same heuristic as git: a NUL byte near the start means binary
+        is_binary = b"\x00" in head
+
+        kind = filetype.guess(head) if head else None
+        if kind is not None:
+            mimetype = kind.mime
+        elif is_binary:
+            mimetype = "application/octet-stream"
+        else:
+            mimetype = mimetypes.guess_type(file_path)[0] or "text/plain"
+
+        metadata = FileMetadata(sha=sha, size=size, mimetype=mimetype, is_binary=is_binary)
+        self.metadata_cache.set((sha, Path(file_path).suffix.lower()), metadata)
+        return metadata
+
     async def update_file(self, schema: UpdateFileSchema) -> CommitInfo:
         def _update_file() -> CommitInfo:
             repo = git.Repo(self.base_path / schema.repo_path)
             author = git.Actor(schema.author.name, schema.author.email)
 
-            if schema.branch_name in repo.heads:
-                parent = repo.heads[schema.branch_name].commit
-                parents = [parent]
-                index = git.IndexFile.from_tree(repo, parent.tree)
-            else:
-                parents = []
-                index = git.IndexFile(repo)
-
-            if schema.encoding == "utf-8":
-                content_bytes = schema.content.encode("utf-8")
-            elif schema.encoding == "base64":
-                content_bytes = base64.b64decode(schema.content)
-            else:
-                raise ValueError(f"Unsupported encoding: {schema.encoding}")
-
-            with tempfile.NamedTemporaryFile(mode="wb", delete=True, delete_on_close=False) as tmp:
-                tmp.write(content_bytes)
-                tmp.close()
-                blob_sha = bytes.fromhex(repo.git.hash_object("-w", tmp.name))
-
-            entry_data = self.IndexEntryData(
-                mode=self.FILE_MODE_REGULAR,
-                sha=blob_sha,
-                stage=self.INDEX_STAGE_NORMAL,
-                path=schema.file_path,
-            )
-            index.add([git.IndexEntry(entry_data)])
-
-            new_commit = git.Commit.create_from_tree(
-                repo,
-                index.write_tree(),
-                schema.message,
-                parents,
-                author=author,
-                committer=author,
-            )
+            with self._objects_lock(Path(repo.git_dir), exclusive=False):
+                if schema.branch_name in repo.heads:
+                    parent = repo.heads[schema.branch_name].commit
+                    parents = [parent]
+                    index = git.IndexFile.from_tree(repo, parent.tree)
+                else:
+                    parents = []
+                    index = git.IndexFile(repo)
+
+                if schema.encoding == "utf-8":
+                    content_bytes = schema.content.encode("utf-8")
+                elif schema.encoding == "base64":
+                    content_bytes = base64.b64decode(schema.content)
+                else:
+                    raise ValueError(f"Unsupported encoding: {schema.encoding}")
+
+                with tempfile.NamedTemporaryFile(mode="wb", delete=True, delete_on_close=False) as tmp:
+                    tmp.write(content_bytes)
+                    tmp.close()
+                    blob_sha = bytes.fromhex(repo.git.hash_object("-w", tmp.name))
+
+                entry_data = self.IndexEntryData(
+                    mode=self.FILE_MODE_REGULAR,
+                    sha=blob_sha,
+                    stage=self.INDEX_STAGE_NORMAL,
+                    path=schema.file_path,
+                )
+                index.add([git.IndexEntry(entry_data)])
+
+                new_commit = git.Commit.create_from_tree(
+                    repo,
+                    index.write_tree(),
+                    schema.message,
+                    parents,
+                    author=author,
+                    committer=author,
+                )
 
-            if schema.branch_name in repo.heads:
-                repo.heads[schema.branch_name].commit = new_commit
-            else:
-                repo.create_head(schema.branch_name, new_commit.hexsha)
+                if schema.branch_name in repo.heads:
+                    repo.heads[schema.branch_name].commit = new_commit
+                else:
+                    repo.create_head(schema.branch_name, new_commit.hexsha)
 
-            return self._commit_to_info(new_commit)
+                return self._commit_to_info(new_commit)
 
         return await asyncio.to_thread(_update_file)
 
@@ -296,38 +910,38 @@ class GitPythonStorage(AbstractRepositoryStorage):
             if schema.branch_name not in repo.heads:
                 raise BranchNotFoundException(branch=schema.branch_name)
 
-            parent = repo.heads[schema.branch_name].commit
-            index = git.IndexFile.from_tree(repo, parent.tree)
+            with self._objects_lock(Path(repo.git_dir), exclusive=False):
+                parent = repo.heads[schema.branch_name].commit
+                index = git.IndexFile.from_tree(repo, parent.tree)
 
-            index.entries.pop((schema.file_path, self.INDEX_STAGE_NORMAL), None)
+                index.entries.pop((schema.file_path, self.INDEX_STAGE_NORMAL), None)
 
-            commit = git.Commit.create_from_tree(
-                repo,
-                tree=index.write_tree(),
-                message=schema.message,
-                parent_commits=[parent],
-                author=author,
-                committer=author,
-            )
-            repo.heads[schema.branch_name].commit = commit
+                commit = git.Commit.create_from_tree(
+                    repo,
+                    tree=index.write_tree(),
+                    message=schema.message,
+                    parent_commits=[parent],
+                    author=author,
+                    committer=author,
+                )
+                repo.heads[schema.branch_name].commit = commit
 
-            return self._commit_to_info(commit)
+                return self._commit_to_info(commit)
 
         return await asyncio.to_thread(_delete_file)
 
     async def get_refs(self, schema: GetRefsSchema) -> dict[str, str]:
         def _get_refs() -> dict[str, str]:
-            repo = Repo(self.base_path / schema.repo_path)
-            refs = {}
-
-            for head in repo.heads:
-                refs[f"refs/heads/{head.name}"] = head.commit.hexsha
+            repo_dir = self.base_path / schema.repo_path
+            all_refs = self._read_refs(repo_dir, "refs/", peel=True)
+            refs = {
+                name: sha for name, sha in all_refs.items() if name.startswith((self.HEADS_PREFIX, self.TAGS_PREFIX))
+            }
 
-            for tag in repo.tags:
-                refs[f"refs/tags/{tag.name}"] = tag.commit.hexsha
-
-            if repo.head.is_valid():
-                refs["HEAD"] = repo.head.commit.hexsha
+            head = (repo_dir / "HEAD").read_text().strip()
+            head_sha = all_refs.get(head.removeprefix("ref: ")) if head.startswith("ref: ") else head
+            if head_sha:
+                refs["HEAD"] = head_sha
 
             return refs
 
@@ -347,26 +961,10 @@ class GitPythonStorage(AbstractRepositoryStorage):
         """
 
         def _get() -> list[TreeNode]:
-            repo = Repo(self.base_path / schema.repo_path)
-
-            if schema.branch_name not in repo.heads:
-                raise BranchNotFoundException(branch=schema.branch_name)
-
-            commit = repo.heads[schema.branch_name].commit
-
-            if schema.path:
-                try:
-                    tree = commit.tree / schema.path
-                except KeyError as e:
-                    raise FileNotFoundException(file_path=schema.path) from e
-            else:
-                tree = commit.tree
-
-            if isinstance(tree, git.Blob):
-                raise IsFileException(file_path=schema.path)
+            tree = self._resolve_tree(Repo(self.base_path / schema.repo_path), schema)
 
             nodes = []
-            for item in cast(git.Tree, tree):
+            for item in tree:
                 node_type = "tree" if isinstance(item, git.Tree) else "blob"
                 size = item.size if isinstance(item, git.Blob) else None
 
@@ -383,3 +981,138 @@ class GitPythonStorage(AbstractRepositoryStorage):
             return nodes
 
         return await asyncio.to_thread(_get)
+
+    @staticmethod
+    def _resolve_tree(repo: Repo, schema: GetTreeSchema) -> git.Tree:
+        """
+        :raises BranchNotFoundException:
+        :raises FileNotFoundException:
+        :raises IsFileException:
+        """
+
+        commit = GitPythonStorage._branch_commit(repo, schema.branch_name)
+
+        if schema.path:
+            try:
+                tree = commit.tree / schema.path
+            except KeyError as e:
+                raise FileNotFoundException(file_path=schema.path) from e
+        else:
+            tree = commit.tree
+
+        if isinstance(tree, git.Blob):
+            raise IsFileException(file_path=schema.path)
+
+        return cast(git.Tree, tree)
+
+    @classmethod
+    def _branch_commit(cls, repo: Repo, branch_name: str) -> Commit:
+        """:raises BranchNotFoundException:"""
+
+        sha = cls._read_ref(Path(repo.git_dir), cls.HEADS_PREFIX + branch_name)
+        if sha is None:
+            raise BranchNotFoundException(branch=branch_name)
+        return repo.commit(sha)
+
+    @classmethod
+    def _read_ref(cls, repo_dir: Path, name: str) -> str | None:
+        """Resolves a single ref without listing the others, None if it doesn't exist."""
+
+        if not cls.REF_PATH_PATTERN.match(name):
+            return None
+
+        try:
+            value: str | None = (repo_dir / name).read_text().strip()
+        except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+            value = cls._read_packed_refs(repo_dir, name)[0].get(name)
+
+        if value is not None and value.startswith("ref: "):
+            return cls._read_ref(repo_dir, value.removeprefix("ref: "))
+        return value
+
+    def _read_refs(self, repo_dir: Path, prefix: str, peel: bool = False) -> dict[str, str]:
+        """
+        Maps the refs starting with `prefix` to the SHAs they point to, resolved the way git does it: loose ref
+        files take precedence over `packed-refs`. No objects are read, except for loose tags when `peel` is set.
+
+        With `peel` annotated tags are mapped to the commit they tag instead of the tag object.
+        """
+
+        refs, peeled = self._read_packed_refs(repo_dir, prefix)
+        loose = self._read_loose_refs(repo_dir, prefix)
+        refs.update(loose)
+
+        for name, value in refs.items():
+            if value.startswith("ref: "):
+                # Symbolic refs, such as `refs/remotes/origin/HEAD`, point to refs in the same listing
+                refs[name] = refs.get(value.removeprefix("ref: "), "")
+
+        repo: Repo | None = None
+        for name, sha in refs.items():
+            if not peel or not name.startswith(self.TAGS_PREFIX):
+                continue
+            if name in loose:
+                # Unlike `packed-refs`, loose tags don't record what they peel to
+                repo = repo or Repo(repo_dir)
+                refs[name] = self._peel(repo, sha)
+            elif name in peeled:
+                refs[name] = peeled[name]
+
+        return {name: sha for name, sha in refs.items() if sha}
+
+    @staticmethod
+    def _read_packed_refs(repo_dir: Path, prefix: str) -> tuple[dict[str, str], dict[str, str]]:
+        """Returns the packed refs starting with `prefix` and what their annotated tags peel to."""
+
+        refs: dict[str, str] = {}
+        peeled: dict[str, str] = {}
+        try:
+            lines = (repo_dir / "packed-refs").read_text().splitlines()
+        except FileNotFoundError:
+            return refs, peeled
+
+        name: str | None = None
+        for line in lines:
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("^"):
+                # The peeled value of the ref on the previous line
+                if name is not None:
+                    peeled[name] = line[1:]
+                continue
+
+            sha, _, ref = line.partition(" ")
+            name = ref if ref.startswith(prefix) else None
+            if name is not None:
+                refs[name] = sha
+
+        return refs, peeled
+
+    @classmethod
+    def _read_loose_refs(cls, repo_dir: Path, prefix: str) -> dict[str, str]:
+        refs: dict[str, str] = {}
+        if not cls.REF_PATH_PATTERN.match(prefix):
+            return refs
+
+        # Names are built from strings, `Path.relative_to` per file dominates the walk on thousands of refs
+        refs_dir = prefix.rpartition("/")[0]
+        for root, _, files in os.walk(os.path.join(repo_dir, refs_dir)):
+            directory = refs_dir + root[len(str(repo_dir)) + len(refs_dir) + 1 :].replace(os.sep, "/")
+            for file_name in files:
+                name = f"{directory}/{file_name}"
+                if not name.startswith(prefix) or name.endswith(".lock"):
+                    continue
+                try:
+                    with open(os.path.join(root, file_name)) as file:
+                        refs[name] = file.read().strip()
+                except FileNotFoundError:
+                    continue  # deleted or packed meanwhile
+
+        return refs
+
+    @staticmethod
+    def _peel(repo: Repo, sha: str) -> str:
+        obj = git.Object.new_from_sha(repo, bytes.fromhex(sha))
+        while isinstance(obj, TagObject):
+            obj = obj.object
+        return obj.hexsha
@@ -0,0 +1,101 @@
+import asyncio
+import hashlib
+import os
+from collections.abc import Iterator
+from pathlib import Path
+from typing import BinaryIO
+from uuid import uuid4
+
+from domain.exceptions.git import LargeObjectIntegrityException, LargeObjectNotFoundException
+from domain.ports.large_object_storage import AbstractLargeObjectStorage
+from domain.value_objects.git import LfsPointer
+
+
+class LocalLargeObjectStorage(AbstractLargeObjectStorage):
+    """
+    Stores objects under `objects_dir/ab/cd/abcd...`, the layout git-lfs uses locally.
+
+    Objects are written to a temporary file and renamed into place only after the hash is verified,
+    so a partially uploaded object is never visible. Equal files uploaded to different repositories
+    are stored once.
+    """
+
+    def __init__(self, objects_dir: Path, chunk_size: int) -> None:
+        self.objects_dir = objects_dir
+        self._chunk_size = chunk_size
+
+    def _object_path(self, oid: str) -> Path:
+        return self.objects_dir / oid[:2] / oid[2:4] / oid
+
+    async def get_size(self, oid: str) -> int | None:
+        def _size() -> int | None:
+            try:
+                return self._object_path(oid).stat().st_size
+            except FileNotFoundError:
+                return None
+
+        return await asyncio.to_thread(_size)
+
+    async def save(self, oid: str, size: int, stream: BinaryIO) -> None:
+        """:raises LargeObjectIntegrityException:"""
+
+        def _save() -> None:
+            object_path = self._object_path(oid)
+            if object_path.exists():
+                # Already stored (possibly by another repository). The stream is left unread.
+                return
+
+            tmp_path = self.objects_dir / "tmp" / uuid4().hex
+            tmp_path.parent.mkdir(parents=True, exist_ok=True)
+            digest = hashlib.sha256()
+            written = 0
+            try:
+                with tmp_path.open("wb") as file:
+                    while chunk := stream.read(self._chunk_size):
+                        written += len(chunk)
+                        if written > size:
+                            raise LargeObjectIntegrityException(oid=oid, reason="size mismatch")
+                        digest.update(chunk)
+                        file.write(chunk)
+
+                if written != size:
+                    raise LargeObjectIntegrityException(oid=oid, reason="size mismatch")
+                if digest.hexdigest() != oid:
+                    raise LargeObjectIntegrityException(oid=oid, reason="hash mismatch")
+
+                object_path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(tmp_path, object_path)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+
+        await asyncio.to_thread(_save)
+
+    async def save_bytes(self, data: bytes) -> LfsPointer:
+        def _save() -> LfsPointer:
+            pointer = LfsPointer(oid=hashlib.sha256(data).hexdigest(), size=len(data))
+            object_path = self._object_path(pointer.oid)
+            if not object_path.exists():
+                tmp_path = self.objects_dir / "tmp" / uuid4().hex
+                tmp_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path.write_bytes(data)
+                object_path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(tmp_path, object_path)
+            return pointer
+
+        return await asyncio.to_thread(_save)
+
+    async def open(self, oid: str) -> Iterator[bytes]:
+        """:raises LargeObjectNotFoundException:"""
+
+        object_path = self._object_path(oid)
+        try:
+            file = await asyncio.to_thread(object_path.open, "rb")
+        except FileNotFoundError as e:
+            raise LargeObjectNotFoundException(oid=oid) from e
+
+        def _stream() -> Iterator[bytes]:
+            with file:
+                while chunk := file.read(self._chunk_size):
+                    yield chunk
+
+        return _stream()
@@ -0,0 +1,130 @@
+import asyncio
+import os
+import shutil
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+from loguru import logger
+from pydantic import BaseModel
+
+from infrastructure.storage.git_storage import GitPythonStorage
+
+
+class ReaperStats(BaseModel):
+    runs: int = 0
+    tombstones_pending: int = 0
+    tombstones_reaped: int = 0
+    pools_released: int = 0
+    files_removed: int = 0
+    bytes_removed: int = 0
+    errors: int = 0
+    last_run_duration: float = 0.0
+
+
+class TombstoneReaper:
+    """
+    Removes repositories that `GitPythonStorage.delete_repository` moved into the trash.
+
+    A tombstone is only removed once it's `min_age` seconds old, which leaves a window to restore a
+    repository deleted by mistake.
+
+    Deletion is throttled: files are unlinked in batches of `files_per_batch` with a `batch_pause` between
+    them, so reaping a huge repository doesn't starve the request path of disk I/O.
+    """
+
+    def __init__(
+        self,
+        git_storage: GitPythonStorage,
+        interval: float,
+        files_per_batch: int,
+        batch_pause: float,
+        pool_min_age: float,
+        min_age: float,
+    ) -> None:
+        self._storage = git_storage
+        self._interval = interval
+        self._files_per_batch = files_per_batch
+        self._batch_pause = batch_pause
+        self._pool_min_age = pool_min_age
+        self._min_age = min_age
+
+        self.stats = ReaperStats()
+
+    async def run(self) -> None:
+        logger.bind(interval=self._interval).info("Tombstone reaper started")
+        while True:
+            try:
+                await self.reap()
+            except Exception:
+                self.stats.errors += 1
+                logger.exception("Tombstone reaper run failed")
+
+            await asyncio.sleep(self._interval)
+
+    async def reap(self) -> int:
+        """Removes every tombstone older than `min_age` and returns how many were removed."""
+
+        started_at = time.perf_counter()
+        self.stats.pools_released += await asyncio.to_thread(self._storage.tombstone_orphan_pools, self._pool_min_age)
+
+        trash_path = self._storage.trash_path
+        tombstones = await asyncio.to_thread(lambda: list(trash_path.iterdir()) if trash_path.exists() else [])
+        self.stats.tombstones_pending = len(tombstones)
+
+        reaped = 0
+        for tombstone in tombstones:
+            try:
+                if self._storage.tombstone_age(tombstone) < self._min_age:
+                    continue
+
+                await self._remove(tombstone)
+            except OSError:
+                self.stats.errors += 1
+                logger.bind(tombstone=tombstone.name).exception("Failed to remove tombstone")
+                continue
+
+            reaped += 1
+            self.stats.tombstones_pending -= 1
+            self.stats.tombstones_reaped += 1
+
+        self.stats.runs += 1
+        self.stats.last_run_duration = time.perf_counter() - started_at
+        if reaped:
+            logger.bind(reaped=reaped, duration=self.stats.last_run_duration).info("Tombstones removed")
+
+        return reaped
+
+    async def _remove(self, tombstone: Path) -> None:
+        if not tombstone.is_dir() or tombstone.is_symlink():
+            await asyncio.to_thread(tombstone.unlink, missing_ok=True)
+            return
+
+        files = self._walk_files(tombstone)
+        while await asyncio.to_thread(self._remove_batch, files):
+            await asyncio.sleep(self._batch_pause)
+
+        # Only empty directories are left at this point
+        await asyncio.to_thread(shutil.rmtree, tombstone)
+
+    def _remove_batch(self, files: Iterator[Path]) -> bool:
+        """Unlinks up to `files_per_batch` files. Returns False once there is nothing left."""
+
+        removed = 0
+        for path in files:
+            size = path.lstat().st_size
+            path.unlink()
+            self.stats.files_removed += 1
+            self.stats.bytes_removed += size
+
+            removed += 1
+            if removed >= self._files_per_batch:
+                return True
+
+        return False
+
+    @staticmethod
+    def _walk_files(root: Path) -> Iterator[Path]:
+        for dir_path, _, file_names in os.walk(root):
+            for file_name in file_names:
+                yield Path(dir_path) / file_name
@@ -0,0 +1,123 @@
+import asyncio
+import fcntl
+import os
+import shutil
+import time
+from pathlib import Path
+from uuid import uuid4
+
+from git import Repo
+from loguru import logger
+from pydantic import BaseModel
+
+
+class SparePoolStats(BaseModel):
+    depth: int = 0
+    hits: int = 0
+    misses: int = 0
+    created: int = 0
+    errors: int = 0
+
+
+class SpareRepositoryPool:
+    """
+    Keeps up to `size` empty bare repositories ready in `spare_dir`, so creating a repository is one rename.
+
+    Spares are initialised under a `.tmp` name and renamed once complete: anything without the suffix is
+    ready to use. Taking a spare is a rename as well, so several workers can share the directory safely.
+    Refills hold an exclusive flock on `LOCK_FILE`, otherwise every worker would top the pool up to `size`.
+    """
+
+    TMP_SUFFIX = ".tmp"
+    LOCK_FILE = ".refill.lock"
+    # A temporary spare older than this was left by a crashed worker
+    STALE_TMP_AGE = 600.0
+
+    def __init__(self, spare_dir: Path, size: int, interval: float) -> None:
+        self.spare_dir = spare_dir
+        self._size = size
+        self._interval = interval
+
+        self.stats = SparePoolStats()
+
+    def acquire(self, target: Path) -> bool:
+        """
+        Moves a spare repository to `target`. Returns False when the pool is empty.
+        Blocking: call it from a worker thread.
+        """
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        for spare in self._ready_spares():
+            try:
+                os.replace(spare, target)
+            except FileNotFoundError:
+                continue  # taken by another worker
+
+            self.stats.hits += 1
+            self.stats.depth = max(self.stats.depth - 1, 0)
+            return True
+
+        self.stats.misses += 1
+        return False
+
+    async def run(self) -> None:
+        logger.bind(size=self._size, interval=self._interval).info("Spare repository pool started")
+        await asyncio.to_thread(self._remove_stale)
+
+        while True:
+            try:
+                await self.refill()
+            except Exception:
+                self.stats.errors += 1
+                logger.exception("Spare repository pool refill failed")
+
+            await asyncio.sleep(self._interval)
+
+    async def refill(self) -> int:
+        """Tops the pool up to `size` and returns how many spares were created."""
+
+        depth, created = await asyncio.to_thread(self._refill)
+
+        self.stats.depth = depth
+        self.stats.created += created
+        return created
+
+    def _refill(self) -> tuple[int, int]:
+        """Counts and creates the missing spares under the lock. Returns the new depth and how many were created."""
+
+        self.spare_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.spare_dir / self.LOCK_FILE, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+
+            created = 0
+            depth = len(self._ready_spares())
+            while depth < self._size:
+                self._create_spare()
+                depth += 1
+                created += 1
+
+        return depth, created
+
+    def _create_spare(self) -> None:
+        name = uuid4().hex
+        tmp_path = self.spare_dir / f"{name}{self.TMP_SUFFIX}"
+        Repo.init(tmp_path, bare=True)
+        os.replace(tmp_path, self.spare_dir / name)
+
+    def _ready_spares(self) -> list[Path]:
+        if not self.spare_dir.exists():
+            return []
+        return [
+            path
+            for path in self.spare_dir.iterdir()
+            if not path.name.endswith(self.TMP_SUFFIX) and path.name != self.LOCK_FILE
+        ]
+
+    def _remove_stale(self) -> None:
+        if not self.spare_dir.exists():
+            return
+
+        now = time.time()
+        for path in self.spare_dir.glob(f"*{self.TMP_SUFFIX}"):
+            if now - path.stat().st_mtime > self.STALE_TMP_AGE:
+                shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,193 @@
+import json
+import queue
+import threading
+import urllib.request
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from typing import Any
+
+from loguru import logger
+
+from config.config import TracingConfig
+from infrastructure.tracing.tracer import AttributeValue, Span, SpanProcessor
+
+# OTLP enum values
+SPAN_KINDS = {"internal": 1, "server": 2, "client": 3}
+STATUS_CODES = {"unset": 0, "ok": 1, "error": 2}
+
+
+class AbstractSpanExporter(ABC):
+    @abstractmethod
+    def export(self, spans: Sequence[Span]) -> None:
+        pass
+
+    def shutdown(self) -> None:
+        """Flushes and releases the exporter's resources. Nothing to do by default."""
+        return None
+
+
+class InMemorySpanExporter(AbstractSpanExporter):
+    """Keeps finished spans in a list, for tests."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._spans: list[Span] = []
+
+    def export(self, spans: Sequence[Span]) -> None:
+        with self._lock:
+            self._spans.extend(spans)
+
+    @property
+    def spans(self) -> list[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+
+class OtlpHttpSpanExporter(AbstractSpanExporter):
+    """Sends spans to an OpenTelemetry collector with OTLP over HTTP, JSON encoded."""
+
+    def __init__(self, endpoint: str, service_name: str, headers: dict[str, str], timeout: float) -> None:
+        self._url = endpoint.rstrip("/") + "/v1/traces"
+        self._service_name = service_name
+        self._headers = {"Content-Type": "application/json", **headers}
+        self._timeout = timeout
+
+    def export(self, spans: Sequence[Span]) -> None:
+        request = urllib.request.Request(self._url, data=self.encode(spans), headers=self._headers, method="POST")
+        with urllib.request.urlopen(request, timeout=self._timeout) as response:
+            response.read()
+
+    def encode(self, spans: Sequence[Span]) -> bytes:
+        body = {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": _encode_attributes({"service.name": self._service_name})},
+                    "scopeSpans": [{"scope": {"name": self._service_name}, "spans": [_encode_span(i) for i in spans]}],
+                }
+            ]
+        }
+        return json.dumps(body, separators=(",", ":")).encode()
+
+
+def _encode_span(span: Span) -> dict[str, Any]:
+    encoded: dict[str, Any] = {
+        "traceId": span.context.trace_id,
+        "spanId": span.context.span_id,
+        "name": span.name,
+        "kind": SPAN_KINDS[span.kind],
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": _encode_attributes(span.attributes),
+        "status": {"code": STATUS_CODES[span.status], "message": span.status_message},
+    }
+    if span.parent_span_id is not None:
+        encoded["parentSpanId"] = span.parent_span_id
+    return encoded
+
+
+def _encode_attributes(attributes: dict[str, AttributeValue]) -> list[dict[str, Any]]:
+    encoded = []
+    for key, value in attributes.items():
+        # bool is checked first, it's a subclass of int. 64-bit integers are strings in OTLP JSON.
+        if isinstance(value, bool):
+            typed: dict[str, Any] = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        encoded.append({"key": key, "value": typed})
+    return encoded
+
+
+class SimpleSpanProcessor:
+    """Exports every span as it ends, on the thread that ended it. For tests and debugging."""
+
+    def __init__(self, exporter: AbstractSpanExporter) -> None:
+        self._exporter = exporter
+
+    def on_end(self, span: Span) -> None:
+        self._exporter.export([span])
+
+    def shutdown(self) -> None:
+        self._exporter.shutdown()
+
+
+class BatchSpanProcessor:
+    """
+    Queues finished spans and exports them in batches from a background thread.
+
+    Ending a span only puts it on a bounded queue. When the exporter can't keep up the queue fills and
+    further spans are dropped instead of slowing down requests or growing without bound.
+    """
+
+    def __init__(
+        self, exporter: AbstractSpanExporter, max_queue_size: int, max_batch_size: int, schedule_delay: float
+    ) -> None:
+        self._exporter = exporter
+        self._queue: queue.Queue[Span] = queue.Queue(maxsize=max_queue_size)
+        self._max_batch_size = max_batch_size
+        self._schedule_delay = schedule_delay
+        self._stopped = threading.Event()
+        self.dropped = 0
+
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+
+    def on_end(self, span: Span) -> None:
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def shutdown(self) -> None:
+        self._stopped.set()
+        self._thread.join(timeout=self._schedule_delay + 5)
+        self._exporter.shutdown()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._stopped.wait(self._schedule_delay)
+            while self._export_batch():
+                pass
+
+    def _export_batch(self) -> bool:
+        """Exports up to one batch, returns whether a full batch was sent and more may be waiting."""
+
+        batch: list[Span] = []
+        while len(batch) < self._max_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if not batch:
+            return False
+
+        try:
+            self._exporter.export(batch)
+        except Exception as e:
+            logger.bind(spans=len(batch), error=str(e)).warning("Failed to export spans")
+        return len(batch) == self._max_batch_size
+
+
+def create_span_processor(config: TracingConfig) -> SpanProcessor:
+    if config.exporter == "memory":
+        return SimpleSpanProcessor(InMemorySpanExporter())
+
+    exporter = OtlpHttpSpanExporter(
+        endpoint=config.otlp_endpoint,
+        service_name=config.service_name,
+        headers=config.otlp_headers,
+        timeout=config.export_timeout,
+    )
+    return BatchSpanProcessor(
+        exporter,
+        max_queue_size=config.max_queue_size,
+        max_batch_size=config.max_batch_size,
+        schedule_delay=config.schedule_delay,
+    )
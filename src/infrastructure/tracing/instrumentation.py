@@ -0,0 +1,132 @@
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import wraps
+from inspect import iscoroutinefunction
+from typing import Any, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExecutionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from application.ports.use_case import AbstractUseCase
+from infrastructure.tracing.tracer import TRACER, Span, Tracer, get_current_span
+
+T = TypeVar("T", bound=type)
+
+MAX_STATEMENT_LENGTH = 2048
+_INSTRUMENTED = "__traced__"
+
+
+def trace_async_methods(prefix: str, tracer: Tracer = TRACER) -> Callable[[T], T]:
+    """
+    Class decorator running every public coroutine method in a span named `<prefix>.<method>`.
+
+    Spans are only created inside a trace, calls made by background tasks are not traced.
+    """
+
+    def decorator(cls: T) -> T:
+        for name, method in list(vars(cls).items()):
+            if not name.startswith("_") and iscoroutinefunction(method):
+                setattr(cls, name, _traced(method, f"{prefix}.{name}", tracer))
+        return cls
+
+    return decorator
+
+
+def _traced(method: Callable[..., Any], span_name: str, tracer: Tracer) -> Callable[..., Any]:
+    @wraps(method)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with tracer.span(span_name, require_parent=True):
+            return await method(*args, **kwargs)
+
+    setattr(wrapper, _INSTRUMENTED, True)
+    return wrapper
+
+
+def instrument_use_cases(tracer: Tracer = TRACER) -> None:
+    """
+    Wraps `execute` of every imported `AbstractUseCase` subclass in a span named after the use case.
+    Must run after the use cases are imported, i.e. after the DI container is. Safe to call again.
+    """
+
+    pending: list[type] = [AbstractUseCase]
+    while pending:
+        cls = pending.pop()
+        pending.extend(cls.__subclasses__())
+
+        execute = vars(cls).get("execute")
+        if execute is None or not iscoroutinefunction(execute) or getattr(execute, _INSTRUMENTED, False):
+            continue
+        cls.execute = _traced(execute, f"use_case.{cls.__name__}", tracer)  # type: ignore[attr-defined]
+
+
+def instrument_engine(engine: AsyncEngine, tracer: Tracer = TRACER) -> None:
+    """Runs every statement in a client span carrying the SQL, never its parameters."""
+
+    sync_engine = engine.sync_engine
+    if getattr(sync_engine, _INSTRUMENTED, False):
+        return
+    setattr(sync_engine, _INSTRUMENTED, True)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def start_statement_span(
+        conn: Connection, cursor: Any, statement: str, parameters: Any, context: ExecutionContext, executemany: bool
+    ) -> None:
+        if not tracer.enabled or get_current_span() is None:
+            return
+        operation = statement.lstrip().split(" ", 1)[0].upper()
+        span = tracer.start_span(
+            f"db.{operation}",
+            kind="client",
+            attributes={
+                "db.system": sync_engine.dialect.name,
+                "db.operation": operation,
+                "db.statement": statement[:MAX_STATEMENT_LENGTH],
+            },
+        )
+        context._trace_span = span  # type: ignore[attr-defined]
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def end_statement_span(
+        conn: Connection, cursor: Any, statement: str, parameters: Any, context: ExecutionContext, executemany: bool
+    ) -> None:
+        span: Span | None = getattr(context, "_trace_span", None)
+        if span is not None:
+            tracer.end_span(span)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def fail_statement_span(exception_context: Any) -> None:
+        context = exception_context.execution_context
+        span: Span | None = getattr(context, "_trace_span", None) if context is not None else None
+        if span is not None:
+            span.record_exception(exception_context.original_exception)
+            tracer.end_span(span)
+
+
+class TracedThreadPoolExecutor(ThreadPoolExecutor):
+    """
+    Records how long work submitted from inside a trace waited for a free thread, as an `executor.queue`
+    span under the span that submitted it. `asyncio.to_thread` uses the loop's default executor, so the
+    time git operations spend queued is told apart from the time they run.
+    """
+
+    def __init__(self, *args: Any, tracer: Tracer = TRACER, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._tracer = tracer
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future[Any]:
+        parent = get_current_span() if self._tracer.enabled else None
+        if parent is None:
+            return super().submit(fn, *args, **kwargs)
+
+        tracer = self._tracer
+        queued_at = time.time_ns()
+
+        def run() -> Any:
+            span = tracer.start_span("executor.queue", parent=parent.context, start_ns=queued_at)
+            span.set_attribute("executor.queue_depth", self._work_queue.qsize())
+            tracer.end_span(span)
+            return fn(*args, **kwargs)
+
+        return super().submit(run)
@@ -0,0 +1,224 @@
+import random
+import re
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Literal, Protocol
+
+SpanKind = Literal["internal", "server", "client"]
+AttributeValue = str | int | float | bool
+
+TRACEPARENT_PATTERN = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+INVALID_TRACE_ID = "0" * 32
+INVALID_SPAN_ID = "0" * 16
+
+
+class SpanContext:
+    __slots__ = ("trace_id", "span_id", "sampled")
+
+    def __init__(self, trace_id: str, span_id: str, sampled: bool) -> None:
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.sampled = sampled
+
+    @classmethod
+    def from_traceparent(cls, header: str | None) -> "SpanContext | None":
+        """Parses a W3C `traceparent` header. Unknown versions and all-zero IDs are ignored."""
+
+        match = TRACEPARENT_PATTERN.match(header.strip().lower()) if header else None
+        if match is None:
+            return None
+        trace_id, span_id, flags = match.groups()
+        if trace_id == INVALID_TRACE_ID or span_id == INVALID_SPAN_ID:
+            return None
+        return cls(trace_id=trace_id, span_id=span_id, sampled=bool(int(flags, 16) & 1))
+
+    def to_traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+class Span:
+    """One timed operation. Spans of unsampled traces are still created, so that their children know it."""
+
+    __slots__ = (
+        "name",
+        "context",
+        "parent_span_id",
+        "kind",
+        "start_ns",
+        "end_ns",
+        "attributes",
+        "status",
+        "status_message",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        context: SpanContext,
+        parent_span_id: str | None,
+        kind: SpanKind,
+        start_ns: int,
+        attributes: dict[str, AttributeValue] | None = None,
+    ) -> None:
+        self.name = name
+        self.context = context
+        self.parent_span_id = parent_span_id
+        self.kind = kind
+        self.start_ns = start_ns
+        self.end_ns: int | None = None
+        self.attributes: dict[str, AttributeValue] = attributes or {}
+        self.status: Literal["unset", "ok", "error"] = "unset"
+        self.status_message = ""
+
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        self.attributes[key] = value
+
+    def record_exception(self, exception: BaseException) -> None:
+        self.status = "error"
+        self.status_message = f"{type(exception).__name__}: {exception}"
+
+    @property
+    def duration(self) -> float:
+        """Seconds, 0 while the span is still running."""
+
+        return (self.end_ns - self.start_ns) / 1e9 if self.end_ns is not None else 0.0
+
+
+class SpanProcessor(Protocol):
+    def on_end(self, span: Span) -> None: ...
+
+    def shutdown(self) -> None: ...
+
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def get_current_span() -> Span | None:
+    return _current_span.get()
+
+
+class Tracer:
+    """
+    Creates spans and hands the finished, sampled ones to a processor.
+
+    The current span is kept in a context variable. `asyncio.to_thread`, tasks and SQLAlchemy's greenlets
+    copy the context, so spans started there get the right parent without passing it around. Without a
+    processor the tracer is disabled and `span` costs one attribute check.
+    """
+
+    def __init__(self) -> None:
+        self._processor: SpanProcessor | None = None
+        self.service_name = ""
+        self.sample_ratio = 1.0
+
+    def configure(self, processor: SpanProcessor | None, service_name: str, sample_ratio: float = 1.0) -> None:
+        if self._processor is not None and self._processor is not processor:
+            self._processor.shutdown()
+        self._processor = processor
+        self.service_name = service_name
+        self.sample_ratio = sample_ratio
+
+    def shutdown(self) -> None:
+        """Flushes the spans still queued and disables the tracer."""
+
+        processor, self._processor = self._processor, None
+        if processor is not None:
+            processor.shutdown()
+
+    @property
+    def enabled(self) -> bool:
+        return self._processor is not None
+
+    def start_span(
+        self,
+        name: str,
+        kind: SpanKind = "internal",
+        attributes: dict[str, AttributeValue] | None = None,
+        parent: SpanContext | None = None,
+        trace_id: str | None = None,
+        start_ns: int | None = None,
+    ) -> Span:
+        """
+        Starts a span under `parent`, or the current span when no parent is given. A root span gets
+        `trace_id` if set, a random one otherwise, and is sampled with `sample_ratio`.
+
+        The span isn't made current, see `activate`.
+        """
+
+        if parent is None:
+            current = _current_span.get()
+            parent = current.context if current is not None else None
+
+        if parent is not None:
+            context = SpanContext(trace_id=parent.trace_id, span_id=_random_id(64), sampled=parent.sampled)
+        else:
+            context = SpanContext(
+                trace_id=trace_id or _random_id(128),
+                span_id=_random_id(64),
+                sampled=random.random() < self.sample_ratio,
+            )
+
+        return Span(
+            name=name,
+            context=context,
+            parent_span_id=parent.span_id if parent is not None else None,
+            kind=kind,
+            start_ns=start_ns if start_ns is not None else time.time_ns(),
+            attributes=attributes,
+        )
+
+    def end_span(self, span: Span, end_ns: int | None = None) -> None:
+        span.end_ns = end_ns if end_ns is not None else time.time_ns()
+        processor = self._processor
+        if processor is not None and span.context.sampled:
+            processor.on_end(span)
+
+    @staticmethod
+    def activate(span: Span) -> Token[Span | None]:
+        return _current_span.set(span)
+
+    @staticmethod
+    def deactivate(token: Token[Span | None]) -> None:
+        _current_span.reset(token)
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        kind: SpanKind = "internal",
+        attributes: dict[str, AttributeValue] | None = None,
+        require_parent: bool = False,
+    ) -> Iterator[Span | None]:
+        """
+        Runs the block in a new current span, recording an exception that escapes it.
+
+        With `require_parent` no span is created outside of a trace, so that background work such as the
+        reaper's doesn't start a trace per statement.
+        """
+
+        if self._processor is None or (require_parent and _current_span.get() is None):
+            yield None
+            return
+
+        span = self.start_span(name, kind=kind, attributes=attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            self.end_span(span)
+
+
+def _random_id(bits: int) -> str:
+    value = 0
+    while value == 0:
+        value = random.getrandbits(bits)
+    return f"{value:0{bits // 4}x}"
+
+
+TRACER = Tracer()
@@ -0,0 +1,24 @@
+import threading
+
+
+class ConditionalRequestStats:
+    """Counts git reads and how many of the conditional ones were answered with 304 Not Modified."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+
+        self.requests = 0
+        self.conditional = 0
+        self.not_modified = 0
+
+    def record(self, conditional: bool, not_modified: bool) -> None:
+        with self._lock:
+            self.requests += 1
+            self.conditional += conditional
+            self.not_modified += not_modified
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of conditional requests that didn't need a body."""
+
+        return self.not_modified / self.conditional if self.conditional else 0.0
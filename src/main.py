@@ -1,39 +1,149 @@
 import asyncio
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
 
 import uvicorn
-from asgiref.wsgi import WsgiToAsgi
-from flask import Flask
 
 from api import router as api_router
 from config import settings
+from config.logging import sampler, sink
 from infrastructure.database.db_helper import check_connection, db_helper
 from infrastructure.di.container import Container
+from infrastructure.metrics.instruments import (
+    HTTP_REQUEST_SECONDS,
+    REGISTRY,
+    register_access_token_revocations,
+    register_caches,
+    register_executors,
+    register_logging,
+    register_password_hasher,
+    register_pool,
+    register_refresh_token_purger,
+    register_statements,
+)
+from infrastructure.middleware.auth import setup_auth
+from infrastructure.middleware.compression import setup_compression_middleware
 from infrastructure.middleware.errors import register_error_handlers
+from infrastructure.middleware.metrics import setup_metrics
+from infrastructure.middleware.profiling import setup_profiling
+from infrastructure.middleware.rate_limit import setup_rate_limiting
 from infrastructure.middleware.setup import setup_logging_middleware
+from infrastructure.middleware.tracing import setup_tracing
+from infrastructure.server.asgi import FlaskAsgiApp, LoopBoundFlask
+from infrastructure.tracing.exporters import create_span_processor
+from infrastructure.tracing.instrumentation import instrument_engine, instrument_use_cases
+from infrastructure.tracing.tracer import TRACER
 
 
-def create_app() -> Flask:
+def create_app() -> LoopBoundFlask:
     container = Container()
 
     container.wire(modules=["api.v1.auth", "api.v1.repository"])
 
-    app = Flask(__name__)
+    app = LoopBoundFlask(__name__)
+    app.container = container  # type: ignore[attr-defined]
     app.url_map.strict_slashes = False
 
+    if settings.metrics.enabled:
+        # First, so that the time spent in the other hooks is measured too
+        setup_metrics(app, REGISTRY, HTTP_REQUEST_SECONDS, settings.metrics.path)
     setup_logging_middleware(app)
+    if settings.tracing.enabled:
+        TRACER.configure(
+            create_span_processor(settings.tracing),
+            service_name=settings.tracing.service_name,
+            sample_ratio=settings.tracing.sample_ratio,
+        )
+        instrument_use_cases()
+        instrument_engine(db_helper.engine)
+        setup_tracing(app, TRACER)
+    setup_profiling(
+        app,
+        profiler=container.services.profiler(),
+        store=container.services.profile_store(),
+        config=settings.profiling,
+    )
+    access_token_cache = container.services.access_token_cache() if settings.auth.access_token_cache.enabled else None
+    revocations = (
+        container.services.access_token_revocations() if settings.auth.access_token_revocation.enabled else None
+    )
+    setup_auth(app, container.services.token_service(), access_token_cache, revocations)
     register_error_handlers(app)
+    compression_cache = setup_compression_middleware(app, settings.compression)
+    setup_rate_limiting(app, container.services.rate_limiter() if settings.rate_limit.enabled else None)
+
+    metadata_cache = container.storages.git_storage().metadata_cache
+    conditional_stats = container.services.conditional_stats()
+    register_pool(REGISTRY, db_helper.engine.pool)
+    register_logging(REGISTRY, sink, sampler)
+    register_password_hasher(REGISTRY, container.services.password_hasher())
+    register_refresh_token_purger(REGISTRY, container.services.refresh_token_purger())
+    if revocations is not None:
+        register_access_token_revocations(REGISTRY, revocations)
+    if db_helper.slow_query_monitor is not None:
+        register_statements(REGISTRY, db_helper.slow_query_monitor)
+    caches: dict[str, Callable[[], tuple[float, float]]] = {
+        "blob_metadata": lambda: (metadata_cache.hits, metadata_cache.misses),
+        "compressed_responses": lambda: (compression_cache.hits, compression_cache.misses),
+        "etag_not_modified": lambda: (
+            conditional_stats.not_modified,
+            conditional_stats.conditional - conditional_stats.not_modified,
+        ),
+    }
+    if access_token_cache is not None:
+        caches["verified_access_tokens"] = lambda: (access_token_cache.hits, access_token_cache.misses)
+    register_caches(REGISTRY, caches)
 
     app.register_blueprint(api_router)
 
     return app
 
 
-app: Flask = create_app()
-asgi_app = WsgiToAsgi(app)  # type: ignore
+@asynccontextmanager
+async def lifespan() -> AsyncIterator[None]:
+    """
+    Starts the background work of the served app. uvicorn imports `main:asgi_app` by name, which creates a
+    second app next to the one in the `__main__` module `run_server` runs from, so nothing is started there.
+    """
+
+    await check_connection()
+    container: Container = app.container  # type: ignore[attr-defined]
+
+    if settings.auth.access_token_revocation.enabled:
+        # Loaded before the first request, so that tokens revoked before startup are rejected right away
+        await container.services.access_token_revocations().reload()
+
+    background_tasks = [asyncio.create_task(container.storages.reaper().run())]
+    if settings.git.spare_pool.size > 0:
+        background_tasks.append(asyncio.create_task(container.storages.spare_pool().run()))
+    if settings.auth.access_token_revocation.enabled:
+        background_tasks.append(asyncio.create_task(container.services.access_token_revocations().run()))
+    if settings.auth.refresh_token_purge.enabled:
+        background_tasks.append(asyncio.create_task(container.services.refresh_token_purger().run()))
+
+    try:
+        yield
+    finally:
+        for task in background_tasks:
+            task.cancel()
+        await asyncio.gather(*background_tasks, return_exceptions=True)
+        container.storages.bundle_import_runner().shutdown()
+        container.services.password_hasher().shutdown()
+        TRACER.shutdown()
+        await db_helper.dispose()
+
+
+app: LoopBoundFlask = create_app()
+asgi_app = FlaskAsgiApp(
+    app,
+    wsgi_threads=settings.run.wsgi_threads,
+    executor_threads=settings.run.executor_threads,
+    lifespan=lifespan,
+)
+register_executors(REGISTRY, lambda: asgi_app.executors)
 
 
 async def run_server() -> None:
-    await check_connection()
     config = uvicorn.Config(
         "main:asgi_app",
         host=settings.run.host,
@@ -41,11 +151,7 @@ async def run_server() -> None:
         reload=settings.run.reload,
     )
     server = uvicorn.Server(config)
-
-    try:
-        await server.serve()
-    finally:
-        await db_helper.dispose()
+    await server.serve()
 
 
 if __name__ == "__main__":
@@ -12,6 +12,7 @@ from uuid import uuid4
 
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from utils import generate_pem_pair
 
 from config import settings
 from domain.entities.user import User
@@ -24,33 +25,38 @@ def project_root() -> Path:
 
 
 @pytest.fixture(scope="session")
-def test_secrets_dir(project_root: Path) -> Path:
-    return project_root / "tests" / "secrets"
+def test_images_dir(project_root: Path) -> Path:
+    return project_root / "tests" / "images"
 
 
 @pytest.fixture(scope="session")
-def test_images_dir(project_root: Path) -> Path:
-    return project_root / "tests" / "images"
+def key_pair() -> tuple[str, str]:
+    return generate_pem_pair()
+
+
+@pytest.fixture(scope="session")
+def another_key_pair() -> tuple[str, str]:
+    return generate_pem_pair()
 
 
 @pytest.fixture(scope="session")
-def private_key(test_secrets_dir: Path) -> str:
-    return (test_secrets_dir / "test-private.pem").read_text()
+def private_key(key_pair: tuple[str, str]) -> str:
+    return key_pair[0]
 
 
 @pytest.fixture(scope="session")
-def another_private_key(test_secrets_dir: Path) -> str:
-    return (test_secrets_dir / "another-private.pem").read_text()
+def another_private_key(another_key_pair: tuple[str, str]) -> str:
+    return another_key_pair[0]
 
 
 @pytest.fixture(scope="session")
-def public_key(test_secrets_dir: Path) -> str:
-    return (test_secrets_dir / "test-public.pem").read_text()
+def public_key(key_pair: tuple[str, str]) -> str:
+    return key_pair[1]
 
 
 @pytest.fixture(scope="session")
-def another_public_key(test_secrets_dir: Path) -> str:
-    return (test_secrets_dir / "another-public.pem").read_text()
+def another_public_key(another_key_pair: tuple[str, str]) -> str:
+    return another_key_pair[1]
 
 
 @pytest.fixture
@@ -70,9 +70,9 @@ class TestAuthenticationService:
         user = await self.service(session)._authenticate_user(credentials)
         assert user.email == self.data.email
 
-    def test_check_password_logic(self, session: AsyncSession) -> None:
+    async def test_check_password_logic(self, session: AsyncSession) -> None:
         password = "test_password"
         hashed = bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
 
-        assert self.service(session).check_password(password, hashed) is True
-        assert self.service(session).check_password("wrong", hashed) is False
+        assert await self.service(session).check_password(password, hashed) is True
+        assert await self.service(session).check_password("wrong", hashed) is False
@@ -53,7 +53,7 @@ class TestRegistrationService:
             self.service(session)._check_username_policy(username)
 
     async def test_prepare_user_create_schema_mapping(self, session: AsyncSession) -> None:
-        schema = self.service(session).prepare_user_create_schema(**asdict(self.data))
+        schema = await self.service(session).prepare_user_create_schema(**asdict(self.data))
         assert schema.email == self.data.email
         assert schema.username == self.data.username
         assert bcrypt.checkpw(self.data.password.encode(), schema.password_hash.encode())
@@ -0,0 +1,152 @@
+import io
+import subprocess
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Generator
+from uuid import uuid4
+
+import pytest
+
+from domain.exceptions.git import (
+    BundleExportException,
+    BundleTooLargeException,
+    EmptyRepositoryException,
+    InvalidBundleException,
+)
+from domain.schemas.repository_storage import InitRepositorySchema, UpdateFileSchema
+from domain.value_objects.git import Author
+from infrastructure.storage.bundle_import import BundleImportRunner
+from infrastructure.storage.git_storage import GitPythonStorage
+
+
+@pytest.fixture
+def git_storage() -> Generator[GitPythonStorage, None, None]:
+    with TemporaryDirectory(prefix="test_") as tmp:
+        yield GitPythonStorage(repositories_dir=Path(tmp))
+
+
+@pytest.fixture
+async def source_repo(git_storage: GitPythonStorage) -> str:
+    await git_storage.init_repository(InitRepositorySchema(repo_path="source"))
+    await git_storage.update_file(
+        UpdateFileSchema(
+            repo_path="source",
+            file_path="file.txt",
+            content="content",
+            branch_name="main",
+            message="Add file",
+            author=Author(name="test-user", email="test@example.com"),
+        )
+    )
+    return "source"
+
+
+class TestBundles:
+    @staticmethod
+    def git_run(repo_dir: Path, *args: str) -> str:
+        return subprocess.run(["git", *args], cwd=repo_dir, capture_output=True, text=True, check=True).stdout.strip()
+
+    async def _export(self, git_storage: GitPythonStorage, repo_path: str) -> bytes:
+        return b"".join(await git_storage.open_bundle_stream(repo_path=repo_path, chunk_size=1024, buffer_size=1024**2))
+
+    async def test_export_and_import_round_trip(self, git_storage: GitPythonStorage, source_repo: str) -> None:
+        data = await self._export(git_storage, source_repo)
+        bundle_path = await git_storage.save_bundle(io.BytesIO(data), max_size=len(data), chunk_size=100)
+        await git_storage.verify_bundle(bundle_path)
+
+        await git_storage.init_repository(InitRepositorySchema(repo_path="imported"))
+        git_storage.import_bundle(repo_path="imported", bundle_path=bundle_path)
+
+        imported_dir = git_storage.base_path / "imported"
+        assert self.git_run(imported_dir, "cat-file", "-p", "HEAD:file.txt") == "content"
+        assert self.git_run(imported_dir, "symbolic-ref", "HEAD") == "refs/heads/main"
+        assert not bundle_path.exists()
+
+    async def test_export_empty_repository_raises_exception(self, git_storage: GitPythonStorage) -> None:
+        await git_storage.init_repository(InitRepositorySchema(repo_path="empty"))
+
+        with pytest.raises(EmptyRepositoryException):
+            await git_storage.open_bundle_stream(repo_path="empty", chunk_size=1024, buffer_size=1024**2)
+
+    def _corrupt(self, git_storage: GitPythonStorage, repo_path: str) -> None:
+        repo_dir = git_storage.base_path / repo_path
+        blob_sha = self.git_run(repo_dir, "rev-parse", "main:file.txt")
+        (repo_dir / "objects" / blob_sha[:2] / blob_sha[2:]).unlink()
+
+    async def test_export_failure_is_raised_before_stream(
+        self, git_storage: GitPythonStorage, source_repo: str
+    ) -> None:
+        self._corrupt(git_storage, source_repo)
+
+        with pytest.raises(BundleExportException):
+            await git_storage.open_bundle_stream(repo_path=source_repo, chunk_size=1024, buffer_size=1024**2)
+
+    async def test_export_failure_after_buffer_raises_from_stream(
+        self, git_storage: GitPythonStorage, source_repo: str
+    ) -> None:
+        self._corrupt(git_storage, source_repo)
+        stream = await git_storage.open_bundle_stream(repo_path=source_repo, chunk_size=1, buffer_size=1)
+
+        with pytest.raises(BundleExportException):
+            b"".join(stream)
+
+    async def test_save_too_large_bundle_raises_exception(self, git_storage: GitPythonStorage) -> None:
+        with pytest.raises(BundleTooLargeException):
+            await git_storage.save_bundle(io.BytesIO(b"x" * 10), max_size=5, chunk_size=2)
+
+        assert not any(git_storage.imports_path.iterdir())
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            b"not a bundle",
+            b"# v2 git bundle\n\n",
+            b"# v2 git bundle\n-" + b"a" * 40 + b" parent\n" + b"b" * 40 + b" refs/heads/main\n\n",
+        ],
+    )
+    async def test_verify_invalid_bundle_raises_exception(self, git_storage: GitPythonStorage, content: bytes) -> None:
+        bundle_path = await git_storage.save_bundle(io.BytesIO(content), max_size=1024, chunk_size=1024)
+
+        with pytest.raises(InvalidBundleException):
+            await git_storage.verify_bundle(bundle_path)
+
+    async def test_import_runner_reports_status(self, git_storage: GitPythonStorage, source_repo: str) -> None:
+        runner = BundleImportRunner(git_storage=git_storage, max_workers=1, job_ttl=60)
+        data = await self._export(git_storage, source_repo)
+        bundle_path = await git_storage.save_bundle(io.BytesIO(data), max_size=len(data), chunk_size=1024)
+        await git_storage.init_repository(InitRepositorySchema(repo_path="imported"))
+        repository_id = uuid4()
+
+        runner.submit(repository_id=repository_id, repo_path="imported", bundle_path=bundle_path)
+
+        for _ in range(100):
+            job = runner.get(repository_id)
+            assert job is not None
+            if job.finished_at:
+                break
+            time.sleep(0.05)
+
+        assert job.status == "succeeded"
+        assert runner.get(uuid4()) is None
+        runner.shutdown()
+
+    async def test_import_status_is_shared_between_workers(
+        self, git_storage: GitPythonStorage, source_repo: str
+    ) -> None:
+        runner = BundleImportRunner(git_storage=git_storage, max_workers=1, job_ttl=60)
+        other_worker = BundleImportRunner(git_storage=git_storage, max_workers=1, job_ttl=60)
+        repository_id = uuid4()
+
+        runner.submit(repository_id=repository_id, repo_path="missing", bundle_path=git_storage.base_path / "none")
+
+        for _ in range(100):
+            job = other_worker.get(repository_id)
+            assert job is not None
+            if job.finished_at:
+                break
+            time.sleep(0.05)
+
+        assert job.status == "failed"
+        runner.shutdown()
+        other_worker.shutdown()
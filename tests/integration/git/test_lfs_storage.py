@@ -0,0 +1,59 @@
+import hashlib
+import io
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Generator
+
+import pytest
+
+from domain.exceptions.git import LargeObjectIntegrityException, LargeObjectNotFoundException
+from infrastructure.storage.lfs_storage import LocalLargeObjectStorage
+
+
+@pytest.fixture
+def lfs_storage() -> Generator[LocalLargeObjectStorage, None, None]:
+    with TemporaryDirectory(prefix="test_") as tmp:
+        yield LocalLargeObjectStorage(objects_dir=Path(tmp) / "objects", chunk_size=4)
+
+
+class TestLocalLargeObjectStorage:
+    data = b"large binary content"
+    oid = hashlib.sha256(data).hexdigest()
+
+    async def test_save_and_open(self, lfs_storage: LocalLargeObjectStorage) -> None:
+        await lfs_storage.save(oid=self.oid, size=len(self.data), stream=io.BytesIO(self.data))
+
+        assert await lfs_storage.get_size(self.oid) == len(self.data)
+        assert b"".join(await lfs_storage.open(self.oid)) == self.data
+        assert (lfs_storage.objects_dir / self.oid[:2] / self.oid[2:4] / self.oid).exists()
+
+    async def test_save_bytes_deduplicates(self, lfs_storage: LocalLargeObjectStorage) -> None:
+        first = await lfs_storage.save_bytes(self.data)
+        second = await lfs_storage.save_bytes(self.data)
+
+        assert first == second
+        assert first.oid == self.oid
+        assert first.to_text() == (
+            f"version https://git-lfs.github.com/spec/v1\noid sha256:{self.oid}\nsize {len(self.data)}\n"
+        )
+
+    @pytest.mark.parametrize(
+        "oid, size",
+        [
+            (hashlib.sha256(b"other").hexdigest(), len(data)),
+            (oid, len(data) - 1),
+            (oid, len(data) + 1),
+        ],
+    )
+    async def test_save_rejects_mismatch(self, lfs_storage: LocalLargeObjectStorage, oid: str, size: int) -> None:
+        with pytest.raises(LargeObjectIntegrityException):
+            await lfs_storage.save(oid=oid, size=size, stream=io.BytesIO(self.data))
+
+        assert await lfs_storage.get_size(oid) is None
+        assert not any((lfs_storage.objects_dir / "tmp").iterdir())
+
+    async def test_open_missing_object_raises_exception(self, lfs_storage: LocalLargeObjectStorage) -> None:
+        assert await lfs_storage.get_size(self.oid) is None
+
+        with pytest.raises(LargeObjectNotFoundException):
+            await lfs_storage.open(self.oid)
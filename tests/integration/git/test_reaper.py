@@ -0,0 +1,72 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Generator
+
+import pytest
+
+from domain.schemas.repository_storage import ForkRepositorySchema, InitRepositorySchema
+from infrastructure.storage.git_storage import GitPythonStorage
+from infrastructure.storage.reaper import TombstoneReaper
+
+
+@pytest.fixture
+def git_storage() -> Generator[GitPythonStorage, None, None]:
+    with TemporaryDirectory(prefix="test_") as tmp:
+        yield GitPythonStorage(repositories_dir=Path(tmp))
+
+
+@pytest.fixture
+def reaper(git_storage: GitPythonStorage) -> TombstoneReaper:
+    return TombstoneReaper(
+        git_storage=git_storage, interval=0, files_per_batch=2, batch_pause=0, pool_min_age=0, min_age=0
+    )
+
+
+class TestTombstoneReaper:
+    async def test_reap_removes_tombstones(self, git_storage: GitPythonStorage, reaper: TombstoneReaper) -> None:
+        for repo_path in ("repo-1", "repo-2"):
+            await git_storage.init_repository(InitRepositorySchema(repo_path=repo_path))
+            await git_storage.delete_repository(repo_path=repo_path)
+
+        assert await reaper.reap() == 2
+
+        assert not any(git_storage.trash_path.iterdir())
+        assert reaper.stats.tombstones_reaped == 2
+        assert reaper.stats.tombstones_pending == 0
+        assert reaper.stats.files_removed > 2  # more than one batch per tombstone
+        assert reaper.stats.runs == 1
+
+    async def test_reap_keeps_fresh_tombstones(self, git_storage: GitPythonStorage) -> None:
+        reaper = TombstoneReaper(
+            git_storage=git_storage, interval=0, files_per_batch=2, batch_pause=0, pool_min_age=0, min_age=60
+        )
+        await git_storage.init_repository(InitRepositorySchema(repo_path="repo"))
+        tombstone = await git_storage.delete_repository(repo_path="repo")
+
+        assert await reaper.reap() == 0
+
+        assert tombstone is not None
+        assert (git_storage.trash_path / tombstone).is_dir()
+        assert reaper.stats.tombstones_pending == 1
+
+        await git_storage.restore_repository(repo_path="repo", tombstone=tombstone)
+        assert (git_storage.base_path / "repo").is_dir()
+
+    async def test_reap_without_trash(self, reaper: TombstoneReaper) -> None:
+        assert await reaper.reap() == 0
+        assert reaper.stats.runs == 1
+
+    async def test_reap_releases_orphan_pools(self, git_storage: GitPythonStorage, reaper: TombstoneReaper) -> None:
+        await git_storage.init_repository(InitRepositorySchema(repo_path="source"))
+        await git_storage.fork_repository(ForkRepositorySchema(source_repo_path="source", repo_path="fork"))
+
+        await git_storage.delete_repository(repo_path="source")
+        await reaper.reap()
+        assert len(list(git_storage.pools_path.iterdir())) == 1
+
+        await git_storage.delete_repository(repo_path="fork")
+        await reaper.reap()
+
+        assert not any(git_storage.pools_path.iterdir())
+        assert not any(git_storage.trash_path.iterdir())
+        assert reaper.stats.pools_released == 1
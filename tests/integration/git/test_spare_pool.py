@@ -0,0 +1,70 @@
+import asyncio
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Generator
+
+import pytest
+from git import Repo
+
+from domain.schemas.repository_storage import InitRepositorySchema
+from infrastructure.storage.git_storage import GitPythonStorage
+from infrastructure.storage.spare_pool import SpareRepositoryPool
+
+
+@pytest.fixture
+def temp_storage_path() -> Generator[Path, None, None]:
+    with TemporaryDirectory(prefix="test_") as tmp:
+        yield Path(tmp)
+
+
+@pytest.fixture
+def spare_pool(temp_storage_path: Path) -> SpareRepositoryPool:
+    return SpareRepositoryPool(spare_dir=temp_storage_path / GitPythonStorage.SPARE_DIR_NAME, size=2, interval=0)
+
+
+class TestSpareRepositoryPool:
+    async def test_refill_tops_up_pool(self, spare_pool: SpareRepositoryPool) -> None:
+        assert await spare_pool.refill() == 2
+        assert await spare_pool.refill() == 0
+
+        assert spare_pool.stats.depth == 2
+        assert spare_pool.stats.created == 2
+
+    async def test_workers_refilling_together_do_not_overfill(self, temp_storage_path: Path) -> None:
+        spare_dir = temp_storage_path / GitPythonStorage.SPARE_DIR_NAME
+        workers = [SpareRepositoryPool(spare_dir=spare_dir, size=3, interval=0) for _ in range(4)]
+
+        created = await asyncio.gather(*(worker.refill() for worker in workers))
+
+        assert sum(created) == 3
+        assert len([path for path in spare_dir.iterdir() if path.name != SpareRepositoryPool.LOCK_FILE]) == 3
+
+    async def test_acquire_moves_spare_into_place(
+        self, spare_pool: SpareRepositoryPool, temp_storage_path: Path
+    ) -> None:
+        await spare_pool.refill()
+        target = temp_storage_path / "user_1" / "repository_1"
+
+        assert spare_pool.acquire(target)
+
+        assert Repo(target).bare
+        assert spare_pool.stats.hits == 1
+        assert spare_pool.stats.depth == 1
+
+    async def test_acquire_from_empty_pool(self, spare_pool: SpareRepositoryPool, temp_storage_path: Path) -> None:
+        assert not spare_pool.acquire(temp_storage_path / "repo")
+        assert spare_pool.stats.misses == 1
+
+    async def test_init_repository_uses_pool_and_falls_back(
+        self, spare_pool: SpareRepositoryPool, temp_storage_path: Path
+    ) -> None:
+        git_storage = GitPythonStorage(repositories_dir=temp_storage_path, spare_pool=spare_pool)
+        await spare_pool.refill()
+
+        for i in range(3):
+            fs_repo = await git_storage.init_repository(InitRepositorySchema(repo_path=f"repo-{i}"))
+            assert Repo(fs_repo.full_path).bare
+
+        assert spare_pool.stats.hits == 2
+        assert spare_pool.stats.misses == 1
+        assert await git_storage.repository_exists("repo-2")
@@ -1,5 +1,7 @@
+import asyncio
 import base64
 import subprocess
+import time
 from pathlib import Path
 from tempfile import TemporaryDirectory
 from typing import Generator
@@ -14,6 +16,7 @@ from domain.exceptions.git import (
     FileNotFoundException,
     IsDirectoryException,
     IsFileException,
+    RepositoryNotFoundException,
     UnmergedBranchDeletionException,
 )
 from domain.schemas.repository_storage import (
@@ -21,11 +24,13 @@ from domain.schemas.repository_storage import (
     CreateInitialCommitSchema,
     DeleteBranchSchema,
     DeleteFileSchema,
+    ForkRepositorySchema,
     GetCommitsSchema,
     GetFileSchema,
     GetRefsSchema,
     GetTreeSchema,
     InitRepositorySchema,
+    ListBranchesSchema,
     UpdateFileSchema,
 )
 from domain.value_objects.git import Author
@@ -81,9 +86,150 @@ class TestGitPythonStorage:
         temp_storage_path: Path,
     ) -> None:
         await git_storage.init_repository(self.init_schema)
-        await git_storage.delete_repository(repo_path=self.init_schema.repo_path)
+        tombstone = await git_storage.delete_repository(repo_path=self.init_schema.repo_path)
 
         assert not (temp_storage_path / self.init_schema.repo_path).exists()
+        assert tombstone is not None
+        assert (git_storage.trash_path / tombstone / "HEAD").exists()
+
+    async def test_delete_non_existing_repository_returns_none(self, git_storage: GitPythonStorage) -> None:
+        assert await git_storage.delete_repository(repo_path="ghost") is None
+
+    async def test_restore_repository(
+        self,
+        git_storage: GitPythonStorage,
+        author: Author,
+    ) -> None:
+        await git_storage.init_repository(self.init_schema)
+        await self._commit_file(git_storage, author, self.init_schema.repo_path, "content")
+        await git_storage.fork_repository(
+            ForkRepositorySchema(source_repo_path=self.init_schema.repo_path, repo_path="fork-repo")
+        )
+
+        tombstone = await git_storage.delete_repository(repo_path="fork-repo")
+        assert tombstone is not None
+        await git_storage.restore_repository(repo_path="fork-repo", tombstone=tombstone)
+
+        fork_dir = git_storage.base_path / "fork-repo"
+        assert self.git_run(fork_dir, "cat-file", "-p", f"{self.default_branch}:file.txt") == "content"
+        assert not any(git_storage.trash_path.iterdir())
+
+        # The restored repository is a pool member again, so the pool outlives the source
+        await git_storage.delete_repository(repo_path=self.init_schema.repo_path)
+        assert git_storage.tombstone_orphan_pools(min_age=0) == 0
+
+    async def _commit_file(self, git_storage: GitPythonStorage, author: Author, repo_path: str, content: str) -> str:
+        commit = await git_storage.update_file(
+            UpdateFileSchema(
+                repo_path=repo_path,
+                file_path="file.txt",
+                content=content,
+                branch_name=self.default_branch,
+                message=content,
+                author=author,
+            )
+        )
+        return commit.commit_hash
+
+    async def test_fork_repository_shares_objects(
+        self,
+        git_storage: GitPythonStorage,
+        author: Author,
+    ) -> None:
+        await git_storage.init_repository(self.init_schema)
+        source_head = await self._commit_file(git_storage, author, self.init_schema.repo_path, "source content")
+
+        fork = await git_storage.fork_repository(
+            ForkRepositorySchema(source_repo_path=self.init_schema.repo_path, repo_path="fork-repo")
+        )
+
+        assert (fork.full_path / "objects" / "info" / "alternates").exists()
+        assert self.git_run(fork.full_path, "rev-parse", self.default_branch) == source_head
+        assert self.git_run(fork.full_path, "cat-file", "-p", f"{self.default_branch}:file.txt") == "source content"
+        self.git_run(fork.full_path, "rev-list", "--objects", "--all")
+
+        # Both repositories keep working independently after the fork
+        fork_head = await self._commit_file(git_storage, author, "fork-repo", "fork content")
+        await self._commit_file(git_storage, author, self.init_schema.repo_path, "new source content")
+
+        assert self.git_run(fork.full_path, "rev-parse", self.default_branch) == fork_head
+        source_dir = git_storage.base_path / self.init_schema.repo_path
+        assert self.git_run(source_dir, "cat-file", "-p", f"{self.default_branch}:file.txt") == "new source content"
+
+    async def test_concurrent_first_forks_share_one_pool(
+        self, git_storage: GitPythonStorage, author: Author, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        await git_storage.init_repository(self.init_schema)
+        source_head = await self._commit_file(git_storage, author, self.init_schema.repo_path, "source content")
+
+        # Widens the window between finding no pool and creating one, every fork would create its own unlocked
+        get_pool_objects = git_storage._get_pool_objects
+
+        def slow_get_pool_objects(repo_dir: Path) -> Path | None:
+            pool_objects = get_pool_objects(repo_dir)
+            time.sleep(0.05)
+            return pool_objects
+
+        monkeypatch.setattr(git_storage, "_get_pool_objects", slow_get_pool_objects)
+        forks = await asyncio.gather(
+            *(
+                git_storage.fork_repository(
+                    ForkRepositorySchema(source_repo_path=self.init_schema.repo_path, repo_path=f"fork-{i}")
+                )
+                for i in range(4)
+            )
+        )
+
+        assert len(list(git_storage.pools_path.iterdir())) == 1
+        for fork in forks:
+            assert self.git_run(fork.full_path, "rev-parse", self.default_branch) == source_head
+            self.git_run(fork.full_path, "rev-list", "--objects", "--all")
+        self.git_run(git_storage.base_path / self.init_schema.repo_path, "rev-list", "--objects", "--all")
+
+    async def test_fork_of_fork_sees_objects_created_after_first_fork(
+        self,
+        git_storage: GitPythonStorage,
+        author: Author,
+    ) -> None:
+        await git_storage.init_repository(self.init_schema)
+        await self._commit_file(git_storage, author, self.init_schema.repo_path, "first")
+        await git_storage.fork_repository(
+            ForkRepositorySchema(source_repo_path=self.init_schema.repo_path, repo_path="fork-1")
+        )
+        fork_head = await self._commit_file(git_storage, author, "fork-1", "second")
+
+        fork = await git_storage.fork_repository(ForkRepositorySchema(source_repo_path="fork-1", repo_path="fork-2"))
+
+        assert self.git_run(fork.full_path, "cat-file", "-p", f"{fork_head}:file.txt") == "second"
+        self.git_run(fork.full_path, "rev-list", "--objects", "--all")
+        self.git_run(git_storage.base_path / "fork-1", "rev-list", "--objects", "--all")
+
+    async def test_fork_survives_source_deletion_and_pool_is_released_with_last_member(
+        self,
+        git_storage: GitPythonStorage,
+        author: Author,
+    ) -> None:
+        await git_storage.init_repository(self.init_schema)
+        await self._commit_file(git_storage, author, self.init_schema.repo_path, "content")
+        fork = await git_storage.fork_repository(
+            ForkRepositorySchema(source_repo_path=self.init_schema.repo_path, repo_path="fork-repo")
+        )
+
+        await git_storage.delete_repository(self.init_schema.repo_path)
+
+        assert self.git_run(fork.full_path, "cat-file", "-p", f"{self.default_branch}:file.txt") == "content"
+        assert len(list(git_storage.pools_path.iterdir())) == 1
+
+        await git_storage.delete_repository("fork-repo")
+
+        # Pools are released by the reaper, never on the request path
+        assert git_storage.tombstone_orphan_pools(min_age=3600) == 0
+        assert git_storage.tombstone_orphan_pools(min_age=0) == 1
+        assert not any(git_storage.pools_path.iterdir())
+
+    async def test_fork_non_existing_repository_raises_exception(self, git_storage: GitPythonStorage) -> None:
+        with pytest.raises(RepositoryNotFoundException):
+            await git_storage.fork_repository(ForkRepositorySchema(source_repo_path="ghost", repo_path="fork-repo"))
 
     async def test_repository_exists_success(
         self,
@@ -184,6 +330,87 @@ class TestGitPythonStorage:
 
         assert file_content.encoding == "base64"
         assert file_content.content == image_base64
+        assert file_content.mimetype == "image/jpeg"
+
+    async def test_get_file_metadata_with_binary_content(
+        self,
+        git_storage: GitPythonStorage,
+        author: Author,
+        test_images_dir: Path,
+    ) -> None:
+        await git_storage.init_repository(self.init_schema)
+        image_bytes = (test_images_dir / "image.jpg").read_bytes()
+        commit_schema = UpdateFileSchema(
+            repo_path=self.init_schema.repo_path,
+            file_path="image.jpg",
+            content=base64.b64encode(image_bytes).decode("ascii"),
+            encoding="base64",
+            branch_name=self.default_branch,
+            message="add image",
+            author=author,
+        )
+        await git_storage.update_file(commit_schema)
+
+        metadata = await git_storage.get_file_metadata(
+            GetFileSchema(repo_path=self.init_schema.repo_path, file_path="image.jpg", branch_name=self.default_branch)
+        )
+
+        assert metadata.size == len(image_bytes)
+        assert metadata.mimetype == "image/jpeg"
+        assert metadata.is_binary
+
+    async def test_get_file_metadata_is_cached_and_works_for_forks(
+        self,
+        git_storage: GitPythonStorage,
+        author: Author,
+    ) -> None:
+        await git_storage.init_repository(self.init_schema)
+        commit_schema = UpdateFileSchema(
+            repo_path=self.init_schema.repo_path,
+            file_path="data.json",
+            content='{"key": "value"}',
+            branch_name=self.default_branch,
+            message="add file",
+            author=author,
+        )
+        await git_storage.update_file(commit_schema)
+        # The fork reads the blob through objects/info/alternates
+        await git_storage.fork_repository(
+            ForkRepositorySchema(source_repo_path=self.init_schema.repo_path, repo_path="fork-repo")
+        )
+
+        schema = GetFileSchema(repo_path="fork-repo", file_path="data.json", branch_name=self.default_branch)
+        metadata = await git_storage.get_file_metadata(schema)
+        cached = await git_storage.get_file_metadata(schema)
+
+        assert metadata == cached
+        assert metadata.size == len(commit_schema.content)
+        assert metadata.mimetype == "application/json"
+        assert not metadata.is_binary
+        assert git_storage.metadata_cache.hits == 1
+
+    async def test_get_file_metadata_of_directory_raises_exception(
+        self,
+        git_storage: GitPythonStorage,
+        author: Author,
+    ) -> None:
+        await git_storage.init_repository(self.init_schema)
+        await self._commit_file(git_storage, author, self.init_schema.repo_path, "content")
+        await git_storage.update_file(
+            UpdateFileSchema(
+                repo_path=self.init_schema.repo_path,
+                file_path="dir/file.txt",
+                content="content",
+                branch_name=self.default_branch,
+                message="add file",
+                author=author,
+            )
+        )
+
+        with pytest.raises(IsDirectoryException):
+            await git_storage.get_file_metadata(
+                GetFileSchema(repo_path=self.init_schema.repo_path, file_path="dir", branch_name=self.default_branch)
+            )
 
     async def test_upload_unknown_encoding_file(
         self,
@@ -489,6 +716,47 @@ class TestGitPythonStorage:
         branches = await git_storage.get_branches(self.init_schema.repo_path)
         assert set(["master"] + [f"feature_{i}" for i in range(10)]) == set([i.name for i in branches])
 
+    async def test_list_branches_pages_packed_and_loose_refs(
+        self,
+        git_storage: GitPythonStorage,
+        author: Author,
+    ) -> None:
+        await git_storage.init_repository(self.init_schema)
+        await git_storage.create_initial_commit(
+            CreateInitialCommitSchema(
+                repo_path=self.init_schema.repo_path,
+                branch_name=self.default_branch,
+                author=author,
+            )
+        )
+        repo_dir = git_storage.base_path / self.init_schema.repo_path
+        for name in ["ci/1", "ci/2", "ci/3", "feature"]:
+            self.git_run(repo_dir, "branch", name)
+        self.git_run(repo_dir, "pack-refs", "--all")
+        # A loose ref overrides its packed entry
+        self.git_run(repo_dir, "branch", "ci/4")
+        head = self.git_run(repo_dir, "rev-parse", self.default_branch)
+
+        def schema(**kwargs: object) -> ListBranchesSchema:
+            return ListBranchesSchema(repo_path=self.init_schema.repo_path, **kwargs)  # type: ignore[arg-type]
+
+        first = await git_storage.list_branches(schema(prefix="ci/", limit=3))
+        assert [i.name for i in first.branches] == ["ci/1", "ci/2", "ci/3"]
+        assert first.next_after == "ci/3"
+
+        second = await git_storage.list_branches(schema(prefix="ci/", limit=3, after=first.next_after))
+        assert [i.name for i in second.branches] == ["ci/4"]
+        assert second.next_after is None
+        assert {i.commit_sha for i in first.branches + second.branches} == {head}
+
+        descending = await git_storage.list_branches(schema(descending=True, after="ci/2", limit=10))
+        assert [i.name for i in descending.branches] == ["ci/1"]
+
+        assert (await git_storage.list_branches(schema(prefix="../../", limit=10))).branches == []
+        assert await git_storage.resolve_branch(self.init_schema.repo_path, "ci/1") == head
+        with pytest.raises(BranchNotFoundException):
+            await git_storage.resolve_branch(self.init_schema.repo_path, "../HEAD")
+
     async def test_get_commit_success(
         self,
         git_storage: GitPythonStorage,
@@ -633,6 +901,29 @@ class TestGitPythonStorage:
 
         assert len(refs) == 4
 
+    async def test_get_refs_peels_annotated_tags(
+        self,
+        git_storage: GitPythonStorage,
+        author: Author,
+    ) -> None:
+        await git_storage.init_repository(self.init_schema)
+        repo_dir = git_storage.base_path / self.init_schema.repo_path
+        await git_storage.create_initial_commit(
+            CreateInitialCommitSchema(
+                repo_path=self.init_schema.repo_path, author=author, branch_name=self.default_branch
+            )
+        )
+        master_sha = self.git_run(repo_dir, "rev-parse", "master")
+
+        env = ["-c", "user.name=test", "-c", "user.email=test@example.com"]
+        self.git_run(repo_dir, *env, "tag", "-a", "v1.0", "-m", "packed")
+        self.git_run(repo_dir, "pack-refs", "--all")
+        self.git_run(repo_dir, *env, "tag", "-a", "v2.0", "-m", "loose")
+
+        refs = await git_storage.get_refs(GetRefsSchema(repo_path=self.init_schema.repo_path))
+
+        assert refs["refs/tags/v1.0"] == refs["refs/tags/v2.0"] == refs["HEAD"] == master_sha
+
     async def test_get_refs_empty_repo(
         self,
         git_storage: GitPythonStorage,
@@ -705,6 +996,7 @@ class TestGitPythonStorage:
 
         assert file_content.encoding == "base64"
         assert file_content.content == image_base64
+        assert file_content.mimetype == "image/jpeg"
 
     async def test_get_file_from_non_existing_branch_raises_exception(
         self,
@@ -927,3 +1219,41 @@ class TestGitPythonStorage:
                     path="file.txt",
                 )
             )
+
+    async def test_resolve_matches_the_listed_shas(
+        self,
+        git_storage: GitPythonStorage,
+        author: Author,
+    ) -> None:
+        await git_storage.init_repository(self.init_schema)
+        commit = await git_storage.update_file(
+            UpdateFileSchema(
+                repo_path=self.init_schema.repo_path,
+                file_path="src/main.py",
+                content="main",
+                branch_name=self.default_branch,
+                message="add main",
+                author=author,
+            )
+        )
+        repo_path = self.init_schema.repo_path
+
+        root = await git_storage.get_tree(GetTreeSchema(repo_path=repo_path, branch_name=self.default_branch, path=""))
+        src = await git_storage.get_tree(
+            GetTreeSchema(repo_path=repo_path, branch_name=self.default_branch, path="src")
+        )
+
+        assert await git_storage.resolve_branch(repo_path, self.default_branch) == commit.commit_hash
+        assert await git_storage.resolve_tree(
+            GetTreeSchema(repo_path=repo_path, branch_name=self.default_branch, path="src")
+        ) == next(n.sha for n in root if n.name == "src")
+        assert await git_storage.resolve_blob(
+            GetFileSchema(repo_path=repo_path, file_path="src/main.py", branch_name=self.default_branch)
+        ) == next(n.sha for n in src if n.name == "main.py")
+
+        with pytest.raises(BranchNotFoundException):
+            await git_storage.resolve_branch(repo_path, "non-existing")
+        with pytest.raises(IsFileException):
+            await git_storage.resolve_tree(
+                GetTreeSchema(repo_path=repo_path, branch_name=self.default_branch, path="src/main.py")
+            )
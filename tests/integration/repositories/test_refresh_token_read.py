@@ -9,6 +9,7 @@ from utils import create_user_model
 from domain.exceptions.refresh_token import RefreshTokenNotFoundException
 from domain.filters.refresh_token import RefreshTokenFilter
 from domain.schemas.refresh_token import RefreshTokenCreateSchema
+from domain.value_objects.common import Cursor, KeysetPagination
 from infrastructure.repositories.refresh_token import (
     RefreshTokenReadRepository,
     RefreshTokenWriteRepository,
@@ -78,3 +79,61 @@ class TestRefreshTokenReadRepository:
         tokens = await self._get_repo(session).get_all(RefreshTokenFilter())
 
         assert len(tokens) == 3
+
+    async def test_get_all_filters(self, session: AsyncSession) -> None:
+        user = await create_user_model(session)
+        other = await create_user_model(session, username="other_user", email="other@example.com")
+        write_repo = RefreshTokenWriteRepository(session=session)
+        now = datetime.now(timezone.utc)
+
+        tokens = [
+            (user.id, now + timedelta(days=1)),
+            (user.id, now - timedelta(days=1)),
+            (other.id, now + timedelta(days=1)),
+        ]
+        for i, (user_id, expires_at) in enumerate(tokens):
+            data = self.TestData(user_id=user_id, token_id=uuid.uuid4(), token_hash=f"hash_{i}", expires_at=expires_at)
+            await write_repo.create(data.to_create_schema())
+        revoked = self.TestData(user_id=user.id, token_id=uuid.uuid4(), token_hash="hash_revoked")
+        await write_repo.create(revoked.to_create_schema())
+        await write_repo.revoke_by_identity(revoked.token_id)
+
+        repo = self._get_repo(session)
+        assert len(await repo.get_all(RefreshTokenFilter(user_id=user.id))) == 3
+        assert len(await repo.get_all(RefreshTokenFilter(user_id=user.id, is_revoked=False))) == 2
+        active = await repo.get_all(RefreshTokenFilter(user_id=user.id, is_revoked=False, expires_after=now))
+        assert [t.token_hash for t in active] == ["hash_0"]
+        assert len(await repo.get_all(RefreshTokenFilter(expires_before=now))) == 1
+
+    async def test_get_all_keyset_pagination(self, session: AsyncSession) -> None:
+        user = await create_user_model(session)
+        write_repo = RefreshTokenWriteRepository(session=session)
+        for i in range(5):
+            data = self.TestData(user_id=user.id, token_id=uuid.uuid4(), token_hash=f"hash_{i}")
+            await write_repo.create(data.to_create_schema())
+
+        repo = self._get_repo(session)
+        filter_ = RefreshTokenFilter(user_id=user.id)
+        pages = []
+        pagination = KeysetPagination(limit=2)
+        while page := await repo.get_all(filter_, pagination):
+            pages.append(page)
+            pagination = KeysetPagination(limit=2, after=Cursor(created_at=page[-1].created_at, id=page[-1].id))
+
+        assert [len(page) for page in pages] == [2, 2, 1]
+        listed = [token.id for page in pages for token in page]
+        assert listed == [token.id for token in await repo.get_all(filter_)]
+        assert len(set(listed)) == 5
+
+    async def test_stream_all(self, session: AsyncSession) -> None:
+        user = await create_user_model(session)
+        write_repo = RefreshTokenWriteRepository(session=session)
+        for i in range(5):
+            data = self.TestData(user_id=user.id, token_id=uuid.uuid4(), token_hash=f"hash_{i}")
+            await write_repo.create(data.to_create_schema())
+
+        repo = self._get_repo(session)
+        filter_ = RefreshTokenFilter(user_id=user.id)
+        streamed = [token.id async for token in repo.stream_all(filter_, batch_size=2)]
+
+        assert streamed == [token.id for token in await repo.get_all(filter_)]
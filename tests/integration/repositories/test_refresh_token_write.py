@@ -3,7 +3,7 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 
 import pytest
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from utils import create_user_model
 
@@ -13,6 +13,7 @@ from domain.schemas.refresh_token import (
     RefreshTokenUpdateSchema,
 )
 from infrastructure.database.models.refresh_token import RefreshTokenModel
+from infrastructure.database.models.user import UserModel
 from infrastructure.repositories.refresh_token import RefreshTokenWriteRepository
 
 
@@ -106,3 +107,76 @@ class TestRefreshTokenWriteRepository:
         stmt = select(RefreshTokenModel).where(RefreshTokenModel.user_id == data.user_id)
         tokens = (await session.execute(stmt)).scalars().all()
         assert all(t.is_revoked for t in tokens)
+
+    async def test_delete_stale(self, session: AsyncSession) -> None:
+        data = await self._get_test_data(session)
+        repo = self._get_repo(session)
+        now = datetime.now(timezone.utc)
+
+        live, expired, old_revoked, new_revoked = (uuid.uuid4() for _ in range(4))
+        for token_id in (live, expired, old_revoked, new_revoked):
+            schema = data.to_create_schema()
+            schema.id, schema.token_hash = token_id, f"h_{token_id}"
+            if token_id == expired:
+                schema.expires_at = now - timedelta(days=1)
+            await repo.create(schema)
+        await repo.revoke_by_identity(old_revoked)
+        await repo.revoke_by_identity(new_revoked)
+        await session.execute(
+            update(RefreshTokenModel)
+            .where(RefreshTokenModel.id == old_revoked)
+            .values(revoked_at=now - timedelta(days=8))
+        )
+
+        revoked_before = now - timedelta(days=7)
+        assert await repo.delete_stale(expired_before=now, revoked_before=revoked_before, limit=1) == 1
+        assert await repo.delete_stale(expired_before=now, revoked_before=revoked_before, limit=10) == 1
+        assert await repo.delete_stale(expired_before=now, revoked_before=revoked_before, limit=10) == 0
+
+        stmt = select(RefreshTokenModel.id).where(RefreshTokenModel.user_id == data.user_id)
+        assert set((await session.execute(stmt)).scalars().all()) == {live, new_revoked}
+
+    async def test_rotate(self, session: AsyncSession) -> None:
+        data = await self._get_test_data(session)
+        repo = self._get_repo(session)
+        await repo.create(data.to_create_schema())
+        new = self.TestData(user_id=data.user_id, token_hash="rotated_hash")
+
+        user = await repo.rotate(data.token_id, data.token_hash, new.to_create_schema())
+
+        assert user is not None
+        assert user.id == data.user_id
+        # The statement bypasses the session, the created token is still loaded with its old state
+        stmt = (
+            select(RefreshTokenModel)
+            .where(RefreshTokenModel.user_id == data.user_id)
+            .execution_options(populate_existing=True)
+        )
+        tokens = {t.id: t for t in (await session.execute(stmt)).scalars().all()}
+        assert tokens[data.token_id].is_revoked is True
+        assert tokens[data.token_id].revoked_at is not None
+        assert tokens[new.token_id].is_revoked is False
+        assert tokens[new.token_id].token_hash == "rotated_hash"
+
+        # Replaying the rotated token changes nothing
+        replay = self.TestData(user_id=data.user_id, token_hash="replayed_hash")
+        assert await repo.rotate(data.token_id, data.token_hash, replay.to_create_schema()) is None
+        assert await session.get(RefreshTokenModel, replay.token_id) is None
+
+    async def test_rotate_rejects_mismatches(self, session: AsyncSession) -> None:
+        data = await self._get_test_data(session)
+        repo = self._get_repo(session)
+        await repo.create(data.to_create_schema())
+        new = self.TestData(user_id=data.user_id, token_hash="rotated_hash")
+
+        assert await repo.rotate(data.token_id, "another_hash", new.to_create_schema()) is None
+        other_user = new.to_create_schema()
+        other_user.user_id = uuid.uuid4()
+        assert await repo.rotate(data.token_id, data.token_hash, other_user) is None
+
+        await session.execute(update(UserModel).where(UserModel.id == data.user_id).values(is_active=False))
+        assert await repo.rotate(data.token_id, data.token_hash, new.to_create_schema()) is None
+
+        db_token = await session.get(RefreshTokenModel, data.token_id)
+        assert db_token is not None
+        assert db_token.is_revoked is False
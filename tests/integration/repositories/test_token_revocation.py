@@ -0,0 +1,65 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from utils import create_user_model
+
+from infrastructure.database.models.token_revocation import UserTokenRevocationModel
+from infrastructure.repositories.token_revocation import (
+    TokenRevocationReadRepository,
+    TokenRevocationWriteRepository,
+)
+
+
+class TestTokenRevocationRepository:
+    async def test_revoke_token(self, session: AsyncSession) -> None:
+        user = await create_user_model(session)
+        write_repo = TokenRevocationWriteRepository(session=session)
+        now = datetime.now(timezone.utc)
+        live, expired = uuid.uuid4(), uuid.uuid4()
+
+        await write_repo.revoke_token(live, user.id, now + timedelta(minutes=10))
+        await write_repo.revoke_token(live, user.id, now + timedelta(minutes=10))
+        await write_repo.revoke_token(expired, user.id, now - timedelta(minutes=10))
+
+        tokens = await TokenRevocationReadRepository(session=session).get_revoked_tokens(expires_after=now)
+        assert [token.jti for token in tokens] == [live]
+
+    async def test_revoke_user(self, session: AsyncSession) -> None:
+        user = await create_user_model(session)
+        write_repo = TokenRevocationWriteRepository(session=session)
+        read_repo = TokenRevocationReadRepository(session=session)
+
+        await write_repo.revoke_user(user.id)
+        await write_repo.revoke_user(user.id)
+        await write_repo.notify()
+
+        stmt = select(UserTokenRevocationModel).where(UserTokenRevocationModel.user_id == user.id)
+        assert len((await session.execute(stmt)).scalars().all()) == 1
+        recent = await read_repo.get_user_revocations(revoked_after=datetime.now(timezone.utc) - timedelta(minutes=15))
+        assert [revocation.user_id for revocation in recent] == [user.id]
+        assert await read_repo.get_user_revocations(revoked_after=datetime.now(timezone.utc)) == []
+
+    async def test_delete_stale(self, session: AsyncSession) -> None:
+        user, other = await create_user_model(session), await create_user_model(session)
+        write_repo = TokenRevocationWriteRepository(session=session)
+        read_repo = TokenRevocationReadRepository(session=session)
+        now = datetime.now(timezone.utc)
+        live = uuid.uuid4()
+
+        await write_repo.revoke_token(live, user.id, now + timedelta(minutes=10))
+        for _ in range(3):
+            await write_repo.revoke_token(uuid.uuid4(), user.id, now - timedelta(minutes=10))
+        await write_repo.revoke_user(user.id)
+        await write_repo.revoke_user(other.id)
+
+        # Both revocations of users were made in this transaction, `now()` is its start
+        later = now + timedelta(seconds=1)
+        # One expired token and the revocation of one user per batch
+        assert await write_repo.delete_stale(expired_before=now, revoked_before=later, limit=1) == 2
+        assert await write_repo.delete_stale(expired_before=now, revoked_before=later, limit=5) == 3
+
+        tokens = await read_repo.get_revoked_tokens(expires_after=now - timedelta(days=1))
+        assert [token.jti for token in tokens] == [live]
+        assert await read_repo.get_user_revocations(revoked_after=now - timedelta(days=1)) == []
@@ -0,0 +1,56 @@
+import asyncio
+import json
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from main import asgi_app
+
+PASSWORD = "Password123!"
+
+
+async def call(method: str, path: str, body: dict[str, Any] | None = None, token: str | None = None) -> dict[str, Any]:
+    sent: list[dict[str, Any]] = []
+    headers = [(b"content-type", b"application/json")]
+    if token is not None:
+        headers.append((b"authorization", f"Bearer {token}".encode()))
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.request", "body": json.dumps(body or {}).encode(), "more_body": False}
+
+    async def send(message: dict[str, Any]) -> None:
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "query_string": b"",
+        "headers": headers,
+        "server": ("testserver", 80),
+        "client": ("127.0.0.1", 1234),
+    }
+    await asgi_app(scope, receive, send)
+
+    body_bytes = b"".join(m.get("body", b"") for m in sent[1:])
+    return {"status": sent[0]["status"], "json": json.loads(body_bytes) if body_bytes else None}
+
+
+async def test_logged_out_token_is_rejected_by_the_served_app(session: AsyncSession) -> None:
+    lifespan_messages: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+    lifespan_events: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+    lifespan = asyncio.create_task(asgi_app({"type": "lifespan"}, lifespan_messages.get, lifespan_events.put))
+
+    await lifespan_messages.put({"type": "lifespan.startup"})
+    assert (await lifespan_events.get())["type"] == "lifespan.startup.complete"
+    try:
+        user = {"email": "logout@example.com", "username": "logout-user", "password": PASSWORD}
+        assert (await call("POST", "/api/v1/auth/register", user))["status"] == 201
+        login = await call("POST", "/api/v1/auth/login", {"email": user["email"], "password": PASSWORD})
+        token = login["json"]["access"]
+
+        assert (await call("POST", "/api/v1/auth/logout", token=token))["status"] == 204
+        assert (await call("POST", "/api/v1/auth/logout", token=token))["status"] == 401
+    finally:
+        await lifespan_messages.put({"type": "lifespan.shutdown"})
+        await lifespan
@@ -0,0 +1,35 @@
+import json
+from datetime import UTC, datetime
+
+from flask import Flask, jsonify
+
+from api.utils.json_response import json_response
+from domain.schemas.repository_storage import TreeNode
+from domain.value_objects.git import Author, CommitInfo
+
+NODES = [
+    TreeNode(name="README.md", path="README.md", type="blob", sha="a" * 40, size=12),
+    TreeNode(name="src", path="src", type="tree", sha="b" * 40, size=None),
+]
+
+
+def test_list_matches_jsonify() -> None:
+    with Flask(__name__).app_context():
+        expected = jsonify([i.model_dump() for i in NODES]).get_json()
+
+    response = json_response(NODES)
+
+    assert response.mimetype == "application/json"
+    assert json.loads(response.get_data()) == expected
+
+
+def test_single_model_and_empty_list() -> None:
+    commit = CommitInfo(
+        commit_hash="c" * 40,
+        author=Author(name="alice", email="alice@example.com"),
+        message="Initial commit",
+        committed_datetime=datetime(2026, 1, 2, 3, 4, 5, tzinfo=UTC),
+    )
+
+    assert json.loads(json_response(commit).get_data())["committed_datetime"] == "2026-01-02T03:04:05Z"
+    assert json_response([]).get_data() == b"[]"
@@ -0,0 +1,84 @@
+from pathlib import Path
+
+import jwt
+import pytest
+from utils import generate_pem_pair
+
+from domain.entities.user import User
+from domain.exceptions.auth import InvalidTokenException
+from domain.services.auth.keys import StaticJwtKeyStore
+from domain.services.auth.token import TokenService
+from domain.value_objects.token import AccessTokenVo
+from infrastructure.auth.key_store import FileJwtKeyStore
+
+
+@pytest.mark.parametrize("algorithm", ["ES256", "EdDSA"])
+def test_tokens_carry_the_kid_of_their_key(algorithm: str, user: User) -> None:
+    store = StaticJwtKeyStore(*generate_pem_pair(algorithm), algorithm=algorithm)
+    token_service = TokenService(key_store=store)
+
+    token = token_service.generate_access(user)
+
+    header = jwt.get_unverified_header(token.value)
+    assert header["alg"] == algorithm
+    assert header["kid"] == store.current().kid
+    assert token_service.verify_access(token).sub == user.id
+    assert token_service.verify_refresh(token_service.generate_refresh(user)).sub == user.id
+
+
+def test_sessions_survive_a_rotation_to_another_algorithm(
+    tmp_path: Path, user: User, private_key: str, public_key: str
+) -> None:
+    rsa_service = TokenService(private_key=private_key, public_key=public_key)
+    rsa_token = rsa_service.generate_refresh(user)
+
+    private_path, public_path, retired_path = tmp_path / "private.pem", tmp_path / "public.pem", tmp_path / "old.pem"
+    for path, content in zip((private_path, public_path), generate_pem_pair("EdDSA"), strict=True):
+        path.write_text(content)
+    retired_path.write_text(public_key)
+    eddsa_service = TokenService(
+        key_store=FileJwtKeyStore(
+            private_path, public_path, algorithm="EdDSA", check_interval=60, retired_keys=[(retired_path, "RS256")]
+        )
+    )
+
+    assert eddsa_service.verify_refresh(rsa_token).jti == rsa_service.verify_refresh(rsa_token).jti
+    assert jwt.get_unverified_header(eddsa_service.generate_refresh(user).value)["alg"] == "EdDSA"
+    with pytest.raises(InvalidTokenException):
+        rsa_service.verify_refresh(eddsa_service.generate_refresh(user))
+
+
+def test_unknown_kids_and_foreign_algorithms_are_rejected(user: User, private_key: str, public_key: str) -> None:
+    token_service = TokenService(private_key=private_key, public_key=public_key)
+    kid = jwt.get_unverified_header(token_service.generate_access(user).value)["kid"]
+    claims = {"sub": str(user.id), "email": user.email, "iat": 0, "exp": 2**31, "type": "access"}
+
+    unknown_kid = jwt.encode(claims, key=private_key, algorithm="RS256", headers={"kid": "unknown"})
+    with pytest.raises(InvalidTokenException):
+        token_service.verify_access(AccessTokenVo(value=unknown_kid))
+
+    # A token naming the RSA key's kid but another algorithm must not be checked with that algorithm
+    forged = jwt.encode(claims, key="a shared secret of 32 bytes long", algorithm="HS256", headers={"kid": kid})
+    with pytest.raises(InvalidTokenException):
+        token_service.verify_access(AccessTokenVo(value=forged))
+
+
+def test_tokens_without_kid_are_verified_with_the_current_key(
+    user: User, private_key: str, public_key: str
+) -> None:
+    token_service = TokenService(private_key=private_key, public_key=public_key)
+    claims = {"sub": str(user.id), "email": user.email, "iat": 0, "exp": 2**31, "type": "access"}
+    legacy = jwt.encode(claims, key=private_key, algorithm="RS256")
+
+    assert token_service.verify_access(AccessTokenVo(value=legacy)).sub == user.id
+
+
+def test_jwks_publishes_public_keys_only(private_key: str, public_key: str) -> None:
+    retired_public_key = generate_pem_pair("ES256")[1]
+    store = StaticJwtKeyStore(private_key, public_key, algorithm="RS256", retired_keys=[(retired_public_key, "ES256")])
+
+    jwks = TokenService(key_store=store).jwks()
+
+    assert [key["kid"] for key in jwks["keys"]] == list(store.current().verification_keys)
+    assert [key["alg"] for key in jwks["keys"]] == ["RS256", "ES256"]
+    assert all("d" not in key and key["use"] == "sig" for key in jwks["keys"])
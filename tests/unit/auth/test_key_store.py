@@ -0,0 +1,83 @@
+import os
+from pathlib import Path
+
+import jwt
+import pytest
+
+from domain.entities.user import User
+from domain.exceptions.auth import InvalidTokenException
+from domain.services.auth.token import TokenService
+from infrastructure.auth.key_store import FileJwtKeyStore
+
+
+@pytest.fixture
+def key_files(tmp_path: Path, private_key: str, public_key: str) -> tuple[Path, Path]:
+    private_path, public_path = tmp_path / "private.pem", tmp_path / "public.pem"
+    private_path.write_text(private_key)
+    public_path.write_text(public_key)
+    return private_path, public_path
+
+
+def replace(path: Path, content: str) -> None:
+    """Writes and renames, as a rotation should, and moves the mtime on for coarse filesystem clocks."""
+
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(content)
+    stat = path.stat()
+    os.utime(tmp, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    tmp.replace(path)
+
+
+def test_keys_are_parsed_once(key_files: tuple[Path, Path]) -> None:
+    store = FileJwtKeyStore(*key_files, algorithm="RS256", check_interval=60)
+
+    assert store.current() is store.current()
+    assert not isinstance(store.current().signing_key, str)
+
+
+def test_rotated_keys_are_picked_up(
+    key_files: tuple[Path, Path], user: User, another_private_key: str, another_public_key: str
+) -> None:
+    private_path, public_path = key_files
+    store = FileJwtKeyStore(private_path, public_path, algorithm="RS256", check_interval=0)
+    token_service = TokenService(key_store=store)
+    old_token = token_service.generate_access(user)
+
+    replace(private_path, another_private_key)
+    replace(public_path, another_public_key)
+
+    new_token = token_service.generate_access(user)
+    assert token_service.verify_access(new_token).sub == user.id
+    assert TokenService(private_key=another_private_key, public_key=another_public_key).verify_access(new_token)
+    with pytest.raises(InvalidTokenException):
+        token_service.verify_access(old_token)
+
+
+def test_half_rotated_or_broken_keys_keep_the_current_ones(
+    key_files: tuple[Path, Path], user: User, another_private_key: str, another_public_key: str
+) -> None:
+    private_path, public_path = key_files
+    store = FileJwtKeyStore(private_path, public_path, algorithm="RS256", check_interval=0)
+    token_service = TokenService(key_store=store)
+    keys = store.current()
+
+    replace(private_path, another_private_key)
+    assert store.current() is keys
+    replace(public_path, "-----BEGIN PUBLIC KEY-----\ntruncated")
+    assert store.current() is keys
+    assert token_service.verify_access(token_service.generate_access(user)).sub == user.id
+
+    replace(public_path, another_public_key)
+    assert store.current() is not keys
+
+
+def test_missing_keys_fail_at_startup(tmp_path: Path) -> None:
+    with pytest.raises(OSError):
+        FileJwtKeyStore(tmp_path / "private.pem", tmp_path / "public.pem", algorithm="RS256", check_interval=0)
+
+
+def test_token_service_requires_keys() -> None:
+    with pytest.raises(ValueError):
+        TokenService()
+    with pytest.raises(jwt.PyJWTError):
+        TokenService(private_key="not a key", public_key="not a key")
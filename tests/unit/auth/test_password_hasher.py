@@ -0,0 +1,89 @@
+import asyncio
+from collections.abc import Iterator
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from domain.entities.user import User
+from domain.exceptions.auth import InvalidCredentialsException
+from domain.ports.repositories.user import AbstractUserReadRepository, AbstractUserWriteRepository
+from domain.services.auth.authentication import AuthenticationService
+from domain.services.auth.password_hasher import get_rounds, hash_password
+from domain.services.auth.token import TokenService
+from domain.value_objects.auth import LoginCredentials
+from infrastructure.auth.password_hasher import PooledPasswordHasher
+
+PASSWORD = "Password123"
+
+
+@pytest.fixture
+def hasher() -> Iterator[PooledPasswordHasher]:
+    hasher = PooledPasswordHasher(workers=2, rounds=4)
+    yield hasher
+    hasher.shutdown()
+
+
+async def test_hashes_run_off_the_event_loop(hasher: PooledPasswordHasher) -> None:
+    ticks = 0
+
+    async def tick() -> None:
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0)
+
+    ticker = asyncio.create_task(tick())
+    hasher.rounds = 10
+    password_hash = await hasher.hash(PASSWORD)
+    ticker.cancel()
+
+    assert ticks > 1
+    assert await hasher.verify(PASSWORD, password_hash)
+    assert not await hasher.verify("wrong", password_hash)
+    assert (hasher.pending, hasher.completed) == (0, 3)
+
+
+def test_hashes_of_another_cost_need_a_rehash(hasher: PooledPasswordHasher) -> None:
+    assert get_rounds(hash_password(PASSWORD, rounds=5)) == 5
+    assert not hasher.needs_rehash(hash_password(PASSWORD, rounds=4))
+    assert hasher.needs_rehash(hash_password(PASSWORD, rounds=5))
+    assert hasher.needs_rehash("not a bcrypt hash")
+
+
+def build_service(user: User, hasher: PooledPasswordHasher) -> tuple[AuthenticationService, AsyncMock]:
+    read_repository = AsyncMock(spec=AbstractUserReadRepository)
+    read_repository.get_by_email.return_value = user
+    write_repository = AsyncMock(spec=AbstractUserWriteRepository)
+    write_repository.update.side_effect = lambda identity, schema: user.model_copy(
+        update={"password_hash": schema.password_hash}
+    )
+    service = AuthenticationService(
+        token_service=MagicMock(spec=TokenService),
+        user_read_repository=read_repository,
+        password_hasher=hasher,
+        user_write_repository=write_repository,
+    )
+    return service, write_repository
+
+
+async def test_login_rehashes_passwords_of_another_cost(user: User, hasher: PooledPasswordHasher) -> None:
+    user.password_hash = hash_password(PASSWORD, rounds=5)
+    service, write_repository = build_service(user, hasher)
+
+    await service.login(LoginCredentials(email=user.email, password=PASSWORD))
+
+    write_repository.update.assert_awaited_once()
+    new_hash = write_repository.update.await_args.args[1].password_hash
+    assert get_rounds(new_hash) == 4
+    assert await hasher.verify(PASSWORD, new_hash)
+
+
+async def test_login_keeps_hashes_of_the_current_cost(user: User, hasher: PooledPasswordHasher) -> None:
+    user.password_hash = hash_password(PASSWORD, rounds=4)
+    service, write_repository = build_service(user, hasher)
+
+    await service.login(LoginCredentials(email=user.email, password=PASSWORD))
+    with pytest.raises(InvalidCredentialsException):
+        await service.login(LoginCredentials(email=user.email, password="Wrong12345"))
+
+    write_repository.update.assert_not_awaited()
@@ -0,0 +1,102 @@
+from collections.abc import Iterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from infrastructure.auth.refresh_token_purger import RefreshTokenPurger
+
+ACCESS_TOKEN_LIFETIME = 900
+
+
+@pytest.fixture(autouse=True)
+def revocations_delete_stale() -> Iterator[AsyncMock]:
+    with patch("infrastructure.auth.refresh_token_purger.TokenRevocationWriteRepository") as repository:
+        repository.return_value.delete_stale = AsyncMock(return_value=0)
+        yield repository.return_value.delete_stale
+
+
+def build_purger(batches: list[int], batch_size: int = 100) -> tuple[RefreshTokenPurger, AsyncMock, MagicMock]:
+    delete_stale = AsyncMock(side_effect=batches)
+    uow = MagicMock(session=object(), commit=AsyncMock())
+
+    @asynccontextmanager
+    async def uow_factory() -> AsyncIterator[Any]:
+        yield uow
+
+    purger = RefreshTokenPurger(
+        uow_factory=uow_factory,  # type: ignore[arg-type]
+        interval=3600,
+        batch_size=batch_size,
+        batch_pause=0,
+        revoked_retention=timedelta(days=7).total_seconds(),
+        access_token_lifetime=ACCESS_TOKEN_LIFETIME,
+    )
+    return purger, delete_stale, uow
+
+
+async def test_purge_deletes_in_batches_until_a_short_one() -> None:
+    purger, delete_stale, uow = build_purger([100, 100, 42])
+
+    with patch("infrastructure.auth.refresh_token_purger.RefreshTokenWriteRepository") as repository:
+        repository.return_value.delete_stale = delete_stale
+        deleted = await purger.purge()
+
+    assert deleted == 242
+    assert delete_stale.await_count == 3
+    assert uow.commit.await_count == 4  # and one batch of revocations
+    kwargs = delete_stale.await_args.kwargs
+    assert kwargs["limit"] == 100
+    assert kwargs["expired_before"] - kwargs["revoked_before"] == timedelta(days=7)
+    assert kwargs["expired_before"] <= datetime.now(tz=kwargs["expired_before"].tzinfo)
+
+    assert purger.stats.runs == 1
+    assert purger.stats.rows_deleted == 242
+    assert purger.stats.last_run_deleted == 242
+
+
+async def test_stats_accumulate_over_runs() -> None:
+    purger, delete_stale, _ = build_purger([3, 0])
+
+    with patch("infrastructure.auth.refresh_token_purger.RefreshTokenWriteRepository") as repository:
+        repository.return_value.delete_stale = delete_stale
+        assert await purger.purge() == 3
+        assert await purger.purge() == 0
+
+    assert purger.stats.runs == 2
+    assert purger.stats.rows_deleted == 3
+    assert purger.stats.last_run_deleted == 0
+
+
+async def test_failed_batch_is_not_counted() -> None:
+    purger, delete_stale, uow = build_purger([100, RuntimeError("deadlock")])
+
+    with patch("infrastructure.auth.refresh_token_purger.RefreshTokenWriteRepository") as repository:
+        repository.return_value.delete_stale = delete_stale
+        with pytest.raises(RuntimeError):
+            await purger.purge()
+
+    assert uow.commit.await_count == 1
+    assert purger.stats.rows_deleted == 100
+    assert purger.stats.runs == 0
+
+
+async def test_purge_deletes_stale_access_token_revocations(revocations_delete_stale: AsyncMock) -> None:
+    purger, delete_stale, uow = build_purger([0], batch_size=10)
+    revocations_delete_stale.side_effect = [10, 4]
+
+    with patch("infrastructure.auth.refresh_token_purger.RefreshTokenWriteRepository") as repository:
+        repository.return_value.delete_stale = delete_stale
+        assert await purger.purge() == 14
+
+    assert revocations_delete_stale.await_count == 2
+    assert uow.commit.await_count == 3
+    kwargs = revocations_delete_stale.await_args.kwargs
+    assert kwargs["limit"] == 10
+    assert kwargs["expired_before"] - kwargs["revoked_before"] == timedelta(seconds=ACCESS_TOKEN_LIFETIME)
+
+    assert purger.stats.rows_deleted == 0
+    assert purger.stats.revocations_deleted == 14
+    assert purger.stats.last_run_deleted == 14
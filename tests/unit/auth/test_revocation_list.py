@@ -0,0 +1,205 @@
+import asyncio
+import time
+from collections.abc import Iterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from flask import Flask, Response, g, jsonify
+
+from domain.entities.token_revocation import RevokedAccessToken, UserTokenRevocation
+from domain.entities.user import User
+from domain.services.auth.token import TokenService
+from domain.value_objects.token import AccessTokenVo
+from infrastructure.auth.revocation_list import AccessTokenRevocationList
+from infrastructure.auth.token_cache import VerifiedTokenCache
+from infrastructure.middleware.auth import require_auth, setup_auth
+from infrastructure.middleware.errors import register_error_handlers
+
+LIFETIME = 900
+
+
+@pytest.fixture
+def token_service(private_key: str, public_key: str) -> TokenService:
+    return TokenService(private_key=private_key, public_key=public_key, access_token_lifetime=LIFETIME)
+
+
+@pytest.fixture
+def repository() -> Iterator[AsyncMock]:
+    with patch("infrastructure.auth.revocation_list.TokenRevocationReadRepository") as repository:
+        repository.return_value = AsyncMock()
+        repository.return_value.get_revoked_tokens.return_value = []
+        repository.return_value.get_user_revocations.return_value = []
+        yield repository.return_value
+
+
+@asynccontextmanager
+async def uow_factory() -> AsyncIterator[Any]:
+    yield MagicMock(session=object())
+
+
+def build_revocations(token_cache: VerifiedTokenCache | None = None) -> AccessTokenRevocationList:
+    return AccessTokenRevocationList(
+        uow_factory=uow_factory,  # type: ignore[arg-type]
+        engine=MagicMock(),
+        channel="revocations",
+        reload_interval=30,
+        access_token_lifetime=LIFETIME,
+        token_cache=token_cache,
+    )
+
+
+@pytest.fixture
+def revocations(repository: AsyncMock) -> AccessTokenRevocationList:
+    return build_revocations()
+
+
+def build_app(
+    token_service: TokenService, revocations: AccessTokenRevocationList, cache: VerifiedTokenCache | None = None
+) -> Flask:
+    app = Flask(__name__)
+    setup_auth(app, token_service, cache, revocations)
+    register_error_handlers(app)
+
+    @app.get("/me")
+    @require_auth()
+    async def me() -> tuple[Response, int]:
+        return jsonify({"id": g.access_payload.sub}), 200
+
+    return app
+
+
+async def test_revoked_token_is_rejected(
+    token_service: TokenService, user: User, repository: AsyncMock, revocations: AccessTokenRevocationList
+) -> None:
+    revoked = token_service.verify_access(token_service.generate_access(user))
+    other = token_service.verify_access(token_service.generate_access(user))
+    assert revoked.jti is not None
+    repository.get_revoked_tokens.return_value = [
+        RevokedAccessToken(
+            jti=revoked.jti, user_id=user.id, expires_at=datetime.fromtimestamp(revoked.exp, tz=timezone.utc)
+        )
+    ]
+
+    assert not revocations.is_revoked(revoked)
+    await revocations.reload()
+
+    assert revocations.is_revoked(revoked)
+    assert not revocations.is_revoked(other)
+    assert (revocations.reloads, revocations.rejected, len(revocations)) == (1, 1, 1)
+    # Only revocations that can still match a valid token are asked for
+    expires_after = repository.get_revoked_tokens.await_args.kwargs["expires_after"]
+    revoked_after = repository.get_user_revocations.await_args.kwargs["revoked_after"]
+    assert expires_after - revoked_after == timedelta(seconds=LIFETIME)
+
+
+async def test_user_revocation_covers_tokens_issued_until_then(
+    token_service: TokenService, user: User, repository: AsyncMock, revocations: AccessTokenRevocationList
+) -> None:
+    payload = token_service.verify_access(token_service.generate_access(user))
+    revoked_before = datetime.fromtimestamp(payload.iat, tz=timezone.utc)
+    repository.get_user_revocations.return_value = [UserTokenRevocation(user_id=user.id, revoked_before=revoked_before)]
+    await revocations.reload()
+
+    assert revocations.is_revoked(payload)
+    assert not revocations.is_revoked(payload.model_copy(update={"iat": payload.iat + 1}))
+    assert not revocations.is_revoked(payload.model_copy(update={"sub": uuid4(), "jti": uuid4()}))
+
+    # Dropped on the next reload once it can't match a valid token anymore
+    repository.get_user_revocations.return_value = []
+    await revocations.reload()
+    assert not revocations.is_revoked(payload)
+
+
+async def test_reload_drops_cached_tokens_of_newly_revoked_users(
+    token_service: TokenService, user: User, repository: AsyncMock
+) -> None:
+    cache = VerifiedTokenCache(max_size=10)
+    revocations = build_revocations(token_cache=cache)
+    payload = token_service.verify_access(token_service.generate_access(user))
+    cache.set("revoked", payload)
+    cache.set("other", payload.model_copy(update={"sub": uuid4()}))
+
+    repository.get_user_revocations.return_value = [
+        UserTokenRevocation(user_id=user.id, revoked_before=datetime.fromtimestamp(payload.iat, tz=timezone.utc))
+    ]
+    await revocations.reload()
+
+    assert cache.get("revoked") is None
+    assert cache.get("other") is not None
+
+    # Only new revocations drop tokens, a token cached after the first reload survives the next one
+    cache.set("revoked", payload.model_copy(update={"iat": payload.iat + 1}))
+    await revocations.reload()
+    assert cache.get("revoked") is not None
+
+
+def test_middleware_rejects_revoked_tokens_on_cache_hits(
+    token_service: TokenService, user: User, repository: AsyncMock, revocations: AccessTokenRevocationList
+) -> None:
+    cache = VerifiedTokenCache(max_size=10)
+    client = build_app(token_service, revocations, cache).test_client()
+    token = token_service.generate_access(user).value
+    headers = {"Authorization": f"Bearer {token}"}
+    # Flask runs async views in an event loop of their own, the test can't run in one
+    asyncio.run(revocations.reload())
+    assert client.get("/me", headers=headers).status_code == 200
+    assert len(cache) == 1
+
+    payload = token_service.verify_access(AccessTokenVo(value=token))
+    assert payload.jti is not None
+    repository.get_revoked_tokens.return_value = [
+        RevokedAccessToken(jti=payload.jti, user_id=user.id, expires_at=datetime.fromtimestamp(time.time() + LIFETIME))
+    ]
+    asyncio.run(revocations.reload())
+
+    assert client.get("/me", headers=headers).status_code == 401
+    assert len(cache) == 0
+
+
+def test_middleware_fails_closed_until_the_first_reload(
+    token_service: TokenService, user: User, repository: AsyncMock, revocations: AccessTokenRevocationList
+) -> None:
+    client = build_app(token_service, revocations).test_client()
+    headers = {"Authorization": f"Bearer {token_service.generate_access(user).value}"}
+
+    assert client.get("/me", headers=headers).status_code == 503
+    repository.get_revoked_tokens.side_effect = ConnectionError
+    with pytest.raises(ConnectionError):
+        asyncio.run(revocations.reload())
+    assert client.get("/me", headers=headers).status_code == 503
+
+    repository.get_revoked_tokens.side_effect = None
+    asyncio.run(revocations.reload())
+    assert revocations.loaded
+    assert client.get("/me", headers=headers).status_code == 200
+
+
+async def test_added_revocations_apply_without_a_reload(
+    token_service: TokenService, user: User, repository: AsyncMock
+) -> None:
+    cache = VerifiedTokenCache(max_size=10)
+    revocations = build_revocations(token_cache=cache)
+    await revocations.reload()
+    token = token_service.verify_access(token_service.generate_access(user))
+    other = token_service.verify_access(token_service.generate_access(user))
+    assert token.jti is not None
+    cache.set("other", other)
+
+    revocations.add_token(token.jti, datetime.fromtimestamp(token.exp, tz=timezone.utc))
+    assert revocations.is_revoked(token)
+    assert not revocations.is_revoked(other)
+
+    revoked_before = datetime.fromtimestamp(other.iat, tz=timezone.utc)
+    revocations.add_user(user.id, revoked_before)
+    assert revocations.is_revoked(other)
+    assert cache.get("other") is None
+
+    # The reload brings the same revocation from the database, the cache isn't emptied again
+    repository.get_user_revocations.return_value = [UserTokenRevocation(user_id=user.id, revoked_before=revoked_before)]
+    cache.set("other", other.model_copy(update={"iat": other.iat + 1}))
+    await revocations.reload()
+    assert cache.get("other") is not None
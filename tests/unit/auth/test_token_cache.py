@@ -0,0 +1,97 @@
+import time
+from unittest.mock import patch
+from uuid import UUID
+
+import pytest
+from flask import Flask, Response, g, jsonify
+
+from domain.entities.user import User
+from domain.services.auth.token import TokenService
+from domain.value_objects.token import AccessTokenPayload, AccessTokenVo
+from infrastructure.auth.token_cache import VerifiedTokenCache
+from infrastructure.middleware.auth import require_auth, setup_auth
+
+
+@pytest.fixture
+def token_service(private_key: str, public_key: str) -> TokenService:
+    return TokenService(private_key=private_key, public_key=public_key)
+
+
+def build_app(token_service: TokenService, cache: VerifiedTokenCache | None) -> Flask:
+    app = Flask(__name__)
+    setup_auth(app, token_service, cache)
+
+    @app.get("/me")
+    @require_auth()
+    async def me() -> tuple[Response, int]:
+        return jsonify({"id": g.access_payload.sub}), 200
+
+    @app.get("/public")
+    @require_auth(optional=True)
+    async def public() -> tuple[Response, int]:
+        return jsonify({"id": g.access_payload.sub if g.access_payload else None}), 200
+
+    return app
+
+
+def test_signature_is_checked_once_per_token(token_service: TokenService, user: User) -> None:
+    cache = VerifiedTokenCache(max_size=10)
+    client = build_app(token_service, cache).test_client()
+    headers = {"Authorization": f"Bearer {token_service.generate_access(user).value}"}
+
+    with patch.object(token_service, "verify_access", wraps=token_service.verify_access) as verify_access:
+        responses = [client.get("/me", headers=headers) for _ in range(5)]
+
+    assert [response.status_code for response in responses] == [200] * 5
+    assert responses[-1].json == {"id": str(user.id)}
+    assert verify_access.call_count == 1
+    assert (cache.hits, cache.misses) == (4, 1)
+
+
+def test_expired_entries_are_verified_again(token_service: TokenService, user: User) -> None:
+    cache = VerifiedTokenCache(max_size=10)
+    token = token_service.generate_access(user).value
+    cache.set(token, token_service.verify_access(AccessTokenVo(value=token)))
+    assert cache.get(token) is not None
+
+    with patch("infrastructure.auth.token_cache.time.time", return_value=time.time() + 3600):
+        assert cache.get(token) is None
+    assert len(cache) == 0
+
+
+def test_invalidated_users_are_verified_again(token_service: TokenService, user: User) -> None:
+    cache = VerifiedTokenCache(max_size=10)
+    token = token_service.generate_access(user).value
+    payload = token_service.verify_access(AccessTokenVo(value=token))
+    other = AccessTokenPayload(sub=UUID(int=1), email="other@example.com", iat=0, exp=2**31)
+    cache.set(token, payload)
+    cache.set("other", other)
+
+    assert cache.invalidate_user(user.id) == 1
+    assert cache.get(token) is None
+    assert cache.get("other") == other
+
+
+def test_invalid_tokens_are_not_cached(token_service: TokenService, user: User) -> None:
+    cache = VerifiedTokenCache(max_size=10)
+    client = build_app(token_service, cache).test_client()
+    headers = {"Authorization": f"Bearer {token_service.generate_access(user).value}garbage"}
+
+    assert client.get("/me", headers=headers).status_code != 200
+    assert len(cache) == 0
+
+
+def test_optional_routes_treat_invalid_tokens_as_anonymous(
+    token_service: TokenService, private_key: str, public_key: str, user: User
+) -> None:
+    client = build_app(token_service, None).test_client()
+    token = token_service.generate_access(user).value
+    expired_token = TokenService(private_key=private_key, public_key=public_key, access_token_lifetime=-60)
+
+    expired = client.get("/public", headers={"Authorization": f"Bearer {expired_token.generate_access(user).value}"})
+    invalid = client.get("/public", headers={"Authorization": f"Bearer {token}garbage"})
+    valid = client.get("/public", headers={"Authorization": f"Bearer {token}"})
+
+    assert (expired.status_code, expired.json) == (200, {"id": None})
+    assert (invalid.status_code, invalid.json) == (200, {"id": None})
+    assert valid.json == {"id": str(user.id)}
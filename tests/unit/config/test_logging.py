@@ -0,0 +1,103 @@
+import io
+import json
+import threading
+from collections.abc import Iterator
+from uuid import uuid4
+
+import pytest
+from loguru import logger
+
+from config.logging import LevelSampler, QueuedJsonSink
+
+
+class BlockedStream(io.StringIO):
+    """Holds the writer thread on its first write until `release` is set."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.release = threading.Event()
+
+    def write(self, s: str) -> int:
+        self.release.wait(timeout=5)
+        return super().write(s)
+
+
+@pytest.fixture
+def handlers() -> Iterator[list[int]]:
+    ids: list[int] = []
+    yield ids
+    for handler_id in ids:
+        logger.remove(handler_id)
+
+
+def test_records_are_written_as_json_lines(handlers: list[int]) -> None:
+    stream = io.StringIO()
+    sink = QueuedJsonSink(stream=stream)
+    handler_id = logger.add(sink, format="{message}", level="INFO")
+
+    logger.bind(user_id=uuid4(), attempts=2).info("Signed in as {}", "alice")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("Failed")
+    logger.remove(handler_id)
+
+    signed_in, failed = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert signed_in["message"] == "Signed in as alice"
+    assert signed_in["level"] == "INFO"
+    assert signed_in["extra"]["attempts"] == 2
+    assert isinstance(signed_in["extra"]["user_id"], str)
+    assert failed["exception"]["type"] == "ValueError"
+    assert "boom" in failed["exception"]["traceback"]
+    assert sink.written == 2
+    assert sink.dropped == 0
+
+
+def test_records_over_the_queue_size_are_dropped(handlers: list[int]) -> None:
+    stream = BlockedStream()
+    sink = QueuedJsonSink(stream=stream, max_queue_size=3, batch_size=1)
+    handler_id = logger.add(sink, format="{message}", level="INFO")
+
+    for i in range(20):
+        logger.info("Record {}", i)
+    assert sink.dropped > 0
+
+    stream.release.set()
+    logger.remove(handler_id)
+    assert sink.written + sink.dropped == 20
+    assert len(stream.getvalue().splitlines()) == sink.written
+
+
+def test_sampling_keeps_whole_requests_and_other_levels(handlers: list[int]) -> None:
+    sampler = LevelSampler({"info": 0.5})
+    stream = io.StringIO()
+    handlers.append(logger.add(stream, format="{level} {extra[request_id]}", level="INFO", filter=sampler))
+
+    request_ids = [str(uuid4()) for _ in range(200)]
+    for request_id in request_ids:
+        request_logger = logger.bind(request_id=request_id)
+        request_logger.info("Starting")
+        request_logger.info("Done")
+        request_logger.warning("Slow")
+
+    lines = [line.split() for line in stream.getvalue().splitlines()]
+    kept = {request_id for level, request_id in lines if level == "INFO"}
+    assert sum(level == "WARNING" for level, _ in lines) == 200
+    assert sum(level == "INFO" for level, _ in lines) == 2 * len(kept)
+    assert 50 < len(kept) < 150
+    assert sampler.sampled_out == 2 * (200 - len(kept))
+
+
+def test_sampling_decision_can_be_taken_before_logging(handlers: list[int]) -> None:
+    sampler = LevelSampler({"info": 0.5})
+    stream = io.StringIO()
+    handlers.append(logger.add(stream, format="{extra[request_id]}", level="INFO", filter=sampler))
+
+    request_ids = [str(uuid4()) for _ in range(200)]
+    kept = [request_id for request_id in request_ids if sampler.keeps("INFO", request_id)]
+    for request_id in kept:
+        logger.bind(request_id=request_id).info("Done")
+
+    assert stream.getvalue().splitlines() == kept
+    assert sampler.sampled_out == 200 - len(kept)
+    assert sampler.keeps("WARNING", request_ids[0])
@@ -0,0 +1,94 @@
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+from flask import Flask, g
+from loguru import logger
+from sqlalchemy import Engine, create_engine, text
+
+from config.config import DatabaseConfig
+from infrastructure.database.slow_queries import SlowQueryMonitor, fingerprint
+from infrastructure.middleware.setup import setup_logging_middleware
+
+
+@pytest.fixture
+def engine() -> Iterator[Engine]:
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE repositories (id INTEGER PRIMARY KEY, name TEXT)"))
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def records() -> Iterator[list[dict[str, Any]]]:
+    records: list[dict[str, Any]] = []
+    handler_id = logger.add(lambda message: records.append(message.record), level="WARNING")
+    yield records
+    logger.remove(handler_id)
+
+
+@pytest.mark.parametrize(
+    ("statement", "expected"),
+    [
+        (
+            "SELECT users.id FROM users WHERE users.email = $1::VARCHAR AND users.id IN ($2, $3)",
+            "SELECT users.id FROM users WHERE users.email = ?::VARCHAR AND users.id IN (...)",
+        ),
+        ("INSERT INTO t (a, b) VALUES (1, 'it''s'), (2, 'b')", "INSERT INTO t (a, b) VALUES (...)"),
+        ("SELECT *\n  FROM t1 WHERE a = %(a_1)s AND b = :b LIMIT 10", "SELECT * FROM t1 WHERE a = ? AND b = ? LIMIT ?"),
+    ],
+)
+def test_fingerprint(statement: str, expected: str) -> None:
+    assert fingerprint(statement) == expected
+
+
+def test_statements_are_aggregated_by_fingerprint(engine: Engine, records: list[dict[str, Any]]) -> None:
+    monitor = SlowQueryMonitor(DatabaseConfig.SlowQueries(threshold=60))
+    monitor.instrument(engine)
+
+    with engine.connect() as conn:
+        for i in range(20):
+            conn.execute(text(f"SELECT name FROM repositories WHERE id = {i}"))
+        conn.execute(text("SELECT count(*) FROM repositories"))
+
+    by_fingerprint = {i.fingerprint: i for i in monitor.summary()}
+    selected = by_fingerprint["SELECT name FROM repositories WHERE id = ?"]
+    assert selected.count == 20
+    assert selected.slow_count == 0
+    assert 0 < selected.p95_seconds <= selected.max_seconds
+    assert by_fingerprint["SELECT count(*) FROM repositories"].count == 1
+    assert records == []
+
+
+def test_slow_statements_are_logged_with_the_request_id(engine: Engine, records: list[dict[str, Any]]) -> None:
+    app = Flask(__name__)
+    setup_logging_middleware(app)
+    monitor = SlowQueryMonitor(DatabaseConfig.SlowQueries(threshold=0))
+    monitor.instrument(engine)
+
+    with app.test_request_context():
+        g.request_id = "request-1"
+        with engine.connect() as conn:
+            conn.execute(text("SELECT name FROM repositories WHERE name = :name"), {"name": "secret"})
+
+    (record,) = records
+    assert record["message"] == "Slow SQL statement"
+    assert record["extra"]["request_id"] == "request-1"
+    assert record["extra"]["statement"] == "SELECT name FROM repositories WHERE name = ?"
+    assert "secret" not in str(record["extra"])
+    assert "plan" not in record["extra"]
+
+
+def test_tracked_fingerprints_are_capped(engine: Engine) -> None:
+    monitor = SlowQueryMonitor(DatabaseConfig.SlowQueries(threshold=60, max_fingerprints=2))
+    monitor.instrument(engine)
+
+    with engine.connect() as conn:
+        for column in ("id", "name", "id, name"):
+            conn.execute(text(f"SELECT {column} FROM repositories"))
+
+    assert {i.fingerprint for i in monitor.summary()} == {
+        "SELECT name FROM repositories",
+        "SELECT id, name FROM repositories",
+    }
@@ -0,0 +1,108 @@
+import gzip
+import json
+
+import pytest
+from flask import Flask, Response, jsonify
+
+from config.config import CompressionConfig
+from infrastructure.middleware.compression import setup_compression_middleware
+from infrastructure.utils.cache import LRUCache
+
+PNG_HEADER = b"\x89PNG\r\n\x1a\n" + b"\x00" * 4096
+ROWS = [{"name": f"file-{i}.py", "type": "blob"} for i in range(200)]
+
+
+@pytest.fixture
+def app_and_cache() -> tuple[Flask, LRUCache[tuple[str, str, str], bytes]]:
+    app = Flask(__name__)
+    cache = setup_compression_middleware(app, CompressionConfig(encodings=["br", "zstd", "gzip"]))
+
+    @app.get("/tree")
+    def tree() -> Response:
+        return jsonify(ROWS)
+
+    @app.get("/small")
+    def small() -> Response:
+        return jsonify({"ok": True})
+
+    @app.get("/blob")
+    def blob() -> Response:
+        response = Response("line\n" * 1000, mimetype="text/plain")
+        response.set_etag("a" * 40)
+        return response
+
+    @app.get("/png")
+    def png() -> Response:
+        return Response(PNG_HEADER, mimetype="application/octet-stream")
+
+    @app.get("/stream")
+    def stream() -> Response:
+        return Response(iter([b"chunk " * 500, b"", b"tail " * 500]), mimetype="text/plain")
+
+    return app, cache
+
+
+def test_gzip_is_negotiated(app_and_cache: tuple[Flask, LRUCache[tuple[str, str, str], bytes]]) -> None:
+    app, _ = app_and_cache
+    response = app.test_client().get("/tree", headers={"Accept-Encoding": "gzip, br;q=0"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert int(response.headers["Content-Length"]) == len(response.data)
+    assert json.loads(gzip.decompress(response.data)) == ROWS
+
+
+def test_preferred_encoding_follows_q_values(
+    app_and_cache: tuple[Flask, LRUCache[tuple[str, str, str], bytes]],
+) -> None:
+    brotli = pytest.importorskip("brotli")
+    app, _ = app_and_cache
+    response = app.test_client().get("/tree", headers={"Accept-Encoding": "gzip;q=0.5, br"})
+
+    assert response.headers["Content-Encoding"] == "br"
+    assert json.loads(brotli.decompress(response.data)) == ROWS
+
+
+@pytest.mark.parametrize(
+    ("path", "accept_encoding"),
+    [
+        ("/tree", ""),
+        ("/tree", "gzip;q=0"),
+        ("/small", "gzip"),
+        ("/png", "gzip"),
+    ],
+)
+def test_response_is_left_uncompressed(
+    app_and_cache: tuple[Flask, LRUCache[tuple[str, str, str], bytes]], path: str, accept_encoding: str
+) -> None:
+    app, _ = app_and_cache
+    response = app.test_client().get(path, headers={"Accept-Encoding": accept_encoding})
+
+    assert "Content-Encoding" not in response.headers
+
+
+def test_streamed_body_is_compressed_incrementally(
+    app_and_cache: tuple[Flask, LRUCache[tuple[str, str, str], bytes]],
+) -> None:
+    app, _ = app_and_cache
+    response = app.test_client().get("/stream", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.is_streamed
+    assert gzip.decompress(response.data) == b"chunk " * 500 + b"tail " * 500
+
+
+def test_sha_addressed_body_is_compressed_once(
+    app_and_cache: tuple[Flask, LRUCache[tuple[str, str, str], bytes]],
+) -> None:
+    app, cache = app_and_cache
+    client = app.test_client()
+
+    first = client.get("/blob", headers={"Accept-Encoding": "gzip"})
+    second = client.get("/blob", headers={"Accept-Encoding": "gzip"})
+
+    assert first.data == second.data
+    assert gzip.decompress(second.data) == b"line\n" * 1000
+    assert second.headers["ETag"] == f'W/"{"a" * 40}"'
+    assert cache.hits == 1
+    assert len(cache) == 1
@@ -0,0 +1,108 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import Flask, Response
+
+from infrastructure.metrics.instruments import register_caches, time_async_methods
+from infrastructure.metrics.registry import Registry
+from infrastructure.middleware.metrics import setup_metrics
+
+
+def sample(text: str, line_start: str) -> float:
+    return float(next(line for line in text.splitlines() if line.startswith(line_start)).rsplit(" ", 1)[1])
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    registry = Registry()
+    histogram = registry.histogram("op_seconds", "Operations.", labelnames=("method",), buckets=(0.1, 1.0))
+
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.labels("get").observe(value)
+    text = registry.render()
+
+    assert "# TYPE op_seconds histogram" in text
+    assert sample(text, 'op_seconds_bucket{method="get",le="0.1"}') == 1
+    assert sample(text, 'op_seconds_bucket{method="get",le="1.0"}') == 3
+    assert sample(text, 'op_seconds_bucket{method="get",le="+Inf"}') == 4
+    assert sample(text, 'op_seconds_count{method="get"}') == 4
+    assert sample(text, 'op_seconds_sum{method="get"}') == 4.05
+
+
+def test_counter_sums_the_slots_of_all_threads() -> None:
+    registry = Registry()
+    counter = registry.counter("events_total", "Events.", labelnames=("kind",))
+    barrier = threading.Barrier(8)
+
+    def record() -> None:
+        barrier.wait()
+        for _ in range(10_000):
+            counter.labels("a").inc()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for _ in range(8):
+            executor.submit(record)
+
+    assert sample(registry.render(), 'events_total{kind="a"}') == 80_000
+
+
+def test_label_values_are_escaped() -> None:
+    registry = Registry()
+    registry.counter("c_total", "C.", labelnames=("path",)).labels('a"b\\c\nd').inc()
+
+    assert 'c_total{path="a\\"b\\\\c\\nd"} 1' in registry.render()
+
+
+def test_callbacks_are_read_on_scrape() -> None:
+    registry = Registry()
+    stats = {"hits": 0, "misses": 0}
+    register_caches(registry, {"blobs": lambda: (stats["hits"], stats["misses"])})
+
+    stats.update(hits=3, misses=1)
+    text = registry.render()
+
+    assert sample(text, 'cache_hits_total{cache="blobs"}') == 3
+    assert sample(text, 'cache_hit_ratio{cache="blobs"}') == 0.75
+
+
+async def test_public_coroutine_methods_are_timed() -> None:
+    registry = Registry()
+    histogram = registry.histogram("storage_seconds", "Storage.", labelnames=("method",))
+
+    @time_async_methods(histogram)
+    class Storage:
+        async def get_tree(self) -> str:
+            return "tree"
+
+        async def _helper(self) -> None:
+            pass
+
+    assert await Storage().get_tree() == "tree"
+    text = registry.render()
+
+    assert sample(text, 'storage_seconds_count{method="get_tree"}') == 1
+    assert "_helper" not in text
+
+
+def test_requests_are_labelled_by_url_rule() -> None:
+    registry = Registry()
+    histogram = registry.histogram("http_seconds", "Requests.", labelnames=("method", "route", "status"))
+    app = Flask(__name__)
+    setup_metrics(app, registry, histogram, "/metrics")
+
+    @app.get("/<username>/<repository_name>/branches")
+    async def branches(username: str, repository_name: str) -> Response:
+        return Response(b"[]")
+
+    client = app.test_client()
+    client.get("/alice/secret-project/branches")
+    client.get("/bob/other/branches")
+    client.get("/missing")
+
+    response = client.get("/metrics")
+    text = response.get_data(as_text=True)
+
+    assert response.content_type == Registry.CONTENT_TYPE
+    route = 'method="GET",route="/<username>/<repository_name>/branches",status="200"'
+    assert sample(text, f"http_seconds_count{{{route}}}") == 2
+    assert sample(text, 'http_seconds_count{method="GET",route="<unmatched>",status="404"}') == 1
+    assert "secret-project" not in text
@@ -0,0 +1,168 @@
+import asyncio
+import time
+import uuid
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from flask import Response, jsonify
+
+from config.config import ProfilingConfig
+from domain.entities.user import User
+from domain.services.auth.token import TokenService
+from infrastructure.middleware.auth import setup_auth
+from infrastructure.middleware.profiling import setup_profiling
+from infrastructure.middleware.setup import setup_logging_middleware
+from infrastructure.profiling.sampler import AWAITING_FRAME, ProfileSession, SamplingProfiler
+from infrastructure.profiling.store import ProfileStore
+from infrastructure.server.asgi import FlaskAsgiApp, LoopBoundFlask
+
+
+def spin(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+@pytest.fixture
+def token_service(private_key: str, public_key: str) -> TokenService:
+    return TokenService(private_key=private_key, public_key=public_key)
+
+
+@pytest.fixture
+def revocations() -> MagicMock:
+    return MagicMock(is_revoked=MagicMock(return_value=False))
+
+
+@pytest.fixture
+def store() -> ProfileStore:
+    return ProfileStore(max_requested=10, slowest_per_route=2, window=60)
+
+
+@pytest.fixture
+def asgi_app(user: User, token_service: TokenService, store: ProfileStore, revocations: MagicMock) -> FlaskAsgiApp:
+    app = LoopBoundFlask(__name__)
+    setup_logging_middleware(app)
+    setup_auth(app, token_service, revocations=revocations)
+    setup_profiling(
+        app,
+        profiler=SamplingProfiler(interval=0.001),
+        store=store,
+        config=ProfilingConfig(admin_user_ids=[user.id]),
+    )
+
+    @app.get("/<username>/<repository_name>/tree")
+    async def get_tree(username: str, repository_name: str) -> Response:
+        await asyncio.to_thread(spin, 0.05)
+        await asyncio.sleep(0.05)
+        return jsonify([])
+
+    return FlaskAsgiApp(app, wsgi_threads=2, executor_threads=2)
+
+
+async def call(app: FlaskAsgiApp, path: str, headers: dict[str, str]) -> dict[str, Any]:
+    sent: list[dict[str, Any]] = []
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict[str, Any]) -> None:
+        sent.append(message)
+
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": query.encode(),
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+        "server": ("testserver", 80),
+        "client": ("127.0.0.1", 1234),
+    }
+    await app(scope, receive, send)
+
+    return {
+        "status": sent[0]["status"],
+        "headers": {name.decode(): value.decode() for name, value in sent[0]["headers"]},
+        "body": b"".join(m.get("body", b"") for m in sent[1:]),
+    }
+
+
+async def test_admin_request_is_profiled_across_threads(
+    asgi_app: FlaskAsgiApp, user: User, token_service: TokenService, store: ProfileStore
+) -> None:
+    auth = {"Authorization": f"Bearer {token_service.generate_access(user).value}"}
+    request_id = str(uuid.uuid4())
+
+    response = await call(asgi_app, "/alice/repo/tree", {**auth, "X-Profile": "1", "X-Request-ID": request_id})
+
+    assert response["status"] == 200
+    assert response["headers"]["x-profile-id"] == request_id
+    profile = store.get(request_id)
+    assert profile is not None and profile.requested
+    assert profile.route == "/<username>/<repository_name>/tree"
+
+    stacks = [line.rsplit(" ", 1)[0] for line in profile.folded.splitlines()]
+    assert any(stack.startswith("executor;") and "spin" in stack for stack in stacks)
+    assert any(stack.startswith("loop;") and "get_tree" in stack and stack.endswith(AWAITING_FRAME) for stack in stacks)
+
+    listed = await call(asgi_app, "/debug/profiles", auth)
+    assert [i["request_id"] for i in asgi_app.app.json.loads(listed["body"])] == [request_id]
+    folded = await call(asgi_app, f"/debug/profiles/{request_id}", auth)
+    assert folded["body"].decode() == profile.folded
+
+
+async def test_profiling_is_for_admins_only(
+    asgi_app: FlaskAsgiApp, token_service: TokenService, store: ProfileStore
+) -> None:
+    other = User(email="other@example.com", username="other", password_hash="hash")
+    auth = {"Authorization": f"Bearer {token_service.generate_access(other).value}"}
+
+    response = await call(asgi_app, "/alice/repo/tree?profile=1", auth)
+
+    assert response["status"] == 200
+    assert "x-profile-id" not in response["headers"]
+    assert store.list() == []
+    assert (await call(asgi_app, "/debug/profiles", auth))["status"] == 403
+
+
+async def test_revoked_admin_token_is_not_profiled(
+    asgi_app: FlaskAsgiApp, user: User, token_service: TokenService, store: ProfileStore, revocations: MagicMock
+) -> None:
+    auth = {"Authorization": f"Bearer {token_service.generate_access(user).value}"}
+    revocations.is_revoked.return_value = True
+
+    response = await call(asgi_app, "/alice/repo/tree?profile=1", auth)
+
+    assert response["status"] == 200
+    assert "x-profile-id" not in response["headers"]
+    assert store.list() == []
+    assert (await call(asgi_app, "/debug/profiles", auth))["status"] == 403
+
+
+def session(route: str, duration: float) -> ProfileSession:
+    profiled = ProfileSession(request_id=str(uuid.uuid4()), method="GET", route=route, thread_id=0)
+    profiled.duration = duration
+    return profiled
+
+
+def test_store_keeps_the_slowest_requests_per_route(store: ProfileStore) -> None:
+    assert store.offer(session("/tree", 0.3))
+    assert store.offer(session("/tree", 0.5))
+    assert not store.offer(session("/tree", 0.2))
+    assert store.offer(session("/tree", 0.9))
+    assert store.offer(session("/commits", 0.1))
+
+    assert [(i.route, i.duration) for i in store.list()] == [("/tree", 0.9), ("/tree", 0.5), ("/commits", 0.1)]
+
+
+def test_store_forgets_captures_outside_the_window(monkeypatch: pytest.MonkeyPatch) -> None:
+    store = ProfileStore(max_requested=10, slowest_per_route=1, window=60)
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    store.offer(session("/tree", 0.9))
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 61)
+
+    assert store.offer(session("/tree", 0.1))
+    assert [i.duration for i in store.list()] == [0.1]
@@ -0,0 +1,149 @@
+from typing import Any
+
+import pytest
+from flask import Flask, Response, g, jsonify, request
+
+from domain.entities.user import User
+from domain.services.auth.token import TokenService
+from infrastructure.middleware.auth import require_auth, setup_auth
+from infrastructure.middleware.rate_limit import RateLimiter, rate_limit, setup_rate_limiting
+from infrastructure.rate_limit.backends import InMemoryRateLimitBackend, RedisRateLimitBackend
+
+
+class LuaRedisStandIn:
+    """Runs the backend's Lua script the way Redis would, against a dict and a controllable clock."""
+
+    def __init__(self) -> None:
+        lupa = pytest.importorskip("lupa")
+        self._lua = lupa.LuaRuntime()
+        self.hashes: dict[str, dict[str, str]] = {}
+        self.now = 1_700_000_000.0
+
+    def _call(self, command: str, key: str = "", *args: Any) -> Any:
+        if command == "TIME":
+            seconds, micros = divmod(int(self.now * 1_000_000), 1_000_000)
+            return self._lua.table_from([str(seconds), str(micros)])
+        if command == "HMGET":
+            values = self.hashes.get(key, {})
+            return self._lua.table_from([values.get(field, False) for field in args])
+        if command == "HSET":
+            self.hashes.setdefault(key, {}).update(zip(args[::2], args[1::2], strict=True))
+            return len(args) // 2
+        if command == "PEXPIRE":
+            return 1
+        raise AssertionError(f"Unexpected command {command}")
+
+    async def eval(self, script: str, numkeys: int, *keys_and_args: Any) -> Any:
+        keys, argv = keys_and_args[:numkeys], keys_and_args[numkeys:]
+        self._lua.globals().redis = self._lua.table_from({"call": self._call})
+        function = self._lua.eval(f"function(KEYS, ARGV) {script} end")
+        result = function(self._lua.table_from(keys), self._lua.table_from(argv))
+        return [int(result[1]), result[2].encode()]
+
+
+class BrokenRedis:
+    async def eval(self, script: str, numkeys: int, *keys_and_args: Any) -> Any:
+        raise ConnectionError("redis is down")
+
+
+def build_app(limiter: RateLimiter | None) -> Flask:
+    app = Flask(__name__)
+    setup_rate_limiting(app, limiter)
+
+    @app.before_request
+    def authenticate() -> None:
+        user = request.headers.get("X-User")
+        g.access_payload = type("Payload", (), {"sub": user})() if user else None
+
+    @app.get("/branches")
+    @rate_limit(cost=1)
+    async def branches() -> tuple[Response, int]:
+        return jsonify([]), 200
+
+    @app.get("/bundle")
+    @rate_limit(cost=5)
+    async def bundle() -> Response:
+        return Response(b"bundle")
+
+    return app
+
+
+def test_requests_over_the_burst_are_rejected() -> None:
+    app = build_app(RateLimiter(InMemoryRateLimitBackend(max_keys=100), capacity=6, refill_rate=0.001))
+    client = app.test_client()
+
+    first = client.get("/bundle")
+    assert first.status_code == 200
+    assert first.headers["RateLimit-Limit"] == "6"
+    assert first.headers["RateLimit-Remaining"] == "1"
+
+    assert client.get("/branches").status_code == 200
+
+    rejected = client.get("/branches")
+    assert rejected.status_code == 429
+    assert rejected.headers["RateLimit-Remaining"] == "0"
+    assert int(rejected.headers["Retry-After"]) > 0
+
+
+def test_users_and_addresses_have_separate_buckets() -> None:
+    app = build_app(RateLimiter(InMemoryRateLimitBackend(max_keys=100), capacity=5, refill_rate=0.001))
+    client = app.test_client()
+
+    assert client.get("/bundle").status_code == 200
+    assert client.get("/bundle").status_code == 429
+    assert client.get("/bundle", headers={"X-User": "alice"}).status_code == 200
+    assert client.get("/bundle", headers={"X-User": "bob"}).status_code == 200
+
+
+def test_routes_are_not_limited_without_a_limiter() -> None:
+    response = build_app(None).test_client().get("/branches")
+
+    assert response.status_code == 200
+    assert "RateLimit-Limit" not in response.headers
+
+
+def test_optional_auth_keys_token_bearing_reads_by_user(private_key: str, public_key: str, user: User) -> None:
+    token_service = TokenService(private_key=private_key, public_key=public_key, access_token_lifetime=60)
+    app = Flask(__name__)
+    setup_auth(app, token_service)
+    setup_rate_limiting(app, RateLimiter(InMemoryRateLimitBackend(max_keys=100), capacity=1, refill_rate=0.001))
+
+    @app.get("/tree")
+    @require_auth(optional=True)
+    @rate_limit(cost=1)
+    async def tree() -> Response:
+        return jsonify([])
+
+    client = app.test_client()
+    auth = {"Authorization": f"Bearer {token_service.generate_access(user).value}"}
+
+    assert client.get("/tree").status_code == 200
+    assert client.get("/tree").status_code == 429
+    # Same address, but the token moves the request into the user's own bucket
+    assert client.get("/tree", headers=auth).status_code == 200
+    assert client.get("/tree", headers=auth).status_code == 429
+
+
+async def test_redis_backend_shares_buckets_and_refills() -> None:
+    redis = LuaRedisStandIn()
+    worker_a = RedisRateLimitBackend(client=redis, key_prefix="rl:")
+    worker_b = RedisRateLimitBackend(client=redis, key_prefix="rl:")
+
+    assert (await worker_a.consume("user:1", cost=3, capacity=4, refill_rate=1)).allowed
+    rejected = await worker_b.consume("user:1", cost=3, capacity=4, refill_rate=1)
+    assert not rejected.allowed
+    assert rejected.retry_after == pytest.approx(2)
+
+    redis.now += 2
+    decision = await worker_b.consume("user:1", cost=3, capacity=4, refill_rate=1)
+    assert decision.allowed
+    assert decision.remaining == pytest.approx(0)
+    assert set(redis.hashes) == {"rl:user:1"}
+
+
+async def test_redis_backend_fails_open() -> None:
+    backend = RedisRateLimitBackend(client=BrokenRedis(), key_prefix="rl:")
+
+    decision = await backend.consume("user:1", cost=3, capacity=4, refill_rate=1)
+
+    assert decision.allowed
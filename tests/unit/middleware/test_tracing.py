@@ -0,0 +1,154 @@
+import asyncio
+import json
+import uuid
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from flask import Flask, Response, g
+
+from infrastructure.middleware.tracing import setup_tracing
+from infrastructure.tracing.exporters import (
+    BatchSpanProcessor,
+    InMemorySpanExporter,
+    OtlpHttpSpanExporter,
+    SimpleSpanProcessor,
+)
+from infrastructure.tracing.instrumentation import TracedThreadPoolExecutor, trace_async_methods
+from infrastructure.tracing.tracer import SpanContext, Tracer
+
+
+@pytest.fixture
+def exporter() -> InMemorySpanExporter:
+    return InMemorySpanExporter()
+
+
+@pytest.fixture
+def tracer(exporter: InMemorySpanExporter) -> Iterator[Tracer]:
+    tracer = Tracer()
+    tracer.configure(SimpleSpanProcessor(exporter), service_name="test")
+    yield tracer
+    tracer.shutdown()
+
+
+def build_app(tracer: Tracer, request_id: str | None = None) -> Flask:
+    app = Flask(__name__)
+
+    @app.before_request
+    def assign_request_id() -> None:
+        if request_id:
+            g.request_id = request_id
+
+    setup_tracing(app, tracer)
+
+    @app.get("/<username>/<repository_name>/tree")
+    async def tree(username: str, repository_name: str) -> Response:
+        with tracer.span("use_case.GetTreeUseCase"):
+            return Response(b"[]")
+
+    return app
+
+
+def test_traceparent_continues_the_callers_trace(tracer: Tracer, exporter: InMemorySpanExporter) -> None:
+    trace_id, parent_id = "4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7"
+
+    build_app(tracer).test_client().get("/alice/repo/tree", headers={"traceparent": f"00-{trace_id}-{parent_id}-01"})
+
+    use_case, server = exporter.spans
+    assert server.name == "GET /<username>/<repository_name>/tree"
+    assert server.kind == "server"
+    assert server.context.trace_id == use_case.context.trace_id == trace_id
+    assert server.parent_span_id == parent_id
+    assert use_case.parent_span_id == server.context.span_id
+    assert server.attributes["http.status_code"] == 200
+
+
+def test_request_id_becomes_the_trace_id(tracer: Tracer, exporter: InMemorySpanExporter) -> None:
+    request_id = str(uuid.uuid4())
+
+    build_app(tracer, request_id=request_id).test_client().get("/alice/repo/tree")
+
+    assert {span.context.trace_id for span in exporter.spans} == {uuid.UUID(request_id).hex}
+
+
+def test_unsampled_traces_are_not_exported(tracer: Tracer, exporter: InMemorySpanExporter) -> None:
+    traceparent = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-00"
+
+    build_app(tracer).test_client().get("/alice/repo/tree", headers={"traceparent": traceparent})
+
+    assert exporter.spans == []
+
+
+@pytest.mark.parametrize(
+    "header",
+    [None, "garbage", "01-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01", f"00-{'0' * 32}-{'1' * 16}-01"],
+)
+def test_invalid_traceparent_is_ignored(header: str | None) -> None:
+    assert SpanContext.from_traceparent(header) is None
+
+
+async def test_storage_methods_and_executor_wait_are_traced(tracer: Tracer, exporter: InMemorySpanExporter) -> None:
+    @trace_async_methods("git", tracer=tracer)
+    class Storage:
+        async def get_tree(self) -> str:
+            return await asyncio.to_thread(lambda: "tree")
+
+    loop = asyncio.get_running_loop()
+    executor = TracedThreadPoolExecutor(max_workers=1, tracer=tracer)
+    loop.set_default_executor(executor)
+    try:
+        assert await Storage().get_tree() == "tree"  # outside a trace, not recorded
+        with tracer.span("use_case.GetTreeUseCase") as parent:
+            await Storage().get_tree()
+    finally:
+        loop.set_default_executor(ThreadPoolExecutor())
+        executor.shutdown()
+
+    queue, storage, use_case = exporter.spans
+    assert parent is not None and use_case.context.span_id == parent.context.span_id
+    assert storage.name == "git.get_tree"
+    assert storage.parent_span_id == use_case.context.span_id
+    assert queue.name == "executor.queue"
+    assert queue.parent_span_id == storage.context.span_id
+
+
+async def test_exceptions_mark_the_span_as_failed(tracer: Tracer, exporter: InMemorySpanExporter) -> None:
+    with pytest.raises(ValueError):
+        with tracer.span("use_case.Failing"):
+            raise ValueError("boom")
+
+    (span,) = exporter.spans
+    assert span.status == "error"
+    assert span.status_message == "ValueError: boom"
+
+
+def test_otlp_encoding(tracer: Tracer) -> None:
+    span = tracer.start_span("db.SELECT", kind="client", attributes={"db.statement": "SELECT 1", "rows": 1})
+    tracer.end_span(span)
+
+    body = json.loads(OtlpHttpSpanExporter("http://collector:4318", "github-clone", {}, timeout=1).encode([span]))
+
+    resource_spans = body["resourceSpans"][0]
+    assert resource_spans["resource"]["attributes"] == [
+        {"key": "service.name", "value": {"stringValue": "github-clone"}}
+    ]
+    (encoded,) = resource_spans["scopeSpans"][0]["spans"]
+    assert encoded["traceId"] == span.context.trace_id
+    assert encoded["kind"] == 3
+    assert encoded["startTimeUnixNano"] == str(span.start_ns)
+    assert {"key": "rows", "value": {"intValue": "1"}} in encoded["attributes"]
+    assert "parentSpanId" not in encoded
+
+
+def test_batch_processor_drops_spans_over_the_queue_size(exporter: InMemorySpanExporter) -> None:
+    tracer = Tracer()
+    processor = BatchSpanProcessor(exporter, max_queue_size=2, max_batch_size=10, schedule_delay=60)
+    tracer.configure(processor, service_name="test")
+
+    for name in ("a", "b", "c"):
+        with tracer.span(name):
+            pass
+    tracer.shutdown()
+
+    assert [span.name for span in exporter.spans] == ["a", "b"]
+    assert processor.dropped == 1
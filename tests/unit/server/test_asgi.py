@@ -0,0 +1,144 @@
+import asyncio
+import threading
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+import pytest
+from flask import Response, g, jsonify, request
+
+from infrastructure.server.asgi import FlaskAsgiApp, LoopBoundFlask
+
+
+@pytest.fixture
+def asgi_app() -> FlaskAsgiApp:
+    app = LoopBoundFlask(__name__)
+
+    @app.before_request
+    def set_user() -> None:
+        g.user = request.headers.get("X-User")
+
+    @app.post("/echo")
+    async def echo() -> Response:
+        await asyncio.sleep(0)
+        return jsonify(
+            {
+                "body": request.get_data(as_text=True),
+                "user": g.user,
+                "loop_id": id(asyncio.get_running_loop()),
+                "thread": threading.current_thread().name,
+            }
+        )
+
+    @app.get("/stream")
+    def stream() -> Response:
+        return Response(iter([b"a", b"", b"b"]))
+
+    return FlaskAsgiApp(app, wsgi_threads=4, executor_threads=2)
+
+
+async def call(app: FlaskAsgiApp, method: str, path: str, body: list[bytes] | None = None) -> dict[str, Any]:
+    chunks = list(body or [b""])
+    sent: list[dict[str, Any]] = []
+
+    async def receive() -> dict[str, Any]:
+        chunk = chunks.pop(0)
+        return {"type": "http.request", "body": chunk, "more_body": bool(chunks)}
+
+    async def send(message: dict[str, Any]) -> None:
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "query_string": b"",
+        "headers": [(b"x-user", b"alice"), (b"content-type", b"text/plain")],
+        "server": ("testserver", 80),
+        "client": ("127.0.0.1", 1234),
+    }
+    await app(scope, receive, send)
+
+    return {
+        "status": sent[0]["status"],
+        "body": b"".join(m.get("body", b"") for m in sent[1:]),
+        "messages": sent,
+    }
+
+
+async def test_async_views_run_on_server_loop(asgi_app: FlaskAsgiApp) -> None:
+    results = await asyncio.gather(*(call(asgi_app, "POST", "/echo", [b"hel", b"lo"]) for _ in range(8)))
+
+    loop_id = id(asyncio.get_running_loop())
+    for result in results:
+        assert result["status"] == 200
+        payload = asgi_app.app.json.loads(result["body"])
+        assert payload["body"] == "hello"
+        assert payload["user"] == "alice"
+        assert payload["loop_id"] == loop_id
+        assert payload["thread"] == threading.current_thread().name
+
+
+async def test_streamed_response_is_sent_in_chunks(asgi_app: FlaskAsgiApp) -> None:
+    result = await call(asgi_app, "GET", "/stream")
+
+    assert result["body"] == b"ab"
+    assert [m.get("more_body") for m in result["messages"][1:]] == [True, True, False]
+
+
+async def test_lifespan_binds_loop(asgi_app: FlaskAsgiApp) -> None:
+    messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+    sent: list[dict[str, Any]] = []
+
+    async def receive() -> dict[str, Any]:
+        if len(messages) == 1:
+            assert asgi_app.app.loop is asyncio.get_running_loop()
+        return messages.pop(0)
+
+    async def send(message: dict[str, Any]) -> None:
+        sent.append(message)
+
+    await asgi_app({"type": "lifespan"}, receive, send)
+
+    assert [m["type"] for m in sent] == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+    assert asgi_app.app.loop is None
+
+
+async def run_lifespan(app: FlaskAsgiApp, *types: str) -> list[str]:
+    messages = [{"type": f"lifespan.{message_type}"} for message_type in types]
+    sent: list[dict[str, Any]] = []
+
+    async def receive() -> dict[str, Any]:
+        return messages.pop(0)
+
+    async def send(message: dict[str, Any]) -> None:
+        sent.append(message)
+
+    await app({"type": "lifespan"}, receive, send)
+    return [m["type"] for m in sent]
+
+
+async def test_lifespan_context_wraps_serving(asgi_app: FlaskAsgiApp) -> None:
+    events: list[str] = []
+
+    @asynccontextmanager
+    async def lifespan() -> AsyncIterator[None]:
+        events.append("startup")
+        yield
+        events.append("shutdown")
+
+    app = FlaskAsgiApp(asgi_app.app, wsgi_threads=1, executor_threads=1, lifespan=lifespan)
+
+    assert await run_lifespan(app, "startup", "shutdown") == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+    assert events == ["startup", "shutdown"]
+
+
+async def test_failed_startup_is_reported(asgi_app: FlaskAsgiApp) -> None:
+    @asynccontextmanager
+    async def lifespan() -> AsyncIterator[None]:
+        raise ConnectionError("database is down")
+        yield
+
+    app = FlaskAsgiApp(asgi_app.app, wsgi_threads=1, executor_threads=1, lifespan=lifespan)
+
+    assert await run_lifespan(app, "startup") == ["lifespan.startup.failed"]
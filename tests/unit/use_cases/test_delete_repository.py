@@ -90,3 +90,32 @@ async def test_delete_repository_error_no_commit(
         await use_case.execute(command)
 
     mock_uow.commit.assert_not_awaited()
+
+
+async def test_delete_repository_restores_files_when_commit_fails(
+    command: DeleteRepositoryCommand,
+    mock_uow: AsyncMock,
+    mock_git_storage: AsyncMock,
+    mock_policy_service: MagicMock,
+    mock_user_reader: AsyncMock,
+    mock_repository_reader: AsyncMock,
+    mock_repository_writer: AsyncMock,
+    mock_user: MagicMock,
+    mock_repository: MagicMock,
+) -> None:
+    mock_uow.commit.side_effect = RuntimeError
+    mock_git_storage.delete_repository.return_value = "tombstone"
+    use_case = DeleteRepositoryUseCase(
+        uow=mock_uow,
+        git_storage=mock_git_storage,
+        policy_service=mock_policy_service,
+        user_reader_factory=lambda _: mock_user_reader,
+        repository_reader_factory=lambda _: mock_repository_reader,
+        repository_writer_factory=lambda _: mock_repository_writer,
+    )
+
+    with pytest.raises(RuntimeError):
+        await use_case.execute(command)
+
+    expected_path = RepositoryService.get_repository_path(user_id=mock_user.id, repository_id=mock_repository.id)
+    mock_git_storage.restore_repository.assert_awaited_once_with(repo_path=expected_path, tombstone="tombstone")
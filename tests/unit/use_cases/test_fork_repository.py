@@ -0,0 +1,121 @@
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from application.commands.git import ForkRepositoryCommand
+from application.use_cases.git.fork_repository import ForkRepositoryUseCase
+from domain.exceptions.common import PermissionDenied
+from domain.exceptions.git import RepositoryAlreadyExistsException
+
+
+@pytest.fixture
+def command() -> ForkRepositoryCommand:
+    return ForkRepositoryCommand(initiator_id=uuid4(), owner_username="username", repository_name="repository")
+
+
+@pytest.fixture(autouse=True)
+def named_entities(mock_user: MagicMock, mock_repository: MagicMock) -> None:
+    mock_user.email = "test@example.com"
+    mock_repository.name = "repository"
+    mock_repository.description = "description"
+
+
+@pytest.fixture
+def use_case(
+    mock_uow: AsyncMock,
+    mock_git_storage: AsyncMock,
+    mock_policy_service: MagicMock,
+    mock_user_reader: AsyncMock,
+    mock_repository_reader: AsyncMock,
+    mock_repository_writer: AsyncMock,
+    mock_repository_service: AsyncMock,
+) -> ForkRepositoryUseCase:
+    return ForkRepositoryUseCase(
+        uow=mock_uow,
+        git_storage=mock_git_storage,
+        policy_service=mock_policy_service,
+        user_reader_factory=lambda _: mock_user_reader,
+        repository_reader_factory=lambda _: mock_repository_reader,
+        repository_writer_factory=lambda _: mock_repository_writer,
+        repository_service_factory=lambda _: mock_repository_service,
+    )
+
+
+async def test_fork_repository_success(
+    command: ForkRepositoryCommand,
+    use_case: ForkRepositoryUseCase,
+    mock_uow: AsyncMock,
+    mock_git_storage: AsyncMock,
+    mock_policy_service: MagicMock,
+    mock_repository_writer: AsyncMock,
+    mock_repository_service: AsyncMock,
+    mock_repository: MagicMock,
+    mock_user: MagicMock,
+) -> None:
+    call_manager = MagicMock()
+    call_manager.attach_mock(mock_uow, "uow")
+    call_manager.attach_mock(mock_policy_service, "policy")
+    call_manager.attach_mock(mock_repository_service, "service")
+    call_manager.attach_mock(mock_repository_writer, "writer")
+    call_manager.attach_mock(mock_git_storage, "storage")
+
+    # Act
+    result = await use_case.execute(command)
+
+    # Assert: order
+    expected_order = [
+        "uow.__aenter__",
+        "policy.can",
+        "service.check_repository_name",
+        "writer.create",
+        "service.get_repository_path",
+        "service.get_repository_path",
+        "storage.fork_repository",
+        "uow.commit",
+        "uow.__aexit__",
+    ]
+    actual_order = [call[0] for call in call_manager.mock_calls]
+    assert expected_order == actual_order
+
+    # Assert: the fork keeps the source name and points back to it
+    mock_repository_service.check_repository_name.assert_awaited_once_with(mock_user.id, mock_repository.name)
+    create_schema = mock_repository_writer.create.call_args.args[0]
+    assert create_schema.owner_id == mock_user.id
+    assert create_schema.forked_from_id == mock_repository.id
+
+    assert result == mock_repository
+
+
+async def test_fork_repository_name_taken_no_commit(
+    command: ForkRepositoryCommand,
+    use_case: ForkRepositoryUseCase,
+    mock_uow: AsyncMock,
+    mock_git_storage: AsyncMock,
+    mock_repository_service: AsyncMock,
+) -> None:
+    mock_repository_service.check_repository_name.side_effect = RepositoryAlreadyExistsException(
+        repository_name=command.repository_name
+    )
+
+    with pytest.raises(RepositoryAlreadyExistsException):
+        await use_case.execute(command)
+
+    mock_git_storage.fork_repository.assert_not_awaited()
+    mock_uow.commit.assert_not_awaited()
+
+
+async def test_fork_repository_permission_denied(
+    command: ForkRepositoryCommand,
+    use_case: ForkRepositoryUseCase,
+    mock_uow: AsyncMock,
+    mock_git_storage: AsyncMock,
+    mock_policy_service: MagicMock,
+) -> None:
+    mock_policy_service.can.return_value = False
+
+    with pytest.raises(PermissionDenied):
+        await use_case.execute(command)
+
+    mock_git_storage.fork_repository.assert_not_awaited()
+    mock_uow.commit.assert_not_awaited()
@@ -0,0 +1,65 @@
+from collections.abc import Iterator
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from application.commands.git import GetTreeCommand
+from application.use_cases.git.get_tree import GetTreeUseCase
+from domain.services.etag import make_etag
+from infrastructure.utils.stats import ConditionalRequestStats
+
+TREE_SHA = "c" * 40
+
+
+@pytest.fixture
+def stats() -> ConditionalRequestStats:
+    return ConditionalRequestStats()
+
+
+@pytest.fixture
+def use_case(
+    mock_uow: AsyncMock, mock_git_storage: AsyncMock, mock_repository: MagicMock, stats: ConditionalRequestStats
+) -> Iterator[GetTreeUseCase]:
+    mock_git_storage.resolve_tree.return_value = TREE_SHA
+    mock_git_storage.get_tree.return_value = []
+
+    with patch("application.use_cases.git.get_tree.RepositoryReader") as reader:
+        reader.return_value.get_all = AsyncMock(return_value=[mock_repository])
+        yield GetTreeUseCase(uow=mock_uow, git_storage=mock_git_storage, conditional_stats=stats)
+
+
+def make_command(if_none_match: frozenset[str] = frozenset()) -> GetTreeCommand:
+    return GetTreeCommand(
+        owner_username="username", repository_name="repository", ref="main", path="src", if_none_match=if_none_match
+    )
+
+
+async def test_get_tree_returns_etag(
+    use_case: GetTreeUseCase, mock_git_storage: AsyncMock, stats: ConditionalRequestStats
+) -> None:
+    result = await use_case.execute(make_command())
+
+    assert result.etag == make_etag(TREE_SHA, "src")
+    assert result.data == []
+    mock_git_storage.get_tree.assert_awaited_once()
+    assert (stats.requests, stats.conditional, stats.not_modified) == (1, 0, 0)
+
+
+async def test_get_tree_not_modified_skips_listing(
+    use_case: GetTreeUseCase, mock_git_storage: AsyncMock, stats: ConditionalRequestStats
+) -> None:
+    result = await use_case.execute(make_command(frozenset({make_etag(TREE_SHA, "src")})))
+
+    assert result.not_modified
+    mock_git_storage.get_tree.assert_not_called()
+    assert stats.hit_rate == 1.0
+
+
+async def test_get_tree_stale_etag_returns_listing(
+    use_case: GetTreeUseCase, mock_git_storage: AsyncMock, stats: ConditionalRequestStats
+) -> None:
+    result = await use_case.execute(make_command(frozenset({"stale"})))
+
+    assert not result.not_modified
+    mock_git_storage.get_tree.assert_awaited_once()
+    assert stats.hit_rate == 0.0
@@ -0,0 +1,100 @@
+import io
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from application.commands.git import ImportRepositoryCommand
+from application.use_cases.git.bundles.import_repository import ImportRepositoryUseCase
+from domain.exceptions.git import InvalidBundleException, RepositoryAlreadyExistsException
+from domain.services.repository import RepositoryService
+
+
+@pytest.fixture
+def command() -> ImportRepositoryCommand:
+    return ImportRepositoryCommand(user_id=uuid4(), repository_name="repository", bundle=io.BytesIO(b"bundle"))
+
+
+@pytest.fixture
+def mock_import_runner() -> MagicMock:
+    return MagicMock()
+
+
+@pytest.fixture
+def mock_create_repository_use_case(mock_repository: MagicMock) -> AsyncMock:
+    use_case = AsyncMock()
+    use_case.execute.return_value = mock_repository
+    return use_case
+
+
+async def test_import_repository_success(
+    command: ImportRepositoryCommand,
+    mock_git_storage: AsyncMock,
+    mock_import_runner: MagicMock,
+    mock_create_repository_use_case: AsyncMock,
+    mock_repository: MagicMock,
+) -> None:
+    bundle_path = Path("bundle")
+    mock_git_storage.save_bundle.return_value = bundle_path
+
+    call_manager = MagicMock()
+    call_manager.attach_mock(mock_git_storage, "storage")
+    call_manager.attach_mock(mock_create_repository_use_case, "create_repository")
+    call_manager.attach_mock(mock_import_runner, "runner")
+
+    use_case = ImportRepositoryUseCase(
+        git_storage=mock_git_storage,
+        import_runner=mock_import_runner,
+        create_repository_use_case=mock_create_repository_use_case,
+    )
+
+    # Act
+    result = await use_case.execute(command)
+
+    # Assert: order
+    expected_order = [
+        "storage.save_bundle",
+        "storage.verify_bundle",
+        "create_repository.execute",
+        "runner.submit",
+    ]
+    actual_order = [call[0] for call in call_manager.mock_calls]
+    assert expected_order == actual_order
+
+    # Assert: correct arguments
+    expected_path = RepositoryService.get_repository_path(user_id=command.user_id, repository_id=mock_repository.id)
+    mock_import_runner.submit.assert_called_once_with(
+        repository_id=mock_repository.id, repo_path=expected_path, bundle_path=bundle_path
+    )
+    assert result == mock_import_runner.submit.return_value
+
+
+@pytest.mark.parametrize("failing_step", ["verify_bundle", "create_repository"])
+async def test_import_repository_error_removes_bundle(
+    failing_step: str,
+    command: ImportRepositoryCommand,
+    mock_git_storage: AsyncMock,
+    mock_import_runner: MagicMock,
+    mock_create_repository_use_case: AsyncMock,
+) -> None:
+    bundle_path = Path("bundle")
+    mock_git_storage.save_bundle.return_value = bundle_path
+    if failing_step == "verify_bundle":
+        exception: Exception = InvalidBundleException(reason="broken")
+        mock_git_storage.verify_bundle.side_effect = exception
+    else:
+        exception = RepositoryAlreadyExistsException(repository_name=command.repository_name)
+        mock_create_repository_use_case.execute.side_effect = exception
+
+    use_case = ImportRepositoryUseCase(
+        git_storage=mock_git_storage,
+        import_runner=mock_import_runner,
+        create_repository_use_case=mock_create_repository_use_case,
+    )
+
+    with pytest.raises(type(exception)):
+        await use_case.execute(command)
+
+    mock_git_storage.remove_bundle.assert_awaited_once_with(bundle_path)
+    mock_import_runner.submit.assert_not_called()
@@ -0,0 +1,90 @@
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from application.commands.git import LfsBatchCommand
+from application.use_cases.git.lfs.batch import LfsBatchUseCase
+from domain.exceptions.common import PermissionDenied
+from domain.value_objects.git import LfsObjectSpec
+
+STORED_OID = "a" * 64
+MISSING_OID = "b" * 64
+
+
+@pytest.fixture
+def mock_lfs_storage() -> AsyncMock:
+    storage = AsyncMock()
+    storage.get_size.side_effect = lambda oid: 10 if oid == STORED_OID else None
+    return storage
+
+
+@pytest.fixture
+def use_case(
+    mock_uow: AsyncMock,
+    mock_lfs_storage: AsyncMock,
+    mock_policy_service: MagicMock,
+    mock_user_reader: AsyncMock,
+    mock_repository_reader: AsyncMock,
+    mock_user: MagicMock,
+    mock_repository: MagicMock,
+) -> LfsBatchUseCase:
+    mock_user.email = "user@example.com"
+    mock_repository.name = "repository"
+    return LfsBatchUseCase(
+        uow=mock_uow,
+        lfs_storage=mock_lfs_storage,
+        policy_service=mock_policy_service,
+        user_reader_factory=lambda _: mock_user_reader,
+        repository_reader_factory=lambda _: mock_repository_reader,
+    )
+
+
+def make_command(operation: str, initiator_id: bool = True) -> LfsBatchCommand:
+    return LfsBatchCommand(
+        initiator_id=uuid4() if initiator_id else None,
+        owner_username="username",
+        repository_name="repository",
+        operation=operation,
+        objects=[LfsObjectSpec(oid=STORED_OID, size=10), LfsObjectSpec(oid=MISSING_OID, size=20)],
+    )
+
+
+async def test_lfs_batch_reports_stored_objects(use_case: LfsBatchUseCase, mock_policy_service: MagicMock) -> None:
+    statuses = await use_case.execute(make_command("download", initiator_id=False))
+
+    assert [status.stored_size for status in statuses] == [10, None]
+    mock_policy_service.can.assert_not_called()
+
+
+async def test_lfs_batch_upload_checks_policy(use_case: LfsBatchUseCase, mock_policy_service: MagicMock) -> None:
+    await use_case.execute(make_command("upload"))
+
+    mock_policy_service.can.assert_called_once()
+    assert mock_policy_service.can.call_args.kwargs["action"] == "repository:commit"
+
+
+async def test_lfs_batch_upload_permission_denied(
+    use_case: LfsBatchUseCase, mock_policy_service: MagicMock, mock_lfs_storage: AsyncMock
+) -> None:
+    mock_policy_service.can.return_value = False
+
+    with pytest.raises(PermissionDenied):
+        await use_case.execute(make_command("upload"))
+
+    mock_lfs_storage.get_size.assert_not_called()
+
+
+async def test_lfs_batch_upload_requires_initiator(use_case: LfsBatchUseCase) -> None:
+    with pytest.raises(PermissionDenied):
+        await use_case.execute(make_command("upload", initiator_id=False))
+
+
+def test_lfs_batch_command_rejects_invalid_oid() -> None:
+    with pytest.raises(ValueError):
+        LfsBatchCommand(
+            owner_username="username",
+            repository_name="repository",
+            operation="download",
+            objects=[LfsObjectSpec(oid="not-a-sha", size=1)],
+        )
@@ -0,0 +1,102 @@
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from application.commands.auth import UserLogoutCommand
+from application.use_cases.auth.logout_user import LogoutUserUseCase
+from domain.entities.user import User
+from domain.services.auth.token import TokenService
+from infrastructure.auth.revocation_list import AccessTokenRevocationList
+
+
+@pytest.fixture
+def token_service(private_key: str, public_key: str) -> TokenService:
+    return TokenService(private_key=private_key, public_key=public_key)
+
+
+@pytest.fixture
+def repositories() -> Iterator[tuple[MagicMock, MagicMock]]:
+    module = "application.use_cases.auth.logout_user"
+    with (
+        patch(f"{module}.RefreshTokenWriteRepository") as refresh_write,
+        patch(f"{module}.TokenRevocationWriteRepository") as revocations,
+    ):
+        refresh_write.return_value = AsyncMock()
+        revocations.return_value = AsyncMock()
+        yield refresh_write.return_value, revocations.return_value
+
+
+async def test_logout_revokes_the_current_session(
+    mock_uow: AsyncMock, token_service: TokenService, user: User, repositories: tuple[MagicMock, MagicMock]
+) -> None:
+    refresh_write, revocations = repositories
+    access = token_service.verify_access(token_service.generate_access(user))
+    refresh = token_service.generate_refresh(user)
+
+    command = UserLogoutCommand(
+        user_id=user.id, access_token_jti=access.jti, access_token_exp=access.exp, refresh_token=refresh.value
+    )
+    await LogoutUserUseCase(uow=mock_uow, token_service=token_service).execute(command)
+
+    assert revocations.revoke_token.await_args.kwargs["jti"] == access.jti
+    assert revocations.revoke_token.await_args.kwargs["expires_at"].timestamp() == access.exp
+    refresh_write.revoke_by_identity.assert_awaited_once_with(token_service.verify_refresh(refresh).jti)
+    refresh_write.revoke_all_for_user.assert_not_called()
+    revocations.revoke_user.assert_not_called()
+    revocations.notify.assert_awaited_once()
+    mock_uow.commit.assert_awaited_once()
+
+
+async def test_logout_everywhere_revokes_every_session(
+    mock_uow: AsyncMock, token_service: TokenService, user: User, repositories: tuple[MagicMock, MagicMock]
+) -> None:
+    refresh_write, revocations = repositories
+
+    command = UserLogoutCommand(user_id=user.id, access_token_jti=uuid4(), access_token_exp=0, everywhere=True)
+    await LogoutUserUseCase(uow=mock_uow, token_service=token_service).execute(command)
+
+    refresh_write.revoke_all_for_user.assert_awaited_once_with(user.id)
+    revocations.revoke_user.assert_awaited_once_with(user.id)
+    revocations.revoke_token.assert_not_called()
+    revocations.notify.assert_awaited_once()
+    mock_uow.commit.assert_awaited_once()
+
+
+async def test_invalid_refresh_token_doesnt_fail_the_logout(
+    mock_uow: AsyncMock, token_service: TokenService, user: User, repositories: tuple[MagicMock, MagicMock]
+) -> None:
+    refresh_write, _ = repositories
+
+    command = UserLogoutCommand(user_id=user.id, access_token_exp=0, refresh_token="garbage")
+    await LogoutUserUseCase(uow=mock_uow, token_service=token_service).execute(command)
+
+    refresh_write.revoke_by_identity.assert_not_called()
+    mock_uow.commit.assert_awaited_once()
+
+
+async def test_logout_applies_the_revocation_locally_after_commit(
+    mock_uow: AsyncMock, token_service: TokenService, user: User, repositories: tuple[MagicMock, MagicMock]
+) -> None:
+    _, revocations = repositories
+    local = MagicMock(spec=AccessTokenRevocationList)
+    call_manager = MagicMock()
+    call_manager.attach_mock(mock_uow.commit, "commit")
+    call_manager.attach_mock(local, "local")
+    access = token_service.verify_access(token_service.generate_access(user))
+    assert access.jti is not None
+    use_case = LogoutUserUseCase(uow=mock_uow, token_service=token_service, revocations=local)
+
+    await use_case.execute(UserLogoutCommand(user_id=user.id, access_token_jti=access.jti, access_token_exp=access.exp))
+
+    assert [name for name, *_ in call_manager.mock_calls] == ["commit", "local.add_token"]
+    jti, expires_at = local.add_token.call_args.args
+    assert (jti, expires_at.timestamp()) == (access.jti, access.exp)
+
+    revoked_before = datetime.now(tz=timezone.utc)
+    revocations.revoke_user.return_value = revoked_before
+    await use_case.execute(UserLogoutCommand(user_id=user.id, access_token_exp=access.exp, everywhere=True))
+
+    local.add_user.assert_called_once_with(user.id, revoked_before)
@@ -0,0 +1,112 @@
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from application.commands.auth import RefreshTokensCommand
+from application.use_cases.auth.refresh_tokens import RefreshTokensUseCase
+from domain.entities.refresh import RefreshToken
+from domain.entities.user import User
+from domain.exceptions.auth import InvalidTokenException
+from domain.exceptions.refresh_token import RefreshTokenAlreadyRevokedException
+from domain.exceptions.user import UserInactiveException
+from domain.services.auth.token import TokenService
+
+
+@pytest.fixture
+def token_service(private_key: str, public_key: str) -> TokenService:
+    return TokenService(private_key=private_key, public_key=public_key)
+
+
+@pytest.fixture
+def user() -> User:
+    return User(id=uuid4(), email="user@example.com", username="username", password_hash="hash")
+
+
+@pytest.fixture
+def repositories() -> Iterator[tuple[MagicMock, MagicMock, MagicMock]]:
+    module = "application.use_cases.auth.refresh_tokens"
+    with (
+        patch(f"{module}.RefreshTokenReadRepository") as refresh_read,
+        patch(f"{module}.RefreshTokenWriteRepository") as refresh_write,
+        patch(f"{module}.UserReadRepository") as user_read,
+    ):
+        refresh_read.return_value = AsyncMock()
+        refresh_write.return_value = AsyncMock()
+        user_read.return_value = AsyncMock()
+        yield refresh_read.return_value, refresh_write.return_value, user_read.return_value
+
+
+def stored_token(token_service: TokenService, token: str, user: User, is_revoked: bool = False) -> RefreshToken:
+    return RefreshToken(
+        id=token_service.verify_refresh(token_service.generate_refresh(user)).jti,
+        user_id=user.id,
+        token_hash=token_service.hash_token(token),
+        expires_at=datetime.now(timezone.utc) + timedelta(days=1),
+        is_revoked=is_revoked,
+    )
+
+
+async def test_rotation_is_a_single_repository_call(
+    mock_uow: AsyncMock, token_service: TokenService, user: User, repositories: tuple[MagicMock, ...]
+) -> None:
+    refresh_read, refresh_write, user_read = repositories
+    refresh_write.rotate.return_value = user
+    old_refresh = token_service.generate_refresh(user)
+
+    use_case = RefreshTokensUseCase(uow=mock_uow, token_service=token_service)
+    access, refresh = await use_case.execute(RefreshTokensCommand(refresh_token=old_refresh.value))
+
+    kwargs = refresh_write.rotate.await_args.kwargs
+    assert kwargs["identity"] == token_service.verify_refresh(old_refresh).jti
+    assert kwargs["token_hash"] == token_service.hash_token(old_refresh.value)
+    assert kwargs["schema"].user_id == user.id
+    assert kwargs["schema"].id == token_service.verify_refresh(refresh).jti
+    assert kwargs["schema"].token_hash == token_service.hash_token(refresh.value)
+    assert token_service.verify_access(access).sub == user.id
+    mock_uow.commit.assert_awaited_once()
+    refresh_read.get_by_identity.assert_not_called()
+    user_read.get_by_identity.assert_not_called()
+
+
+async def test_revoked_token_reuse_is_reported(
+    mock_uow: AsyncMock, token_service: TokenService, user: User, repositories: tuple[MagicMock, ...]
+) -> None:
+    refresh_read, refresh_write, _ = repositories
+    refresh_write.rotate.return_value = None
+    old_refresh = token_service.generate_refresh(user)
+    refresh_read.get_by_identity.return_value = stored_token(token_service, old_refresh.value, user, is_revoked=True)
+
+    use_case = RefreshTokensUseCase(uow=mock_uow, token_service=token_service)
+    with pytest.raises(RefreshTokenAlreadyRevokedException):
+        await use_case.execute(RefreshTokensCommand(refresh_token=old_refresh.value))
+
+    mock_uow.commit.assert_not_called()
+
+
+async def test_hash_mismatch_is_reported(
+    mock_uow: AsyncMock, token_service: TokenService, user: User, repositories: tuple[MagicMock, ...]
+) -> None:
+    refresh_read, refresh_write, _ = repositories
+    refresh_write.rotate.return_value = None
+    refresh_read.get_by_identity.return_value = stored_token(token_service, "another token", user)
+
+    use_case = RefreshTokensUseCase(uow=mock_uow, token_service=token_service)
+    with pytest.raises(InvalidTokenException):
+        await use_case.execute(RefreshTokensCommand(refresh_token=token_service.generate_refresh(user).value))
+
+
+async def test_inactive_user_is_reported(
+    mock_uow: AsyncMock, token_service: TokenService, user: User, repositories: tuple[MagicMock, ...]
+) -> None:
+    refresh_read, refresh_write, user_read = repositories
+    refresh_write.rotate.return_value = None
+    old_refresh = token_service.generate_refresh(user)
+    refresh_read.get_by_identity.return_value = stored_token(token_service, old_refresh.value, user)
+    user_read.get_by_identity.return_value = user.model_copy(update={"is_active": False})
+
+    use_case = RefreshTokensUseCase(uow=mock_uow, token_service=token_service)
+    with pytest.raises(UserInactiveException):
+        await use_case.execute(RefreshTokensCommand(refresh_token=old_refresh.value))
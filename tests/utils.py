@@ -1,11 +1,33 @@
 from typing import Any
 
 import bcrypt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from infrastructure.database.models.user import UserModel
 
 
+def generate_pem_pair(algorithm: str = "RS256") -> tuple[str, str]:
+    """A fresh private and public key in PEM for the JWT `algorithm`, so no key is kept in the repository."""
+
+    key: rsa.RSAPrivateKey | ec.EllipticCurvePrivateKey | ed25519.Ed25519PrivateKey
+    if algorithm == "RS256":
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    elif algorithm == "ES256":
+        key = ec.generate_private_key(ec.SECP256R1())
+    else:
+        key = ed25519.Ed25519PrivateKey.generate()
+
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    public_pem = key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return private_pem.decode(), public_pem.decode()
+
+
 async def create_user_model(session: AsyncSession, **kwargs: Any) -> UserModel:
     if "password" in kwargs:
         password = kwargs.pop("password")